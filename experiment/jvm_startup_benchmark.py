@@ -0,0 +1,67 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tkltest.util import constants, jvm_util
+
+
+def time_launches(command, launches):
+    durations = []
+    for _ in range(launches):
+        start_time = time.perf_counter()
+        subprocess.run(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start_time)
+    return durations
+
+
+def benchmark(java_path, classpath, main_class, main_args, launches):
+    cache_dir = tempfile.mkdtemp(prefix='tkltest-jvm-benchmark-')
+    try:
+        modes = {
+            'classpath on the command line': '"{}" -cp "{}"'.format(java_path, os.pathsep.join(classpath)),
+            'argument file': '"{}" {}'.format(java_path, jvm_util.get_classpath_args(java_path, classpath, cache_dir)),
+        }
+        class_data_sharing_args = jvm_util.get_class_data_sharing_args(java_path, 'benchmark', classpath, cache_dir)
+        if class_data_sharing_args:
+            # the first launch creates the archive
+            time_launches('"{}" {} -cp "{}" {} {}'.format(java_path, class_data_sharing_args,
+                                                        os.pathsep.join(classpath), main_class, main_args), 1)
+            modes['argument file and class data sharing'] = '"{}" {}'.format(
+                java_path, jvm_util.get_jvm_launch_args(java_path, 'benchmark', classpath, cache_dir))
+        else:
+            print('Class data sharing needs Java {}+ and a classpath of jars; skipping it'.format(13))
+        results = {}
+        for mode, launch_command in modes.items():
+            results[mode] = time_launches('{} {} {}'.format(launch_command, main_class, main_args), launches)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    baseline = statistics.median(results['classpath on the command line'])
+    print('{:40} {:>10} {:>10} {:>10}'.format('mode', 'mean (s)', 'median (s)', 'speedup'))
+    for mode, durations in results.items():
+        median = statistics.median(durations)
+        print('{:40} {:10.3f} {:10.3f} {:9.2f}x'.format(mode, statistics.mean(durations), median, baseline / median))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the startup of JVM launches of the TackleTest CLI',
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('-j', '--java', type=str, dest='java_path', default='java', help='Java launcher')
+    parser.add_argument('-cp', '--classpath', type=str, nargs='+', dest='classpath',
+                        default=[os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)],
+                        help='Classpath entries of the launched tool')
+    parser.add_argument('-m', '--main-class', type=str, dest='main_class', default='org.jacoco.cli.internal.Main',
+                        help='Main class of the launched tool')
+    parser.add_argument('-a', '--args', type=str, dest='main_args', default='--help',
+                        help='Arguments of the launched tool')
+    parser.add_argument('-n', '--launches', type=int, dest='launches', default=20,
+                        help='Number of timed launches per mode')
+    args = parser.parse_args()
+    benchmark(args.java_path, args.classpath, args.main_class, args.main_args, args.launches)
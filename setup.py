@@ -31,9 +31,10 @@ setup(
         'yattag==1.15.0',
         'jinja2==3.1.2',
         'beautifulsoup4==4.12.0',
-        'kaitaistruct==0.9',
+        'kaitaistruct==0.10',
         'psutil==5.9.5',
         'tqdm==4.66.0',
+        'numpy==1.26.4',
         # 'nltk==3.6.7',
         # 'pyenchant==3.2.2',
         # 'lxml==4.9.1',
@@ -18,13 +18,26 @@ import os
 from pathlib import Path, PurePath
 import sys
 import unittest
+from unittest import mock
+import numpy as np
 import toml
 import shutil
 import copy
+import json
+import tempfile
+import time
+import random
+import tracemalloc
+import threading
+import shlex
+import subprocess
+import zipfile
+from xml.etree import ElementTree
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__))+os.sep+'..')
-from tkltest.util import config_util, constants, command_util
-from tkltest.unit.util import dir_util, build_util
-from tkltest.unit.generate import generate, augment
+from tkltest.util import config_util, constants, command_util, jvm_util
+from tkltest.unit.util import budget_util, dir_util, build_util, checkpoint_util, coverage_cache_util, coverage_util, \
+    incremental_util, jacoco_exec_util, jacoco_service_util, probe_coverage_util
+from tkltest.unit.generate import generate, generate_standalone, augment
 
 
 class UnitTests(unittest.TestCase):
@@ -572,6 +585,1258 @@ class UnitTests(unittest.TestCase):
         dir_util.cd_cli_dir()
         self.__assert_no_artifact_at_cli([app_name])
 
+    def test_merge_jacoco_exec_files(self) -> None:
+        """Test reading, writing and merging of jacoco execution data files"""
+        session1 = {'id': 'session-1', 'start': 1000, 'dump': 2000}
+        session2 = {'id': 'session-\u00e9', 'start': 3000, 'dump': 4000}
+        exec_data1 = {
+            0x8000000000000001: ('irs/IRS', 10, 0b0000000101),
+            0x2: ('irs/Salary', 3, 0b001),
+            0x3: ('irs/Employer', 4, 0),
+        }
+        exec_data2 = {
+            0x8000000000000001: ('irs/IRS', 10, 0b1000000100),
+            0x4: ('irs/Employee', 130, 1 << 129),
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            exec_file1 = os.path.join(tmp_dir, 'test1_jacoco.exec')
+            exec_file2 = os.path.join(tmp_dir, 'test2_jacoco.exec')
+            merged_file = os.path.join(tmp_dir, 'merged.exec')
+            jacoco_exec_util.write_exec_file(exec_file1, [session1], exec_data1)
+            jacoco_exec_util.write_exec_file(exec_file2, [session2], exec_data2)
+
+            sessions, exec_data = jacoco_exec_util.read_exec_file(exec_file1)
+            self.assertEqual([session1], sessions)
+            # classes without executed probes are not written
+            self.assertEqual({k: v for k, v in exec_data1.items() if v[2]}, exec_data)
+
+            jacoco_exec_util.merge_exec_files([exec_file1, exec_file2], merged_file)
+            sessions, exec_data = jacoco_exec_util.read_exec_file(merged_file)
+            self.assertEqual([session1, session2], sessions)
+            self.assertEqual({
+                0x8000000000000001: ('irs/IRS', 10, 0b1000000101),
+                0x2: ('irs/Salary', 3, 0b001),
+                0x4: ('irs/Employee', 130, 1 << 129),
+            }, exec_data)
+
+            # execution data with the same class id but a different probe count cannot be merged
+            jacoco_exec_util.write_exec_file(exec_file2, [session2], {0x2: ('irs/Salary', 5, 0b10000)})
+            with self.assertRaises(ValueError):
+                jacoco_exec_util.merge_exec_files([exec_file1, exec_file2], merged_file)
+
+    def test_probe_coverage_matrix(self) -> None:
+        """Test coverage gains computed from probe arrays of app classes"""
+        class_models = probe_coverage_util.analyze_class_files(['test/data/irs/monolith/target/classes'])
+        class_ids = {model['name']: class_id for class_id, model in class_models.items()}
+        self.assertEqual({'irs/BusinessProcess', 'irs/Employee', 'irs/Employer', 'irs/IRS', 'irs/Salary'},
+                         set(class_ids.keys()))
+        # Salary only has straight-line methods, each covered by the probe at its return instruction
+        salary = class_models[class_ids['irs/Salary']]
+        self.assertEqual(8, salary['probe_count'])
+        self.assertEqual(8, sum(weights[3] for _, weights in salary['groups']))
+        self.assertEqual(0, sum(weights[1] for _, weights in salary['groups']))
+
+        def all_probes(class_name):
+            model = class_models[class_ids[class_name]]
+            return class_ids[class_name], (class_name, model['probe_count'], (1 << model['probe_count']) - 1)
+
+        def totals(class_name):
+            return [sum(weights[i] for _, weights in class_models[class_ids[class_name]]['groups'])
+                    for i in range(len(probe_coverage_util.COVERAGE_COUNTERS))]
+
+        salary_probes = all_probes('irs/Salary')
+        employer_probes = all_probes('irs/Employer')
+        tests_exec_data = [dict([salary_probes]), dict([salary_probes, employer_probes]), {}]
+        # execution data of tests can be streamed
+        coverage, weights = probe_coverage_util.build_coverage_matrix(class_models, {},
+                                                                      (exec_data for exec_data in tests_exec_data))
+        gains = probe_coverage_util.compute_coverage_gain(coverage, weights)
+        self.assertEqual(totals('irs/Salary'), list(gains[0]))
+        self.assertEqual([a + b for a, b in zip(totals('irs/Salary'), totals('irs/Employer'))], list(gains[1]))
+        self.assertEqual([0, 0, 0, 0], list(gains[2]))
+        # no gain for the first test once the second one is added
+        self.assertEqual([0, 0, 0, 0], list(probe_coverage_util.compute_coverage_gain(coverage[0], weights,
+                                                                                       coverage[1])))
+
+        # items covered by the base suite are excluded from the matrix
+        coverage, weights = probe_coverage_util.build_coverage_matrix(class_models, dict([salary_probes]),
+                                                                      tests_exec_data)
+        gains = probe_coverage_util.compute_coverage_gain(coverage, weights)
+        self.assertEqual([0, 0, 0, 0], list(gains[0]))
+        self.assertEqual(totals('irs/Employer'), list(gains[1]))
+
+    def test_probe_coverage_matrix_memory(self) -> None:
+        """Test that the coverage matrix is built within its memory budget"""
+        # 16 classes with 512 probes each and one coverage item per probe
+        class_models = {class_id: {'name': 'app/C{}'.format(class_id), 'probe_count': 512,
+                                   'groups': [(1 << probe, (1, 0, 0, 0)) for probe in range(512)]}
+                        for class_id in range(16)}
+
+        def tests_exec_data(test_count):
+            # each test covers about half of the probes of each class
+            random_probes = random.Random(0)
+            for _ in range(test_count):
+                yield {class_id: (model['name'], 512, random_probes.getrandbits(512))
+                       for class_id, model in class_models.items()}
+
+        expected_coverage, expected_weights = probe_coverage_util.build_coverage_matrix(class_models, {},
+                                                                                        tests_exec_data(2000))
+        # the matrix has 2000 rows of 1KB, and the covered items of the tests take 32MB
+        tracemalloc.start()
+        try:
+            coverage, weights = probe_coverage_util.build_coverage_matrix(class_models, {}, tests_exec_data(2000),
+                                                                          memory_budget=1)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertIsInstance(coverage, np.memmap)
+        self.assertLess(peak, 3 * 1024 * 1024)
+        self.assertTrue(np.array_equal(expected_coverage, coverage))
+        self.assertTrue(np.array_equal(expected_weights, weights))
+        self.assertTrue(np.array_equal(probe_coverage_util.compute_coverage_gain(expected_coverage, weights),
+                                       probe_coverage_util.compute_coverage_gain(coverage, weights)))
+
+    def test_probe_coverage_jacoco_counters(self) -> None:
+        """Test coverage counters of app classes against the counters of a JaCoCo report"""
+        class_models = probe_coverage_util.analyze_class_files(['test/data/irs/monolith/target/classes'])
+        with open('test/data/irs/monolith/jacoco.csv') as f:
+            header = f.readline().strip().split(',')
+            report = {row[2]: row for row in (line.strip().split(',') for line in f if line.strip())}
+        self.assertEqual({'BusinessProcess', 'Employee', 'Employer', 'IRS', 'Salary'}, set(report.keys()))
+        for class_id, model in class_models.items():
+            row = report[model['name'].split('/')[-1]]
+            # gain of a test executing all probes of the class
+            coverage, weights = probe_coverage_util.build_coverage_matrix(
+                class_models, {}, [{class_id: (model['name'], model['probe_count'],
+                                               (1 << model['probe_count']) - 1)}])
+            gains = probe_coverage_util.compute_coverage_gain(coverage, weights)
+            for i, counter in enumerate(probe_coverage_util.COVERAGE_COUNTERS):
+                total = int(row[header.index(counter.upper() + '_MISSED')]) + \
+                        int(row[header.index(counter.upper() + '_COVERED')])
+                self.assertEqual(total, gains[0][i], model['name'] + ' ' + counter)
+
+    def test_augmentation_coverage_cache(self) -> None:
+        """Test reuse and LRU eviction of cached coverage data of test classes"""
+        app_classes_hash = coverage_cache_util.get_app_classes_hash(['test/data/irs/monolith/target/classes'])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            test_file = os.path.join(tmp_dir, 'irs', 'Salary_ESTest.java')
+            os.makedirs(os.path.dirname(test_file))
+            Path(test_file).write_text('class Salary_ESTest {}')
+            Path(test_file[:-5] + '_scaffolding.java').write_text('class Salary_ESTest_scaffolding {}')
+            key = coverage_cache_util.get_test_cache_key(test_file, app_classes_hash, 'offline=True')
+            self.assertNotEqual(key, coverage_cache_util.get_test_cache_key(test_file, app_classes_hash,
+                                                                            'offline=False'))
+
+            exec_file = os.path.join(tmp_dir, 'Salary_ESTest_jacoco.exec')
+            dest_file = os.path.join(tmp_dir, 'dest.exec')
+            jacoco_exec_util.write_exec_file(exec_file, [], {0x2: ('irs/Salary', 3, 0b001)})
+            self.assertFalse(coverage_cache_util.get_cached_coverage(cache_dir, key, dest_file))
+            coverage_cache_util.add_cached_coverage(cache_dir, key, exec_file)
+            self.assertTrue(coverage_cache_util.get_cached_coverage(cache_dir, key, dest_file))
+            self.assertEqual(Path(exec_file).read_bytes(), Path(dest_file).read_bytes())
+
+            # a change in the scaffolding class changes the key
+            Path(test_file[:-5] + '_scaffolding.java').write_text('class Salary_ESTest_scaffolding { }')
+            new_key = coverage_cache_util.get_test_cache_key(test_file, app_classes_hash, 'offline=True')
+            self.assertNotEqual(key, new_key)
+
+            # the least recently used entry is evicted first
+            coverage_cache_util.add_cached_coverage(cache_dir, new_key, exec_file)
+            os.utime(os.path.join(cache_dir, key + '.exec'), (0, 0))
+            coverage_cache_util.evict_cached_coverage(cache_dir, max_size=os.path.getsize(exec_file) / (1024 * 1024))
+            self.assertEqual([new_key + '.exec'], os.listdir(cache_dir))
+
+    def test_add_test_methods_to_ctd_suite(self) -> None:
+        """Test adding a test class with only selected test methods to a test directory"""
+        test_class = os.path.join('test', 'data', 'irs', 'basic_blocks', 'irs-evosuite-tests', 'irs',
+                                  'Employer_ESTest.java')
+        test_methods = coverage_util.get_test_methods(test_class)
+        self.assertEqual(['test{}'.format(i) for i in range(8)], test_methods)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            coverage_util.add_test_methods_to_ctd_suite(test_class, ['test1', 'test6'], tmp_dir)
+            added_test_dir = os.path.join(tmp_dir, os.path.dirname(test_class).split(os.sep, 1)[1])
+            self.assertEqual({'Employer_ESTest.java', 'Employer_ESTest_scaffolding.java'},
+                             set(os.listdir(added_test_dir)))
+            added_test_class = os.path.join(added_test_dir, 'Employer_ESTest.java')
+            self.assertEqual(['test1', 'test6'], coverage_util.get_test_methods(added_test_class))
+            added_source = Path(added_test_class).read_text()
+            self.assertEqual(added_source.count('{'), added_source.count('}'))
+
+    def test_shard_bb_test_generation(self) -> None:
+        """Test splitting CTD test plans into shards and merging the shards' building-block sequences"""
+        ctd_plans = {
+            'models_and_test_plans': {
+                'monolithic': {
+                    'irs.Employer': {'m1': [], 'm2': [], 'm3': []},
+                    'irs.Salary': {'m1': [], 'm2': []},
+                    'irs.IRS': {'m1': []},
+                    'irs.Main': {'m1': []}
+                }
+            },
+            'statistics': {'target_methods': 7}
+        }
+        ctd_shards = generate.split_ctd_models_and_test_plans(ctd_plans, 2)
+        self.assertEqual(2, len(ctd_shards))
+        self.assertEqual([{'irs.Employer', 'irs.Main'}, {'irs.Salary', 'irs.IRS'}],
+                         [set(shard['models_and_test_plans']['monolithic']) for shard in ctd_shards])
+        self.assertEqual(ctd_plans['statistics'], ctd_shards[0]['statistics'])
+        self.assertEqual(4, len(generate.split_ctd_models_and_test_plans(ctd_plans, 8)))
+
+        bb_seq_file = os.path.join('test', 'data', 'irs', 'basic_blocks',
+                                   'irs_EvoSuiteTestGenerator' + constants.TKL_BB_SEQ_FILE_SUFFIX)
+        with open(bb_seq_file) as f:
+            bb_sequences = json.load(f)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shard_files = []
+            for shard, class_name in enumerate(bb_sequences['test_sequences']):
+                shard_sequences = dict(bb_sequences, test_sequences={
+                    class_name: bb_sequences['test_sequences'][class_name]
+                })
+                shard_file = os.path.join(tmp_dir, 'shard{}.json'.format(shard))
+                with open(shard_file, 'w') as f:
+                    json.dump(shard_sequences, f)
+                shard_files.append(shard_file)
+            merged_file = os.path.join(tmp_dir, 'merged.json')
+            generate.merge_bb_test_sequences(shard_files, merged_file)
+            with open(merged_file) as f:
+                self.assertEqual(bb_sequences, json.load(f))
+
+    def test_combined_bb_test_generation(self) -> None:
+        """Test running the base test generators concurrently in combined mode and merging their outputs"""
+        ctd_plans = {
+            'models_and_test_plans': {'monolithic': {'irs.Employer': {'m1': []}, 'irs.Salary': {'m1': []}}}
+        }
+        ctd_file = 'irs' + constants.TKL_CTD_TEST_PLAN_FILE_SUFFIX
+        runs = []
+
+        def run_command(command, verbose, cwd, timeout=None):
+            # the generator creates sequences and tests for the target classes of its run
+            args = command.split()
+            test_generator = args[args.index('-tg') + 1]
+            runs.append((test_generator, args[args.index('-tl') + 1], os.path.basename(cwd)))
+            with open(os.path.join(cwd, ctd_file)) as f:
+                class_names = list(json.load(f)['models_and_test_plans']['monolithic'])
+            with open(os.path.join(cwd, 'irs_' + test_generator + constants.TKL_BB_SEQ_FILE_SUFFIX), 'w') as f:
+                json.dump({'test_sequences': {class_name: [test_generator] for class_name in class_names}}, f)
+            if test_generator == constants.BASE_TEST_GENERATORS['evosuite']:
+                for class_name in class_names:
+                    test_dir = os.path.join(cwd, 'irs' + constants.TKL_EVOSUITE_OUTDIR_SUFFIX, 'irs')
+                    os.makedirs(test_dir, exist_ok=True)
+                    Path(test_dir, class_name.split('.')[-1] + '_ESTest.java').write_text('')
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                with open(ctd_file, 'w') as f:
+                    json.dump(ctd_plans, f)
+                for shards in [1, 2]:
+                    runs.clear()
+                    with mock.patch.object(jvm_util, 'get_jvm_launch_args', return_value='-cp tkltest.jar'), \
+                            mock.patch.object(command_util, 'run_command', side_effect=run_command):
+                        generate.run_bb_test_generator(app_name='irs', ctd_file=ctd_file,
+                                                       monolith_app_path=['classes'],
+                                                       app_classpath_file='classpath.txt',
+                                                       test_generator_name=constants.COMBINED_TEST_GENERATOR_NAME,
+                                                       time_limit=60, jdk_path='java', shards=shards)
+                    # each test generator runs for each shard, in its own directory, with the full time limit
+                    self.assertEqual(2 * shards, len(runs))
+                    self.assertEqual(2 * shards, len({shard_dir for _, _, shard_dir in runs}))
+                    self.assertEqual(sorted([(constants.BASE_TEST_GENERATORS['evosuite'], '60'),
+                                             (constants.BASE_TEST_GENERATORS['randoop'], '60')] * shards),
+                                     sorted((test_generator, time_limit) for test_generator, time_limit, _ in runs))
+                    # the sequences of each test generator and the evosuite tests of the shards are merged
+                    for test_generator in ['evosuite', 'randoop']:
+                        with open('irs_' + constants.BASE_TEST_GENERATORS[test_generator] +
+                                  constants.TKL_BB_SEQ_FILE_SUFFIX) as f:
+                            self.assertEqual({'irs.Employer': [constants.BASE_TEST_GENERATORS[test_generator]],
+                                              'irs.Salary': [constants.BASE_TEST_GENERATORS[test_generator]]},
+                                             json.load(f)['test_sequences'])
+                    self.assertEqual(['Employer_ESTest.java', 'Salary_ESTest.java'], sorted(
+                        os.listdir(os.path.join('irs' + constants.TKL_EVOSUITE_OUTDIR_SUFFIX, 'irs'))))
+                    self.assertFalse([file for file in os.listdir('.') if constants.TKL_BB_SHARD_DIR_SUFFIX in file])
+            finally:
+                os.chdir(cwd)
+
+    def test_weighted_time_budget(self) -> None:
+        """Test allocation of per-class time budgets weighted by class size and dev-test coverage"""
+        app_class_files = incremental_util.get_app_class_files([os.path.join('test', 'data', 'irs', 'monolith',
+                                                                             'target', 'classes')])
+        class_metrics = budget_util.get_class_metrics(app_class_files, ['irs.Salary', 'irs.BusinessProcess'])
+        self.assertEqual(8, class_metrics['irs.Salary']['methods'])
+        # the metrics are the JaCoCo counters of the classes
+        with open('test/data/irs/monolith/jacoco.csv') as f:
+            jacoco_counters = {row[1] + '.' + row[2]: [int(row[i]) + int(row[i + 1]) for i in (3, 5, 11)]
+                               for row in (line.strip().split(',') for line in f.readlines()[1:])}
+        for class_name, metrics in class_metrics.items():
+            self.assertEqual(jacoco_counters[class_name],
+                             [metrics['instructions'], metrics['branches'], metrics['methods']])
+        self.assertEqual({'instructions': 0, 'branches': 0, 'methods': 0},
+                         budget_util.get_class_file_metrics(b'not a class file'))
+        self.assertGreater(class_metrics['irs.BusinessProcess']['instructions'],
+                           class_metrics['irs.Salary']['instructions'])
+        self.assertEqual(0, budget_util.get_class_weight(class_metrics['irs.Salary'], dev_test_coverage=1.0))
+
+        class_time_limits = budget_util.plan_class_time_budgets({'small': 10, 'medium': 100, 'large': 1000,
+                                                                 'covered': 0}, 20)
+        self.assertEqual({'small': 2, 'medium': 5, 'large': 80, 'covered': 2}, class_time_limits)
+
+        ctd_plans = {
+            'models_and_test_plans': {'monolithic': {'small': {}, 'medium': {}, 'large': {}, 'covered': {}}},
+            'statistics': {}
+        }
+        ctd_tiers = generate.split_ctd_models_and_test_plans_by_time_limit(ctd_plans, class_time_limits, 20)
+        self.assertEqual([80, 5, 2], [time_limit for _, time_limit in ctd_tiers])
+        self.assertEqual(['large'], list(ctd_tiers[0][0]['models_and_test_plans']['monolithic']))
+        self.assertEqual(['small', 'covered'], list(ctd_tiers[2][0]['models_and_test_plans']['monolithic']))
+
+    def test_deadline_priority_batches(self) -> None:
+        """Test splitting target classes into priority batches and fitting batches to the time left"""
+        class_weights = {'a': 5, 'b': 50, 'c': 20, 'd': 0, 'e': 10}
+        batches = budget_util.get_priority_batches(class_weights, 2)
+        self.assertEqual([['b', 'c', 'e'], ['a', 'd']], batches)
+        self.assertEqual([['b'], ['c'], ['e'], ['a'], ['d']], budget_util.get_priority_batches(class_weights, 8))
+
+        class_time_limits = dict.fromkeys(class_weights, 10)
+        self.assertEqual(['b', 'c', 'e'], budget_util.fit_batch_to_time(batches[0], class_time_limits, 60, 1, 1.0, 100))
+        self.assertEqual(['b', 'c'], budget_util.fit_batch_to_time(batches[0], class_time_limits, 60, 1, 1.0, 85))
+        self.assertEqual(['b', 'c', 'e'], budget_util.fit_batch_to_time(batches[0], class_time_limits, 60, 2, 1.0, 85))
+        self.assertEqual([], budget_util.fit_batch_to_time(batches[0], class_time_limits, 60, 1, 2.0, 100))
+
+    def test_deadline_without_batches(self) -> None:
+        """Test creating the build file for an empty test suite when no priority batch fits before the deadline"""
+        config = config_util.init_config()
+        config['general']['app_name'] = 'irs'
+        config['general']['monolith_app_path'] = [os.path.abspath('test/data/irs/monolith/target/classes')]
+        config['general']['app_classpath_file'] = 'irs_classpath.txt'
+        config['generate']['time_limit'] = 60
+        config['generate']['ctd_amplified']['deadline'] = 120
+        ctd_file = 'irs' + constants.TKL_CTD_TEST_PLAN_FILE_SUFFIX
+
+        def generate_ctd_models_and_test_plans(*args):
+            with open(ctd_file, 'w') as f:
+                json.dump({'models_and_test_plans': {'monolithic': {'irs.Salary': {}, 'irs.IRS': {}}}}, f)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                Path(config['general']['app_classpath_file']).write_text('')
+                with mock.patch.object(generate, 'generate_CTD_models_and_test_plans',
+                                       side_effect=generate_ctd_models_and_test_plans), \
+                        mock.patch.object(generate, 'run_bb_test_generator') as run_bb_test_generator, \
+                        mock.patch.object(generate, 'extend_sequences') as extend_sequences, \
+                        mock.patch.object(generate, 'augment_with_code_coverage') as augment_with_code_coverage, \
+                        mock.patch.object(build_util, 'get_build_classpath', return_value=''), \
+                        mock.patch.object(build_util, 'generate_build_xml', return_value='build.xml') as build_xml, \
+                        mock.patch.object(build_util, 'integrate_tests_into_app_build_file'):
+                    # the deadline leaves no time for the first batch
+                    generate.generate_ctd_amplified_tests(config, output_dir=tmp_dir,
+                                                          start_time=time.time() - 100)
+                run_bb_test_generator.assert_not_called()
+                extend_sequences.assert_not_called()
+                augment_with_code_coverage.assert_not_called()
+                # the build file is created for the empty test suite
+                test_directory = 'irs' + constants.TKLTEST_DEFAULT_CTDAMPLIFIED_TEST_DIR_SUFFIX
+                build_xml.assert_called_once()
+                self.assertEqual(test_directory, build_xml.call_args.kwargs['test_root_dir'])
+                self.assertEqual([], os.listdir(test_directory))
+                self.assertFalse(os.path.exists(test_directory + constants.TKLTEST_TEMP_DIR_SUFFIX))
+            finally:
+                os.chdir(cwd)
+
+    def test_plateau_coverage_sampling(self) -> None:
+        """Test sampling target method coverage of building-block sequences and merging sequences of rounds"""
+        bb_seq_file = os.path.join('test', 'data', 'irs', 'basic_blocks',
+                                   'irs_EvoSuiteTestGenerator' + constants.TKL_BB_SEQ_FILE_SUFFIX)
+        with open(bb_seq_file) as f:
+            bb_sequences = json.load(f)
+        sequences = bb_sequences['test_sequences']['irs.Employer']['sequences']
+        class_plans = {
+            '<init>()V': {'formatted_signature': 'irs.Employer()'},
+            'setEmployerId(I)V': {'formatted_signature': 'void setEmployerId(int)'},
+            'notCalled()V': {'formatted_signature': 'void notCalled()'}
+        }
+        self.assertAlmostEqual(2 / 3, generate.get_bb_sequences_method_coverage('irs.Employer', class_plans,
+                                                                                sequences))
+        self.assertEqual(0, generate.get_bb_sequences_method_coverage('irs.Employer', class_plans, []))
+
+        round_sequences = {'test_sequences': {'irs.Employer': {'sequences': sequences[:1] + ['{ new Employer(); }'],
+                                                               'imports': ['java.util.List']}}}
+        merged_sequences = generate.union_bb_test_sequences(bb_sequences, round_sequences)
+        self.assertEqual(sequences + ['{ new Employer(); }'],
+                         merged_sequences['test_sequences']['irs.Employer']['sequences'])
+        self.assertEqual(bb_sequences['test_sequences']['irs.Salary'], merged_sequences['test_sequences']['irs.Salary'])
+        self.assertEqual(len(sequences), len(bb_sequences['test_sequences']['irs.Employer']['sequences']))
+
+    def test_plateau_rounds(self) -> None:
+        """Test plateau rounds stopping on JaCoCo coverage of the round tests and keeping the tests of all rounds"""
+        class_models = probe_coverage_util.analyze_class_files(['test/data/irs/monolith/target/classes'])
+        class_ids = {model['name']: class_id for class_id, model in class_models.items()}
+        # the first round covers half of the methods of Salary, and the second round the other half; the tests of
+        # Salary cover Employer only in the second round
+        round_probes = {'irs/Salary': [0b00001111, 0b11110000], 'irs/Employer': [0, 0b1]}
+        self.assertEqual({'instruction_covered': 0, 'instruction_total': 39}, {
+            key: value for key, value in probe_coverage_util.compute_class_coverage(class_models, {})[
+                'irs/Salary'].items() if key.startswith('instruction')})
+
+        config = config_util.init_config()
+        config['general']['app_name'] = 'irs'
+        config['general']['monolith_app_path'] = [os.path.abspath('test/data/irs/monolith/target/classes')]
+        config['generate']['time_limit'] = 100
+        config['generate']['ctd_amplified']['plateau_window'] = 10
+        config['generate']['ctd_amplified']['plateau_threshold'] = 1
+        round_classes = []
+
+        def run_bb_test_generator(app_name, ctd_file, *args):
+            with open(ctd_file) as f:
+                round_classes.append(sorted(class_name for plans in json.load(f)['models_and_test_plans'].values()
+                                            for class_name in plans))
+            if 'irs.Salary' not in round_classes[-1]:
+                return
+            test_dir = os.path.join('irs' + constants.TKL_EVOSUITE_OUTDIR_SUFFIX, 'irs')
+            os.makedirs(test_dir)
+            Path(test_dir, 'Salary_ESTest.java').write_text(
+                '// round {}\npublic class Salary_ESTest extends Salary_ESTest_scaffolding {{}}'.format(
+                    len(round_classes)))
+            Path(test_dir, 'Salary_ESTest_scaffolding.java').write_text('public class Salary_ESTest_scaffolding {}')
+            with open('irs_EvoSuiteTestGenerator' + constants.TKL_BB_SEQ_FILE_SUFFIX, 'w') as f:
+                json.dump({'test_sequences': {'irs.Salary': {
+                    'sequences': ['{{ /* round {} */ }}'.format(len(round_classes))], 'imports': []}}}, f)
+
+        def collect_coverage(test_classes, test_src_dir, app_paths, app_classpath, app_packages, raw_cov_data_dir,
+                             work_dir, jdk_path, test_methods=False, timeout=None):
+            self.assertEqual([os.path.join(test_src_dir, 'irs', 'Salary_ESTest.java')], test_classes)
+            os.makedirs(raw_cov_data_dir)
+            jacoco_exec_util.write_exec_file(os.path.join(raw_cov_data_dir, 'Salary_ESTest_jacoco.exec'), [], {
+                class_ids[class_name]: (class_name, class_models[class_ids[class_name]]['probe_count'],
+                                        probes[len(round_classes) - 1])
+                for class_name, probes in round_probes.items()})
+            return True
+
+        ctd_plans = {'models_and_test_plans': {'irs': {'irs.Salary': {}, 'irs.Employer': {}}}}
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                with open('ctd.json', 'w') as f:
+                    json.dump(ctd_plans, f)
+                with mock.patch.object(generate, 'run_bb_test_generator', side_effect=run_bb_test_generator), \
+                        mock.patch.object(coverage_util, 'collect_test_classes_coverage_in_single_jvm',
+                                          side_effect=collect_coverage), \
+                        mock.patch.object(build_util, 'get_build_classpath', return_value=''):
+                    getattr(generate, '__run_bb_test_generator_until_plateau')(config, 'ctd.json', None, '')
+
+                # Salary was completely covered in the second round; Employer, with no coverage in the first round,
+                # is generated for until its coverage does not grow in the third round
+                self.assertEqual([['irs.Employer', 'irs.Salary'], ['irs.Employer', 'irs.Salary'], ['irs.Employer']],
+                                 round_classes)
+                test_dir = os.path.join('irs' + constants.TKL_EVOSUITE_OUTDIR_SUFFIX, 'irs')
+                self.assertEqual(['Salary_ESTest.java', 'Salary_ESTest_scaffolding.java', 'Salary_round1_ESTest.java',
+                                  'Salary_round1_ESTest_scaffolding.java'], sorted(os.listdir(test_dir)))
+                self.assertIn('// round 2', Path(test_dir, 'Salary_ESTest.java').read_text())
+                self.assertEqual('// round 1\npublic class Salary_round1_ESTest extends '
+                                 'Salary_round1_ESTest_scaffolding {}',
+                                 Path(test_dir, 'Salary_round1_ESTest.java').read_text())
+                self.assertEqual('public class Salary_round1_ESTest_scaffolding {}',
+                                 Path(test_dir, 'Salary_round1_ESTest_scaffolding.java').read_text())
+                with open('irs_EvoSuiteTestGenerator' + constants.TKL_BB_SEQ_FILE_SUFFIX) as f:
+                    self.assertEqual(['{ /* round 1 */ }', '{ /* round 2 */ }'],
+                                     json.load(f)['test_sequences']['irs.Salary']['sequences'])
+                self.assertFalse(os.path.exists('irs' + constants.TKL_PLATEAU_ROUNDS_DIR_SUFFIX))
+            finally:
+                os.chdir(cwd)
+
+    def test_jvm_launch_args(self) -> None:
+        """Test parsing java versions and building argument file and class data sharing arguments"""
+        self.assertEqual(17, jvm_util.parse_java_version('openjdk version "17.0.2" 2022-01-18'))
+        self.assertEqual(8, jvm_util.parse_java_version('java version "1.8.0_292"'))
+        self.assertEqual(21, jvm_util.parse_java_version('openjdk version "21" 2023-09-19'))
+        self.assertEqual(0, jvm_util.parse_java_version('java: command not found'))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            java_path = os.path.join(tmp_dir, 'java')
+            with open(java_path, 'w') as f:
+                f.write('#!/bin/sh\necho \'openjdk version "17.0.2" 2022-01-18\' >&2\n')
+            os.chmod(java_path, 0o755)
+            jar = os.path.join(tmp_dir, 'tool.jar')
+            Path(jar).touch()
+            cache_dir = os.path.join(tmp_dir, 'cache')
+
+            classpath_args = jvm_util.get_classpath_args(java_path, [jar, tmp_dir], cache_dir)
+            self.assertTrue(classpath_args.startswith('"@' + cache_dir))
+            with open(classpath_args[2:-1]) as f:
+                self.assertEqual('-cp "{}"\n'.format(os.pathsep.join([jar, tmp_dir])), f.read())
+            self.assertEqual(classpath_args, jvm_util.get_classpath_args(java_path, [jar, tmp_dir], cache_dir))
+
+            # no archive for classpaths with directories
+            self.assertEqual('', jvm_util.get_class_data_sharing_args(java_path, 'tool', [jar, tmp_dir], cache_dir))
+            self.assertIn('-XX:ArchiveClassesAtExit=', jvm_util.get_class_data_sharing_args(java_path, 'tool', [jar],
+                                                                                             cache_dir))
+            # only one launch creates the archive
+            self.assertEqual('', jvm_util.get_class_data_sharing_args(java_path, 'tool', [jar], cache_dir))
+
+    def test_jvm_resource_profiles(self) -> None:
+        """Test computing JVM resource profiles from the machine and app size, with configured overrides"""
+        profile = jvm_util.get_resource_profile('sequence_extender', 100, 1, cpu_count=8, total_memory=16384)
+        self.assertEqual({'max_heap': 2048, 'gc': 'ParallelGC', 'gc_threads': 8, 'jvm_args': '', 'workers': 1},
+                         profile)
+        self.assertEqual('-Xmx2048m -XX:+UseParallelGC -XX:ParallelGCThreads=8', jvm_util.get_resource_args(profile))
+
+        # large app: the heap grows with the class count, and fewer runs are performed concurrently
+        profile = jvm_util.get_resource_profile('sequence_extender', 8000, 4, cpu_count=8, total_memory=16384)
+        self.assertEqual((5024, 2, 4), (profile['max_heap'], profile['workers'], profile['gc_threads']))
+
+        # many concurrent runs on few cores
+        profile = jvm_util.get_resource_profile('bb_test_generator', 100, 8, cpu_count=4, total_memory=65536)
+        self.assertEqual((4, 'SerialGC'), (profile['workers'], profile['gc']))
+        self.assertEqual('-Xmx2048m -XX:+UseSerialGC', jvm_util.get_resource_args(profile))
+
+        # unknown memory
+        profile = jvm_util.get_resource_profile('ctd_modeler', 8000, 2, cpu_count=4, total_memory=0)
+        self.assertEqual((5024, 2), (profile['max_heap'], profile['workers']))
+
+        # two heaps per run (evosuite master and client processes) halve the runs that fit in memory
+        profile = jvm_util.get_resource_profile('evosuite', 100, 8, cpu_count=8, total_memory=16384)
+        self.assertEqual((2048, 6), (profile['max_heap'], profile['workers']))
+        profile = jvm_util.get_resource_profile('evosuite', 100, 8, cpu_count=8, total_memory=16384, heaps_per_run=2)
+        self.assertEqual((2048, 3), (profile['max_heap'], profile['workers']))
+
+        config = config_util.init_config()
+        config['generate']['jvm_profiles']['sequence_extender'].update({'max_heap': 8192, 'gc': 'G1GC',
+                                                                       'jvm_args': '-Xss4m'})
+        profile = jvm_util.get_resource_profile('sequence_extender', 100, 1, config['generate']['jvm_profiles'],
+                                                cpu_count=8, total_memory=16384)
+        self.assertEqual('-Xmx8192m -XX:+UseG1GC -XX:ParallelGCThreads=8 -Xss4m', jvm_util.get_resource_args(profile))
+
+    def test_evosuite_staging(self) -> None:
+        """Test staging app classes for evosuite with links and target/excluded class lookups"""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app_dir = os.path.join(tmp_dir, 'classes')
+            os.makedirs(os.path.join(app_dir, 'pkg', 'sub'))
+            for file in ['A.class', 'A$1.class', 'B.class', os.path.join('sub', 'A.class'), 'app.properties']:
+                Path(app_dir, 'pkg', file).write_text(file)
+            os.chdir(tmp_dir)
+            try:
+                copy_dir, target_dir = generate_standalone.stage_app_classes_for_evosuite(
+                    [app_dir], ['pkg.A', 'pkg.B'], ['pkg.B'])
+                self.assertEqual(['A.class'], os.listdir(os.path.join(target_dir, 'pkg')))
+                self.assertEqual({'A$1.class', 'B.class', 'sub', 'app.properties'},
+                                 set(os.listdir(os.path.join(copy_dir, 'pkg'))))
+                self.assertEqual(['A.class'], os.listdir(os.path.join(copy_dir, 'pkg', 'sub')))
+                self.assertEqual('A.class', Path(target_dir, 'pkg', 'A.class').read_text())
+                # files are staged as links to the app files
+                self.assertTrue(os.path.samefile(os.path.join(app_dir, 'pkg', 'B.class'),
+                                                 os.path.join(copy_dir, 'pkg', 'B.class')))
+
+                copy_dir, target_dir = generate_standalone.stage_app_classes_for_evosuite([app_dir], [], ['pkg.B'])
+                self.assertEqual('', target_dir)
+                self.assertEqual({'A.class', 'A$1.class', 'sub', 'app.properties'},
+                                 set(os.listdir(os.path.join(copy_dir, 'pkg'))))
+            finally:
+                os.chdir(cwd)
+
+    def test_evosuite_worker_pool_merge(self) -> None:
+        """Test listing the classes dispatched to evosuite workers and merging their statistics"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            target_dir = os.path.join(tmp_dir, 'targets')
+            os.makedirs(os.path.join(target_dir, 'pkg', 'sub'))
+            for file in ['A.class', 'A$1.class', 'package-info.class', os.path.join('sub', 'B.class'), 'C.java']:
+                Path(target_dir, 'pkg', file).touch()
+            self.assertEqual(['pkg.A', 'pkg.sub.B'], generate_standalone.get_evosuite_target_classes(target_dir))
+
+            statistics_files = []
+            for worker, (columns, row) in enumerate([('TARGET_CLASS,criterion,Coverage', 'pkg.A,BRANCH,0.5'),
+                                                     ('TARGET_CLASS,criterion,Coverage,Total_Time',
+                                                      'pkg.sub.B,BRANCH,1.0,2000')]):
+                statistics_file = os.path.join(tmp_dir, str(worker), 'statistics.csv')
+                os.makedirs(os.path.dirname(statistics_file))
+                Path(statistics_file).write_text(columns + '\n' + row + '\n')
+                statistics_files.append(statistics_file)
+            merged_file = os.path.join(tmp_dir, 'evosuite-report', 'statistics.csv')
+            generate_standalone.merge_evosuite_statistics(statistics_files, merged_file)
+            self.assertEqual(['TARGET_CLASS,criterion,Coverage,Total_Time', 'pkg.A,BRANCH,0.5,',
+                              'pkg.sub.B,BRANCH,1.0,2000'], Path(merged_file).read_text().splitlines())
+
+    def test_evosuite_worker_pool_failures(self) -> None:
+        """Test reporting the classes that evosuite workers failed to generate tests for"""
+        run_worker_pool = getattr(generate_standalone, '__run_evosuite_worker_pool')
+        config = config_util.init_config()
+        config['general']['app_name'] = 'app'
+
+        commands = []
+
+        def run_command(command, verbose, cwd=None, env_vars=None, timeout=None):
+            commands.append(command)
+            if ' -class pkg.B ' in command:
+                raise subprocess.CalledProcessError(1, command, stderr='failed')
+            Path(cwd, 'tests', 'pkg').mkdir(parents=True)
+            Path(cwd, 'tests', 'pkg', 'A_ESTest.java').touch()
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            target_dir = os.path.join(tmp_dir, 'targets')
+            os.makedirs(os.path.join(target_dir, 'pkg'))
+            for file in ['A.class', 'B.class']:
+                Path(target_dir, 'pkg', file).touch()
+            master_jar = os.path.join(tmp_dir, 'evosuite-master.jar')
+            Path(master_jar).touch()
+            os.chdir(tmp_dir)
+            try:
+                with mock.patch.object(command_util, 'run_command', side_effect=run_command), \
+                        mock.patch.object(jvm_util, 'get_java_version', return_value=17):
+                    self.assertEqual(1, run_worker_pool(config, 'java', master_jar, 1024, target_dir, [target_dir],
+                                                        'tests', 2))
+                    self.assertEqual(['A_ESTest.java'], os.listdir(os.path.join('tests', 'pkg')))
+                    # the directories of the workers are removed
+                    self.assertFalse([file for file in os.listdir('.')
+                                      if file.startswith('app' + constants.TKL_EVOSUITE_WORKER_DIR_SUFFIX)])
+                    # only one of the concurrent workers creates the class data sharing archive of the master
+                    self.assertEqual(1, sum('-XX:ArchiveClassesAtExit=' in command for command in commands))
+                    self.assertTrue(all(' -jar {} -mem 1024 '.format(master_jar) in command for command in commands))
+                    # failing for all classes exits
+                    with mock.patch.object(command_util, 'run_command',
+                                           side_effect=subprocess.CalledProcessError(1, 'evosuite')), \
+                            self.assertRaises(SystemExit):
+                        run_worker_pool(config, 'java', master_jar, None, target_dir, [target_dir], 'tests', 2)
+            finally:
+                os.chdir(cwd)
+
+    def test_randoop_shards_merge(self) -> None:
+        """Test merging of randoop shard tests with removal of structurally identical test methods"""
+        test_method = '    @Test\n    public void {0}() throws Throwable {{\n        if (debug)\n' \
+                      '            System.out.format("%n%s%n", "{1}.{0}");\n{2}    }}\n\n'
+        test_class = 'import org.junit.Test;\n\npublic class {} {{\n\n    public static boolean debug = false;\n\n' \
+                     '{}}}\n'
+        shard_tests = [
+            {'RegressionTest0.java': test_class.format('RegressionTest0', ''.join([
+                test_method.format('test1', 'RegressionTest0', '        java.lang.String str0 = "a";\n'),
+                test_method.format('test2', 'RegressionTest0', '        int i0 = 1;\n')]))},
+            {'RegressionTest0.java': test_class.format('RegressionTest0', test_method.format(
+                'test1', 'RegressionTest0', '        java.lang.String str3 =  "a";\n')),
+             'RegressionTest1.java': test_class.format('RegressionTest1', test_method.format(
+                 'test1', 'RegressionTest1', '        int i0 = 2;\n')),
+             'RegressionTest.java': 'public class RegressionTest {}\n'}
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shard_test_dirs = []
+            for shard, tests in enumerate(shard_tests):
+                shard_test_dir = os.path.join(tmp_dir, str(shard))
+                os.makedirs(shard_test_dir)
+                for file, source in tests.items():
+                    Path(shard_test_dir, file).write_text(source)
+                shard_test_dirs.append(shard_test_dir)
+            merged_test_dir = os.path.join(tmp_dir, 'merged')
+            self.assertEqual((3, 1), generate_standalone.merge_randoop_tests(shard_test_dirs, merged_test_dir))
+            self.assertEqual(['RegressionTest.java', 'RegressionTest0.java', 'RegressionTest1.java'],
+                             sorted(os.listdir(merged_test_dir)))
+            merged_source = Path(merged_test_dir, 'RegressionTest1.java').read_text()
+            self.assertIn('public class RegressionTest1 {', merged_source)
+            self.assertIn('"RegressionTest1.test1"', merged_source)
+            self.assertIn('int i0 = 2;', merged_source)
+            self.assertIn('RegressionTest0.class, RegressionTest1.class',
+                          Path(merged_test_dir, 'RegressionTest.java').read_text())
+
+    def test_extender_completion(self) -> None:
+        """Test detecting completion of the extender from its coverage file, and terminating lingering extenders"""
+        run_extender = getattr(generate, '__run_extender')
+        is_coverage_file_complete = getattr(generate, '__is_extender_coverage_file_complete')
+        processes = []
+        real_start_command = command_util.start_command
+
+        def start_command(command, verbose, cwd=None):
+            processes.append(real_start_command(command, verbose=verbose, cwd=cwd))
+            return processes[-1]
+
+        def extender_command(script):
+            return '"{}" -c "{}"'.format(sys.executable, script)
+
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch.object(constants, 'EXTENDER_EXIT_GRACE_PERIOD', 0.5), \
+                mock.patch.object(generate.command_util, 'start_command', side_effect=start_command):
+            coverage_file = os.path.join(tmp_dir, 'irs' + constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX)
+            self.assertFalse(is_coverage_file_complete(coverage_file))
+            Path(coverage_file).write_text('{"test_plan_coverage_info": ')
+            self.assertFalse(is_coverage_file_complete(coverage_file))
+
+            # the extender writes its coverage file but does not exit (e.g., due to threads of the app)
+            start_time = time.time()
+            self.assertTrue(run_extender(extender_command(
+                "import time; f = open('{}', 'w'); f.write('{{}}'); f.close(); time.sleep(60)".format(
+                    os.path.basename(coverage_file))),
+                os.path.basename(coverage_file), verbose=False, cwd=tmp_dir))
+            self.assertLess(time.time() - start_time, 30)
+            self.assertTrue(is_coverage_file_complete(coverage_file))
+            # the lingering extender is killed after the grace period
+            self.assertIsNotNone(processes[-1].poll())
+            self.assertNotEqual(0, processes[-1].returncode)
+
+            # the extender exits without writing its coverage file
+            os.remove(coverage_file)
+            self.assertFalse(run_extender(extender_command("import sys; sys.exit(1)"),
+                                          os.path.basename(coverage_file), verbose=False, cwd=tmp_dir))
+            self.assertEqual(1, processes[-1].returncode)
+
+            # the extender does not complete before the end time
+            start_time = time.time()
+            self.assertFalse(run_extender(extender_command("import time; time.sleep(60)"),
+                                          os.path.basename(coverage_file), verbose=False, cwd=tmp_dir,
+                                          end_time=time.time() + 0.5))
+            self.assertLess(time.time() - start_time, 30)
+            self.assertNotEqual(0, processes[-1].returncode)
+
+    def test_merge_extender_reports(self) -> None:
+        """Test merging of coverage and summary reports created by extender shards"""
+        shard_reports = [
+            {'monolithic': {'irs.Employer': {'setEmployerId': {'row_0': 'COVERED'}}},
+             'test_plan_rows': 4, 'execution_time': 10, 'uncovered_rows': ['irs.Employer_0']},
+            {'monolithic': {'irs.Salary': {'getSalary': {'row_0': 'UNCOVERED'}}},
+             'test_plan_rows': 2, 'execution_time': 7, 'uncovered_rows': ['irs.Salary_0']}
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_files = []
+            for shard, shard_report in enumerate(shard_reports):
+                report_file = os.path.join(tmp_dir, 'shard{}.json'.format(shard))
+                with open(report_file, 'w') as f:
+                    json.dump(shard_report, f)
+                report_files.append(report_file)
+            merged_file = os.path.join(tmp_dir, 'merged.json')
+            generate.merge_extender_reports(report_files, merged_file)
+            with open(merged_file) as f:
+                merged_report = json.load(f)
+        self.assertEqual({'irs.Employer', 'irs.Salary'}, set(merged_report['monolithic']))
+        self.assertEqual(6, merged_report['test_plan_rows'])
+        self.assertEqual(10, merged_report['execution_time'])
+        self.assertEqual(['irs.Employer_0', 'irs.Salary_0'], merged_report['uncovered_rows'])
+
+    def test_incremental_generation_manifest(self) -> None:
+        """Test detection of changed target classes and attribution of generated tests for incremental generation"""
+        ctd_plans = {
+            'models_and_test_plans': {
+                'monolithic': {'irs.IRS': {'m1': []}, 'irs.Salary': {'m1': []}, 'irs.Employer': {'m1': []}}
+            }
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app_dir = os.path.join(tmp_dir, 'classes')
+            shutil.copytree(os.path.join('test', 'data', 'irs', 'monolith', 'target', 'classes'), app_dir)
+            app_class_files = incremental_util.get_app_class_files([app_dir])
+            class_hashes = incremental_util.get_target_class_hashes(ctd_plans, app_class_files, {})
+            referenced_classes = incremental_util.get_referenced_classes(
+                incremental_util.read_class_file(app_class_files, 'irs/IRS'))
+            self.assertTrue({'irs/Salary', 'java/util/HashMap'} <= referenced_classes)
+            self.assertEqual(set(), incremental_util.get_referenced_classes(b'not a class file'))
+            state_dir = os.path.join(tmp_dir, 'state')
+            self.assertEqual({}, incremental_util.load_manifest(state_dir))
+
+            test_dir = os.path.join(tmp_dir, 'tests')
+            os.makedirs(os.path.join(test_dir, 'monolithic', 'irs'))
+            for test_file in ['irs_IRS_Test.java', 'irs_Salary_Test.java', 'irs_Employer_Test.java']:
+                Path(os.path.join(test_dir, 'monolithic', 'irs', test_file)).write_text('')
+            class_test_files = incremental_util.get_class_test_files(test_dir, list(class_hashes))
+            self.assertEqual([os.path.join('monolithic', 'irs', 'irs_IRS_Test.java')], class_test_files['irs.IRS'])
+            incremental_util.save_manifest(state_dir, class_hashes, class_test_files)
+            manifest = incremental_util.load_manifest(state_dir)
+            self.assertEqual(([], []), incremental_util.get_changed_classes(manifest, class_hashes))
+
+            # IRS references Salary, so a change in Salary changes both; Employer is no longer a target
+            with open(os.path.join(app_dir, 'irs', 'Salary.class'), 'ab') as f:
+                f.write(b'\0')
+            del ctd_plans['models_and_test_plans']['monolithic']['irs.Employer']
+            class_hashes = incremental_util.get_target_class_hashes(ctd_plans, app_class_files, {})
+            self.assertEqual((['irs.IRS', 'irs.Salary'], ['irs.Employer']),
+                             incremental_util.get_changed_classes(manifest, class_hashes))
+        self.assertEqual({'monolithic': {'irs.IRS': {}}},
+                         incremental_util.remove_classes_from_report(
+                             {'monolithic': {'irs.IRS': {}, 'irs.Salary': {}}}, {'irs.Salary'}))
+
+    def test_generate_phase_checkpoints(self) -> None:
+        """Test that phase checkpoints are valid only for unchanged inputs and intact outputs"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, 'irs_ctd_models_and_test_plans.json')
+            output_dir = os.path.join(tmp_dir, 'irs-ctd-amplified-tests')
+            checkpoint_file = os.path.join(tmp_dir, 'irs' + constants.TKL_GENERATE_CHECKPOINT_FILE_SUFFIX)
+            Path(input_file).write_text('{}')
+            os.makedirs(os.path.join(output_dir, 'irs'))
+            Path(os.path.join(output_dir, 'irs', 'irs_IRS_Test.java')).write_text('class irs_IRS_Test {}')
+
+            fingerprint = checkpoint_util.get_fingerprint({'bad_path': False}, [input_file])
+            self.assertNotEqual(fingerprint, checkpoint_util.get_fingerprint({'bad_path': True}, [input_file]))
+            checkpoints = checkpoint_util.load_checkpoints(checkpoint_file)
+            self.assertFalse(checkpoint_util.is_phase_complete(checkpoints, 'sequence_extension', fingerprint))
+            checkpoint_util.mark_phase_complete(checkpoint_file, checkpoints, 'sequence_extension', fingerprint,
+                                                [output_dir])
+            checkpoints = checkpoint_util.load_checkpoints(checkpoint_file)
+            self.assertTrue(checkpoint_util.is_phase_complete(checkpoints, 'sequence_extension', fingerprint))
+
+            # changed outputs invalidate the checkpoint, as do changed inputs
+            Path(os.path.join(output_dir, 'irs', 'irs_Salary_Test.java')).write_text('')
+            self.assertFalse(checkpoint_util.is_phase_complete(checkpoints, 'sequence_extension', fingerprint))
+            os.remove(os.path.join(output_dir, 'irs', 'irs_Salary_Test.java'))
+            self.assertTrue(checkpoint_util.is_phase_complete(checkpoints, 'sequence_extension', fingerprint))
+            Path(input_file).write_text('{"models_and_test_plans": {}}')
+            self.assertFalse(checkpoint_util.is_phase_complete(
+                checkpoints, 'sequence_extension', checkpoint_util.get_fingerprint({'bad_path': False}, [input_file])))
+
+    def test_lazy_greedy_augmentation(self) -> None:
+        """Test lazy-greedy selection of augmenting tests over a coverage matrix"""
+        # test -> covered items; each item has one instruction
+        test_items = {'T0Test.java': [0, 1, 2, 3], 'T1Test.java': [0, 1, 2], 'T2Test.java': [4, 5],
+                      'T3Test.java': [3, 6], 'T4Test.java': [7]}
+        coverage = np.zeros((len(test_items), 8), dtype=np.uint8)
+        for row, items in enumerate(test_items.values()):
+            coverage[row, items] = 1
+        coverage_matrix = {
+            'tests': {test: row for row, test in enumerate(test_items)},
+            'coverage': np.packbits(coverage, axis=1, bitorder='little'),
+            'weights': np.array([[1, 0, 0, 0]] * 8, dtype=np.int64)
+        }
+        tests_with_coverage_gain = {
+            test: {'instruction_cov_delta': len(items), 'branch_cov_delta': 0, 'line_cov_delta': 0,
+                   'method_cov_delta': 0} for test, items in test_items.items()
+        }
+        base_coverage = {counter + suffix: 10 if suffix == '_total' else 0
+                         for counter in probe_coverage_util.COVERAGE_COUNTERS for suffix in ('_covered', '_total')}
+        augment_ctd_test_suite = getattr(augment, '__augment_ctd_test_suite')
+
+        def run_augmentation(budget=0, target_coverage=0):
+            with mock.patch.object(augment, '__add_test_to_ctd_suite') as add_test, \
+                    mock.patch.object(augment, '__get_augmented_coverage') as get_augmented_coverage, \
+                    mock.patch.object(probe_coverage_util, 'compute_coverage_gain',
+                                      wraps=probe_coverage_util.compute_coverage_gain) as compute_coverage_gain:
+                _, added_count = augment_ctd_test_suite(
+                    tests_with_coverage_gain=tests_with_coverage_gain, coverage_matrix=coverage_matrix,
+                    ctd_test_dir='irs-ctd-amplified-tests', base_ctd_coverage=base_coverage, class_files=[],
+                    raw_cov_dir='cov-data-augmentation', report_dir='reports', max_memory=1024, jdk_path='',
+                    budget=budget, target_coverage=target_coverage)
+            added = [call.kwargs['test'] for call in add_test.call_args_list]
+            self.assertEqual(len(added), added_count)
+            self.assertEqual(added, get_augmented_coverage.call_args.kwargs['added_test_classes'])
+            # gains of single tests (not of the rows they are computed with); the gain of each added test is
+            # computed once more when the test is added
+            evaluations = sum(1 for call in compute_coverage_gain.call_args_list if call.args[0].ndim == 1)
+            return added, evaluations - len(added), \
+                get_augmented_coverage.call_args.kwargs['augmented_coverage_gain']
+
+        added, evaluations, coverage_gain = run_augmentation()
+        # T1 is subsumed by T0, and T3 only adds one item once T0 is added
+        self.assertEqual(['T0Test.java', 'T2Test.java', 'T3Test.java', 'T4Test.java'], added)
+        self.assertEqual(8, coverage_gain['instruction_cov_delta'])
+        # eager greedy re-evaluates every remaining test after each added test (4 + 2 + 1 times); lazy greedy
+        # re-evaluates only stale tests at the top of the heap
+        self.assertEqual(4, evaluations)
+        self.assertLess(evaluations, 4 + 2 + 1)
+
+        added, _, _ = run_augmentation(budget=2)
+        self.assertEqual(['T0Test.java', 'T2Test.java'], added)
+        # 7 of 10 instructions are covered after adding T3
+        added, _, coverage_gain = run_augmentation(target_coverage=65)
+        self.assertEqual(['T0Test.java', 'T2Test.java', 'T3Test.java'], added)
+        self.assertEqual(7, coverage_gain['instruction_cov_delta'])
+
+    def test_augmentation_worker_pool(self) -> None:
+        """Test collecting coverage of augmenting tests with parallel workers"""
+        config = config_util.init_config()
+        config['general']['app_name'] = 'irs'
+        config['general']['monolith_app_path'] = [os.path.abspath('test/data/irs/monolith/target/classes')]
+        test_classes = [os.path.join('irs-evosuite-tests', 'irs', 'T{}_ESTest.java'.format(i)) for i in range(4)]
+        build_test_dirs = {}
+        runs = []
+
+        def generate_build_xml(**kwargs):
+            build_file = os.path.join(kwargs['output_dir'], 'build.xml')
+            Path(build_file).write_text('<project/>')
+            build_test_dirs[build_file] = kwargs['test_root_dir']
+            return build_file
+
+        def run_command(command, verbose, env_vars, timeout=None):
+            # the build runs the test classes of its worker test directory and writes the raw coverage data file
+            build_file = command.split()[2]
+            test_files = sorted(str(path.relative_to(build_test_dirs[build_file]))
+                                for path in Path(build_test_dirs[build_file]).glob('**/*.java'))
+            runs.append((os.path.dirname(build_file), test_files))
+            time.sleep(0.2)
+            probes = 1 << int(os.path.basename(test_files[0])[1])
+            jacoco_exec_util.write_exec_file(coverage_util.get_jacoco_exec_file('ant', os.path.dirname(build_file)),
+                                             [], {0x1: ('irs/IRS', 4, probes)})
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                for test_class in test_classes:
+                    os.makedirs(os.path.dirname(test_class), exist_ok=True)
+                    Path(test_class).write_text('public class {} {{}}'.format(os.path.basename(test_class)[:-5]))
+                os.mkdir('cov-data-augmentation')
+                with mock.patch.object(build_util, 'generate_build_xml', side_effect=generate_build_xml), \
+                        mock.patch.object(build_util, 'get_build_classpath', return_value=''), \
+                        mock.patch.object(command_util, 'run_command', side_effect=run_command):
+                    has_coverage = getattr(augment, '__compute_augmenting_tests_coverage_in_parallel')(
+                        augmentation_test_pool=test_classes, worker_count=2, ctd_test_dir='irs-ctd-amplified-tests',
+                        build_type='ant', raw_cov_data_dir='cov-data-augmentation', jdk_path='', config=config)
+                self.assertTrue(has_coverage)
+                # each worker has its own scratch directory with a build file and test directory
+                worker_dirs = {os.path.dirname(build_file) for build_file in build_test_dirs}
+                self.assertEqual(2, len(worker_dirs))
+                for build_file, test_dir in build_test_dirs.items():
+                    self.assertEqual(os.path.join(os.path.dirname(build_file), 'irs-ctd-amplified-tests'), test_dir)
+                self.assertEqual(worker_dirs, {worker_dir for worker_dir, _ in runs})
+                # each build runs a single test class, in the worker test directory
+                self.assertEqual(sorted(os.path.join('irs', os.path.basename(test_class))
+                                        for test_class in test_classes),
+                                 sorted(test_file for _, test_files in runs for test_file in test_files))
+                # raw coverage data files of all workers are moved to the shared raw coverage data directory
+                for i, test_class in enumerate(test_classes):
+                    exec_data = jacoco_exec_util.read_exec_file(os.path.join(
+                        'cov-data-augmentation', 'T{}_ESTest'.format(i) + constants.JACOCO_SUFFIX_FOR_AUGMENTATION))[1]
+                    self.assertEqual({0x1: ('irs/IRS', 4, 1 << i)}, exec_data)
+                self.assertFalse(os.path.exists('cov-data-augmentation-workers'))
+            finally:
+                os.chdir(cwd)
+
+    def test_background_augmentation_pool_coverage(self) -> None:
+        """Test handing off the augmentation pool coverage collected in the background to the augmentation"""
+        config = config_util.init_config()
+        config['general']['app_name'] = 'irs'
+        compute_base_and_augmenting_tests_coverage = getattr(augment, '__compute_base_and_augmenting_tests_coverage')
+        ctd_test_coverage = {'instruction_covered': 1, 'instruction_total': 10}
+        collection_started = threading.Event()
+        generation_done = threading.Event()
+        collection_threads = []
+
+        def collect_pool_coverage(**kwargs):
+            # the collection overlaps with the CTD-guided test generation
+            collection_threads.append(threading.current_thread())
+            collection_started.set()
+            self.assertTrue(generation_done.wait(timeout=30))
+            if kwargs['evosuite_test_dir'] != 'irs-evosuite-tests':
+                raise RuntimeError('coverage collection failed')
+            self.assertTrue(kwargs['pipelined'])
+            return ['irs-evosuite-tests/irs/IRS_ESTest.java'], True
+
+        def compute_coverage(evosuite_test_dir):
+            os.makedirs('irs-ctd-amplified-tests', exist_ok=True)
+            generation_done.clear()
+            collection_started.clear()
+            with mock.patch.object(augment, '__collect_augmentation_pool_coverage',
+                                   side_effect=collect_pool_coverage) as collect_pool, \
+                    mock.patch.object(augment, '__compute_coverage_efficiency',
+                                      return_value=(ctd_test_coverage, 1, 0.1)), \
+                    mock.patch.object(augment, '__initialize_test_directory'), \
+                    mock.patch.dict(config['general'], {'app_name': evosuite_test_dir.split('-')[0]}):
+                pool_coverage = augment.start_augmentation_pool_coverage_collection(
+                    config=config, build_type='ant', ctd_test_dir='irs-ctd-amplified-tests')
+                # the collection does not block the caller
+                self.assertTrue(collection_started.wait(timeout=30))
+                self.assertFalse(pool_coverage.done())
+                generation_done.set()
+                try:
+                    return compute_base_and_augmenting_tests_coverage(
+                        ctd_test_dir='irs-ctd-amplified-tests', evosuite_test_dir=evosuite_test_dir,
+                        build_file='build.xml', build_type='ant', report_dir='reports', jdk_path='',
+                        config=config, pool_coverage=pool_coverage)
+                finally:
+                    # the augmentation pool is not collected again when joining the background collection
+                    self.assertEqual(1, collect_pool.call_count)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                augmentation_test_pool, base_coverage, raw_cov_data_dir, has_coverage = \
+                    compute_coverage('irs-evosuite-tests')
+                self.assertEqual(['irs-evosuite-tests/irs/IRS_ESTest.java'], augmentation_test_pool)
+                self.assertEqual(ctd_test_coverage, base_coverage)
+                self.assertTrue(has_coverage)
+                # the raw coverage data directory created by the background collection is kept
+                self.assertTrue(os.path.isdir(raw_cov_data_dir))
+                self.assertNotEqual(threading.current_thread(), collection_threads[-1])
+
+                # an error in the background collection is raised when joining it
+                with self.assertRaisesRegex(RuntimeError, 'coverage collection failed'):
+                    compute_coverage('other-evosuite-tests')
+                self.assertNotEqual(threading.current_thread(), collection_threads[-1])
+            finally:
+                os.chdir(cwd)
+
+    def test_skipped_augmentation_with_background_pool_coverage(self) -> None:
+        """Test waiting for the background augmentation pool coverage collection when augmentation does not run"""
+        config = config_util.init_config()
+        config['general']['app_name'] = 'irs'
+        config['general']['monolith_app_path'] = [os.path.abspath('test/data/irs/monolith/target/classes')]
+        config['general']['app_classpath_file'] = 'irs_classpath.txt'
+        config['generate']['ctd_amplified']['base_test_generator'] = constants.COMBINED_TEST_GENERATOR_NAME
+        config['generate']['ctd_amplified']['pipeline_augmentation'] = True
+        ctd_file = 'irs' + constants.TKL_CTD_TEST_PLAN_FILE_SUFFIX
+        collection_done = threading.Event()
+
+        def generate_ctd_models_and_test_plans(*args):
+            with open(ctd_file, 'w') as f:
+                json.dump({'models_and_test_plans': {'monolithic': {'irs.Salary': {}}}}, f)
+
+        def generate_bb_test_sequences(*args):
+            Path('irs_EvoSuiteTestGenerator' + constants.TKL_BB_SEQ_FILE_SUFFIX).write_text(
+                '{"test_sequences": {}}')
+
+        def collect_pool_coverage(**kwargs):
+            self.assertTrue(config['general']['offline_instrumentation'])
+            time.sleep(0.5)
+            collection_done.set()
+            return [], False
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                Path(config['general']['app_classpath_file']).write_text('')
+                with mock.patch.object(generate, 'generate_CTD_models_and_test_plans',
+                                       side_effect=generate_ctd_models_and_test_plans), \
+                        mock.patch.object(generate, '__generate_bb_test_sequences',
+                                          side_effect=generate_bb_test_sequences), \
+                        mock.patch.object(generate, 'extend_sequences',
+                                          side_effect=lambda **kwargs: os.makedirs(kwargs['test_directory'])), \
+                        mock.patch.object(generate, 'augment_with_code_coverage') as augment_with_code_coverage, \
+                        mock.patch.object(augment, '__collect_augmentation_pool_coverage',
+                                          side_effect=collect_pool_coverage), \
+                        mock.patch.object(build_util, 'get_build_classpath', return_value=''), \
+                        mock.patch.object(build_util, 'generate_build_xml', return_value='build.xml'), \
+                        mock.patch.object(build_util, 'integrate_tests_into_app_build_file'):
+                    # the extender creates no coverage file, so test generation exits before augmentation
+                    with self.assertRaises(SystemExit):
+                        generate.generate_ctd_amplified_tests(config, output_dir=tmp_dir)
+                augment_with_code_coverage.assert_not_called()
+                # the collection completed before the exit, its raw coverage data is removed, and the
+                # instrumentation setting changed for it is restored
+                self.assertTrue(collection_done.is_set())
+                self.assertFalse(os.path.exists('cov-data-augmentation'))
+                self.assertFalse(config['general']['offline_instrumentation'])
+            finally:
+                os.chdir(cwd)
+
+    def test_single_jvm_coverage_collection(self) -> None:
+        """Test collecting coverage of augmenting tests in a single JVM"""
+        config = config_util.init_config()
+        config['general']['app_name'] = 'irs'
+        config['general']['monolith_app_path'] = [os.path.abspath('test/data/irs/monolith/target/classes')]
+        config['execute']['app_packages'] = ['irs']
+        config['generate']['ctd_amplified']['augmentation_single_jvm'] = True
+        config['generate']['ctd_amplified']['augmentation_cache_size'] = 0
+        calls = []
+
+        def run_command(command, verbose, env_vars, timeout=None):
+            calls.append(command)
+            if command.startswith('java '):
+                # the runner dumps the coverage data of each test class, named after its simple name
+                output_dir, test_classes_file, mode = shlex.split(command)[-3:]
+                calls.append(Path(test_classes_file).read_text().splitlines())
+                calls.append(Path(os.path.dirname(test_classes_file), constants.COVERAGE_DUMP_RUNNER_CLASS +
+                                     '.java').read_text())
+                for test_class in calls[-2]:
+                    jacoco_exec_util.write_exec_file(
+                        os.path.join(output_dir, test_class.split('.')[-1] + '_jacoco.exec'), [],
+                        {0x1: ('irs/IRS', 4, 0b1)})
+            else:
+                calls.append(Path(command.split('@')[-1]).read_text().splitlines())
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                os.makedirs(os.path.join('irs-evosuite-tests', 'irs'))
+                for test_file in ['IRS_ESTest.java', 'IRS_ESTest_scaffolding.java', 'Salary_ESTest.java']:
+                    Path('irs-evosuite-tests', 'irs', test_file).write_text(
+                        'public class {} {{}}'.format(test_file[:-5]))
+                os.mkdir('lib')
+                with zipfile.ZipFile(os.path.join('lib', constants.JACOCO_AGENT_JAR_NAME), 'w') as zf:
+                    zf.writestr('jacocoagent.jar', b'')
+                os.mkdir('cov-data-augmentation')
+                with mock.patch.object(constants, 'TKLTEST_LIB_DOWNLOAD_DIR', os.path.abspath('lib')), \
+                        mock.patch.object(build_util, 'get_build_classpath', return_value='junit.jar'), \
+                        mock.patch.object(jvm_util, 'get_jvm_launch_args',
+                                          side_effect=lambda java, tool, classpath: '-cp "{}"'.format(
+                                              os.pathsep.join(classpath))), \
+                        mock.patch.object(command_util, 'run_command', side_effect=run_command):
+                    augmentation_test_pool, has_coverage = getattr(augment, '__collect_augmentation_pool_coverage')(
+                        evosuite_test_dir='irs-evosuite-tests', ctd_test_dir='irs-ctd-amplified-tests',
+                        build_file=None, build_type='ant', raw_cov_data_dir='cov-data-augmentation', jdk_path='',
+                        config=config)
+                self.assertTrue(has_coverage)
+                self.assertEqual(['IRS_ESTest.java', 'Salary_ESTest.java'],
+                                 sorted(os.path.basename(test) for test in augmentation_test_pool))
+
+                # test classes are compiled with their scaffolding classes and the runner, and run in one JVM
+                compile_command, sources, run_command, test_classes, runner_source = calls
+                self.assertTrue(compile_command.startswith('javac '))
+                self.assertEqual(['IRS_ESTest.java', 'IRS_ESTest_scaffolding.java', 'Salary_ESTest.java',
+                                  constants.COVERAGE_DUMP_RUNNER_CLASS + '.java'],
+                                 sorted(os.path.basename(source.strip('"')) for source in sources))
+                run_args = shlex.split(run_command)
+                agent_jar = os.path.abspath(os.path.join('cov-data-augmentation-single-jvm', 'jacocoagent.jar'))
+                self.assertEqual(['java', '-javaagent:' + agent_jar + '=output=none,includes=irs'], run_args[:2])
+                self.assertIn('junit.jar', run_args[run_args.index('-cp') + 1].split(os.pathsep))
+                self.assertEqual([constants.COVERAGE_DUMP_RUNNER_CLASS, os.path.abspath('cov-data-augmentation')],
+                                 run_args[-4:-2])
+                self.assertEqual('classes', run_args[-1])
+                self.assertEqual(['irs.IRS_ESTest', 'irs.Salary_ESTest'], sorted(test_classes))
+                self.assertIn('name + "_jacoco.exec"', runner_source)
+                # per-class raw coverage data files, as created by running each test class with the build file
+                self.assertEqual(['IRS_ESTest' + constants.JACOCO_SUFFIX_FOR_AUGMENTATION,
+                                  'Salary_ESTest' + constants.JACOCO_SUFFIX_FOR_AUGMENTATION],
+                                 sorted(os.listdir('cov-data-augmentation')))
+                self.assertFalse(os.path.exists('cov-data-augmentation-single-jvm'))
+            finally:
+                os.chdir(cwd)
+
+    def test_jacoco_service_requests(self) -> None:
+        """Test requests to the JaCoCo service and the fallback to the JaCoCo CLI"""
+        class ServiceProcess:
+            # service process answering each request with the next response
+            def __init__(self, responses):
+                self.requests = []
+                self.stdin = self
+                self.stdout = self
+                self.responses = responses
+
+            def write(self, data):
+                self.requests.extend(line for line in data.split('\n') if line)
+
+            def readline(self):
+                return self.responses.pop(0) + '\n'
+
+            def flush(self):
+                pass
+
+            def close(self):
+                pass
+
+            def poll(self):
+                return None
+
+            def wait(self, timeout=None):
+                return 0
+
+        jacoco_service_util.stop()
+        service_process = ServiceProcess(['OK', 'ERROR\tjava.io.FileNotFoundException: missing.exec'])
+        try:
+            with mock.patch.object(subprocess, 'run') as run_javac, \
+                    mock.patch.object(subprocess, 'Popen', return_value=service_process) as start_service, \
+                    mock.patch.object(command_util, 'run_command') as run_command:
+                jacoco_service_util.report(exec_files=['jacoco.exec'], class_files=['classes', 'lib.jar'],
+                                           csv_file='jacoco.csv', jdk_path='', max_memory=512)
+                with self.assertRaises(subprocess.CalledProcessError) as context:
+                    jacoco_service_util.merge(exec_files=['missing.exec', 'jacoco.exec'], dest_file='merged.exec')
+            # the service is compiled and started once, and serves all requests
+            self.assertEqual(1, run_javac.call_count)
+            self.assertEqual(1, start_service.call_count)
+            self.assertIn('-Xmx512m', start_service.call_args.args[0])
+            run_command.assert_not_called()
+            self.assertEqual([
+                '\t'.join(['report', 'exec=' + os.path.abspath('jacoco.exec'),
+                           'classfiles=' + os.path.abspath('classes'), 'classfiles=' + os.path.abspath('lib.jar'),
+                           'csv=' + os.path.abspath('jacoco.csv')]),
+                '\t'.join(['merge', 'exec=' + os.path.abspath('missing.exec'), 'exec=' + os.path.abspath('jacoco.exec'),
+                           'dest=' + os.path.abspath('merged.exec')])
+            ], service_process.requests)
+            self.assertEqual('java.io.FileNotFoundException: missing.exec', context.exception.stderr)
+        finally:
+            jacoco_service_util.stop()
+        self.assertEqual('quit', service_process.requests[-1])
+
+        # if the service cannot be compiled, operations run the JaCoCo CLI
+        try:
+            with mock.patch.object(subprocess, 'run', side_effect=OSError('javac not found')), \
+                    mock.patch.object(subprocess, 'Popen') as start_service, \
+                    mock.patch.object(jvm_util, 'get_class_data_sharing_args', return_value=''), \
+                    mock.patch.object(command_util, 'run_command') as run_command:
+                jacoco_service_util.merge(exec_files=['a.exec', 'b.exec'], dest_file='merged.exec')
+                jacoco_service_util.report(exec_files=['merged.exec'], class_files=['classes'], xml_file='jacoco.xml')
+            start_service.assert_not_called()
+            jacoco_cli_file = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)
+            self.assertEqual([
+                'java -jar {} merge a.exec b.exec --destfile merged.exec'.format(jacoco_cli_file),
+                'java -jar {} report merged.exec --classfiles classes --xml jacoco.xml'.format(jacoco_cli_file)
+            ], [call.args[0] for call in run_command.call_args_list])
+        finally:
+            jacoco_service_util.stop()
+
+    def test_augmentation_coverage_reports(self) -> None:
+        """Test that coverage of augmenting tests is collected without reports, and the final report is created once"""
+        cwd = os.getcwd()
+        class_files = [os.path.abspath('test/data/irs/monolith/target/classes')]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                os.makedirs(os.path.join('irs-ctd-amplified-tests', 'irs'))
+                Path('irs-ctd-amplified-tests', 'irs', 'T0_ESTest.java').write_text('public class T0_ESTest {}')
+                build_file = build_util.generate_build_xml(
+                    app_name='irs', build_type='ant', monolith_app_path=class_files, app_classpath='',
+                    test_root_dir='irs-ctd-amplified-tests', test_dirs=['irs-ctd-amplified-tests'],
+                    target_class_list=[], main_reports_dir='reports', app_packages=['irs'],
+                    collect_codecoverage=True, output_dir=tmp_dir)
+
+                # the target run for each augmenting test does not create test or coverage reports
+                targets = {target.get('name'): target for target in ElementTree.parse(build_file).getroot()
+                           if target.tag == 'target'}
+
+                def get_tasks(target_name):
+                    target = targets[target_name]
+                    tasks = [element.tag.split('}')[-1] for element in target.iter()]
+                    for dependency in filter(None, target.get('depends', '').split(',')):
+                        tasks += get_tasks(dependency)
+                    return tasks
+                self.assertIn('merge', get_tasks('merge-coverage'))
+                self.assertFalse({'junitreport', 'report'} & set(get_tasks('merge-coverage')))
+                self.assertTrue({'junitreport', 'report'} <= set(get_tasks('merge-coverage-report')))
+
+                def run_command(command, verbose, env_vars, timeout=None):
+                    jacoco_exec_util.write_exec_file(coverage_util.get_jacoco_exec_file('ant', os.path.dirname(
+                        build_file)), [], {0x1: ('irs/IRS', 4, 0b1)})
+
+                os.mkdir('cov-data-augmentation')
+                with mock.patch.object(command_util, 'run_command', side_effect=run_command) as run_build, \
+                        mock.patch.object(jacoco_service_util, 'report') as report:
+                    for test in ['T0_ESTest', 'T1_ESTest']:
+                        raw_cov_file = coverage_util.get_raw_coverage_for_test_suite(
+                            build_file=build_file, build_type='ant', test_root_dir='irs-ctd-amplified-tests',
+                            raw_cov_data_dir='cov-data-augmentation', raw_cov_data_file_pref=test, jdk_path='')
+                        self.assertEqual(os.path.join('cov-data-augmentation',
+                                                      test + constants.JACOCO_SUFFIX_FOR_AUGMENTATION), raw_cov_file)
+                    self.assertEqual(['ant -f {} merge-coverage'.format(build_file)] * 2,
+                                     [call.args[0] for call in run_build.call_args_list])
+                    report.assert_not_called()
+                self.assertFalse(os.path.exists('reports'))
+
+                # the report of the augmented test suite is created once, from the merged raw coverage data
+                jacoco_exec_util.write_exec_file(os.path.join('cov-data-augmentation', 'CTD-guided' +
+                                                              constants.JACOCO_SUFFIX_FOR_AUGMENTATION), [],
+                                                 {0x1: ('irs/IRS', 4, 0b10)})
+
+                def create_report(exec_files, class_files, csv_file, html_dir, xml_file, jdk_path, max_memory):
+                    self.assertEqual({0x1: ('irs/IRS', 4, 0b11)}, jacoco_exec_util.read_exec_file(exec_files[0])[1])
+                    Path(csv_file).write_text(
+                        'GROUP,PACKAGE,CLASS,INSTRUCTION_MISSED,INSTRUCTION_COVERED,BRANCH_MISSED,BRANCH_COVERED,'
+                        'LINE_MISSED,LINE_COVERED,COMPLEXITY_MISSED,COMPLEXITY_COVERED,METHOD_MISSED,METHOD_COVERED\n'
+                        'irs,irs,IRS,5,100,2,6,1,20,1,9,1,8\n')
+
+                base_coverage = {counter + suffix: 0 for counter in probe_coverage_util.COVERAGE_COUNTERS
+                                 for suffix in ('_covered', '_total')}
+                with mock.patch.object(jacoco_service_util, 'report', side_effect=create_report) as report:
+                    augmented_coverage = getattr(augment, '__get_augmented_coverage')(
+                        added_test_classes=['irs-evosuite-tests/irs/T0_ESTest.java',
+                                            'irs-evosuite-tests/irs/T1_ESTest.java'],
+                        augmented_coverage_gain={counter + '_cov_delta': 0
+                                                 for counter in probe_coverage_util.COVERAGE_COUNTERS},
+                        ctd_test_dir='irs-ctd-amplified-tests', base_ctd_coverage=base_coverage,
+                        class_files=class_files, raw_cov_dir='cov-data-augmentation', report_dir='reports',
+                        max_memory=1024, jdk_path='')
+                self.assertEqual(1, report.call_count)
+                self.assertTrue(report.call_args.kwargs['html_dir'] and report.call_args.kwargs['xml_file'])
+                self.assertEqual((100, 105), (augmented_coverage['instruction_covered'],
+                                              augmented_coverage['instruction_total']))
+            finally:
+                os.chdir(cwd)
+
     def __assert_classpath(self, standard_classpath, generated_classpath, build_type, message):
         """
         :param standard_classpath: Path to the standard classpath for comparison.
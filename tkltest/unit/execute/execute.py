@@ -24,7 +24,7 @@ import toml
 
 from tkltest.unit.execute import compare_coverage
 from tkltest.util import constants, command_util, config_util
-from tkltest.unit.util import build_util, dir_util, coverage_util
+from tkltest.unit.util import build_util, dir_util, coverage_util, jacoco_service_util
 from tkltest.util.logging_util import tkltest_status
 from tkltest.unit.execute.coverage_html_writer import CoverageStatisticsHtmlWriter
 
@@ -313,15 +313,13 @@ def __compare_to_dev_tests_coverage(config, jacoco_raw_date_file = ''):
     merged_exec_file = os.path.join(compare_report_dir, 'dev_tkltest_merged.exec')
     merged_coverage_xml = os.path.join(compare_report_dir, 'dev_tkltest_merged.xml')
     merged_html_dir = os.path.join(compare_report_dir, 'dev_tkltest_merged_html')
-    jacoco_cli_file = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)
 
     if not jacoco_raw_date_file:
         jacoco_raw_date_file = coverage_util.get_jacoco_exec_file(config['general']['build_type'], build_dir)
     # merging the .exec files
     try:
-        command_util.run_command("java -Xmx2048m -jar {} merge {} {} --destfile {}".
-                             format(jacoco_cli_file, jacoco_raw_date_file, dev_coverage_exec,
-                                    merged_exec_file), verbose=True)
+        jacoco_service_util.merge(exec_files=[jacoco_raw_date_file, dev_coverage_exec], dest_file=merged_exec_file,
+                                  jdk_path=config['general']['java_jdk_home'], max_memory=2048)
     except subprocess.CalledProcessError as e:
         tkltest_status('Warning: Failed to merge coverage data files {} and {}, not creating a compare report:\n {}\n{}'.format(jacoco_raw_date_file, dev_coverage_exec, e, e.stderr))
         return
@@ -393,10 +391,10 @@ def merge_modules_coverage_reports(tkltest_config, modules_configs, failed_modul
     # get the merged exec file:
     app_build_dir = os.path.join(app_dir, app_name + constants.TKLTEST_BUILD_DIR_SUFFIX)
     merged_exec_file = coverage_util.get_jacoco_exec_file(tkltest_config['general']['build_type'], app_build_dir)
-    jacoco_cli_file = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)
     try:
-        command_util.run_command('java -Xmx'+str(tkltest_config['general']['max_memory_for_coverage']) + 'm  -jar {} merge {} --destfile {}'.
-                         format(jacoco_cli_file, ' '.join(jacoco_exec_files), merged_exec_file), verbose=True)
+        jacoco_service_util.merge(exec_files=jacoco_exec_files, dest_file=merged_exec_file,
+                                  jdk_path=tkltest_config['general']['java_jdk_home'],
+                                  max_memory=tkltest_config['general']['max_memory_for_coverage'])
     except subprocess.CalledProcessError as e:
         tkltest_status('Warning: failed to create a merged coverage report. Jacoco_cli failed to merge exec files: {}\n{}'.format(e, e.stderr))
         return
@@ -14,20 +14,32 @@
 # limitations under the License.
 # ***************************************************************************
 
+import concurrent.futures
+import itertools
 import logging
 import os
+import queue
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import copy
+import heapq
 
-from tkltest.util import constants
-from tkltest.unit.util import coverage_util
+import numpy as np
+
+from tkltest.util import command_util, constants
+from tkltest.unit.util import build_util, coverage_cache_util, coverage_util, jacoco_exec_util, \
+    probe_coverage_util
 from tkltest.util.logging_util import tkltest_status
 
+# directory containing the raw coverage data files of the CTD-guided tests and the augmentation pool
+__RAW_COV_DATA_DIR = 'cov-data-augmentation'
+
 
-def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, report_dir):
+def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, report_dir, pool_coverage=None,
+                               end_time=None):
     """Augments CTD-guided tests with coverage-increasing base tests.
 
     Starting with the CTD-guided and base test suites, iteratively augments the CTD-guided test
@@ -35,15 +47,20 @@ def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, rep
     coverage achieved by the test suite. The augmentation is done in two passes. In the first pass,
     the coverage increment of each test class over the coverage of the initial test suite is
     computed. Test classes that do not increase coverage are discarded; the remaining test classes
-    are sorted based on decreasing order of coverage increments. In the second pass, the initial
-    test suite is augmented by adding one test class at a time: this is done by processing each
-    test class in the sorted order and adding the test class to the test suite if it increases
-    the coverage of the augmented test suite.
+    are kept in a max-heap ordered by coverage increments. In the second pass, the initial test suite
+    is augmented by adding one test class at a time using lazy-greedy selection: the test class at the
+    top of the heap is re-evaluated against the augmented test suite, and is added if its coverage
+    increment is still the largest (otherwise it is pushed back with its updated increment). The second
+    pass can be limited by a budget of added test classes or a target instruction coverage rate. If an end time is
+    given, test classes of the augmentation pool are not run after the end time (so that they are not candidates
+    for augmentation), and the second pass stops at the end time.
 
     Rather than executing the tests at each step to obtain updated coverage, the raw coverage output file (jacoco.exec)
-    of each test from the augmentation pool is kept, and at each step is merged with the current test suite raw
-    coverage file to obtain the new raw coverage file. This way we execute each test only once instead of up to n times,
-    where n is the number of tests in the augmentation pool.
+    of each test from the augmentation pool is kept. The raw coverage files are loaded once into a coverage matrix
+    over coverage items derived from an analysis of the app class files, so that coverage gains at each step are
+    computed in-process from the matrix. This way we execute each test only once instead of up to n times,
+    where n is the number of tests in the augmentation pool, and create a coverage report only for the final
+    augmented test suite.
 
     Args:
         config (dict): loaded and validated config information
@@ -51,6 +68,9 @@ def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, rep
         build_type (str): Type of build file (either ant, maven or gradle)
         ctd_test_dir (str): Root directory for CTD tests
         report_dir (str): Main reports directory, under which coverage report is generated
+        pool_coverage (concurrent.futures.Future): coverage collection for the augmentation pool started in the
+            background (see start_augmentation_pool_coverage_collection()), if any
+        end_time (float): time by which augmentation should be complete (None for no limit)
 
 
     Returns:
@@ -75,7 +95,10 @@ def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, rep
             report_dir=report_dir,
             class_files=config['general']['monolith_app_path'],
             jdk_path=config['general']['java_jdk_home'],
-            dev_tests=dev_tests
+            dev_tests=dev_tests,
+            config=config,
+            pool_coverage=pool_coverage,
+            end_time=end_time
     )
 
     if not has_coverage:
@@ -86,16 +109,14 @@ def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, rep
         len(test_class_augment_pool)))
 
     # initialize map for test classes that provide coverage gain
-    tests_with_coverage_gain, total_inst_cov_gain, total_branch_cov_gain = __compute_tests_with_coverage_gain(
-        test_class_augment_pool=test_class_augment_pool,
-        ctd_test_dir=ctd_test_dir,
-        base_ctd_coverage=base_test_coverage,
-        class_files=config['general']['monolith_app_path'],
-        raw_cov_dir=raw_cov_data_dir,
-        report_dir=report_dir,
-        max_memory=config['general']['max_memory_for_coverage'],
-        jdk_path=config['general']['java_jdk_home']
-    )
+    tests_with_coverage_gain, total_inst_cov_gain, total_branch_cov_gain, coverage_matrix = \
+        __compute_tests_with_coverage_gain(
+            test_class_augment_pool=test_class_augment_pool,
+            base_ctd_coverage=base_test_coverage,
+            class_files=config['general']['monolith_app_path'],
+            raw_cov_dir=raw_cov_data_dir,
+            memory_budget=config['generate']['ctd_amplified']['augmentation_memory_budget']
+        )
 
     if test_class_augment_pool:
         print('')
@@ -106,13 +127,17 @@ def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, rep
     # augment initial test suite with coverage-contributing tests from the augmentation pool
     augmented_coverage, added_test_classes = __augment_ctd_test_suite(
         tests_with_coverage_gain=tests_with_coverage_gain,
+        coverage_matrix=coverage_matrix,
         ctd_test_dir=ctd_test_dir,
         base_ctd_coverage=base_test_coverage,
         class_files=config['general']['monolith_app_path'],
         raw_cov_dir=raw_cov_data_dir,
         report_dir=report_dir,
         max_memory=config['general']['max_memory_for_coverage'],
-        jdk_path=config['general']['java_jdk_home']
+        jdk_path=config['general']['java_jdk_home'],
+        budget=config['generate']['ctd_amplified']['augmentation_budget'],
+        target_coverage=config['generate']['ctd_amplified']['augmentation_target_coverage'],
+        end_time=end_time
     )
     final_test_method_count = __get_test_method_count(ctd_test_dir)
     final_inst_cov_rate = safe_div(augmented_coverage['instruction_covered'], augmented_coverage['instruction_total'])
@@ -142,7 +167,8 @@ def augment_with_code_coverage(config, build_file, build_type, ctd_test_dir, rep
 
 
 def __compute_base_and_augmenting_tests_coverage(ctd_test_dir, evosuite_test_dir, build_file, build_type, report_dir,
-                                                 jdk_path, class_files=None, dev_tests=None):
+                                                 jdk_path, class_files=None, dev_tests=None, config=None,
+                                                 pool_coverage=None, end_time=None):
     """Computes base test suite and augment test suite for coverage-based augmentation.
 
     Given the CTD test suite and the evosuite test suite, computes coverage efficiency of both test suites
@@ -158,6 +184,11 @@ def __compute_base_and_augmenting_tests_coverage(ctd_test_dir, evosuite_test_dir
         jdk_path (str): path to the jdk home to be used for executing the tests and measuring their coverage
         class_files (str): the class file of the app
         dev_tests (dict): information of user test suite, to add its coverage to the base tests coverage
+        config (dict): loaded and validated config information, used for creating build files of parallel
+            coverage workers (if None, coverage of test classes is collected sequentially)
+        pool_coverage (concurrent.futures.Future): coverage collection for the augmentation pool started in the
+            background, which is joined instead of collecting coverage for the augmentation pool
+        end_time (float): time after which no test classes of the augmentation pool are run (None for no limit)
 
     Returns:
         list: test classes in the augmentation pool
@@ -165,12 +196,14 @@ def __compute_base_and_augmenting_tests_coverage(ctd_test_dir, evosuite_test_dir
         str:  directory containing raw coverage data files for CTD test suite and for each of the
     """
 
-    # create a folder that will contain all raw coverage data files
+    # create a folder that will contain all raw coverage data files (unless created by the background
+    # coverage collection for the augmentation pool)
 
-    raw_cov_data_dir = "cov-data-augmentation"
+    raw_cov_data_dir = __RAW_COV_DATA_DIR
 
-    shutil.rmtree(raw_cov_data_dir, ignore_errors=True)
-    os.mkdir(raw_cov_data_dir)
+    if pool_coverage is None:
+        shutil.rmtree(raw_cov_data_dir, ignore_errors=True)
+        os.mkdir(raw_cov_data_dir)
 
     # get coverage info for CTD-guided test suite
     ctd_test_coverage, ctd_test_method_count, ctd_inst_cov_efficiency =\
@@ -205,6 +238,84 @@ def __compute_base_and_augmenting_tests_coverage(ctd_test_dir, evosuite_test_dir
                        .format(ctd_test_method_count, ctd_inst_cov_efficiency))
 
         # set evosuite tests as the augmentation pool and CTD coverage as the base coverage
+    if pool_coverage is not None:
+        tkltest_status('Waiting for the background coverage collection for the augmentation test pool to complete')
+        augmentation_test_pool, has_coverage = pool_coverage.result()
+    else:
+        augmentation_test_pool, has_coverage = __collect_augmentation_pool_coverage(
+            evosuite_test_dir=evosuite_test_dir, ctd_test_dir=ctd_test_dir, build_file=build_file,
+            build_type=build_type, raw_cov_data_dir=raw_cov_data_dir, jdk_path=jdk_path, config=config,
+            end_time=end_time)
+
+    __initialize_test_directory(ctd_test_dir=ctd_test_dir, source_test_dir=ctd_test_dir_bak)
+
+    # remove backup directory created
+    shutil.rmtree(ctd_test_dir_bak, ignore_errors=True)
+
+    return augmentation_test_pool, ctd_test_coverage, raw_cov_data_dir, has_coverage
+
+
+def start_augmentation_pool_coverage_collection(config, build_type, ctd_test_dir, end_time=None):
+    """Starts collecting coverage of the test classes in the augmentation pool in the background.
+
+    The augmentation pool consists of the evosuite tests created during building-block test generation, so
+    its coverage can be collected while the CTD-guided tests are being generated. The collection runs in a
+    background thread, using parallel coverage workers or a single JVM (as the CTD test directory and build
+    file, used for running test classes sequentially, do not exist yet).
+
+    Args:
+        config (dict): loaded and validated config information
+        build_type (str): Type of build file (either ant, maven or gradle)
+        ctd_test_dir (str): Root directory for CTD tests (to be generated)
+        end_time (float): time after which no test classes of the augmentation pool are run (None for no limit)
+
+    Returns:
+        concurrent.futures.Future: future of the test classes in the augmentation pool and whether coverage was
+            collected for any of them, to be passed to augment_with_code_coverage()
+    """
+    shutil.rmtree(__RAW_COV_DATA_DIR, ignore_errors=True)
+    os.mkdir(__RAW_COV_DATA_DIR)
+    pool_coverage = concurrent.futures.Future()
+    pool_coverage.set_running_or_notify_cancel()
+
+    def collect_pool_coverage():
+        try:
+            pool_coverage.set_result(__collect_augmentation_pool_coverage(
+                evosuite_test_dir=config['general']['app_name'] + constants.TKL_EVOSUITE_OUTDIR_SUFFIX,
+                ctd_test_dir=ctd_test_dir, build_file=None, build_type=build_type,
+                raw_cov_data_dir=__RAW_COV_DATA_DIR, jdk_path=config['general']['java_jdk_home'], config=config,
+                pipelined=True, end_time=end_time))
+        except BaseException as e:
+            pool_coverage.set_exception(e)
+
+    # not a daemon thread, so that the test and build processes run by the collection are not left behind if test
+    # generation exits before joining it
+    threading.Thread(target=collect_pool_coverage).start()
+    tkltest_status('Started collecting coverage for the augmentation test pool in the background')
+    return pool_coverage
+
+
+def discard_augmentation_pool_coverage(pool_coverage):
+    """Waits for the coverage collection for the augmentation pool started in the background (see
+    start_augmentation_pool_coverage_collection()) to complete, if augmentation does not run, and removes the raw
+    coverage data files it collected.
+    """
+    tkltest_status('Waiting for the background coverage collection for the augmentation test pool to complete')
+    concurrent.futures.wait([pool_coverage])
+    shutil.rmtree(__RAW_COV_DATA_DIR, ignore_errors=True)
+
+
+def __collect_augmentation_pool_coverage(evosuite_test_dir, ctd_test_dir, build_file, build_type, raw_cov_data_dir,
+                                         jdk_path, config, pipelined=False, end_time=None):
+    """Collects the raw coverage data files of the test classes (or methods) in the augmentation pool.
+
+    Test classes are not run after the end time (if given); in a single JVM, the run is terminated at the end time,
+    keeping the raw coverage data files of the test classes completed so far.
+
+    Returns:
+        list: test classes in the augmentation pool
+        bool: whether any test class in the augmentation pool covers any probe
+    """
     augmentation_test_pool = [
         os.path.join(dir, file)
         for dir, files in coverage_util.get_test_classes(evosuite_test_dir).items()
@@ -217,34 +328,243 @@ def __compute_base_and_augmenting_tests_coverage(ctd_test_dir, evosuite_test_dir
         tkltest_status('Computing individual coverage for each of {} test files in the augmentation test pool'
                    .format(len(augmentation_test_pool)))
 
-    counter = 1
-    has_coverage = False
+    augmentation_test_pool = [test for test in augmentation_test_pool if __has_evosuite_tests(test)]
+    test_methods = bool(config and config['generate']['ctd_amplified']['augment_test_methods'])
+    if test_methods:
+        # the augmentation pool consists of the test methods of the test classes
+        augmentation_test_pool = [test + constants.AUGMENTATION_TEST_METHOD_SEPARATOR + test_method
+                                  for test in augmentation_test_pool
+                                  for test_method in coverage_util.get_test_methods(test)]
+
+    # reuse raw coverage data files of test classes cached in earlier runs
+    test_cache_keys = __get_test_cache_keys(config, augmentation_test_pool)
+    cached_tests = [test for test in augmentation_test_pool if test in test_cache_keys and
+                    coverage_cache_util.get_cached_coverage(cache_dir=__get_coverage_cache_dir(config),
+                                                            key=test_cache_keys[test],
+                                                            dest_file=__get_test_raw_cov_file(raw_cov_data_dir, test))]
+    if cached_tests:
+        tkltest_status('Reusing cached coverage data for {} of {} test files in the augmentation test pool'
+                       .format(len(cached_tests), len(augmentation_test_pool)))
+    uncached_test_pool = [test for test in augmentation_test_pool if test not in cached_tests]
+
+    worker_count = __get_augmentation_worker_count(config, len(uncached_test_pool))
+    if not uncached_test_pool:
+        has_coverage = False
+    elif config and (config['generate']['ctd_amplified']['augmentation_single_jvm'] or test_methods) and \
+            coverage_util.collect_test_classes_coverage_in_single_jvm(
+                test_classes=list(dict.fromkeys(__split_test_method(test)[0] for test in uncached_test_pool)),
+                test_src_dir=evosuite_test_dir,
+                app_paths=config['general']['monolith_app_path'],
+                app_classpath=build_util.get_build_classpath(config),
+                app_packages=config['execute']['app_packages'], raw_cov_data_dir=raw_cov_data_dir,
+                work_dir=os.path.abspath(raw_cov_data_dir + '-single-jvm'), jdk_path=jdk_path,
+                test_methods=test_methods, timeout=command_util.get_remaining_time(end_time)):
+        has_coverage = __has_raw_coverage(uncached_test_pool, raw_cov_data_dir)
+        shutil.rmtree(raw_cov_data_dir + '-single-jvm', ignore_errors=True)
+    elif test_methods:
+        # coverage of test methods is collected in a single JVM only
+        tkltest_status('Warning: failed to collect coverage of test methods in the augmentation test pool')
+        has_coverage = False
+    elif worker_count > 1 or pipelined:
+        # in pipelined mode, the CTD test directory is not available for running test classes sequentially
+        has_coverage = __compute_augmenting_tests_coverage_in_parallel(
+            augmentation_test_pool=uncached_test_pool, worker_count=worker_count, ctd_test_dir=ctd_test_dir,
+            build_type=build_type, raw_cov_data_dir=raw_cov_data_dir, jdk_path=jdk_path, config=config,
+            end_time=end_time)
+    else:
+        has_coverage = False
+        counter = 1
+        for test in uncached_test_pool:
+            if command_util.get_remaining_time(end_time) == 0:
+                __report_skipped_tests(len(uncached_test_pool) - counter + 1)
+                break
+            coverage_util.add_test_class_to_ctd_suite(test_class=test, test_directory=ctd_test_dir)
+            __print_test_counter(counter)
+            counter += 1
+            has_coverage |= __compute_augmenting_test_coverage(test=test, test_dir=ctd_test_dir, build_file=build_file,
+                                                               build_type=build_type,
+                                                               raw_cov_data_dir=raw_cov_data_dir, jdk_path=jdk_path)
+            coverage_util.remove_test_class_from_ctd_suite(test_class=test, test_directory=ctd_test_dir)
+
+    has_coverage |= __has_raw_coverage(cached_tests, raw_cov_data_dir)
+
+    # add raw coverage data files of the test classes run to the cache
+    if test_cache_keys:
+        cache_dir = __get_coverage_cache_dir(config)
+        for test in uncached_test_pool:
+            test_raw_cov_file = __get_test_raw_cov_file(raw_cov_data_dir, test)
+            if test in test_cache_keys and os.path.isfile(test_raw_cov_file):
+                coverage_cache_util.add_cached_coverage(cache_dir=cache_dir, key=test_cache_keys[test],
+                                                        exec_file=test_raw_cov_file)
+        coverage_cache_util.evict_cached_coverage(cache_dir=cache_dir,
+                                                  max_size=config['generate']['ctd_amplified']['augmentation_cache_size'])
+
+    if end_time is not None:
+        # test classes skipped at the deadline are not candidates for augmentation
+        augmentation_test_pool = [test for test in augmentation_test_pool
+                                  if os.path.isfile(__get_test_raw_cov_file(raw_cov_data_dir, test))]
+    return augmentation_test_pool, has_coverage
+
+
+def __report_skipped_tests(skipped_test_count):
+    tkltest_status('Warning: skipped collecting coverage for {} test files in the augmentation test pool at the '
+                   'deadline'.format(skipped_test_count))
+
+
+def __has_evosuite_tests(test):
+    """Checks whether EvoSuite generated any tests in the given test class"""
+    with open(test) as f:
+        if 'EvoSuite did not generate any tests' in f.read():
+            tkltest_status('EvoSuite did not generate any tests at: {}. Skipping the test '.format(test))
+            return False
+    return True
+
+
+def __compute_augmenting_test_coverage(test, test_dir, build_file, build_type, raw_cov_data_dir, jdk_path):
+    """Runs the given test directory, containing a single test class from the augmentation pool, to collect
+    the raw coverage data file of the test class. Only the raw coverage data file is created (coverage reports
+    are created for the final augmented test suite only). Returns whether the test class covers any probe."""
+    test_raw_cov_file = coverage_util.get_raw_coverage_for_test_suite(build_file=build_file, build_type=build_type,
+                                                                      test_root_dir=test_dir,
+                                                                      raw_cov_data_dir=raw_cov_data_dir,
+                                                                      raw_cov_data_file_pref=os.path.basename(test)[:-5],
+                                                                      jdk_path=jdk_path)
+    if not test_raw_cov_file:
+        tkltest_status('Warning: Error while computing coverage for test, skipping current test file {}'.format(test))
+        return False
+    return __has_raw_coverage([test], raw_cov_data_dir)
+
+
+def __has_raw_coverage(augmentation_test_pool, raw_cov_data_dir):
+    """Checks whether the raw coverage data file of any test class in the augmentation pool has covered probes"""
     for test in augmentation_test_pool:
-        with open(test) as f:
-            if 'EvoSuite did not generate any tests' in f.read():
-                tkltest_status('EvoSuite did not generate any tests at: {}. Skipping the test '.format(test))
-                continue
-        coverage_util.add_test_class_to_ctd_suite(test_class=test, test_directory=ctd_test_dir)
-        __print_test_counter(counter)
-        counter += 1
-        test_coverage, test_method_count, inst_cov_efficiency = \
-            __compute_coverage_efficiency(test_dir=ctd_test_dir, build_file=build_file, build_type=build_type,
-                                      report_dir=report_dir, test_suite_name=os.path.basename(test)[:-5],
-                                      raw_cov_data_dir=raw_cov_data_dir, jdk_path=jdk_path)
-        if not test_coverage:
+        test_raw_cov_file = __get_test_raw_cov_file(raw_cov_data_dir, test)
+        if not os.path.isfile(test_raw_cov_file):
             tkltest_status('Warning: Error while computing coverage for test, skipping current test file {}'.format(test))
-        elif test_coverage['instruction_covered'] > 0:
-            has_coverage = True
-        coverage_util.remove_test_class_from_ctd_suite(test_class=test, test_directory=ctd_test_dir)
+            continue
+        try:
+            exec_data = jacoco_exec_util.read_exec_file(test_raw_cov_file)[1]
+        except (OSError, ValueError) as e:
+            tkltest_status('Warning: failed to read coverage data file {}: {}'.format(test_raw_cov_file, e))
+            continue
+        if any(probes for _, _, probes in exec_data.values()):
+            return True
+    return False
 
 
+def __get_coverage_cache_dir(config):
+    """Returns the directory of the cache of raw coverage data files of test classes"""
+    return os.path.abspath(config['general']['app_name'] + constants.TKL_AUGMENTATION_COVERAGE_CACHE_DIR_SUFFIX)
 
-    __initialize_test_directory(ctd_test_dir=ctd_test_dir, source_test_dir=ctd_test_dir_bak)
 
-    # remove backup directory created
-    shutil.rmtree(ctd_test_dir_bak, ignore_errors=True)
+def __get_test_cache_keys(config, augmentation_test_pool):
+    """Computes the coverage cache keys of the test classes in the augmentation pool.
 
-    return augmentation_test_pool, ctd_test_coverage, raw_cov_data_dir, has_coverage
+    The keys depend on the test class sources, the app class files, and the coverage collection mode. Returns
+    an empty dict if the coverage cache is disabled.
+    """
+    if config is None or not config['generate']['ctd_amplified']['augmentation_cache_size'] \
+            or not augmentation_test_pool:
+        return {}
+    app_classes_hash = coverage_cache_util.get_app_classes_hash(config['general']['monolith_app_path'])
+    collection_mode = 'offline={},single_jvm={},packages={}'.format(
+        config['general']['offline_instrumentation'],
+        config['generate']['ctd_amplified']['augmentation_single_jvm'],
+        ':'.join(config['execute']['app_packages']))
+    test_cache_keys = {}
+    for test in augmentation_test_pool:
+        test_file, test_method = __split_test_method(test)
+        test_cache_keys[test] = coverage_cache_util.get_test_cache_key(
+            test_class=test_file, app_classes_hash=app_classes_hash,
+            collection_mode=collection_mode if test_method is None else collection_mode + ',method=' + test_method)
+    return test_cache_keys
+
+
+def __get_augmentation_worker_count(config, pool_size):
+    """Returns the number of parallel workers to use for collecting coverage of the augmentation pool"""
+    if config is None or pool_size < 2:
+        return 1
+    worker_count = config['generate']['ctd_amplified']['augmentation_workers']
+    if not worker_count:
+        worker_count = max(1, (os.cpu_count() or 1) // 2)
+    return min(worker_count, pool_size)
+
+
+def __compute_augmenting_tests_coverage_in_parallel(augmentation_test_pool, worker_count, ctd_test_dir, build_type,
+                                                    raw_cov_data_dir, jdk_path, config, end_time=None):
+    """Collects raw coverage data of the test classes in the augmentation pool using parallel workers.
+
+    Each worker has its own scratch directory, containing a test root directory, a build file (with its build
+    directory and raw coverage data file) and a reports directory, so that workers can run test classes
+    concurrently. Each test class is run by a free worker, and its raw coverage data file is moved to the
+    common raw coverage data directory, as done when test classes are run sequentially in the CTD test directory.
+    Test classes are not run after the end time (if given).
+
+    Args:
+        augmentation_test_pool (list): test classes in the augmentation pool
+        worker_count (int): number of parallel workers
+        ctd_test_dir (str): Root directory for CTD tests
+        build_type (str): Type of build file (either ant, maven or gradle)
+        raw_cov_data_dir (str): directory to store raw coverage data files in
+        jdk_path (str): path to the jdk home to be used for executing the tests and measuring their coverage
+        config (dict): loaded and validated config information
+        end_time (float): time after which no test classes are run (None for no limit)
+
+    Returns:
+        bool: whether any test class in the augmentation pool covers any probe
+    """
+    workers_dir = os.path.abspath(raw_cov_data_dir + '-workers')
+    shutil.rmtree(workers_dir, ignore_errors=True)
+    tkltest_status('Running test files in the augmentation test pool with {} parallel workers'.format(worker_count))
+
+    free_workers = queue.Queue()
+    for worker_id in range(worker_count):
+        worker_dir = os.path.join(workers_dir, 'worker-{}'.format(worker_id))
+        worker_test_dir = os.path.join(worker_dir, os.path.basename(ctd_test_dir))
+        worker_report_dir = os.path.join(worker_dir, config['general']['app_name'] +
+                                         constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX)
+        os.makedirs(worker_test_dir)
+        worker_build_file = build_util.generate_build_xml(
+            app_name=config['general']['app_name'],
+            build_type=build_type,
+            monolith_app_path=config['general']['monolith_app_path'],
+            app_classpath=build_util.get_build_classpath(config),
+            test_root_dir=worker_test_dir,
+            test_dirs=[worker_test_dir],
+            target_class_list=config['generate']['target_class_list'],
+            main_reports_dir=worker_report_dir,
+            app_packages=config['execute']['app_packages'],
+            collect_codecoverage=True,
+            offline_instrumentation=config['general']['offline_instrumentation'],
+            output_dir=worker_dir
+        )
+        free_workers.put((worker_test_dir, worker_build_file))
+
+    counter = itertools.count(1)
+    skipped_tests = []
+
+    def run_test(test):
+        if command_util.get_remaining_time(end_time) == 0:
+            skipped_tests.append(test)
+            return False
+        worker_test_dir, worker_build_file = free_workers.get()
+        try:
+            coverage_util.add_test_class_to_ctd_suite(test_class=test, test_directory=worker_test_dir)
+            __print_test_counter(next(counter))
+            return __compute_augmenting_test_coverage(test=test, test_dir=worker_test_dir,
+                                                      build_file=worker_build_file, build_type=build_type,
+                                                      raw_cov_data_dir=raw_cov_data_dir, jdk_path=jdk_path)
+        finally:
+            coverage_util.remove_test_class_from_ctd_suite(test_class=test, test_directory=worker_test_dir)
+            free_workers.put((worker_test_dir, worker_build_file))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+        has_coverage = any(list(executor.map(run_test, augmentation_test_pool)))
+    if skipped_tests:
+        __report_skipped_tests(len(skipped_tests))
+
+    shutil.rmtree(workers_dir, ignore_errors=True)
+    return has_coverage
 
 
 def __compute_coverage_efficiency(test_dir, build_file, build_type, report_dir, test_suite_name,
@@ -325,201 +645,266 @@ def __get_test_method_count(test_dir):
 
 
 
-def __compute_tests_with_coverage_gain(test_class_augment_pool, ctd_test_dir, base_ctd_coverage, class_files,
-                                       raw_cov_dir, report_dir, max_memory, jdk_path):
+def __compute_tests_with_coverage_gain(test_class_augment_pool, base_ctd_coverage, class_files, raw_cov_dir,
+                                       memory_budget=None):
     """Computes coverage delta for each test class in the augment pool of tests.
 
-    Computes for each test class in the test augment pool additional instruction, line, and branch coverage that
-    it achieves over the base instruction, line, and branch coverage achieved by the CTD-guided tests. Returns
-    information about tests that provide coverage gain and the total instruction and branch coverage gains
-    over all tests.
+    Computes for each test class in the test augment pool additional instruction, line, branch, and method
+    coverage that it achieves over the base coverage achieved by the CTD-guided tests. The raw coverage data
+    file of each test class is streamed once into a coverage matrix (tests x coverage items not covered by the
+    base tests), whose items are derived from an analysis of the app class files; the coverage deltas of all
+    test classes are then computed together as weighted sums over the matrix rows. Returns information about
+    tests that provide coverage gain, the total instruction and branch coverage gains over all tests, and
+    the coverage matrix for use in augmentation.
 
     Args:
         test_class_augment_pool (list): Pool of candidates tests to augment the CTD-guided test suite with
-        ctd_test_dir (str): Root directory for CTD tests
         base_ctd_coverage (dict): Coverage achieved by the CTD tests
         class_files (list): App classes paths
         raw_cov_dir (str): Directory containing raw coverage data files
-        report_dir (str): Main reports directory, under which coverage report is generated
-        max_memory (int): maximal memory to use for merging coverage reports
-        jdk_path (str): path to the jdk home to be used for executing the tests and measuring their coverage
+        memory_budget (int): maximum size, in MB, of the coverage matrix kept in memory (None for no limit)
 
     Returns:
         dict: information about tests that provide coverage gain
         int: total instruction coverage gain
         int: total branch coverage gain
+        dict: coverage matrix of the tests that provide coverage gain, with keys 'tests' (mapping test class
+            to matrix row), 'coverage' and 'weights' (see probe_coverage_util.build_coverage_matrix()); rows of
+            tests that do not provide coverage gain are left in the matrix, so that it is not copied
     """
-    tests_with_coverage_gain = {}
-    total_inst_cov_gain = 0
-    total_branch_cov_gain = 0
-    counter = 1
-    # iterate over evosuite test classes and compute coverage delta over base ctd coverage
-
-    main_coverage_dir = os.path.abspath(os.path.join(report_dir,
-                                                     constants.TKL_CODE_COVERAGE_REPORT_DIR,
-                                                     os.path.basename(ctd_test_dir)))
+    class_models = probe_coverage_util.analyze_class_files(class_files)
 
     ctd_raw_cov_file = os.path.join(raw_cov_dir, "CTD-guided"+constants.JACOCO_SUFFIX_FOR_AUGMENTATION)
+    base_exec_data = {}
+    if os.path.isfile(ctd_raw_cov_file):
+        try:
+            base_exec_data = jacoco_exec_util.read_exec_file(ctd_raw_cov_file)[1]
+        except (OSError, ValueError) as e:
+            tkltest_status('Warning: failed to read coverage data file {}: {}'.format(ctd_raw_cov_file, e))
 
-    for test_class in test_class_augment_pool:
+    # stream raw coverage data of each test class in the augmentation pool into the coverage matrix
+    pool_tests = []
 
-        # add test class to test suite
-        #coverage_util.add_test_class_to_ctd_suite(test_class=test_class, test_directory=ctd_test_dir)
-        __print_test_counter(counter)
-        counter += 1
+    def read_tests_exec_data():
+        counter = 1
+        for test_class in test_class_augment_pool:
+            __print_test_counter(counter)
+            counter += 1
+            test_raw_cov_file = __get_test_raw_cov_file(raw_cov_dir, test_class)
+            if not os.path.isfile(test_raw_cov_file):
+                tkltest_status('Warning: {} does not exist, skipping current test file {}'.format(test_raw_cov_file, test_class))
+                continue
+            try:
+                exec_data = jacoco_exec_util.read_exec_file(test_raw_cov_file)[1]
+            except (OSError, ValueError) as e:
+                logging.error('Warning: error occurred while reading coverage data of test class {}: {}'.format(test_class, e))
+                continue
+            pool_tests.append(test_class)
+            yield exec_data
 
-        test_raw_cov_file = os.path.join(raw_cov_dir,
-                                         os.path.basename(test_class)[:-5]+constants.JACOCO_SUFFIX_FOR_AUGMENTATION)
+    coverage, weights = probe_coverage_util.build_coverage_matrix(class_models, base_exec_data,
+                                                                  read_tests_exec_data(), memory_budget)
 
-        if not os.path.isfile(test_raw_cov_file):
-            tkltest_status('Warning: {} does not exist, skipping current test file {}'.format(test_raw_cov_file, test_class))
-            continue
-        # get coverage delta for test class against base CTD coverage
-        try:
-            coverage_delta, total_coverage = coverage_util.get_delta_coverage(test=test_class,
-                                                                              test_raw_cov_file=test_raw_cov_file,
-                                                                              ctd_raw_cov_file=ctd_raw_cov_file,
-                                                                              main_coverage_dir=main_coverage_dir,
-                                                                              class_files=class_files,
-                                                                              base_coverage=base_ctd_coverage,
-                                                                              remove_merged_cov_file=True,
-                                                                              max_memory=max_memory,
-                                                                              jdk_path=jdk_path)
-            #coverage_delta = coverage_util.get_coverage_for_test_suite(
-            #    build_file=build_file, build_type=build_type, test_root_dir=ctd_test_dir,
-            #    report_dir=report_dir, base_coverage=base_ctd_coverage)
-            if coverage_delta['instruction_cov_delta'] > 0 or coverage_delta['branch_cov_delta'] > 0:
-                logging.info('Coverage gain from test class {}: instruction={}, branch={}'.format(
-                    test_class, coverage_delta['instruction_cov_delta'], coverage_delta['branch_cov_delta']))
-                tests_with_coverage_gain[test_class] = coverage_delta
-                total_inst_cov_gain += coverage_delta['instruction_cov_delta']
-                total_branch_cov_gain += coverage_delta['branch_cov_delta']
-            else:
-                logging.info('No coverage gain from test class {}'.format(test_class))
-        except subprocess.CalledProcessError as e:
-            logging.error('Warning: error occurred while merging augmented test suite with class {}: {}'.format(test_class, e))
-
-        if not coverage_delta and not total_coverage:
-            tkltest_status('Terminating augmentation due to memory exhaustion')
-            return tests_with_coverage_gain, total_inst_cov_gain, total_branch_cov_gain
-
-        # remove test class from test suite
-        #coverage_util.remove_test_class_from_ctd_suite(test_class=test_class, test_directory=ctd_test_dir)
-
-    return tests_with_coverage_gain, total_inst_cov_gain, total_branch_cov_gain
-
-
-def __augment_ctd_test_suite(tests_with_coverage_gain, ctd_test_dir, base_ctd_coverage, class_files,
-                             raw_cov_dir, report_dir, max_memory, jdk_path):
+    # compute coverage delta of each test class against base CTD coverage
+    coverage_gains = probe_coverage_util.compute_coverage_gain(coverage, weights)
+    tests_with_coverage_gain = {}
+    gain_rows = []
+    total_inst_cov_gain = 0
+    total_branch_cov_gain = 0
+    for row, test_class in enumerate(pool_tests):
+        coverage_delta = __get_coverage_delta(coverage_gains[row])
+        if coverage_delta['instruction_cov_delta'] > 0 or coverage_delta['branch_cov_delta'] > 0:
+            logging.info('Coverage gain from test class {}: instruction={}, branch={}'.format(
+                test_class, coverage_delta['instruction_cov_delta'], coverage_delta['branch_cov_delta']))
+            tests_with_coverage_gain[test_class] = coverage_delta
+            gain_rows.append(row)
+            total_inst_cov_gain += coverage_delta['instruction_cov_delta']
+            total_branch_cov_gain += coverage_delta['branch_cov_delta']
+        else:
+            logging.info('No coverage gain from test class {}'.format(test_class))
+
+    coverage_matrix = {
+        'tests': dict(zip(tests_with_coverage_gain.keys(), gain_rows)),
+        'coverage': coverage,
+        'weights': weights
+    }
+    return tests_with_coverage_gain, total_inst_cov_gain, total_branch_cov_gain, coverage_matrix
+
+
+def __augment_ctd_test_suite(tests_with_coverage_gain, coverage_matrix, ctd_test_dir, base_ctd_coverage, class_files,
+                             raw_cov_dir, report_dir, max_memory, jdk_path, budget=0, target_coverage=0,
+                             end_time=None):
     """Augments CTD test suite with tests that contribute to additional coverage.
 
-    Iterates over test classes that contribute to coverage gain, and adds them to the augmented test suite
-    one at a time, ignoring tests that don't increase coverage of the augmented test suite (although they
-    did over the base test suite). Returns information about augmented coverage and count of added test
-    classes.
+    Selects test classes that contribute to coverage gain using lazy-greedy (CELF) selection: test classes are kept
+    in a max-heap keyed by their (instruction+branch) coverage gain, initially the gain over base CTD coverage. As
+    coverage gains can only shrink as tests are added to the augmented test suite, a stale gain is an upper bound on
+    the current gain; so only the test class at the top of the heap is re-evaluated against the augmented test suite,
+    and it is added if its re-evaluated gain is still the largest. Tests that no longer increase coverage are dropped.
+    The coverage gain of a test class is computed from the coverage matrix, as the weighted count of its coverage
+    items that are not yet covered. Selection stops when no test class increases coverage, when the budget of added
+    test classes is reached, when the target instruction coverage rate is reached, or at the end time. Once the
+    augmented test suite is formed, its raw coverage data is merged and the coverage report is created. Returns
+    information about augmented coverage and count of added test classes.
 
     Args:
         tests_with_coverage_gain (dict): Tests that provide coverage gain over base CTD coverage
+        coverage_matrix (dict): coverage matrix of the tests that provide coverage gain
         ctd_test_dir (str): Root directory for CTD tests
         base_ctd_coverage (dict): Coverage achieved by the CTD tests
         class_files (list): App classes paths
         raw_cov_dir (str): Directory containing raw coverage data files
         report_dir (str): Main reports directory, under which coverage report is generated
-        max_memory (int):
-        jdk_path (str): path to the jdk home to be used for executing the tests and measuring their coverage
+        max_memory (int): maximal memory to use for creating the coverage report
+        jdk_path (str): path to the jdk home to be used for creating the coverage report
+        budget (int): maximum number of test classes to add (0 for no limit)
+        target_coverage (int): instruction coverage percentage at which to stop adding test classes (0 for no target)
+        end_time (float): time at which to stop adding test classes (None for no limit)
 
     Returns:
         dict: information about coverage of augmented test suite
         int: total test classes added to CTD test suite
     """
-    # create augmented test directory, initialize it with CTD-guided tests
-    # augmented_test_dir = ctd_test_dir + '-coverage-augmented'
-    # shutil.rmtree(augmented_test_dir, ignore_errors=True)
-    # shutil.copytree(ctd_test_dir, augmented_test_dir)
-
     if tests_with_coverage_gain:
         tkltest_status('Augmenting "{}" with tests from the augmentation pool that contribute to coverage gain'
                        .format(ctd_test_dir))
 
-    main_coverage_dir = os.path.abspath(os.path.join(report_dir,
-                                                     constants.TKL_CODE_COVERAGE_REPORT_DIR,
-                                                     os.path.basename(ctd_test_dir)))
-
-    current_raw_cov_file = os.path.join(raw_cov_dir, "CTD-guided" + constants.JACOCO_SUFFIX_FOR_AUGMENTATION)
-
-    # group test cases by (instruction+branch) coverage gain and create reverse sorted list of gain values
-    grouped_tests_with_cov_gain, ordered_cov_gain_values = __group_tests_by_coverage_gain(tests_with_coverage_gain)
-
-    curr_coverage = base_ctd_coverage
-    augmented_coverage = base_ctd_coverage
-    added_test_classes = 0
-    counter = 1
-    first=True
-    for cov_val in ordered_cov_gain_values:
-        for test_class in grouped_tests_with_cov_gain[cov_val]:
-            coverage_util.add_test_class_to_ctd_suite(test_class=test_class,
-                                                      test_directory=ctd_test_dir)
-            __print_test_counter(counter)
-            counter += 1
+    coverage = coverage_matrix['coverage']
+    weights = coverage_matrix['weights']
+    covered = np.zeros(coverage.shape[1], dtype=np.uint8)
+    augmented_coverage_gain = np.zeros(weights.shape[1], dtype=np.int64)
+    added_test_classes = []
+    added_test_methods = {}
+
+    # heap entries: (negated instruction+branch gain, tie breaker, test class, number of added test classes when
+    # the gain was computed); ties are broken by the order of tests in the augmentation pool
+    heap = [
+        (-(coverage_delta['instruction_cov_delta'] + coverage_delta['branch_cov_delta']), order, test_class, 0)
+        for order, (test_class, coverage_delta) in enumerate(tests_with_coverage_gain.items())
+    ]
+    heapq.heapify(heap)
+    evaluations = 0
+    while heap:
+        if budget and len(added_test_classes) >= budget:
+            tkltest_status('Reached augmentation budget of {} test classes'.format(budget))
+            break
+        if target_coverage and safe_div(base_ctd_coverage['instruction_covered'] + augmented_coverage_gain[0],
+                                        base_ctd_coverage['instruction_total']) * 100 >= target_coverage:
+            tkltest_status('Reached augmentation target instruction coverage of {}%'.format(target_coverage))
+            break
+        if command_util.get_remaining_time(end_time) == 0:
+            tkltest_status('Stopped augmentation at the deadline')
+            break
+        neg_gain, order, test_class, evaluated_at = heapq.heappop(heap)
+        test_coverage = coverage[coverage_matrix['tests'][test_class]]
+        if evaluated_at == len(added_test_classes):
+            # gain is up to date and no other test can have a larger gain: add test to the augmented suite
+            coverage_gain = probe_coverage_util.compute_coverage_gain(test_coverage, weights, covered)
+            __add_test_to_ctd_suite(test=test_class, added_test_methods=added_test_methods,
+                                    test_directory=ctd_test_dir)
+            covered |= test_coverage
+            augmented_coverage_gain += coverage_gain
+            added_test_classes.append(test_class)
+            continue
+        evaluations += 1
+        __print_test_counter(evaluations)
+        coverage_delta = __get_coverage_delta(
+            probe_coverage_util.compute_coverage_gain(test_coverage, weights, covered))
+        if coverage_delta['instruction_cov_delta'] > 0 or coverage_delta['branch_cov_delta'] > 0:
+            heapq.heappush(heap, (-(coverage_delta['instruction_cov_delta'] + coverage_delta['branch_cov_delta']),
+                                  order, test_class, len(added_test_classes)))
 
-            test_raw_cov_file = os.path.join(raw_cov_dir,
-                                        os.path.basename(test_class)[:-5] + constants.JACOCO_SUFFIX_FOR_AUGMENTATION)
-            if not os.path.isfile(test_raw_cov_file):
-                tkltest_status('Warning: coverage date file {} does not exist, skipping current test file {}'.format(test_raw_cov_file, test_class))
-                continue
-            try:
-                coverage_delta, augmented_coverage = coverage_util.get_delta_coverage(
-                    test=test_class, test_raw_cov_file=test_raw_cov_file,
-                    ctd_raw_cov_file=current_raw_cov_file,
-                    main_coverage_dir=main_coverage_dir, class_files=class_files,
-                    base_coverage=curr_coverage,
-                    remove_merged_cov_file=first,
-                    max_memory=max_memory, jdk_path=jdk_path)
-                first = False
-            except subprocess.CalledProcessError as e:
-                logging.error('Warning: error occurred while merging augmented test suite with class {}: {}'.format(test_class, e))
+    logging.info('Lazy-greedy augmentation re-evaluated coverage gain {} times for {} candidate test classes'.format(
+        evaluations, len(tests_with_coverage_gain)))
 
-            if not coverage_delta and not augmented_coverage:
-                tkltest_status('Terminating augmentation due to memory exhaustion')
-                coverage_util.remove_test_class_from_ctd_suite(test_class=test_class, test_directory=ctd_test_dir)
-                return curr_coverage, added_test_classes
+    augmented_coverage = __get_augmented_coverage(
+        added_test_classes=added_test_classes, augmented_coverage_gain=__get_coverage_delta(augmented_coverage_gain),
+        ctd_test_dir=ctd_test_dir, base_ctd_coverage=base_ctd_coverage, class_files=class_files,
+        raw_cov_dir=raw_cov_dir, report_dir=report_dir, max_memory=max_memory, jdk_path=jdk_path)
+    return augmented_coverage, len(added_test_classes)
 
-            if coverage_delta['instruction_cov_delta'] > 0 or coverage_delta['branch_cov_delta'] > 0:
-                curr_coverage = augmented_coverage
-                added_test_classes += 1
-            else:
-                coverage_util.remove_test_class_from_ctd_suite(test_class=test_class, test_directory=ctd_test_dir)
 
-            current_raw_cov_file = os.path.join(raw_cov_dir, constants.JACOCO_MERGED_DATA_FOR_AUGMENTATION)
+def __add_test_to_ctd_suite(test, added_test_methods, test_directory):
+    """Adds a test class, or a test method, from the augmentation pool to the CTD test suite directory.
 
-    return augmented_coverage, added_test_classes
+    A test method is added by (re-)adding its test class with the test methods added so far, which are
+    recorded in added_test_methods (mapping test class file to added test methods).
+    """
+    test_file, test_method = __split_test_method(test)
+    if test_method is None:
+        coverage_util.add_test_class_to_ctd_suite(test_class=test_file, test_directory=test_directory)
+        return
+    added_test_methods.setdefault(test_file, []).append(test_method)
+    coverage_util.add_test_methods_to_ctd_suite(test_class=test_file, test_methods=added_test_methods[test_file],
+                                                test_directory=test_directory)
 
 
-def __group_tests_by_coverage_gain(tests_with_coverage_gain):
-    """Groups test cases by their coverage gain values.
+def __get_augmented_coverage(added_test_classes, augmented_coverage_gain, ctd_test_dir, base_ctd_coverage,
+                             class_files, raw_cov_dir, report_dir, max_memory, jdk_path):
+    """Merges raw coverage data of the augmented test suite and creates its coverage report.
 
-    Groups test cases by the coverage gain values, computed as sum of instruction and branch coverage gains.
-    Returns grouped test cases and reverse sorted list of coverage gain values.
-
-    Args:
-        tests_with_coverage_gain: Coverage gain information about test cases
+    The raw coverage data files of the CTD-guided tests and of the added test classes are merged into a
+    single raw coverage data file, from which the coverage report of the augmented test suite is created.
+    If the report cannot be created, the augmented coverage is computed from the coverage gain over the
+    base coverage.
 
     Returns:
-        dict: test cases grouped by coverage gain values
-        list: reverse sorted list of coverage gain values
+        dict: information about coverage of augmented test suite
     """
-    grouped_tests_with_cov_gain = {}
-    cov_gain_values = []
-    for test_class in tests_with_coverage_gain.keys():
-        test_cov_gain = tests_with_coverage_gain[test_class]['instruction_cov_delta'] + \
-                        tests_with_coverage_gain[test_class]['branch_cov_delta']
-        if test_cov_gain not in grouped_tests_with_cov_gain.keys():
-            grouped_tests_with_cov_gain[test_cov_gain] = [test_class]
-            cov_gain_values.append(test_cov_gain)
-        else:
-            grouped_tests_with_cov_gain[test_cov_gain].append(test_class)
-    cov_gain_values.sort(reverse=True)
-    return grouped_tests_with_cov_gain, cov_gain_values
+    augmented_coverage = {
+        counter_name + '_covered': base_ctd_coverage[counter_name + '_covered'] +
+                                   augmented_coverage_gain[counter_name + '_cov_delta']
+        for counter_name in probe_coverage_util.COVERAGE_COUNTERS
+    }
+    augmented_coverage.update({
+        counter_name + '_total': base_ctd_coverage[counter_name + '_total']
+        for counter_name in probe_coverage_util.COVERAGE_COUNTERS
+    })
+    if not added_test_classes:
+        return augmented_coverage
+
+    raw_cov_files = [os.path.join(raw_cov_dir, "CTD-guided" + constants.JACOCO_SUFFIX_FOR_AUGMENTATION)] + \
+                    [__get_test_raw_cov_file(raw_cov_dir, test_class) for test_class in added_test_classes]
+    augmented_raw_cov_file = os.path.join(raw_cov_dir, constants.JACOCO_MERGED_DATA_FOR_AUGMENTATION)
+    try:
+        jacoco_exec_util.merge_exec_files([raw_cov_file for raw_cov_file in raw_cov_files
+                                           if os.path.isfile(raw_cov_file)], augmented_raw_cov_file)
+    except (OSError, ValueError) as e:
+        tkltest_status('Warning: failed to merge coverage data of augmented test suite: {}'.format(e))
+        return augmented_coverage
+
+    main_coverage_dir = os.path.abspath(os.path.join(report_dir,
+                                                     constants.TKL_CODE_COVERAGE_REPORT_DIR,
+                                                     os.path.basename(ctd_test_dir)))
+    report_coverage = coverage_util.get_coverage_from_exec_file(exec_file=augmented_raw_cov_file,
+                                                                class_files=class_files,
+                                                                main_coverage_dir=main_coverage_dir,
+                                                                report_name=os.path.basename(ctd_test_dir),
+                                                                max_memory=max_memory, jdk_path=jdk_path)
+    return report_coverage if report_coverage else augmented_coverage
+
+
+def __get_coverage_delta(coverage_gain):
+    """Returns coverage delta information for the given vector of coverage gains"""
+    return {
+        counter_name + '_cov_delta': int(coverage_gain[i])
+        for i, counter_name in enumerate(probe_coverage_util.COVERAGE_COUNTERS)
+    }
+
+
+def __get_test_raw_cov_file(raw_cov_dir, test_class):
+    """Returns the raw coverage data file of a test class (or test method) in the augmentation pool"""
+    test_file, test_method = __split_test_method(test_class)
+    test_name = os.path.basename(test_file)[:-5]
+    if test_method:
+        test_name += constants.AUGMENTATION_TEST_METHOD_SEPARATOR + test_method
+    return os.path.join(raw_cov_dir, test_name + constants.JACOCO_SUFFIX_FOR_AUGMENTATION)
+
+
+def __split_test_method(test):
+    """Splits a test in the augmentation pool into its test class file and test method (None for a test class)"""
+    test_file, _, test_method = test.partition(constants.AUGMENTATION_TEST_METHOD_SEPARATOR)
+    return test_file, test_method or None
 
 
 def __print_test_counter(counter):
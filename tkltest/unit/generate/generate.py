@@ -15,10 +15,13 @@
 # ***************************************************************************
 
 import argparse
+import concurrent.futures
 import logging
 import logging.handlers
 import os
+import re
 import csv
+import hashlib
 import shutil
 import subprocess
 import sys
@@ -28,11 +31,13 @@ import json
 from threading import Thread
 
 
-from .augment import augment_with_code_coverage
+from .augment import augment_with_code_coverage, discard_augmentation_pool_coverage, \
+    start_augmentation_pool_coverage_collection
 from .ctd_coverage import create_test_plan_report
 from .generate_standalone import generate_randoop, generate_evosuite
-from tkltest.util import command_util, constants, config_util
-from tkltest.unit.util import build_util, dir_util, coverage_util
+from tkltest.util import command_util, constants, config_util, jvm_util
+from tkltest.unit.util import budget_util, build_util, checkpoint_util, dir_util, coverage_util, incremental_util, \
+    jacoco_exec_util, probe_coverage_util
 from tkltest.util.logging_util import tkltest_status
 
 
@@ -47,13 +52,14 @@ def process_generate_command(args, config):
         config: loaded configuration options
     """
     logging.info('Processing generate command')
+    start_time = time.time()
     output_dir = dir_util.cd_output_dir(config['general']['app_name'], config['general'].get('module_name', ''))
     # clear test directory content
     test_directory = __reset_test_directory(args, config)
 
-    exclude_classes_covered_by_dev_test(config, output_dir)
+    dev_test_coverage = exclude_classes_covered_by_dev_test(config, output_dir)
     if args.sub_command == "ctd-amplified":
-        generate_ctd_amplified_tests(config, output_dir)
+        generate_ctd_amplified_tests(config, output_dir, dev_test_coverage, start_time)
     elif args.sub_command == "randoop":
         generate_randoop(config, output_dir)
     elif args.sub_command == "evosuite":
@@ -77,7 +83,7 @@ def process_generate_command(args, config):
     dir_util.cd_cli_dir()
 
 
-def generate_ctd_amplified_tests(config, output_dir):
+def generate_ctd_amplified_tests(config, output_dir, dev_test_coverage=None, start_time=None):
     """Performs CTD-guided test generation.
 
     Performs CTD-guided test generation in three main steps (by invoking the related Java components):
@@ -86,8 +92,15 @@ def generate_ctd_amplified_tests(config, output_dir):
     both tools, and (3) generates extended test sequences, each covering one row of the CTD test plan. The
     final extended test sequences are stored as JUnit classes in the specified/default test directory.
 
+    In deadline mode, steps (2) and (3) are performed in priority batches of target classes until the deadline
+    (measured from the start of the generate command) is near, and augmentation is skipped if there is not
+    enough time left for it. Test generators, extenders, and augmentation still running when the deadline is near
+    are stopped, and the build file and reports are created even if no tests were generated before the deadline.
+
     Args:
         config (dict): loaded and validated config information
+        dev_test_coverage (dict): instruction coverage of the app classes by the developer tests
+        start_time (float): start time of the generate command
     """
 
     # get relevant configuration options for test generation
@@ -113,45 +126,119 @@ def generate_ctd_amplified_tests(config, output_dir):
 
     jdk_path = os.path.join(config['general']['java_jdk_home'], 'bin', 'java')
 
-    start_time = time.time()
+    deadline = config['generate']['ctd_amplified']['deadline']
+    deadline_time = None
+    if deadline > 0:
+        deadline_time = (start_time or time.time()) + deadline
 
-    # generate CTD models and test plans
-    generate_CTD_models_and_test_plans(app_name,
-                                       # partitions_file,
-                                       target_class_list, excluded_class_list,
-                                       monolith_app_path, app_classpath_file,
-                                       # app_prefix, app_suffix,
-                                       config['generate']['ctd_amplified']['interaction_level'], jdk_path, verbose)
+    # phase checkpoints, for resuming after the phases completed in an earlier run
+    checkpoint_file = app_name + constants.TKL_GENERATE_CHECKPOINT_FILE_SUFFIX
+    resume = config['generate']['ctd_amplified']['resume']
+    checkpoints = checkpoint_util.load_checkpoints(checkpoint_file) if resume else {}
+    ctd_file = app_name+constants.TKL_CTD_TEST_PLAN_FILE_SUFFIX
+
+    ctd_fingerprint = checkpoint_util.get_fingerprint({
+        'target_class_list': target_class_list,
+        'excluded_class_list': excluded_class_list,
+        'interaction_level': config['generate']['ctd_amplified']['interaction_level']
+    }, monolith_app_path + [app_classpath_file])
+    if resume and checkpoint_util.is_phase_complete(checkpoints, 'ctd_modeling', ctd_fingerprint):
+        tkltest_status("Resuming generation: reusing CTD models and test plans")
+    else:
+        start_time = time.time()
 
-    tkltest_status("Computing test plans with CTD took "+str(round(time.time()-start_time,2))+" seconds")
+        # generate CTD models and test plans
+        generate_CTD_models_and_test_plans(app_name,
+                                           # partitions_file,
+                                           target_class_list, excluded_class_list,
+                                           monolith_app_path, app_classpath_file,
+                                           # app_prefix, app_suffix,
+                                           config['generate']['ctd_amplified']['interaction_level'], jdk_path, verbose,
+                                           config['generate']['jvm_profiles'])
+
+        tkltest_status("Computing test plans with CTD took "+str(round(time.time()-start_time,2))+" seconds")
+        checkpoint_util.mark_phase_complete(checkpoint_file, checkpoints, 'ctd_modeling', ctd_fingerprint,
+                                            [ctd_file])
 
     start_time = time.time()
 
     test_generator_name = config['generate']['ctd_amplified']['base_test_generator']
     time_limit = config['generate']['time_limit']
-    ctd_file = app_name+constants.TKL_CTD_TEST_PLAN_FILE_SUFFIX
 
-    # generate building-block test sequences
-    reuse_sequences = config['generate']['ctd_amplified']['reuse_base_tests']
-
-    if reuse_sequences:
-        if (test_generator_name == constants.COMBINED_TEST_GENERATOR_NAME and \
-            (not os.path.isfile(app_name+"_RandoopTestGenerator"+constants.TKL_BB_SEQ_FILE_SUFFIX) \
-                or not os.path.isfile(app_name+"_EvoSuiteTestGenerator"+constants.TKL_BB_SEQ_FILE_SUFFIX))) \
-                or (test_generator_name != constants.COMBINED_TEST_GENERATOR_NAME and
-                    not os.path.isfile(app_name + "_" + test_generator_name + constants.TKL_BB_SEQ_FILE_SUFFIX)):
-                    tkltest_status("Basic block test sequence files do not exist, generating from scratch")
-                    reuse_sequences = False
+    # set default test directory if unspecified in config
+    if 'test_directory' not in config['general'].keys() or \
+            config['general']['test_directory'] == '':
+        test_directory = config['general']['app_name'] + constants.TKLTEST_DEFAULT_CTDAMPLIFIED_TEST_DIR_SUFFIX
+    else:
+        test_directory = config['general']['test_directory']
 
-    if reuse_sequences:
-        tkltest_status("Reusing existing basic block test sequences")
+    # for incremental generation, restrict generation to the target classes that changed since the last run
+    incremental_state = None
+    generation_ctd_file = ctd_file
+    if config['generate']['ctd_amplified']['incremental']:
+        incremental_state = __init_incremental_generation(config, ctd_file)
+        generation_ctd_file = incremental_state['ctd_file']
+    skip_generation = incremental_state is not None and not incremental_state['changed_classes']
+    extended_in_batches = False
+
+    bb_fingerprint = checkpoint_util.get_fingerprint({
+        'base_test_generator': test_generator_name,
+        'time_limit': time_limit,
+        'weighted_time_budget': config['generate']['ctd_amplified']['weighted_time_budget'],
+        'deadline': deadline,
+        'plateau_window': config['generate']['ctd_amplified']['plateau_window'],
+        'plateau_threshold': config['generate']['ctd_amplified']['plateau_threshold'],
+        'reuse_base_tests': config['generate']['ctd_amplified']['reuse_base_tests'],
+        'incremental': config['generate']['ctd_amplified']['incremental']
+    }, [ctd_file])
+    if resume and checkpoint_util.is_phase_complete(checkpoints, 'bb_generation', bb_fingerprint):
+        tkltest_status("Resuming generation: reusing basic block test sequences")
     else:
-        run_bb_test_generator(app_name, ctd_file, monolith_app_path, app_classpath_file,
-                              test_generator_name, time_limit, jdk_path,
-                              # partitions_file,
-                              verbose)
-        tkltest_status("Generating basic block test sequences with "+test_generator_name+" took " +
-            str(round(time.time() - start_time, 2)) + " seconds")
+        # generate building-block test sequences
+        reuse_sequences = config['generate']['ctd_amplified']['reuse_base_tests']
+
+        if reuse_sequences:
+            if (test_generator_name == constants.COMBINED_TEST_GENERATOR_NAME and \
+                (not os.path.isfile(app_name+"_RandoopTestGenerator"+constants.TKL_BB_SEQ_FILE_SUFFIX) \
+                    or not os.path.isfile(app_name+"_EvoSuiteTestGenerator"+constants.TKL_BB_SEQ_FILE_SUFFIX))) \
+                    or (test_generator_name != constants.COMBINED_TEST_GENERATOR_NAME and
+                        not os.path.isfile(app_name + "_" + test_generator_name + constants.TKL_BB_SEQ_FILE_SUFFIX)):
+                        tkltest_status("Basic block test sequence files do not exist, generating from scratch")
+                        reuse_sequences = False
+
+        if reuse_sequences:
+            tkltest_status("Reusing existing basic block test sequences")
+        else:
+            if skip_generation:
+                tkltest_status("No target classes changed, reusing basic block test sequences of the last run")
+            else:
+                if incremental_state is not None:
+                    __remove_bb_test_sequences_files(app_name)
+                class_time_limits = None
+                if config['generate']['ctd_amplified']['weighted_time_budget'] and time_limit > 0:
+                    class_time_limits = __plan_class_time_limits(generation_ctd_file, monolith_app_path, time_limit,
+                                                                 dev_test_coverage)
+                if deadline_time is not None:
+                    # leave time for writing the results and for augmentation
+                    end_time = deadline_time - constants.DEADLINE_FINALIZATION_TIME
+                    if not config['generate']['ctd_amplified']['no_augment_coverage']:
+                        end_time -= deadline * constants.DEADLINE_AUGMENTATION_FRACTION
+                    __generate_tests_in_priority_batches(config, generation_ctd_file,
+                                                         test_directory + constants.TKLTEST_TEMP_DIR_SUFFIX,
+                                                         class_time_limits, dev_test_coverage, end_time, jdk_path,
+                                                         deadline_time - constants.DEADLINE_FINALIZATION_TIME)
+                    extended_in_batches = True
+                else:
+                    __generate_bb_test_sequences(config, generation_ctd_file, class_time_limits, jdk_path)
+                tkltest_status("Generating basic block test sequences with "+test_generator_name+" took " +
+                    str(round(time.time() - start_time, 2)) + " seconds")
+            if incremental_state is not None:
+                __merge_incremental_bb_test_sequences(app_name, incremental_state)
+        bb_outputs = [file for file in [f'{app_name}_{testgen}{constants.TKL_BB_SEQ_FILE_SUFFIX}'
+                                        for testgen in ['EvoSuiteTestGenerator', 'RandoopTestGenerator']]
+                      + [app_name + constants.TKL_EVOSUITE_OUTDIR_SUFFIX] if os.path.exists(file)]
+        checkpoint_util.mark_phase_complete(checkpoint_file, checkpoints, 'bb_generation', bb_fingerprint,
+                                            bb_outputs)
 
     # list of generated BB sequences files
     bb_seq_files = []
@@ -165,134 +252,354 @@ def generate_ctd_amplified_tests(config, output_dir):
         if os.path.isfile(bb_seq_file):
             bb_seq_files.append(bb_seq_file)
 
-    # if no BB sequences files created, exit
+    # if no BB sequences files created, exit (unless in deadline mode, where the build file and reports are created
+    # for an empty test suite if no batch could be generated for before the deadline)
     if not bb_seq_files:
         tkltest_status(f'No basic block sequences generated using "{test_generator_name}"')
-        sys.exit(0)
+        if not extended_in_batches:
+            sys.exit(0)
 
     start_time = time.time()
 
-    # set default test directory if unspecified in config
-    if 'test_directory' not in config['general'].keys() or \
-            config['general']['test_directory'] == '':
-        test_directory = config['general']['app_name'] + constants.TKLTEST_DEFAULT_CTDAMPLIFIED_TEST_DIR_SUFFIX
-    else:
-        test_directory = config['general']['test_directory']
-
-    tmp_test_directory = test_directory + constants.TKLTEST_TEMP_DIR_SUFFIX
-    # generate extended test sequences
-    extend_sequences(app_name=app_name, monolith_app_path=monolith_app_path, app_classpath_file=app_classpath_file,
-                     ctd_file=ctd_file, bb_seq_file=','.join(bb_seq_files), jdk_path=jdk_path,
-                     no_diff_assertions=config['generate']['no_diff_assertions'],
-                     no_ctd_coverage=config['generate']['ctd_amplified']['no_ctd_coverage'],
-                     interaction_level=config['generate']['ctd_amplified']['interaction_level'],
-                     # jee_support=config['generate']['jee_support'],
-                     bad_path=config['generate']['bad_path'],
-                     num_executions=config['generate']['ctd_amplified']['num_seq_executions'],
-                     test_directory=tmp_test_directory, verbose=verbose)
-
-    if os.path.exists(test_directory):
-        shutil.rmtree(test_directory)
-    if os.path.isdir(os.path.join(tmp_test_directory, 'monolithic')):
-        shutil.move(os.path.join(tmp_test_directory, 'monolithic'), test_directory)
+    # in pipelined mode, collect coverage of the augmentation pool (the evosuite tests created during building-block
+    # test generation) in the background while extending sequences, if augmentation is going to run; if it is
+    # skipped after all, the collection is waited for (see __discard_augmentation_pool_coverage())
+    pool_coverage = None
+    offline_instrumentation = config['general']['offline_instrumentation']
+    augmentation_end_time = None
+    if deadline_time is not None:
+        augmentation_end_time = deadline_time - constants.DEADLINE_FINALIZATION_TIME
+    if config['generate']['ctd_amplified']['pipeline_augmentation'] and \
+            not config['generate']['ctd_amplified']['no_augment_coverage'] and bb_seq_files and \
+            not (resume and 'augmentation' in checkpoints) and \
+            (deadline_time is None or
+             deadline_time - time.time() >= deadline * constants.DEADLINE_AUGMENTATION_FRACTION):
+        config['general']['offline_instrumentation'] = True
+        pool_coverage = start_augmentation_pool_coverage_collection(config, build_type, test_directory,
+                                                                    end_time=augmentation_end_time)
+
+    # snapshot of the CTD-guided tests, from which the test directory is restored when resuming augmentation
+    ctd_tests_snapshot = app_name + constants.TKL_CHECKPOINT_CTD_TESTS_DIR_SUFFIX
+    ctd_report_dir = app_name + constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX + os.sep + constants.TKL_CTD_REPORT_DIR
+    extension_fingerprint = checkpoint_util.get_fingerprint({
+        'test_directory': test_directory,
+        'no_diff_assertions': config['generate']['no_diff_assertions'],
+        'no_ctd_coverage': config['generate']['ctd_amplified']['no_ctd_coverage'],
+        'interaction_level': config['generate']['ctd_amplified']['interaction_level'],
+        'bad_path': config['generate']['bad_path'],
+        'num_seq_executions': config['generate']['ctd_amplified']['num_seq_executions']
+    }, [ctd_file, app_name + constants.TKL_EVOSUITE_OUTDIR_SUFFIX] + bb_seq_files)
+    if resume and checkpoint_util.is_phase_complete(checkpoints, 'sequence_extension', extension_fingerprint):
+        tkltest_status("Resuming generation: reusing extended test sequences")
     else:
-        os.mkdir(test_directory)
-    for file in os.listdir(tmp_test_directory):
-        shutil.move(os.path.join(tmp_test_directory, file), test_directory)
-    shutil.rmtree(tmp_test_directory)
-
-    tkltest_status("JUnit tests are saved in " + os.path.abspath(test_directory))
-    tkltest_status("Extending test sequences and writing junit tests took " +
-                 str(round(time.time() - start_time, 2)) + " seconds")
-
-    if not config['generate']['ctd_amplified']['no_ctd_coverage']:
-        app_name = config['general']['app_name']
-
-        if os.path.exists(os.path.abspath(app_name+constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX)):
-            generate_ctd_coverage(os.path.abspath(app_name+constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX),
-                                  os.path.abspath(app_name + "_ctd_models_and_test_plans.json"),
-                                  app_name + constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX + os.sep +
-                                  constants.TKL_CTD_REPORT_DIR)
+        tmp_test_directory = test_directory + constants.TKLTEST_TEMP_DIR_SUFFIX
+        # generate extended test sequences
+        if skip_generation:
+            shutil.rmtree(tmp_test_directory, ignore_errors=True)
+            os.makedirs(tmp_test_directory)
+        elif not extended_in_batches:
+            extend_sequences(app_name=app_name, monolith_app_path=monolith_app_path,
+                             app_classpath_file=app_classpath_file,
+                             ctd_file=generation_ctd_file, bb_seq_file=','.join(bb_seq_files), jdk_path=jdk_path,
+                             no_diff_assertions=config['generate']['no_diff_assertions'],
+                             no_ctd_coverage=config['generate']['ctd_amplified']['no_ctd_coverage'],
+                             interaction_level=config['generate']['ctd_amplified']['interaction_level'],
+                             # jee_support=config['generate']['jee_support'],
+                             bad_path=config['generate']['bad_path'],
+                             num_executions=config['generate']['ctd_amplified']['num_seq_executions'],
+                             test_directory=tmp_test_directory, verbose=verbose,
+                             shards=config['generate']['ctd_amplified']['sequence_extender_shards'],
+                             jvm_profiles=config['generate']['jvm_profiles'])
+        if incremental_state is not None:
+            __splice_incremental_tests(app_name, incremental_state, tmp_test_directory, skip_generation)
+
+        if os.path.exists(test_directory):
+            shutil.rmtree(test_directory)
+        if os.path.isdir(os.path.join(tmp_test_directory, 'monolithic')):
+            shutil.move(os.path.join(tmp_test_directory, 'monolithic'), test_directory)
         else:
-            tkltest_status('Cannot generate CTD coverage report because coverage file was not located', error=True)
-            sys.exit(1)
+            os.mkdir(test_directory)
+        for file in os.listdir(tmp_test_directory):
+            shutil.move(os.path.join(tmp_test_directory, file), test_directory)
+        shutil.rmtree(tmp_test_directory)
+
+        tkltest_status("JUnit tests are saved in " + os.path.abspath(test_directory))
+        tkltest_status("Extending test sequences and writing junit tests took " +
+                     str(round(time.time() - start_time, 2)) + " seconds")
+
+        if not config['generate']['ctd_amplified']['no_ctd_coverage']:
+            app_name = config['general']['app_name']
+
+            if os.path.exists(os.path.abspath(app_name+constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX)):
+                generate_ctd_coverage(os.path.abspath(app_name+constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX),
+                                      os.path.abspath(app_name + "_ctd_models_and_test_plans.json"),
+                                      app_name + constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX + os.sep +
+                                      constants.TKL_CTD_REPORT_DIR)
+                shutil.move(app_name + constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX,
+                            os.path.join(app_name + constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX + os.sep +
+                                         constants.TKL_CTD_REPORT_DIR,
+                                         app_name + constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX))
+            elif extended_in_batches:
+                # in deadline mode, no batch might have been extended before the deadline
+                tkltest_status('Warning: skipping CTD coverage report because no test sequences were extended '
+                               'before the deadline')
+            else:
+                tkltest_status('Cannot generate CTD coverage report because coverage file was not located', error=True)
+                __discard_augmentation_pool_coverage(config, pool_coverage, offline_instrumentation)
+                sys.exit(1)
 
-        shutil.move(app_name + constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX,
-                    os.path.join(app_name + constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX + os.sep +
-                                  constants.TKL_CTD_REPORT_DIR,
-                                 app_name + constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX))
+            # combinatorial coverage file may not exist if no methods have more than one test plan row
+            if os.path.exists(app_name + constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX):
+                shutil.move(app_name + constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX,
+                        os.path.join(app_name + constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX + os.sep +
+                        constants.TKL_CTD_REPORT_DIR, app_name + constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX))
 
-        # combinatorial coverage file may not exist if no methods have more than one test plan row
-        if os.path.exists(app_name + constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX):
-            shutil.move(app_name + constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX,
-                    os.path.join(app_name + constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX + os.sep +
-                    constants.TKL_CTD_REPORT_DIR, app_name + constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX))
+        shutil.rmtree(ctd_tests_snapshot, ignore_errors=True)
+        shutil.copytree(test_directory, ctd_tests_snapshot)
+        checkpoint_util.mark_phase_complete(checkpoint_file, checkpoints, 'sequence_extension',
+                                            extension_fingerprint, [ctd_tests_snapshot, ctd_report_dir])
 
-    # generate a build file
     test_dirs = [test_directory]
-
     if config['general']['reports_path']:
         reports_dir = config['general']['reports_path']
     else:
         reports_dir = app_name+constants.TKLTEST_MAIN_REPORT_DIR_SUFFIX
-
-    build_file = build_util.generate_build_xml(
-        app_name=app_name,
-        build_type=build_type,
-        monolith_app_path=monolith_app_path,
-        app_classpath=build_util.get_build_classpath(config),
-        test_root_dir=test_directory,
-        test_dirs=test_dirs,
-        # partitions_file=partitions_file,
-        target_class_list=target_class_list,
-        main_reports_dir=reports_dir,
-        app_packages=config['execute']['app_packages'],  # for coverage-based augmentation
-        collect_codecoverage=True,  # for coverage-based augmentation
-        offline_instrumentation=True if not config['generate']['ctd_amplified']['no_augment_coverage'] else False,
-        output_dir=output_dir
-    )
-    tkltest_status('Generated {} build file {}'.format(build_type, os.path.abspath(os.path.join(test_directory, build_file))))
-
-    # augment CTD-guided tests with coverage-increasing base tests
-    if not config['generate']['ctd_amplified']['no_augment_coverage']:
-        config['general']['offline_instrumentation'] = True
-        start_time = time.time()
-        has_coverage = augment_with_code_coverage(config=config, build_file=build_file, build_type=build_type,
-                                   ctd_test_dir=test_directory, report_dir=reports_dir)
-        if not has_coverage:
-            # try augmentation again with online instrumentation.
-            # Build files have fixed names hence no need to update the name.
-            tkltest_status('Re-running Coverage-driven test-suite augmentation with online instrumentation')
-            build_util.generate_build_xml(
-                app_name=app_name,
-                build_type=build_type,
-                monolith_app_path=monolith_app_path,
-                app_classpath=build_util.get_build_classpath(config),
-                test_root_dir=test_directory,
-                test_dirs=test_dirs,
-                # partitions_file=partitions_file,
-                target_class_list=target_class_list,
-                main_reports_dir=reports_dir,
-                app_packages=config['execute']['app_packages'],  # for coverage-based augmentation
-                collect_codecoverage=True,  # for coverage-based augmentation
-                offline_instrumentation=False,
-                output_dir=output_dir
-            )
-            config['general']['offline_instrumentation'] = False
-            augment_with_code_coverage(config=config, build_file=build_file, build_type=build_type,
-                                       ctd_test_dir=test_directory, report_dir=reports_dir)
-        tkltest_status('Coverage-driven test-suite augmentation and optimization took {} seconds'.
-                       format(round(time.time() - start_time, 2)))
+    augmentation_fingerprint = checkpoint_util.get_fingerprint({
+        'build_type': build_type,
+        'reports_dir': reports_dir,
+        'app_packages': config['execute']['app_packages'],
+        'ctd_amplified': {option: value for option, value in config['generate']['ctd_amplified'].items()
+                          if option != 'resume'}
+    }, [ctd_tests_snapshot])
+    if resume and checkpoint_util.is_phase_complete(checkpoints, 'augmentation', augmentation_fingerprint):
+        tkltest_status("Resuming generation: reusing generated build file and augmented tests")
+        __discard_augmentation_pool_coverage(config, pool_coverage, offline_instrumentation)
+        config['general']['offline_instrumentation'] = \
+            checkpoints['augmentation']['data']['offline_instrumentation']
+    else:
+        augment_coverage = not config['generate']['ctd_amplified']['no_augment_coverage'] and bool(bb_seq_files)
+        if augment_coverage and deadline_time is not None and \
+                deadline_time - time.time() < deadline * constants.DEADLINE_AUGMENTATION_FRACTION:
+            tkltest_status('Skipping coverage-driven test-suite augmentation: not enough time left before the deadline')
+            augment_coverage = False
+        if not augment_coverage:
+            __discard_augmentation_pool_coverage(config, pool_coverage, offline_instrumentation)
+        if resume:
+            # restore the CTD-guided tests, which might have been changed by an interrupted augmentation
+            shutil.rmtree(test_directory, ignore_errors=True)
+            shutil.copytree(ctd_tests_snapshot, test_directory)
+
+        # generate a build file
+        build_file = build_util.generate_build_xml(
+            app_name=app_name,
+            build_type=build_type,
+            monolith_app_path=monolith_app_path,
+            app_classpath=build_util.get_build_classpath(config),
+            test_root_dir=test_directory,
+            test_dirs=test_dirs,
+            # partitions_file=partitions_file,
+            target_class_list=target_class_list,
+            main_reports_dir=reports_dir,
+            app_packages=config['execute']['app_packages'],  # for coverage-based augmentation
+            collect_codecoverage=True,  # for coverage-based augmentation
+            offline_instrumentation=augment_coverage,
+            output_dir=output_dir
+        )
+        tkltest_status('Generated {} build file {}'.format(build_type, os.path.abspath(os.path.join(test_directory, build_file))))
+
+        # augment CTD-guided tests with coverage-increasing base tests
+        if augment_coverage:
+            config['general']['offline_instrumentation'] = True
+            start_time = time.time()
+            has_coverage = augment_with_code_coverage(config=config, build_file=build_file, build_type=build_type,
+                                                      ctd_test_dir=test_directory, report_dir=reports_dir,
+                                                      pool_coverage=pool_coverage, end_time=augmentation_end_time)
+            if not has_coverage:
+                # try augmentation again with online instrumentation.
+                # Build files have fixed names hence no need to update the name.
+                tkltest_status('Re-running Coverage-driven test-suite augmentation with online instrumentation')
+                build_util.generate_build_xml(
+                    app_name=app_name,
+                    build_type=build_type,
+                    monolith_app_path=monolith_app_path,
+                    app_classpath=build_util.get_build_classpath(config),
+                    test_root_dir=test_directory,
+                    test_dirs=test_dirs,
+                    # partitions_file=partitions_file,
+                    target_class_list=target_class_list,
+                    main_reports_dir=reports_dir,
+                    app_packages=config['execute']['app_packages'],  # for coverage-based augmentation
+                    collect_codecoverage=True,  # for coverage-based augmentation
+                    offline_instrumentation=False,
+                    output_dir=output_dir
+                )
+                config['general']['offline_instrumentation'] = False
+                augment_with_code_coverage(config=config, build_file=build_file, build_type=build_type,
+                                           ctd_test_dir=test_directory, report_dir=reports_dir,
+                                           end_time=augmentation_end_time)
+            tkltest_status('Coverage-driven test-suite augmentation and optimization took {} seconds'.
+                           format(round(time.time() - start_time, 2)))
+        checkpoint_util.mark_phase_complete(
+            checkpoint_file, checkpoints, 'augmentation', augmentation_fingerprint,
+            [test_directory, app_name + constants.TKLTEST_BUILD_DIR_SUFFIX, reports_dir],
+            data={'offline_instrumentation': config['general']['offline_instrumentation']})
     build_util.integrate_tests_into_app_build_file(config['generate']['app_build_files'],
                                                    config['general']['build_type'],
                                                    test_dirs)
 
 
+def __discard_augmentation_pool_coverage(config, pool_coverage, offline_instrumentation):
+    """Waits for the coverage collection for the augmentation pool started in the background, if any, when
+    augmentation does not run, and restores the instrumentation setting that was changed for the collection.
+    """
+    if pool_coverage is None:
+        return
+    discard_augmentation_pool_coverage(pool_coverage)
+    config['general']['offline_instrumentation'] = offline_instrumentation
+
+
+def __init_incremental_generation(config, ctd_file):
+    """Initializes incremental generation of CTD-amplified tests.
+
+    Computes the hashes of the target classes in the CTD test plans and compares them with the manifest of the
+    last run to find the changed target classes. If there are unchanged target classes, the CTD test plans of
+    the changed target classes are written to a separate file, which is used for building-block test
+    generation and sequence extension.
+
+    Returns:
+        dict: incremental generation state (state directory, last manifest, class hashes, changed and removed
+            target classes, and CTD test plans file to generate tests for)
+    """
+    app_name = config['general']['app_name']
+    state_dir = os.path.abspath(app_name + constants.TKL_INCREMENTAL_STATE_DIR_SUFFIX)
+    with open(ctd_file, encoding="utf8") as f:
+        ctd_plans = json.load(f)
+    classpath_digest = ''
+    if config['general']['app_classpath_file'] and os.path.isfile(config['general']['app_classpath_file']):
+        with open(config['general']['app_classpath_file'], 'rb') as f:
+            classpath_digest = hashlib.sha256(f.read()).hexdigest()
+    generation_settings = {
+        'base_test_generator': config['generate']['ctd_amplified']['base_test_generator'],
+        'time_limit': config['generate']['time_limit'],
+        'interaction_level': config['generate']['ctd_amplified']['interaction_level'],
+        'num_seq_executions': config['generate']['ctd_amplified']['num_seq_executions'],
+        'no_diff_assertions': config['generate']['no_diff_assertions'],
+        'bad_path': config['generate']['bad_path'],
+        'app_classpath': classpath_digest
+    }
+    app_class_files = incremental_util.get_app_class_files(config['general']['monolith_app_path'])
+    class_hashes = incremental_util.get_target_class_hashes(ctd_plans, app_class_files, generation_settings)
+    manifest = incremental_util.load_manifest(state_dir)
+    changed_classes, removed_classes = incremental_util.get_changed_classes(manifest, class_hashes)
+    if not manifest:
+        tkltest_status('No incremental generation state found, generating tests for all target classes')
+    else:
+        tkltest_status('Incremental generation: {} of {} target classes changed, {} removed'.format(
+            len(changed_classes), len(class_hashes), len(removed_classes)))
+
+    generation_ctd_file = ctd_file
+    if manifest and len(changed_classes) < len(class_hashes):
+        generation_ctd_file = app_name + constants.TKL_INCREMENTAL_CTD_TEST_PLAN_FILE_SUFFIX
+        with open(generation_ctd_file, 'w', encoding="utf8") as f:
+            json.dump(incremental_util.filter_ctd_models_and_test_plans(ctd_plans, set(changed_classes)), f)
+    return {
+        'state_dir': state_dir,
+        'manifest': manifest,
+        'class_hashes': class_hashes,
+        'changed_classes': changed_classes,
+        'removed_classes': removed_classes,
+        'ctd_file': generation_ctd_file
+    }
+
+
+def __remove_bb_test_sequences_files(app_name):
+    """Removes the building-block test sequences files of the last run (kept in the incremental state)"""
+    for testgen in ['EvoSuiteTestGenerator', 'RandoopTestGenerator']:
+        bb_seq_file = f'{app_name}_{testgen}{constants.TKL_BB_SEQ_FILE_SUFFIX}'
+        if os.path.isfile(bb_seq_file):
+            os.remove(bb_seq_file)
+
+
+def __merge_incremental_bb_test_sequences(app_name, incremental_state):
+    """Merges the building-block test sequences generated for the changed target classes with the sequences
+    of the unchanged target classes from the last run, and saves the merged sequences in the incremental state"""
+    state_dir = incremental_state['state_dir']
+    stale_classes = set(incremental_state['changed_classes']) | set(incremental_state['removed_classes'])
+    os.makedirs(state_dir, exist_ok=True)
+    for testgen in ['EvoSuiteTestGenerator', 'RandoopTestGenerator']:
+        bb_seq_file = f'{app_name}_{testgen}{constants.TKL_BB_SEQ_FILE_SUFFIX}'
+        state_bb_seq_file = os.path.join(state_dir, bb_seq_file)
+        merged_sequences = None
+        if incremental_state['manifest'] and os.path.isfile(state_bb_seq_file):
+            with open(state_bb_seq_file, encoding="utf8") as f:
+                merged_sequences = json.load(f)
+            merged_sequences['test_sequences'] = {
+                class_name: class_sequences
+                for class_name, class_sequences in merged_sequences['test_sequences'].items()
+                if class_name not in stale_classes
+            }
+        if os.path.isfile(bb_seq_file) and incremental_state['changed_classes']:
+            with open(bb_seq_file, encoding="utf8") as f:
+                bb_sequences = json.load(f)
+            if merged_sequences is None:
+                merged_sequences = bb_sequences
+            else:
+                merged_sequences['test_sequences'].update(bb_sequences['test_sequences'])
+        if merged_sequences is None:
+            continue
+        with open(bb_seq_file, 'w', encoding="utf8") as f:
+            json.dump(merged_sequences, f, indent=2)
+        shutil.copyfile(bb_seq_file, state_bb_seq_file)
+
+
+def __splice_incremental_tests(app_name, incremental_state, test_directory, skip_generation):
+    """Splices the tests and extender reports of the unchanged target classes from the last run into the tests
+    and reports generated for the changed target classes, and saves the spliced result in the incremental
+    state along with the manifest of the current run"""
+    state_dir = incremental_state['state_dir']
+    state_test_directory = os.path.join(state_dir, 'tests')
+    manifest_classes = incremental_state['manifest'].get('classes', {})
+    changed_classes = incremental_state['changed_classes']
+    stale_classes = set(changed_classes) | set(incremental_state['removed_classes'])
+
+    class_test_files = incremental_util.get_class_test_files(test_directory, changed_classes)
+    for class_name in incremental_state['class_hashes']:
+        if class_name in stale_classes:
+            continue
+        class_test_files[class_name] = manifest_classes[class_name]['tests']
+        for test_file in manifest_classes[class_name]['tests']:
+            state_test_file = os.path.join(state_test_directory, test_file)
+            if os.path.isfile(state_test_file):
+                os.makedirs(os.path.dirname(os.path.join(test_directory, test_file)), exist_ok=True)
+                shutil.copyfile(state_test_file, os.path.join(test_directory, test_file))
+
+    for report_suffix in [constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX, constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX]:
+        report_file = app_name + report_suffix
+        state_report_file = os.path.join(state_dir, report_file)
+        merged_report = None
+        if incremental_state['manifest'] and os.path.isfile(state_report_file):
+            with open(state_report_file, encoding="utf8") as f:
+                merged_report = incremental_util.remove_classes_from_report(json.load(f), stale_classes)
+        if not skip_generation and os.path.isfile(report_file):
+            with open(report_file, encoding="utf8") as f:
+                report = json.load(f)
+            merged_report = report if merged_report is None else __merge_json_values(merged_report, report, '')
+        if merged_report is None:
+            continue
+        with open(report_file, 'w', encoding="utf8") as f:
+            json.dump(merged_report, f, indent=2)
+        shutil.copyfile(report_file, state_report_file)
+
+    shutil.rmtree(state_test_directory, ignore_errors=True)
+    shutil.copytree(test_directory, state_test_directory)
+    incremental_util.save_manifest(state_dir, incremental_state['class_hashes'], class_test_files)
+
+
 def generate_CTD_models_and_test_plans(app_name,
                                        # partitions_file,
                                        target_class_list, excluded_class_list, monolith_app_path, app_classpath_file,
                                        # app_prefix, app_suffix,
-                                       interaction_level, jdk_path, verbose=False):
+                                       interaction_level, jdk_path, verbose=False, jvm_profiles=None):
     """Generates CTD models and test plans.
 
     Performs the first step in the generation of CTD-guided tests (generation of CTD models and test plans)
@@ -313,29 +620,34 @@ def generate_CTD_models_and_test_plans(app_name,
         interaction_level (int): CTD interaction level (strength) for test-plan generation
         jdk_path (str): path to Java VM
         verbose (bool): run in verbose mode printing detailed status messages
+        jvm_profiles (dict): per-tool overrides of the JVM resource profiles
     """
     tkltest_status('Computing coverage goals using CTD')
 
     # build java command to be executed
-    modeling_command = "\""+jdk_path+"\" -Xmx2048m -cp "+os.path.join(constants.TKLTEST_UNIT_CORE_JAR)+os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DIR, "acts_"+constants.ACTS_VERSION+".jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-cli-1.4.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "soot-"+constants.SOOT_VERSION+".jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "axml-2.0.0.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "slf4j-api-1.7.5.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "guava-29.0-jre.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "failureaccess-1.0.1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-7.1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-analysis-7.1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-commons-7.1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-tree-7.1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-utils-7.1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "heros-1.2.0.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "httpcore-4.4.6.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "httpclient-4.5.13.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-databind-2.14.0-rc1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-core-2.14.0-rc1.jar") + os.pathsep
-    modeling_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-annotations-2.14.0-rc1.jar")
+    classpath = [constants.TKLTEST_UNIT_CORE_JAR,
+                 os.path.join(constants.TKLTEST_LIB_DIR, "acts_"+constants.ACTS_VERSION+".jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-cli-1.4.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "soot-"+constants.SOOT_VERSION+".jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "axml-2.0.0.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "slf4j-api-1.7.5.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "guava-29.0-jre.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "failureaccess-1.0.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-7.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-analysis-7.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-commons-7.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-tree-7.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "asm-utils-7.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "heros-1.2.0.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "httpcore-4.4.6.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "httpclient-4.5.13.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-databind-2.14.0-rc1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-core-2.14.0-rc1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-annotations-2.14.0-rc1.jar")]
+    resource_profile = jvm_util.get_resource_profile('ctd_modeler', jvm_util.get_app_class_count(monolith_app_path),
+                                                     jvm_profiles=jvm_profiles)
+    modeling_command = "\""+jdk_path+"\" " + jvm_util.get_resource_args(resource_profile) + " " + \
+                       jvm_util.get_jvm_launch_args(jdk_path, 'CTDTestPlanGenerator', classpath)
     modeling_command += " org.konveyor.tackle.testgen.model.CTDTestPlanGenerator "
     modeling_command += " -app "+app_name
     # if partitions_file:
@@ -376,14 +688,478 @@ def generate_CTD_models_and_test_plans(app_name,
         sys.exit(1)
 
 
+def __plan_class_time_limits(ctd_file, monolith_app_path, time_limit, dev_test_coverage):
+    """Divides the time budget of building-block test generation across the target classes of the CTD test plans.
+
+    The budget of a target class is weighted by the size of its bytecode and the fraction of its instructions
+    not covered by the developer tests (see budget_util).
+
+    Returns:
+        dict: time limit (in seconds) for each target class
+    """
+    with open(ctd_file, encoding="utf8") as f:
+        ctd_plans = json.load(f)
+    class_names = [class_name for partition_plans in ctd_plans['models_and_test_plans'].values()
+                   for class_name in partition_plans]
+    class_metrics = budget_util.get_class_metrics(incremental_util.get_app_class_files(monolith_app_path),
+                                                  class_names)
+    dev_test_coverage = dev_test_coverage or {}
+    class_weights = {class_name: budget_util.get_class_weight(metrics, dev_test_coverage.get(class_name, 0.0))
+                     for class_name, metrics in class_metrics.items()}
+    class_time_limits = budget_util.plan_class_time_budgets(class_weights, time_limit)
+    tier_sizes = {}
+    for class_time_limit in class_time_limits.values():
+        tier_sizes[class_time_limit] = tier_sizes.get(class_time_limit, 0) + 1
+    tkltest_status('Time limits of target classes weighted by size and dev-test coverage: {}'.format(
+        ', '.join('{}s for {} classes'.format(class_time_limit, tier_sizes[class_time_limit])
+                  for class_time_limit in sorted(tier_sizes, reverse=True))))
+    logging.info('Time limits of target classes: {}'.format(class_time_limits))
+    return class_time_limits
+
+
+def __generate_bb_test_sequences(config, ctd_file, class_time_limits, jdk_path, end_time=None):
+    """Generates building-block test sequences for the target classes of the given CTD test plans, stopping early
+    on coverage plateaus if a plateau window is configured, and terminating the test generators at the end time
+    (if given)"""
+    time_limit = config['generate']['time_limit']
+    if config['generate']['ctd_amplified']['plateau_window'] > 0 and time_limit > 0:
+        __run_bb_test_generator_until_plateau(config, ctd_file, class_time_limits, jdk_path, end_time)
+        return
+    run_bb_test_generator(config['general']['app_name'], ctd_file, config['general']['monolith_app_path'],
+                          config['general']['app_classpath_file'],
+                          config['generate']['ctd_amplified']['base_test_generator'], time_limit, jdk_path,
+                          # partitions_file,
+                          config['general']['verbose'],
+                          config['generate']['ctd_amplified']['base_test_generator_shards'], class_time_limits,
+                          config['generate']['jvm_profiles'], end_time)
+
+
+def __run_bb_test_generator_until_plateau(config, ctd_file, class_time_limits, jdk_path, end_time=None):
+    """Generates building-block test sequences in rounds, stopping the generation for a target class once its
+    coverage plateaus.
+
+    Each round runs the base test generators for the active target classes with a time limit of one plateau
+    window (or the remaining budget of a class, if smaller). After each round, the evosuite tests of the round are
+    run with the JaCoCo agent, and the instruction coverage of each class (with its nested classes) by the tests
+    of all rounds so far is computed from the merged execution data; for classes that no tests were measured for
+    (e.g., with randoop, which generates sequences only), the coverage of the target methods by the sequences
+    accumulated over the rounds is sampled instead. A class becomes inactive once its coverage is complete, its
+    budget is spent, or its coverage grew by less than the plateau threshold (in percentage points per window) in
+    the round; a class that is still uncovered after the first round is not considered to have plateaued. The budget left by classes that stopped early is divided among the classes that are still active.
+    The sequences of all rounds are merged per class, and the evosuite tests of all rounds are kept (see
+    __merge_evosuite_round_tests()). No rounds are started after the end time (if given).
+
+    The base test generators write their outputs only when they exit, so the rounds are separate generator runs.
+    """
+    app_name = config['general']['app_name']
+    time_limit = config['generate']['time_limit']
+    window = config['generate']['ctd_amplified']['plateau_window']
+    threshold = config['generate']['ctd_amplified']['plateau_threshold']
+    evosuite_test_dir = app_name + constants.TKL_EVOSUITE_OUTDIR_SUFFIX
+
+    with open(ctd_file, encoding="utf8") as f:
+        ctd_plans = json.load(f)
+    class_plans = {class_name: plans for partition_plans in ctd_plans['models_and_test_plans'].values()
+                   for class_name, plans in partition_plans.items()}
+    remaining_budgets = {class_name: (class_time_limits or {}).get(class_name, time_limit)
+                         for class_name in class_plans}
+    coverage = dict.fromkeys(class_plans, 0.0)
+    active_classes = [class_name for class_name in class_plans if remaining_budgets[class_name] > 0]
+
+    round_ctd_file = app_name + constants.TKL_PLATEAU_ROUND_CTD_TEST_PLAN_FILE_SUFFIX
+    rounds_dir = app_name + constants.TKL_PLATEAU_ROUNDS_DIR_SUFFIX
+    rounds_coverage_dir = os.path.join(rounds_dir, 'coverage')
+    shutil.rmtree(rounds_dir, ignore_errors=True)
+    os.makedirs(rounds_dir)
+    class_models = None
+    rounds_exec_data = {}
+    evosuite_test_rounds = {}
+    generation_round = 0
+    while active_classes and (end_time is None or time.time() < end_time):
+        generation_round += 1
+        round_time_limits = {class_name: max(round(min(window, remaining_budgets[class_name])), 1)
+                             for class_name in active_classes}
+        with open(round_ctd_file, 'w', encoding="utf8") as f:
+            json.dump(incremental_util.filter_ctd_models_and_test_plans(ctd_plans, active_classes), f)
+        __remove_bb_test_sequences_files(app_name)
+        shutil.rmtree(evosuite_test_dir, ignore_errors=True)
+        run_bb_test_generator(app_name, round_ctd_file, config['general']['monolith_app_path'],
+                              config['general']['app_classpath_file'],
+                              config['generate']['ctd_amplified']['base_test_generator'], window, jdk_path,
+                              config['general']['verbose'],
+                              config['generate']['ctd_amplified']['base_test_generator_shards'], round_time_limits,
+                              config['generate']['jvm_profiles'], end_time)
+
+        # accumulate the outputs of the round
+        class_sequences = {}
+        for testgen in ['EvoSuiteTestGenerator', 'RandoopTestGenerator']:
+            bb_seq_file = f'{app_name}_{testgen}{constants.TKL_BB_SEQ_FILE_SUFFIX}'
+            rounds_bb_seq_file = os.path.join(rounds_dir, bb_seq_file)
+            if os.path.isfile(bb_seq_file):
+                with open(bb_seq_file, encoding="utf8") as f:
+                    bb_sequences = json.load(f)
+                if os.path.isfile(rounds_bb_seq_file):
+                    with open(rounds_bb_seq_file, encoding="utf8") as f:
+                        bb_sequences = union_bb_test_sequences(json.load(f), bb_sequences)
+                with open(rounds_bb_seq_file, 'w', encoding="utf8") as f:
+                    json.dump(bb_sequences, f, indent=2)
+                os.remove(bb_seq_file)
+            if os.path.isfile(rounds_bb_seq_file):
+                with open(rounds_bb_seq_file, encoding="utf8") as f:
+                    for class_name, sequences in json.load(f)['test_sequences'].items():
+                        class_sequences.setdefault(class_name, []).extend(sequences.get('sequences', []))
+        if os.path.isdir(evosuite_test_dir):
+            if __collect_evosuite_round_coverage(config, evosuite_test_dir, active_classes, rounds_exec_data,
+                                                 rounds_coverage_dir, end_time) and class_models is None:
+                class_models = probe_coverage_util.analyze_class_files(config['general']['monolith_app_path'])
+            __merge_evosuite_round_tests(evosuite_test_dir, os.path.join(rounds_dir, evosuite_test_dir),
+                                         evosuite_test_rounds, generation_round)
+            shutil.rmtree(evosuite_test_dir)
+        for log_file in [file for file in os.listdir('.') if file.startswith(app_name + '_') and
+                                                                  file.endswith('_output.log')]:
+            with open(log_file, 'rb') as round_log, open(os.path.join(rounds_dir, log_file), 'ab') as rounds_log:
+                shutil.copyfileobj(round_log, rounds_log)
+            os.remove(log_file)
+
+        # sample coverage and stop the generation for classes whose coverage plateaued
+        class_coverage = probe_coverage_util.compute_class_coverage(class_models, rounds_exec_data) \
+            if class_models is not None else {}
+        stopped_classes = []
+        for class_name in active_classes:
+            remaining_budgets[class_name] -= round_time_limits[class_name]
+            sampled_coverage = __get_instruction_coverage(class_coverage, class_name)
+            if sampled_coverage is None:
+                sampled_coverage = get_bb_sequences_method_coverage(class_name, class_plans[class_name],
+                                                                    class_sequences.get(class_name, []))
+            growth = (sampled_coverage - coverage[class_name]) * 100
+            coverage[class_name] = sampled_coverage
+            # no coverage after the first round is not a plateau (e.g., the search of evosuite has not yielded
+            # tests yet), so the plateau test applies once a class is covered or has been sampled twice
+            if sampled_coverage >= 1 or remaining_budgets[class_name] <= 0 or \
+                    ((sampled_coverage > 0 or generation_round > 1) and
+                     growth < threshold * round_time_limits[class_name] / window):
+                stopped_classes.append(class_name)
+        active_classes = [class_name for class_name in active_classes if class_name not in stopped_classes]
+        reclaimed_budget = sum(max(remaining_budgets[class_name], 0) for class_name in stopped_classes)
+        for class_name in active_classes:
+            remaining_budgets[class_name] += reclaimed_budget / len(active_classes)
+        tkltest_status('Round {} of basic block test sequence generation: coverage plateaued for {} target classes, '
+                       '{} target classes remaining'.format(generation_round, len(stopped_classes),
+                                                            len(active_classes)))
+        logging.info('Sampled coverage of target classes: {}'.format(coverage))
+
+    shutil.rmtree(rounds_coverage_dir, ignore_errors=True)
+    for file in os.listdir(rounds_dir):
+        shutil.move(os.path.join(rounds_dir, file), file)
+    shutil.rmtree(rounds_dir)
+    if os.path.isfile(round_ctd_file):
+        os.remove(round_ctd_file)
+
+
+def __collect_evosuite_round_coverage(config, evosuite_test_dir, target_classes, exec_data, coverage_dir,
+                                      end_time=None):
+    """Runs the evosuite tests of a plateau round with the JaCoCo agent, and merges their execution data into the
+    execution data of the earlier rounds.
+
+    Args:
+        config (dict): loaded and validated config information
+        evosuite_test_dir (str): directory of the evosuite tests of the round
+        target_classes (list): target classes of the round
+        exec_data (dict): execution data of the earlier rounds, updated in place
+        coverage_dir (str): scratch directory for the coverage collection
+        end_time (float): time by which the coverage collection must end (optional)
+
+    Returns:
+        bool: whether coverage of evosuite tests was collected
+    """
+    test_classes = [os.path.join(dir, file)
+                    for dir, files in coverage_util.get_test_classes(evosuite_test_dir).items()
+                    for file in files if '_scaffolding' not in file]
+    if not test_classes:
+        return False
+    shutil.rmtree(coverage_dir, ignore_errors=True)
+    raw_cov_data_dir = os.path.join(coverage_dir, 'raw')
+    collected = coverage_util.collect_test_classes_coverage_in_single_jvm(
+        test_classes=test_classes, test_src_dir=evosuite_test_dir,
+        app_paths=config['general']['monolith_app_path'],
+        app_classpath=build_util.get_build_classpath(config),
+        app_packages=[class_name + '*' for class_name in target_classes],
+        raw_cov_data_dir=raw_cov_data_dir, work_dir=os.path.join(coverage_dir, 'classes'),
+        jdk_path=config['general']['java_jdk_home'], timeout=command_util.get_remaining_time(end_time))
+    if collected and os.path.isdir(raw_cov_data_dir):
+        for exec_file in os.listdir(raw_cov_data_dir):
+            try:
+                jacoco_exec_util.merge_exec_data(
+                    exec_data, jacoco_exec_util.read_exec_file(os.path.join(raw_cov_data_dir, exec_file))[1])
+            except (OSError, ValueError) as e:
+                tkltest_status('Warning: skipping unreadable coverage data file {}: {}'.format(exec_file, e))
+                collected = False
+    shutil.rmtree(coverage_dir, ignore_errors=True)
+    return bool(collected)
+
+
+def __get_instruction_coverage(class_coverage, class_name):
+    """Computes the instruction coverage of a target class, with its nested classes, from the coverage counters
+    computed by probe_coverage_util.compute_class_coverage(). Returns None if the class was not analyzed.
+    """
+    internal_name = class_name.replace('.', '/')
+    covered, total = 0, 0
+    for name, counters in class_coverage.items():
+        if name == internal_name or name.startswith(internal_name + '$'):
+            covered += counters['instruction_covered']
+            total += counters['instruction_total']
+    return covered / total if total else None
+
+
+def __merge_evosuite_round_tests(round_test_dir, merged_test_dir, test_rounds, generation_round):
+    """Merges the evosuite tests of a plateau round into the tests of the earlier rounds.
+
+    The latest tests of a class keep the evosuite names, under which the test sequence extender loads their
+    scaffolding; an earlier test class X_ESTest (with its scaffolding X_ESTest_scaffolding) that is superseded is
+    renamed to X_round<r>_ESTest, where r is the round it was generated in, and its compiled classes are removed.
+
+    Args:
+        round_test_dir (str): directory of the evosuite tests of the round
+        merged_test_dir (str): directory of the evosuite tests of the earlier rounds
+        test_rounds (dict): round that each merged test file was generated in, updated in place
+        generation_round (int): the round
+    """
+    for dir, files in coverage_util.get_test_classes(round_test_dir).items():
+        merged_dir = os.path.join(merged_test_dir, os.path.relpath(dir, round_test_dir))
+        for file in files:
+            if not file.endswith('_ESTest.java'):
+                continue
+            test_file = os.path.join(merged_dir, file)
+            if not os.path.isfile(test_file):
+                continue
+            class_name = file[:-len('_ESTest.java')]
+            renamed_class_name = '{}_round{}'.format(class_name, test_rounds.get(test_file, generation_round - 1))
+            for suffix in ['_ESTest', '_ESTest_scaffolding']:
+                source_file = os.path.join(merged_dir, class_name + suffix + '.java')
+                if not os.path.isfile(source_file):
+                    continue
+                with open(source_file, encoding="utf8") as f:
+                    code = f.read()
+                code = re.sub(r'\b' + re.escape(class_name) + r'_ESTest(_scaffolding)?\b',
+                              renamed_class_name + r'_ESTest\1', code)
+                with open(os.path.join(merged_dir, renamed_class_name + suffix + '.java'), 'w',
+                          encoding="utf8") as f:
+                    f.write(code)
+                os.remove(source_file)
+                for class_file in [compiled_file for compiled_file in os.listdir(merged_dir)
+                                   if re.fullmatch(re.escape(class_name + suffix) + r"(\$.*)?\.class", compiled_file)]:
+                    os.remove(os.path.join(merged_dir, class_file))
+    shutil.copytree(round_test_dir, merged_test_dir, dirs_exist_ok=True)
+    for dir, files in coverage_util.get_test_classes(round_test_dir).items():
+        merged_dir = os.path.join(merged_test_dir, os.path.relpath(dir, round_test_dir))
+        for file in files:
+            test_rounds[os.path.join(merged_dir, file)] = generation_round
+
+
+def union_bb_test_sequences(bb_sequences, other_bb_sequences):
+    """Merges building-block test sequences generated for overlapping sets of target classes.
+
+    The sequences and imports of a target class are merged, without duplicates; for the other data of a target
+    class, the data in other_bb_sequences is taken.
+
+    Args:
+        bb_sequences (dict): building-block test sequences
+        other_bb_sequences (dict): building-block test sequences to merge into bb_sequences
+
+    Returns:
+        dict: the merged building-block test sequences
+    """
+    merged_sequences = dict(bb_sequences, test_sequences=dict(bb_sequences['test_sequences']))
+    for class_name, class_sequences in other_bb_sequences['test_sequences'].items():
+        if class_name not in merged_sequences['test_sequences']:
+            merged_sequences['test_sequences'][class_name] = class_sequences
+            continue
+        merged_class_sequences = dict(merged_sequences['test_sequences'][class_name])
+        for key, value in class_sequences.items():
+            if key in ('sequences', 'imports'):
+                merged_class_sequences[key] = list(dict.fromkeys(merged_class_sequences.get(key, []) + value))
+            else:
+                merged_class_sequences[key] = value
+        merged_sequences['test_sequences'][class_name] = merged_class_sequences
+    return merged_sequences
+
+
+def get_bb_sequences_method_coverage(class_name, class_plans, sequences):
+    """Computes the fraction of the target methods of a class that are called in building-block test sequences.
+
+    Methods are matched by name (constructors, by instantiations of the class), so that overloads of a method are
+    covered together.
+
+    Args:
+        class_name (str): target class
+        class_plans (dict): CTD models and test plans of the target methods of the class
+        sequences (list): building-block test sequences (as code) for the class
+
+    Returns:
+        float: the coverage
+    """
+    if not class_plans:
+        return 1.0
+    simple_class_name = class_name.split('.')[-1].split('$')[-1]
+    code = '\n'.join(sequences)
+    covered_methods = 0
+    for method, method_plans in class_plans.items():
+        signature = method_plans.get('formatted_signature', method) if isinstance(method_plans, dict) else method
+        method_name = re.split(r'[\s.]', signature.split('(')[0])[-1]
+        if method_name in ('<init>', simple_class_name):
+            call_pattern = r'\bnew\s+(?:[\w$]+\.)*' + re.escape(simple_class_name) + r'\s*[(<]'
+        else:
+            call_pattern = r'\.\s*' + re.escape(method_name) + r'\s*\('
+        if re.search(call_pattern, code):
+            covered_methods += 1
+    return covered_methods / len(class_plans)
+
+
+def __generate_tests_in_priority_batches(config, ctd_file, test_directory, class_time_limits, dev_test_coverage,
+                                         end_time, jdk_path, hard_end_time=None):
+    """Generates building-block and extended test sequences in priority batches of target classes until the
+    given end time.
+
+    Target classes are ordered by their expected coverage gain (their size weighted by the fraction of their
+    instructions not covered by the developer tests) and split into batches. Each batch goes through
+    building-block test generation and sequence extension before the next batch is scheduled. A batch is
+    truncated to the classes whose estimated generation time fits before the end time, and no batches are
+    scheduled after a truncated batch. Test generators and extenders still running at the hard end time are
+    terminated, and the JUnit tests of a batch whose extension was terminated are discarded. The building-block
+    sequences, evosuite tests, JUnit tests, and extender reports of the batches are then merged, as if they were
+    generated in a single run.
+
+    Args:
+        config (dict): loaded and validated config information
+        ctd_file (str): name of JSON file containing CTD models and test plans
+        test_directory (str): directory to write the extended JUnit tests to
+        class_time_limits (dict): time limit (in seconds) for each target class (None to use the time limit)
+        dev_test_coverage (dict): instruction coverage of the app classes by the developer tests
+        end_time (float): time by which the generation of the batches should be complete
+        jdk_path (str): path to Java VM
+        hard_end_time (float): time at which test generators and extenders are terminated (None for no limit)
+    """
+    app_name = config['general']['app_name']
+    monolith_app_path = config['general']['monolith_app_path']
+    app_classpath_file = config['general']['app_classpath_file']
+    verbose = config['general']['verbose']
+    time_limit = config['generate']['time_limit']
+    shards = config['generate']['ctd_amplified']['base_test_generator_shards']
+
+    with open(ctd_file, encoding="utf8") as f:
+        ctd_plans = json.load(f)
+    class_names = [class_name for partition_plans in ctd_plans['models_and_test_plans'].values()
+                   for class_name in partition_plans]
+    class_metrics = budget_util.get_class_metrics(incremental_util.get_app_class_files(monolith_app_path),
+                                                  class_names)
+    dev_test_coverage = dev_test_coverage or {}
+    class_weights = {class_name: budget_util.get_class_weight(metrics, dev_test_coverage.get(class_name, 0.0))
+                     for class_name, metrics in class_metrics.items()}
+    batch_time_limits = {class_name: max(time_limit, 0) for class_name in class_names}
+    if class_time_limits:
+        batch_time_limits.update(class_time_limits)
+
+    batch_ctd_file = app_name + constants.TKL_DEADLINE_BATCH_CTD_TEST_PLAN_FILE_SUFFIX
+    batch_dirs = []
+    generated_classes = 0
+    time_scale = 1.0
+    for batch in budget_util.get_priority_batches(class_weights, constants.DEADLINE_PRIORITY_BATCHES):
+        scheduled_batch = budget_util.fit_batch_to_time(batch, batch_time_limits, constants.DEADLINE_BATCH_OVERHEAD,
+                                                        shards, time_scale, end_time - time.time())
+        if not scheduled_batch:
+            break
+        batch_start_time = time.time()
+        batch_dir = os.path.abspath(app_name + constants.TKL_DEADLINE_BATCH_DIR_SUFFIX + str(len(batch_dirs)))
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        os.makedirs(os.path.join(batch_dir, 'bb'))
+        batch_dirs.append(batch_dir)
+        tkltest_status('Generating tests for priority batch {} with {} target classes'.format(
+            len(batch_dirs), len(scheduled_batch)))
+        with open(batch_ctd_file, 'w', encoding="utf8") as f:
+            json.dump(incremental_util.filter_ctd_models_and_test_plans(ctd_plans, scheduled_batch), f)
+
+        __remove_bb_test_sequences_files(app_name)
+        shutil.rmtree(app_name + constants.TKL_EVOSUITE_OUTDIR_SUFFIX, ignore_errors=True)
+        __generate_bb_test_sequences(config, batch_ctd_file, class_time_limits, jdk_path, hard_end_time)
+        bb_seq_files = [file for file in [f'{app_name}_{testgen}{constants.TKL_BB_SEQ_FILE_SUFFIX}'
+                                          for testgen in ['EvoSuiteTestGenerator', 'RandoopTestGenerator']]
+                        if os.path.isfile(file)]
+        batch_test_directory = os.path.join(batch_dir, os.path.basename(test_directory))
+        extended = False
+        if bb_seq_files:
+            extended = extend_sequences(app_name=app_name, monolith_app_path=monolith_app_path,
+                             app_classpath_file=app_classpath_file, ctd_file=batch_ctd_file,
+                             bb_seq_file=','.join(bb_seq_files), jdk_path=jdk_path,
+                             no_diff_assertions=config['generate']['no_diff_assertions'],
+                             no_ctd_coverage=config['generate']['ctd_amplified']['no_ctd_coverage'],
+                             interaction_level=config['generate']['ctd_amplified']['interaction_level'],
+                             bad_path=config['generate']['bad_path'],
+                             num_executions=config['generate']['ctd_amplified']['num_seq_executions'],
+                             test_directory=batch_test_directory,
+                             verbose=verbose, shards=config['generate']['ctd_amplified']['sequence_extender_shards'],
+                             jvm_profiles=config['generate']['jvm_profiles'], end_time=hard_end_time)
+        if not extended:
+            # discard the partial tests and reports of an extension terminated at the deadline
+            shutil.rmtree(batch_test_directory, ignore_errors=True)
+            for report_suffix in [constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX,
+                                  constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX,
+                                  constants.TKL_EXTENDER_SUMMARY_FILE_SUFFIX]:
+                if os.path.isfile(app_name + report_suffix):
+                    os.remove(app_name + report_suffix)
+
+        # set aside the outputs of the batch, to be merged with the outputs of the other batches
+        bb_outputs = bb_seq_files + [file for file in os.listdir('.') if file.startswith(app_name + '_')
+                                     and file.endswith('_output.log')]
+        if os.path.isdir(app_name + constants.TKL_EVOSUITE_OUTDIR_SUFFIX):
+            bb_outputs.append(app_name + constants.TKL_EVOSUITE_OUTDIR_SUFFIX)
+        for bb_output in bb_outputs:
+            shutil.move(bb_output, os.path.join(batch_dir, 'bb', bb_output))
+        for report_suffix in [constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX,
+                              constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX,
+                              constants.TKL_EXTENDER_SUMMARY_FILE_SUFFIX]:
+            if os.path.isfile(app_name + report_suffix):
+                shutil.move(app_name + report_suffix, os.path.join(batch_dir, app_name + report_suffix))
+
+        # calibrate the time estimates of the next batches on the time taken by this batch
+        estimated_time = constants.DEADLINE_BATCH_OVERHEAD + \
+            sum(batch_time_limits[class_name] for class_name in scheduled_batch) / shards
+        time_scale = max((time.time() - batch_start_time) / estimated_time, 0.1)
+        if extended:
+            generated_classes += len(scheduled_batch)
+        if len(scheduled_batch) < len(batch) or (hard_end_time is not None and time.time() >= hard_end_time):
+            break
+
+    if generated_classes < len(class_names):
+        tkltest_status('Generated tests for {} of {} target classes before the deadline; skipped the target classes '
+                       'with the least expected coverage gain'.format(generated_classes, len(class_names)))
+    __merge_bb_test_generator_shards([os.path.join(batch_dir, 'bb') for batch_dir in batch_dirs], batch_ctd_file)
+    shutil.rmtree(test_directory, ignore_errors=True)
+    os.makedirs(test_directory)
+    for batch_dir in batch_dirs:
+        batch_test_directory = os.path.join(batch_dir, os.path.basename(test_directory))
+        if os.path.isdir(batch_test_directory):
+            shutil.copytree(batch_test_directory, test_directory, dirs_exist_ok=True)
+    __merge_extender_shard_reports(app_name, batch_dirs)
+    for batch_dir in batch_dirs:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+    if os.path.isfile(batch_ctd_file):
+        os.remove(batch_ctd_file)
+
+
 def run_bb_test_generator(app_name, ctd_file, monolith_app_path, app_classpath_file, test_generator_name,
                           time_limit, jdk_path,
                           # partitions_file,
-                          verbose=False):
+                          verbose=False, shards=1, class_time_limits=None, jvm_profiles=None, end_time=None):
     """Generates building-block test sequences.
 
     Generates building-block tests sequences using evosuite, randoop, or both tools in combination. Performs
-    test generation by calling the Java component as a subprocess.
+    test generation by calling the Java component as a subprocess. If more than one shard is specified, the
+    target classes in the CTD test plans are split into shards. A Java component is run concurrently for each
+    shard and, in combined mode, for each of evosuite and randoop; the generated test sequences and evosuite
+    tests of the concurrent runs are then merged. If per-class time limits are specified, the target classes
+    with the same time limit are generated for in a separate run, with at most as many concurrent runs as shards
+    (times the number of test generators). Test generators still running at the end time (if given) are
+    terminated.
 
     Args:
         app_name (str): name of the app
@@ -394,35 +1170,42 @@ def run_bb_test_generator(app_name, ctd_file, monolith_app_path, app_classpath_f
         time_limit (int): time limit (in seconds) for evosuite/randoop test generation
         jdk_path (str): path to Java VM
         verbose (bool): run in verbose mode printing detailed status messages
+        shards (int): number of shards of target classes to generate test sequences for concurrently
+        class_time_limits (dict): time limit (in seconds) for each target class, overriding time_limit
+        jvm_profiles (dict): per-tool overrides of the JVM resource profiles
+        end_time (float): time at which the test generators are terminated (None for no limit)
     """
     tkltest_status('Generating basic block test sequences using '+test_generator_name)
 
+    # in combined mode, run the base test generators concurrently instead of one after the other in a single JVM
+    test_generators = [test_generator_name]
+    if test_generator_name == constants.COMBINED_TEST_GENERATOR_NAME:
+        test_generators = [constants.BASE_TEST_GENERATORS['evosuite'], constants.BASE_TEST_GENERATORS['randoop']]
+    if shards > 1 or len(test_generators) > 1 or class_time_limits:
+        with open(ctd_file, encoding="utf8") as f:
+            ctd_plans = json.load(f)
+        # with per-class time limits, the target classes of each time limit are generated for in separate runs
+        ctd_tiers = [(ctd_plans, time_limit)]
+        if class_time_limits:
+            ctd_tiers = split_ctd_models_and_test_plans_by_time_limit(ctd_plans, class_time_limits, time_limit)
+        ctd_shards = [(shard_plans, tier_time_limit) for tier_plans, tier_time_limit in ctd_tiers
+                      for shard_plans in split_ctd_models_and_test_plans(tier_plans, shards)]
+        if len(ctd_shards) == 1 and len(test_generators) == 1:
+            time_limit = ctd_shards[0][1]
+        elif ctd_shards:
+            __run_concurrent_bb_test_generators(app_name, ctd_file, ctd_shards, monolith_app_path,
+                                                app_classpath_file, test_generators, jdk_path, verbose,
+                                                max_workers=shards * len(test_generators), jvm_profiles=jvm_profiles,
+                                                end_time=end_time)
+            return
+
     # build the java command to be executed
-    tg_command = "\""+jdk_path+"\" -Xmx2048m -cp " + os.path.join(constants.TKLTEST_UNIT_CORE_JAR)+os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "randoop-"+constants.RANDOOP_VERSION+".jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "evosuite-standalone-runtime-"+constants.EVOSUITE_VERSION+".jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "evosuite-master-"+constants.EVOSUITE_VERSION+".jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-cli-1.4.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "soot-4.1.0.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-io-2.6.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "javaparser-core-3.16.1.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "javaparser-symbol-solver-core-3.16.1.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "guava-29.0-jre.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "failureaccess-1.0.1.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-databind-2.14.0-rc1.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-core-2.14.0-rc1.jar") + os.pathsep
-    tg_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-annotations-2.14.0-rc1.jar")
-    tg_command += " org.konveyor.tackle.testgen.core.TestSequenceInitializer"
-    tg_command += " -app " + app_name
-    tg_command += " -tp " + ctd_file
-    tg_command += " -pt " + os.pathsep.join(monolith_app_path)
-    tg_command += " -clpt " + app_classpath_file
-    tg_command += " -tg " + test_generator_name
-    tg_command += " -tl " + str(time_limit)
-    jdk_home = os.path.split(os.path.split(jdk_path)[0])[0]
-    if jdk_home:
-        # add double quotes for the case of spaces in the jdk path
-        tg_command += " -jdk \"" + jdk_home + "\""
+    resource_profile = jvm_util.get_resource_profile('bb_test_generator',
+                                                     jvm_util.get_app_class_count(monolith_app_path),
+                                                     jvm_profiles=jvm_profiles)
+    tg_command = __get_bb_test_generator_command(app_name, ctd_file, monolith_app_path, app_classpath_file,
+                                                 test_generator_name, time_limit, jdk_path,
+                                                 jvm_util.get_resource_args(resource_profile))
 
     # if partitions_file:
     #     tg_command += " -tm"
@@ -440,7 +1223,9 @@ def run_bb_test_generator(app_name, ctd_file, monolith_app_path, app_classpath_f
         # run command with verbose=false because, for the bb test generators, verbose option redirects
         # stdout to a file, so nothing should be printed on command line irrespective of the
         # value of verbose
-        command_util.run_command(command=tg_command, verbose=False)
+        command_util.run_command(command=tg_command, verbose=False, timeout=command_util.get_remaining_time(end_time))
+    except subprocess.TimeoutExpired:
+        tkltest_status('Generating basic block sequences did not complete before the deadline', error=True)
     except subprocess.CalledProcessError as e:
         tkltest_status('Generating basic block sequences failed: {}\n{}'.format(e, e.stderr), error=True)
         if 'Test generator failed to generate any tests' in e.stderr:
@@ -448,14 +1233,225 @@ def run_bb_test_generator(app_name, ctd_file, monolith_app_path, app_classpath_f
         sys.exit(1)
 
 
+def split_ctd_models_and_test_plans(ctd_plans, shards):
+    """Splits CTD models and test plans into shards of target classes.
+
+    Target classes are assigned to shards in decreasing order of their number of target methods, each class
+    to the shard with the fewest target methods so far, so that the shards take similar generation time.
+
+    Args:
+        ctd_plans (dict): CTD models and test plans
+        shards (int): maximum number of shards
+
+    Returns:
+        list: CTD models and test plans of each (non-empty) shard
+    """
+    targets = [(partition, class_name, class_plans)
+               for partition, partition_plans in ctd_plans['models_and_test_plans'].items()
+               for class_name, class_plans in partition_plans.items()]
+    targets.sort(key=lambda target: (-len(target[2]), target[1]))
+    shard_targets = [[] for _ in range(min(shards, len(targets)))]
+    shard_loads = [0] * len(shard_targets)
+    for target in targets:
+        shard = shard_loads.index(min(shard_loads))
+        shard_targets[shard].append(target)
+        shard_loads[shard] += max(len(target[2]), 1)
+
+    ctd_shards = []
+    for targets in shard_targets:
+        shard_plans = {key: value for key, value in ctd_plans.items() if key != 'models_and_test_plans'}
+        shard_plans['models_and_test_plans'] = {}
+        for partition, class_name, class_plans in targets:
+            shard_plans['models_and_test_plans'].setdefault(partition, {})[class_name] = class_plans
+        ctd_shards.append(shard_plans)
+    return ctd_shards
+
+
+def split_ctd_models_and_test_plans_by_time_limit(ctd_plans, class_time_limits, default_time_limit):
+    """Splits CTD models and test plans into tiers of target classes having the same time limit.
+
+    Args:
+        ctd_plans (dict): CTD models and test plans
+        class_time_limits (dict): time limit (in seconds) for each target class
+        default_time_limit (int): time limit for target classes without a time limit in class_time_limits
+
+    Returns:
+        list: (CTD models and test plans, time limit) pair of each tier, in decreasing order of time limit
+    """
+    tier_plans = {}
+    for partition, partition_plans in ctd_plans['models_and_test_plans'].items():
+        for class_name, class_plans in partition_plans.items():
+            time_limit = class_time_limits.get(class_name, default_time_limit)
+            if time_limit not in tier_plans:
+                tier_plans[time_limit] = {key: value for key, value in ctd_plans.items()
+                                          if key != 'models_and_test_plans'}
+                tier_plans[time_limit]['models_and_test_plans'] = {}
+            tier_plans[time_limit]['models_and_test_plans'].setdefault(partition, {})[class_name] = class_plans
+    return [(tier_plans[time_limit], time_limit) for time_limit in sorted(tier_plans, reverse=True)]
+
+
+def merge_bb_test_sequences(bb_seq_files, merged_bb_seq_file):
+    """Merges building-block test sequences files generated for disjoint sets of target classes.
+
+    Args:
+        bb_seq_files (list): building-block test sequences files to merge
+        merged_bb_seq_file (str): name of merged building-block test sequences file to create
+    """
+    merged_sequences = None
+    for bb_seq_file in bb_seq_files:
+        with open(bb_seq_file, encoding="utf8") as f:
+            bb_sequences = json.load(f)
+        if merged_sequences is None:
+            merged_sequences = bb_sequences
+        else:
+            merged_sequences['test_sequences'].update(bb_sequences['test_sequences'])
+    with open(merged_bb_seq_file, 'w', encoding="utf8") as f:
+        json.dump(merged_sequences, f, indent=2)
+
+
+def __run_concurrent_bb_test_generators(app_name, ctd_file, ctd_shards, monolith_app_path, app_classpath_file,
+                                        test_generators, jdk_path, verbose, max_workers, jvm_profiles=None,
+                                        end_time=None):
+    """Generates building-block test sequences by running each test generator for each shard concurrently.
+
+    Each shard is given as a (CTD models and test plans, time limit) pair. Each run is performed in its own
+    directory, so that the sequences files, evosuite/randoop output directories, and logs of the runs do not
+    clash; the outputs of the runs are then merged into the current directory. The number of concurrent runs
+    is further limited by the cores and memory of the machine (see jvm_util.get_resource_profile()). Runs still
+    going at the end time (if given) are terminated, and the outputs of the other runs are merged.
+    """
+    if len(ctd_shards) > 1:
+        tkltest_status('Splitting target classes into {} shards for basic block test sequence generation'.format(
+            len(ctd_shards)))
+    monolith_app_path = [os.path.abspath(path) for path in monolith_app_path]
+    app_classpath_file = os.path.abspath(app_classpath_file)
+    shard_runs = []
+    for shard_plans, time_limit in ctd_shards:
+        for test_generator in test_generators:
+            shard_dir = os.path.abspath(app_name + constants.TKL_BB_SHARD_DIR_SUFFIX + str(len(shard_runs)))
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            os.makedirs(shard_dir)
+            with open(os.path.join(shard_dir, ctd_file), 'w', encoding="utf8") as f:
+                json.dump(shard_plans, f)
+            shard_runs.append((shard_dir, test_generator, time_limit))
+    resource_profile = jvm_util.get_resource_profile('bb_test_generator',
+                                                     jvm_util.get_app_class_count(monolith_app_path),
+                                                     min(max_workers, len(shard_runs)), jvm_profiles)
+
+    def run_shard(shard_run):
+        shard_dir, test_generator, time_limit = shard_run
+        tg_command = __get_bb_test_generator_command(app_name, ctd_file, monolith_app_path, app_classpath_file,
+                                                     test_generator, time_limit, jdk_path,
+                                                     jvm_util.get_resource_args(resource_profile))
+        if verbose:
+            tg_command += ' 1> ' + app_name + "_" + test_generator + '_output.log'
+        logging.info(tg_command)
+        try:
+            command_util.run_command(command=tg_command, verbose=False, cwd=shard_dir,
+                                     timeout=command_util.get_remaining_time(end_time))
+        except subprocess.TimeoutExpired:
+            tkltest_status('Generating basic block sequences with {} did not complete before the deadline for shard '
+                           '{}'.format(test_generator, os.path.basename(shard_dir)), error=True)
+        except subprocess.CalledProcessError as e:
+            tkltest_status('Generating basic block sequences with {} failed for shard {}: {}\n{}'.format(
+                test_generator, os.path.basename(shard_dir), e, e.stderr), error=True)
+            return 'Test generator failed to generate any tests' in e.stderr
+        return True
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=resource_profile['workers']) as executor:
+        shard_results = list(executor.map(run_shard, shard_runs))
+    if not all(shard_results):
+        sys.exit(1)
+
+    if verbose:
+        for test_generator in test_generators:
+            tkltest_status("Test generator output will be written to {}".format(
+                app_name + "_" + test_generator + '_output.log'))
+    shard_dirs = [shard_dir for shard_dir, _, _ in shard_runs]
+    __merge_bb_test_generator_shards(shard_dirs, ctd_file)
+    for shard_dir in shard_dirs:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def __merge_bb_test_generator_shards(shard_dirs, ctd_file):
+    """Merges the outputs of building-block test generator shards into the current directory.
+
+    Sequences files are merged into a single sequences file per test generator, output directories (e.g.,
+    the evosuite tests directory) are merged into a single directory, and log files are concatenated.
+    """
+    bb_seq_files = {}
+    output_dirs = {}
+    log_files = {}
+    for shard_dir in shard_dirs:
+        for file in sorted(os.listdir(shard_dir)):
+            shard_file = os.path.join(shard_dir, file)
+            if file == ctd_file:
+                continue
+            if file.endswith(constants.TKL_BB_SEQ_FILE_SUFFIX):
+                bb_seq_files.setdefault(file, []).append(shard_file)
+            elif os.path.isdir(shard_file):
+                output_dirs.setdefault(file, []).append(shard_file)
+            elif file.endswith('.log'):
+                log_files.setdefault(file, []).append(shard_file)
+
+    for file, shard_files in bb_seq_files.items():
+        merge_bb_test_sequences(shard_files, file)
+    for dir, shard_output_dirs in output_dirs.items():
+        shutil.rmtree(dir, ignore_errors=True)
+        for shard_output_dir in shard_output_dirs:
+            shutil.copytree(shard_output_dir, dir, dirs_exist_ok=True)
+    for file, shard_files in log_files.items():
+        with open(file, 'wb') as merged_log:
+            for shard_file in shard_files:
+                with open(shard_file, 'rb') as shard_log:
+                    shutil.copyfileobj(shard_log, merged_log)
+
+
+def __get_bb_test_generator_command(app_name, ctd_file, monolith_app_path, app_classpath_file,
+                                    test_generator_name, time_limit, jdk_path, resource_args):
+    """Builds the java command for running the building-block test generator"""
+    classpath = [constants.TKLTEST_UNIT_CORE_JAR,
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "randoop-"+constants.RANDOOP_VERSION+".jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "evosuite-standalone-runtime-"+constants.EVOSUITE_VERSION+".jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "evosuite-master-"+constants.EVOSUITE_VERSION+".jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-cli-1.4.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "soot-4.1.0.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-io-2.6.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "javaparser-core-3.16.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "javaparser-symbol-solver-core-3.16.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "guava-29.0-jre.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "failureaccess-1.0.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-databind-2.14.0-rc1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-core-2.14.0-rc1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-annotations-2.14.0-rc1.jar")]
+    tg_command = "\""+jdk_path+"\" " + resource_args + " " + \
+                 jvm_util.get_jvm_launch_args(jdk_path, 'TestSequenceInitializer', classpath)
+    tg_command += " org.konveyor.tackle.testgen.core.TestSequenceInitializer"
+    tg_command += " -app " + app_name
+    tg_command += " -tp " + ctd_file
+    tg_command += " -pt " + os.pathsep.join(monolith_app_path)
+    tg_command += " -clpt " + app_classpath_file
+    tg_command += " -tg " + test_generator_name
+    tg_command += " -tl " + str(time_limit)
+    jdk_home = os.path.split(os.path.split(jdk_path)[0])[0]
+    if jdk_home:
+        # add double quotes for the case of spaces in the jdk path
+        tg_command += " -jdk \"" + jdk_home + "\""
+    return tg_command
+
+
 def extend_sequences(app_name, monolith_app_path, app_classpath_file, ctd_file, bb_seq_file, jdk_path,
                      no_diff_assertions, no_ctd_coverage, interaction_level,
                      # jee_support,
-                     bad_path, num_executions, test_directory, verbose=False):
+                     bad_path, num_executions, test_directory, verbose=False, shards=1, jvm_profiles=None,
+                     end_time=None):
     """Generates the final CTD-guided test cases.
 
     Generates extended test sequences for covering the CTD test plan rows that are written as JUnit
-    classes in the specified test directory.
+    classes in the specified test directory. If more than one shard is specified, the target classes in
+    the CTD test plans are split into shards, an extender is run concurrently for each shard, and the JUnit
+    classes and reports generated for the shards are merged. Extenders still running at the end time (if given)
+    are terminated.
 
     Args:
         app_name (str): name of the app
@@ -470,38 +1466,178 @@ def extend_sequences(app_name, monolith_app_path, app_classpath_file, ctd_file,
         num_executions (int): number of executions to perform to determine pass/fail status of generated sequences
         test_directory (str): name of root test directory to write JUnit test classes to
         verbose (bool): run in verbose mode printing detailed status messages
+        shards (int): number of shards of target classes to extend sequences for concurrently
+        jvm_profiles (dict): per-tool overrides of the JVM resource profiles
+        end_time (float): time at which the extenders are terminated (None for no limit)
+
+    Returns:
+        bool: whether the extension completed (False if the extenders were terminated at the end time)
     """
     tkltest_status('Extending sequences to reach coverage goals and generating junit tests')
 
-    te_command = "\"" + jdk_path + "\""
-    te_command += " -Xmx2048m -Xbootclasspath/a:"+constants.TKLTEST_LIB_DOWNLOAD_DIR+os.sep+"replacecall-"+constants.RANDOOP_REPLACECALL_VERSION+\
+    if shards > 1:
+        with open(ctd_file, encoding="utf8") as f:
+            ctd_shards = split_ctd_models_and_test_plans(json.load(f), shards)
+        if len(ctd_shards) > 1:
+            return __run_sharded_extender(app_name, monolith_app_path, app_classpath_file, ctd_file, ctd_shards,
+                                          bb_seq_file, jdk_path, no_diff_assertions, no_ctd_coverage,
+                                          interaction_level, bad_path, num_executions, test_directory, verbose,
+                                          jvm_profiles, end_time)
+
+    resource_profile = jvm_util.get_resource_profile('sequence_extender',
+                                                     jvm_util.get_app_class_count(monolith_app_path),
+                                                     jvm_profiles=jvm_profiles)
+    te_command = __get_extender_command(app_name, monolith_app_path, app_classpath_file, ctd_file, bb_seq_file,
+                                        jdk_path, no_diff_assertions, no_ctd_coverage, interaction_level, bad_path,
+                                        num_executions, test_directory, jvm_util.get_resource_args(resource_profile))
+
+    logging.info(te_command)
+
+    coverage_file_name = app_name+constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX
+
+    # remove existing coverage file - its presence will signal completion of extender
+    if os.path.exists(coverage_file_name):
+        os.remove(coverage_file_name)
+
+    if not __run_extender(te_command, coverage_file_name, verbose, end_time=end_time):
+        if command_util.get_remaining_time(end_time) == 0:
+            return False
+        sys.exit(1)
+    return True
+
+
+def merge_extender_reports(report_files, merged_report_file):
+    """Merges JSON reports created by the extender for disjoint sets of target classes.
+
+    Merges the test plan coverage, CTD coverage, or test generation summary reports created by extender shards.
+    Objects are merged recursively, lists are concatenated, and numbers are added up, except for times, for
+    which the maximum is taken (as the shards run concurrently).
+
+    Args:
+        report_files (list): JSON report files to merge
+        merged_report_file (str): name of merged JSON report file to create
+    """
+    merged_report = None
+    for report_file in report_files:
+        with open(report_file, encoding="utf8") as f:
+            report = json.load(f)
+        merged_report = report if merged_report is None else __merge_json_values(merged_report, report, '')
+    with open(merged_report_file, 'w', encoding="utf8") as f:
+        json.dump(merged_report, f, indent=2)
+
+
+def __merge_json_values(value, other_value, key):
+    if isinstance(value, dict) and isinstance(other_value, dict):
+        merged = dict(value)
+        for other_key, other_key_value in other_value.items():
+            merged[other_key] = __merge_json_values(merged[other_key], other_key_value, other_key) \
+                if other_key in merged else other_key_value
+        return merged
+    if isinstance(value, list) and isinstance(other_value, list):
+        return value + other_value
+    if isinstance(value, (int, float)) and isinstance(other_value, (int, float)) and \
+            not isinstance(value, bool) and not isinstance(other_value, bool):
+        return max(value, other_value) if 'time' in key.lower() else value + other_value
+    return value
+
+
+def __run_sharded_extender(app_name, monolith_app_path, app_classpath_file, ctd_file, ctd_shards, bb_seq_file,
+                           jdk_path, no_diff_assertions, no_ctd_coverage, interaction_level, bad_path,
+                           num_executions, test_directory, verbose, jvm_profiles=None, end_time=None):
+    """Generates the final CTD-guided test cases by running an extender for each shard concurrently.
+
+    Each extender is run in its own directory, with its own test directory, so that the JUnit classes and
+    reports of the shards do not clash; the shard outputs are then merged into the current directory. The
+    number of concurrent extenders is limited by the cores and memory of the machine. Returns whether all
+    extenders completed before the end time (if given).
+    """
+    tkltest_status('Splitting target classes into {} shards for extending sequences'.format(len(ctd_shards)))
+    monolith_app_path = [os.path.abspath(path) for path in monolith_app_path]
+    bb_seq_file = ','.join(os.path.abspath(file) for file in bb_seq_file.split(','))
+    coverage_file_name = app_name + constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX
+    shard_dirs = []
+    for shard, shard_plans in enumerate(ctd_shards):
+        shard_dir = os.path.abspath(app_name + constants.TKL_EXTENDER_SHARD_DIR_SUFFIX + str(shard))
+        shutil.rmtree(shard_dir, ignore_errors=True)
+        os.makedirs(shard_dir)
+        with open(os.path.join(shard_dir, ctd_file), 'w', encoding="utf8") as f:
+            json.dump(shard_plans, f)
+        shard_dirs.append(shard_dir)
+    resource_profile = jvm_util.get_resource_profile('sequence_extender',
+                                                     jvm_util.get_app_class_count(monolith_app_path),
+                                                     len(shard_dirs), jvm_profiles)
+
+    def run_shard(shard_dir):
+        te_command = __get_extender_command(app_name, monolith_app_path, app_classpath_file, ctd_file, bb_seq_file,
+                                            jdk_path, no_diff_assertions, no_ctd_coverage, interaction_level,
+                                            bad_path, num_executions,
+                                            os.path.join(shard_dir, os.path.basename(test_directory)),
+                                            jvm_util.get_resource_args(resource_profile))
+        logging.info(te_command)
+        return __run_extender(te_command, coverage_file_name, verbose, cwd=shard_dir, end_time=end_time)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=resource_profile['workers']) as executor:
+        shard_results = list(executor.map(run_shard, shard_dirs))
+    if not all(shard_results):
+        if command_util.get_remaining_time(end_time) == 0:
+            for shard_dir in shard_dirs:
+                shutil.rmtree(shard_dir, ignore_errors=True)
+            return False
+        sys.exit(1)
+
+    os.makedirs(test_directory, exist_ok=True)
+    for shard_dir in shard_dirs:
+        shard_test_directory = os.path.join(shard_dir, os.path.basename(test_directory))
+        if os.path.isdir(shard_test_directory):
+            shutil.copytree(shard_test_directory, test_directory, dirs_exist_ok=True)
+    __merge_extender_shard_reports(app_name, shard_dirs)
+    for shard_dir in shard_dirs:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    return True
+
+
+def __merge_extender_shard_reports(app_name, shard_dirs):
+    """Merges the reports created by extenders run in the given directories into the current directory"""
+    for report_suffix in [constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX, constants.TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX,
+                          constants.TKL_EXTENDER_SUMMARY_FILE_SUFFIX]:
+        report_files = [os.path.join(shard_dir, app_name + report_suffix) for shard_dir in shard_dirs
+                        if os.path.isfile(os.path.join(shard_dir, app_name + report_suffix))]
+        if report_files:
+            merge_extender_reports(report_files, app_name + report_suffix)
+
+
+def __get_extender_command(app_name, monolith_app_path, app_classpath_file, ctd_file, bb_seq_file, jdk_path,
+                           no_diff_assertions, no_ctd_coverage, interaction_level, bad_path, num_executions,
+                           test_directory, resource_args):
+    """Builds the java command for running the test sequence extender"""
+    te_command = "\"" + jdk_path + "\" " + resource_args
+    te_command += " -Xbootclasspath/a:"+constants.TKLTEST_LIB_DOWNLOAD_DIR+os.sep+"replacecall-"+constants.RANDOOP_REPLACECALL_VERSION+\
                   ".jar -javaagent:"+constants.TKLTEST_LIB_DOWNLOAD_DIR+os.sep+"replacecall-"+constants.RANDOOP_REPLACECALL_VERSION+".jar"
-    te_command += " -cp \"" + os.path.join(constants.TKLTEST_UNIT_CORE_JAR) + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "randoop-"+constants.RANDOOP_VERSION+".jar") + os.pathsep
-    te_command += os.path.abspath(app_name+constants.TKL_EVOSUITE_OUTDIR_SUFFIX) + os.pathsep
-    # if jee_support:
-    #     te_command += os.path.join(constants.TKLTEST_LIB_DIR,
-    #                                "evosuite-standalone-runtime-"+constants.EVOSUITE_VERSION+"-SNAPSHOT.jar") + os.pathsep
-    #     te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "junit-4.13.1.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DIR, "ccmcl.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-databind-2.14.0-rc1.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-core-2.14.0-rc1.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-annotations-2.14.0-rc1.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-cli-1.4.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-io-2.6.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "javaparser-core-3.16.1.jar") + os.pathsep
-    te_command += os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR,
-                               "javaparser-symbol-solver-core-3.16.1.jar") + os.pathsep
+    classpath = [constants.TKLTEST_UNIT_CORE_JAR,
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "randoop-"+constants.RANDOOP_VERSION+".jar"),
+                 os.path.abspath(app_name+constants.TKL_EVOSUITE_OUTDIR_SUFFIX),
+                 # if jee_support:
+                 #     os.path.join(constants.TKLTEST_LIB_DIR,
+                 #                  "evosuite-standalone-runtime-"+constants.EVOSUITE_VERSION+"-SNAPSHOT.jar"),
+                 #     os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "junit-4.13.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DIR, "ccmcl.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-databind-2.14.0-rc1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-core-2.14.0-rc1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "jackson-annotations-2.14.0-rc1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-cli-1.4.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "commons-io-2.6.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "javaparser-core-3.16.1.jar"),
+                 os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "javaparser-symbol-solver-core-3.16.1.jar")]
 
     with open(app_classpath_file) as file:
         for line in file:
             if line.endswith('\n'):
                 # remove new line from line
-                te_command += os.path.abspath(line[:-1]) + os.pathsep
+                classpath.append(os.path.abspath(line[:-1]))
             else:
-                te_command += os.path.abspath(line) + os.pathsep
-    te_command += os.pathsep.join(monolith_app_path)
-    te_command += "\"" # end of "-cp"
+                classpath.append(os.path.abspath(line))
+    classpath += monolith_app_path
+    te_command += " " + jvm_util.get_jvm_launch_args(jdk_path, 'TestSequenceExtender', classpath)
     te_command += " org.konveyor.tackle.testgen.core.extender.TestSequenceExtender"
     te_command += " -app " + app_name
     te_command += " -tp " + ctd_file
@@ -517,49 +1653,85 @@ def extend_sequences(app_name, monolith_app_path, app_classpath_file, ctd_file,
     if not no_ctd_coverage:
         te_command += " -oc " + str(interaction_level)
     te_command += " -ne " + str(num_executions)
+    return te_command
 
-    logging.info(te_command)
-
-    coverage_file_name = app_name+constants.TKL_EXTENDER_COVERAGE_FILE_SUFFIX
-
-    # remove existing coverage file - its presence will signal completion of extender
-    if os.path.exists(coverage_file_name):
-        os.remove(coverage_file_name)
-
-    global proc, thread_error
-    proc=None
-    thread_error = False
-
-    thread = Thread(target=extender_timeout, args=[te_command, coverage_file_name, verbose])
-    thread.start()
-    thread.join(constants.EXTENDER_INITIAL_TIMEOUT)
-    while (not os.path.exists(coverage_file_name)) and thread.is_alive() and not thread_error:
-        thread.join(constants.EXTENDER_REPEATED_TIMEOUT)
 
-    if thread_error:
-        sys.exit(1)
-
-    if proc.poll() is None:
-        tkltest_status('Extender process has not terminated despite its completion, forcibly terminating it\n')
-        proc.kill()
+def __run_extender(te_command, coverage_file_name, verbose, cwd=None, end_time=None):
+    """Runs the extender and waits for it to complete.
 
+    The extender is complete when its process exits or when it has written its coverage file; the process might
+    not exit after completion (due to lingering non-daemon threads of the app under test), in which case it is
+    terminated after a short grace period. Progress is reported periodically while waiting for completion. An
+    extender that has not completed by the end time (if given) is terminated, and its run fails.
 
-def extender_timeout(command, coverage_file_name, verbose):
-    global proc, thread_error
-    proc = command_util.start_command(command, verbose=verbose)
-    output, error = proc.communicate()
+    Args:
+        te_command (str): extender command
+        coverage_file_name (str): name of the coverage file created by the extender
+        verbose (bool): run in verbose mode printing detailed status messages
+        cwd (str): directory to run the extender in (default: current directory)
+        end_time (float): time at which the extender is terminated (None for no limit)
 
+    Returns:
+        bool: whether the extender completed successfully
+    """
+    coverage_file = os.path.join(cwd, coverage_file_name) if cwd else coverage_file_name
+    ext_proc = command_util.start_command(te_command, verbose=verbose, cwd=cwd)
+    # drain stderr concurrently, so that the extender does not block on a full pipe
+    error_lines = []
+    error_reader = Thread(target=lambda: error_lines.extend(ext_proc.stderr), daemon=True)
+    error_reader.start()
+
+    start_time = last_progress_time = time.time()
+    completed = False
+    timed_out = False
+    while not completed:
+        try:
+            ext_proc.wait(timeout=constants.EXTENDER_COMPLETION_POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            completed = __is_extender_coverage_file_complete(coverage_file)
+        if not completed and command_util.get_remaining_time(end_time) == 0:
+            tkltest_status('Extending sequences did not complete before the deadline, terminating the extender\n',
+                           error=True)
+            ext_proc.kill()
+            ext_proc.wait()
+            timed_out = True
+            break
+        if time.time() - last_progress_time >= constants.EXTENDER_PROGRESS_INTERVAL:
+            last_progress_time = time.time()
+            tkltest_status('Extending sequences{}: {} seconds elapsed'.format(
+                ' for ' + os.path.basename(cwd) if cwd else '', round(last_progress_time - start_time)))
+
+    if completed:
+        try:
+            ext_proc.wait(timeout=constants.EXTENDER_EXIT_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            tkltest_status('Extender process has not terminated despite its completion, forcibly terminating it\n')
+            ext_proc.kill()
+            ext_proc.wait()
+    error_reader.join(constants.EXTENDER_EXIT_GRACE_PERIOD)
+    logging.info('Extender completed in {} seconds with return code {}'.format(
+        round(time.time() - start_time, 2), ext_proc.returncode))
+
+    if timed_out:
+        return False
     # return code might not be zero when the extender completed but some threads are still running,
     # hence if coverage file exists we treat the run as succeeded regardless of the return code
-    if os.path.exists(coverage_file_name):
-        return
+    if os.path.exists(coverage_file):
+        return True
+    tkltest_status('Extending sequences and generating JUnit tests failed with return code {}: {}\n'.
+                   format(ext_proc.returncode, ''.join(error_lines)), error=True)
+    return False
 
-    if proc.returncode != 0:
-        tkltest_status('Extending sequences and generating JUnit tests failed with return code {}: {}\n'.
-                               format(proc.returncode, error), error=True)
-        thread_error = True
-        # sys.exit will cause only the thread to exit, hence we need thread_error to signal to main process
-        sys.exit(1)
+
+def __is_extender_coverage_file_complete(coverage_file):
+    """Checks whether the extender coverage file exists and has been completely written"""
+    try:
+        with open(coverage_file, encoding="utf8") as f:
+            json.load(f)
+    except (OSError, ValueError):
+        return False
+    return True
 
 
 def generate_ctd_coverage(ctd_report_file_abs, ctd_model_file_abs, report_output_dir):
@@ -604,18 +1776,21 @@ def exclude_classes_covered_by_dev_test(config, output_dir):
     '''
     exclude classes that are already covered by the developer test suite.
     first running the user test suite and the jacoco cli to get the coverage of the developer test suite
-    than add to the excluded_class_list all the classes that already covered
+    than add to the excluded_class_list all the classes that already covered.
+    returns the instruction coverage (a fraction) of each app class by the developer test suite, or an empty
+    dict if the coverage was not computed
     '''
     if not config['generate']['app_build_files']:
-        return
+        return {}
     if config['dev_tests']['coverage_threshold'] >= 100:
-        return
+        return {}
     dev_coverage_xml, dev_coverage_html, dev_coverage_csv = coverage_util.get_dev_test_coverage(config, output_dir, create_csv=True)
     # read the csv file
     if not os.path.isfile(dev_coverage_csv):
         tkltest_status('Warning: Failed to obtain dev-tests coverage, generating tests for all classes')
-        return
+        return {}
     covered_classes = []
+    class_coverage = {}
     with open(dev_coverage_csv, newline='') as f:
         coverage_info = csv.DictReader(f)
         for row in coverage_info:
@@ -623,11 +1798,14 @@ def exclude_classes_covered_by_dev_test(config, output_dir):
             inst_covered = int(row['INSTRUCTION_COVERED'])
             inst_missed = int(row['INSTRUCTION_MISSED'])
             total_inst = inst_missed + inst_covered
+            if total_inst:
+                class_coverage[class_name] = inst_covered / total_inst
             if not total_inst or inst_covered*100/total_inst > config['dev_tests']['coverage_threshold']:
                 covered_classes.append(class_name)
     config['generate']['excluded_class_list'] += covered_classes
     if covered_classes:
         tkltest_status('The following classes are already covered by developer test suite \n{}.'.format(covered_classes))
+    return class_coverage
 
 
 if __name__ == '__main__':  # pragma: no cover
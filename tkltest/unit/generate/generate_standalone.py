@@ -14,24 +14,45 @@
 # limitations under the License.
 # ***************************************************************************
 
+import concurrent.futures
+import csv
 import logging
 import os
+import re
 import shutil
 import subprocess
 import sys
 import json
 
-from tkltest.util import constants, command_util
-from tkltest.unit.util import build_util, dir_util
+from tkltest.util import constants, command_util, jvm_util
+from tkltest.unit.util import build_util, coverage_util, dir_util
 from tkltest.util.logging_util import tkltest_status
 
+# declaration of a test method, debug statement of Randoop test methods (which names the test method), declaration
+# of a local variable, and identifier
+__TEST_METHOD_DECLARATION_PATTERN = re.compile(r'\bvoid\s+\w+\s*\([^)]*\)[^{]*\{')
+__RANDOOP_DEBUG_STATEMENT_PATTERN = re.compile(r'if\s*\(\s*debug\s*\)\s*System\.out\.format\([^;]*\);')
+__LOCAL_VARIABLE_DECLARATION_PATTERN = re.compile(r'[\w$.]+(?:<[^=;]*>)?(?:\[\])*\s+([A-Za-z_$][\w$]*)\s*=(?!=)')
+__IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_$][\w$]*')
+
+# test suite class of the test classes with a base name, as generated by Randoop
+__RANDOOP_TEST_SUITE_TEMPLATE = """import org.junit.runner.RunWith;
+import org.junit.runners.Suite;
+
+@RunWith(Suite.class)
+@Suite.SuiteClasses({{ {} }})
+public class {} {{
+}}
+"""
+
 
 def generate_evosuite(config, output_dir):
     """Generates test cases using evosuite.
 
     Generates test cases using the EvoSuite test generator standalone. The generated tests are stored in the
     specified test directory or by default in <app-name>-evosuite-standalone-tests. The structure of the directory
-    is created by EvoSuite.
+    is created by EvoSuite. With more than one worker, the target classes are dispatched to a pool of concurrent
+    EvoSuite processes, one per class (see __run_evosuite_worker_pool()).
 
     Args:
         config (dict): loaded and validated config information
@@ -51,20 +72,39 @@ def generate_evosuite(config, output_dir):
     if target_folder:
         evosuite_command += os.pathsep + app_copy_folder + os.sep
     evosuite_command += "\"" #end of -cp
-    evosuite_command += " -jar " + os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "evosuite-master-"+constants.EVOSUITE_VERSION+".jar")
-    if target_folder:
-        evosuite_command += " -target " + target_folder
-    else:
-        evosuite_command += " -target " + app_copy_folder
+    evosuite_master_jar = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, "evosuite-master-"+constants.EVOSUITE_VERSION+".jar")
+    workers = config['generate']['evosuite']['workers']
+    # the heap size of the client process generating the tests is set for worker pools, which would otherwise run
+    # clients with the default heap size of evosuite, and if a heap size is configured
+    set_client_heap = workers > 1 or bool(config['generate']['jvm_profiles'].get('evosuite', {}).get('max_heap'))
+    resource_profile = jvm_util.get_resource_profile('evosuite',
+                                                     jvm_util.get_app_class_count(config['general']['monolith_app_path']),
+                                                     workers, config['generate']['jvm_profiles'],
+                                                     heaps_per_run=2 if set_client_heap else 1)
+    evosuite_command += " " + jvm_util.get_resource_args(resource_profile)
+    client_heap = resource_profile['max_heap'] if set_client_heap else None
 
     evosuite_flags, evosuite_output_dir = __get_evosuite_flags(config)
-    evosuite_command += evosuite_flags
-    logging.info(evosuite_command)
-    try:
-        command_util.run_command(command=evosuite_command, verbose=config['general']['verbose'])
-    except subprocess.CalledProcessError as e:
-        tkltest_status('Generating test suite using Evosuite failed: {}\n{}'.format(e, e.stderr), error=True)
-        sys.exit(1)
+    failed_classes = 0
+    if workers > 1:
+        project_classpath = [target_folder] if target_folder else []
+        project_classpath += [app_copy_folder] + classpath.split(os.pathsep)
+        failed_classes = __run_evosuite_worker_pool(config, evosuite_command, evosuite_master_jar, client_heap,
+                                                    target_folder or app_copy_folder, project_classpath,
+                                                    evosuite_output_dir, resource_profile['workers'])
+    else:
+        evosuite_command += __get_evosuite_master_args(evosuite_master_jar, client_heap)
+        if target_folder:
+            evosuite_command += " -target " + target_folder
+        else:
+            evosuite_command += " -target " + app_copy_folder
+        evosuite_command += evosuite_flags
+        logging.info(evosuite_command)
+        try:
+            command_util.run_command(command=evosuite_command, verbose=config['general']['verbose'])
+        except subprocess.CalledProcessError as e:
+            tkltest_status('Generating test suite using Evosuite failed: {}\n{}'.format(e, e.stderr), error=True)
+            sys.exit(1)
     tkltest_status('Generated Evosuite test suite written to {}'.format(evosuite_output_dir))
 
     if config['general']['reports_path']:
@@ -89,6 +129,9 @@ def generate_evosuite(config, output_dir):
     build_util.integrate_tests_into_app_build_file(config['generate']['app_build_files'],
                                                    config['general']['build_type'],
                                                    [evosuite_output_dir])
+    # the tests of the classes generated for are kept, but a failure for any class fails the command
+    if failed_classes:
+        sys.exit(1)
 
 
 def generate_randoop(config, output_dir):
@@ -96,7 +139,8 @@ def generate_randoop(config, output_dir):
 
     Generates test cases using the Randoop test generator standalone. The generated tests are stored in the
     specified test directory or by default in <app-name>-randoop-standalone-tests. The structure of the directory
-    and test classes is created by Randoop.
+    and test classes is created by Randoop. With more than one shard, concurrent Randoop processes with distinct
+    random seeds generate tests, whose test classes are then merged (see __run_randoop_shards()).
 
     Args:
         config (dict): loaded and validated config information
@@ -114,37 +158,47 @@ def generate_randoop(config, output_dir):
     classpath = __get_classpath(config)
     classpath += os.pathsep + os.pathsep.join(monolith_app_path)
     classpath += os.pathsep + os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, 'randoop-'+constants.RANDOOP_VERSION+'.jar')
-    randoop_command = "\"" + os.path.join(config['general']['java_jdk_home'], "bin", "java") + "\" -classpath \"" + \
-                      classpath + "\""
+    java_path = os.path.join(config['general']['java_jdk_home'], "bin", "java")
+    shards = config['generate']['randoop']['shards']
+    resource_profile = jvm_util.get_resource_profile('randoop', jvm_util.get_app_class_count(monolith_app_path),
+                                                     shards, config['generate']['jvm_profiles'])
+    randoop_command = "\"" + java_path + "\" " + jvm_util.get_resource_args(resource_profile)
+    randoop_command += " " + jvm_util.get_classpath_args(java_path, classpath.split(os.pathsep))
     if 'test_directory' not in config['general'].keys() or \
             config['general']['test_directory'] == '':
         randoop_output_dir = app_name+constants.TKLTEST_DEFAULT_RANDOOP_TEST_DIR_SUFFIX
     else:
         randoop_output_dir = config['general']['test_directory']
 
-    randoop_command += " randoop.main.Main gentests --junit-output-dir=" + randoop_output_dir
+    randoop_command += " randoop.main.Main gentests"
     # if config['generate']['partitions_file']:
     #     randoop_command += " --classlist=" + __generate_class_list_file(__parse_partitions_file(config['generate']['partitions_file']),
     #                                                                     config['general']['app_name'],
     #                                                                     config['generate']['excluded_class_list'])
     # elif
     if config['generate']['target_class_list']:
-        randoop_command += " --classlist=" + __generate_class_list_file(config['generate']['target_class_list'],
-                                                                        config['general']['app_name'],
-                                                                        config['generate']['excluded_class_list'])
+        class_list_file = __generate_class_list_file(config['generate']['target_class_list'],
+                                                     config['general']['app_name'],
+                                                     config['generate']['excluded_class_list'])
     else:
-        randoop_command += " --classlist=" + __generate_class_list_all_app(monolith_app_path,
-                                                                           config['general']['app_name'],
-                                                                           config['generate']['excluded_class_list'])
+        class_list_file = __generate_class_list_all_app(monolith_app_path,
+                                                        config['general']['app_name'],
+                                                        config['generate']['excluded_class_list'])
     if 'max_memory' in config['generate']['randoop'].keys():
         randoop_command += " --jvm-max-memory="+config['generate']['randoop']['max_memory']+"mb"
-    randoop_command += __get_randoop_flags(config, time_limit)
-    logging.info(randoop_command)
-    try:
-        command_util.run_command(command=randoop_command, verbose=config['general']['verbose'])
-    except subprocess.CalledProcessError as e:
-        tkltest_status('Generating test suite using Randoop failed: {}\n{}'.format(e, e.stderr), error=True)
-        sys.exit(1)
+    if shards > 1:
+        __run_randoop_shards(config, randoop_command, class_list_file, randoop_output_dir, shards,
+                             resource_profile['workers'])
+    else:
+        randoop_command += " --junit-output-dir=" + randoop_output_dir
+        randoop_command += " --classlist=" + class_list_file
+        randoop_command += __get_randoop_flags(config, time_limit)
+        logging.info(randoop_command)
+        try:
+            command_util.run_command(command=randoop_command, verbose=config['general']['verbose'])
+        except subprocess.CalledProcessError as e:
+            tkltest_status('Generating test suite using Randoop failed: {}\n{}'.format(e, e.stderr), error=True)
+            sys.exit(1)
     tkltest_status('Generated Randoop test suite written to {}'.format(randoop_output_dir))
 
     # generate a build file
@@ -166,45 +220,313 @@ def generate_randoop(config, output_dir):
                                                    [randoop_output_dir])
 
 
-def __arrange_folders_for_evosuite(paths_list,  config):
-    # first copy the app to a new folder containing all the files.
-    copy_dir_name = 'evosuite-app-copy'
-    shutil.rmtree(copy_dir_name, ignore_errors=True)
-    for p in paths_list:
-        shutil.copytree(p, copy_dir_name)
+def __run_randoop_shards(config, randoop_command, class_list_file, randoop_output_dir, shards, workers):
+    """Generates test cases using concurrent Randoop processes (shards) with distinct random seeds.
+
+    In partition mode, each shard generates tests for a partition of the target classes; in seeds mode, each shard
+    generates tests for all target classes. Each shard runs in its own working directory, with its own JUnit output
+    directory and the same time limit as a single Randoop run; the test classes of the shards are then merged into
+    the test directory, without structurally identical test methods (see merge_randoop_tests()).
+
+    Args:
+        config (dict): loaded and validated config information
+        randoop_command (str): Randoop command without the class list, output directory, seed, and flags
+        class_list_file (str): file containing the names of the target classes
+        randoop_output_dir (str): test directory to merge the generated tests into
+        shards (int): number of Randoop processes
+        workers (int): number of concurrent Randoop processes
+    """
+    app_name = config['general']['app_name']
+    partition_classes = config['generate']['randoop']['shard_mode'] == 'partition'
+    with open(class_list_file) as f:
+        class_list = f.read().split()
+    if partition_classes:
+        shards = max(1, min(shards, len(class_list)))
+    tkltest_status('Generating test cases with {} Randoop shards, {} at a time'.format(shards, min(shards, workers)))
+
+    def run_shard(shard):
+        shard_dir = os.path.abspath(app_name + constants.TKL_RANDOOP_SHARD_DIR_SUFFIX + str(shard))
+        shutil.rmtree(shard_dir, ignore_errors=True)
+        os.makedirs(shard_dir)
+        shard_class_list_file = os.path.join(shard_dir, 'classlist.txt')
+        with open(shard_class_list_file, 'w') as f:
+            f.write('\n'.join(class_list[shard::shards] if partition_classes else class_list))
+        shard_command = randoop_command + " --junit-output-dir=" + os.path.join(shard_dir, 'tests')
+        shard_command += " --classlist=" + shard_class_list_file
+        shard_command += " --randomseed=" + str(shard)
+        shard_command += __get_randoop_flags(config, config['generate']['time_limit'])
+        logging.info(shard_command)
+        try:
+            command_util.run_command(command=shard_command, verbose=False, cwd=shard_dir)
+        except subprocess.CalledProcessError as e:
+            tkltest_status('Generating tests using Randoop failed for shard {}: {}\n{}'.format(shard, e, e.stderr),
+                           error=True)
+            return None
+        return shard_dir
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        shard_dirs = list(executor.map(run_shard, range(shards)))
+    if not any(shard_dirs):
+        sys.exit(1)
+
+    shard_dirs = [shard_dir for shard_dir in shard_dirs if shard_dir]
+    kept_count, removed_count = merge_randoop_tests([os.path.join(shard_dir, 'tests') for shard_dir in shard_dirs],
+                                                    randoop_output_dir)
+    tkltest_status('Merged {} test methods of the Randoop shards; removed {} structurally identical test methods'.format(
+        kept_count, removed_count))
+    for shard_dir in shard_dirs:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def merge_randoop_tests(shard_test_dirs, merged_test_dir):
+    """Merges the test classes generated by Randoop shards into one test directory.
+
+    The regression and error-revealing test classes of the shards are renumbered, in shard order, and written to the
+    merged test directory along with a test suite class for each of them, as generated by Randoop. Test methods that
+    are structurally identical to a test method of an earlier test class (that is, identical up to whitespace,
+    local variable names, and the debug statement naming the test method) are removed, and test classes left without
+    test methods are omitted.
+
+    Args:
+        shard_test_dirs (list): JUnit output directories of the Randoop shards
+        merged_test_dir (str): test directory to write the merged test classes to
 
+    Returns:
+        tuple: number of test methods kept, number of structurally identical test methods removed
+    """
+    kept_count = removed_count = 0
+    test_keys = set()
+    os.makedirs(merged_test_dir, exist_ok=True)
+    for basename in constants.RANDOOP_TEST_BASENAMES:
+        test_class_pattern = re.compile(re.escape(basename) + r'(\d+)\.java$')
+        merged_test_classes = []
+        for test_dir in shard_test_dirs:
+            test_files = [name for name in os.listdir(test_dir) if test_class_pattern.match(name)] \
+                if os.path.isdir(test_dir) else []
+            for test_file in sorted(test_files, key=lambda name: int(test_class_pattern.match(name).group(1))):
+                with open(os.path.join(test_dir, test_file)) as f:
+                    source = f.read()
+                test_source = []
+                pos = 0
+                for _, start, end in coverage_util.get_test_method_spans(source):
+                    test_key = __get_randoop_test_key(source[start:end])
+                    if test_key in test_keys:
+                        test_source.append(source[pos:start])
+                        pos = end
+                        removed_count += 1
+                    else:
+                        test_keys.add(test_key)
+                        kept_count += 1
+                test_source.append(source[pos:])
+                test_source = ''.join(test_source)
+                if not coverage_util.get_test_method_spans(test_source):
+                    continue
+                test_class = basename + str(len(merged_test_classes))
+                merged_test_classes.append(test_class)
+                test_source = re.sub(r'\b{}\b'.format(test_file[:-len('.java')]), test_class, test_source)
+                with open(os.path.join(merged_test_dir, test_class + '.java'), 'w') as f:
+                    f.write(test_source)
+        if merged_test_classes:
+            with open(os.path.join(merged_test_dir, basename + '.java'), 'w') as f:
+                f.write(__RANDOOP_TEST_SUITE_TEMPLATE.format(
+                    ', '.join(test_class + '.class' for test_class in merged_test_classes), basename))
+    return kept_count, removed_count
+
+
+def __get_randoop_test_key(test_method):
+    """Returns a key of a Randoop test method (given as its source), which is the same for structurally identical
+    test methods: the body of the method without the debug statement naming the test method, with local variables
+    renamed in declaration order and whitespace normalized"""
+    declaration = __TEST_METHOD_DECLARATION_PATTERN.search(test_method)
+    body = test_method[declaration.end() if declaration else 0:]
+    body = __RANDOOP_DEBUG_STATEMENT_PATTERN.sub('', body)
+    variable_names = {}
+    for variable_name in __LOCAL_VARIABLE_DECLARATION_PATTERN.findall(body):
+        variable_names.setdefault(variable_name, '#' + str(len(variable_names)))
+    body = __IDENTIFIER_PATTERN.sub(lambda name: variable_names.get(name.group(0), name.group(0)), body)
+    return ' '.join(body.split())
+
+
+def __run_evosuite_worker_pool(config, evosuite_command, evosuite_master_jar, client_heap, target_folder,
+                               project_classpath, evosuite_output_dir, workers):
+    """Generates test cases using a pool of concurrent EvoSuite processes, one for each target class.
+
+    Each class is generated for by an EvoSuite process with the same flags (in particular, the same per-class
+    search budget) as in a single EvoSuite run over the target directory, in its own working directory, with its
+    own test and report directories; the test directories and statistics files of the classes are then merged.
+    Exits if test generation failed for all classes.
+
+    Args:
+        config (dict): loaded and validated config information
+        evosuite_command (str): JVM command for launching the EvoSuite master, without the master arguments
+        evosuite_master_jar (str): EvoSuite master jar
+        client_heap (int): heap size in MB of the EvoSuite client processes (None for the default of EvoSuite)
+        target_folder (str): directory containing the target classes
+        project_classpath (list): classpath of the classes under test (target classes, other app classes, and
+            library dependencies)
+        evosuite_output_dir (str): test directory to merge the generated tests into
+        workers (int): number of concurrent EvoSuite processes
+
+    Returns:
+        int: number of classes for which test generation failed
+    """
+    app_name = config['general']['app_name']
+    class_names = get_evosuite_target_classes(target_folder)
+    tkltest_status('Generating test cases for {} classes with {} concurrent EvoSuite workers'.format(
+        len(class_names), workers))
+
+    def run_worker(worker):
+        worker_dir = os.path.abspath(app_name + constants.TKL_EVOSUITE_WORKER_DIR_SUFFIX + str(worker))
+        shutil.rmtree(worker_dir, ignore_errors=True)
+        os.makedirs(worker_dir)
+        worker_test_dir = os.path.join(worker_dir, 'tests')
+        # the class data sharing arguments are computed per launch, so that only one worker creates the archive
+        worker_command = evosuite_command + __get_evosuite_master_args(evosuite_master_jar, client_heap)
+        worker_command += " -class " + class_names[worker]
+        worker_command += " -projectCP \"" + os.pathsep.join(project_classpath) + "\""
+        worker_command += __get_evosuite_flags(config, worker_test_dir)[0]
+        worker_command += " -Dreport_dir=" + os.path.join(worker_dir, constants.EVOSUITE_REPORT_DIR)
+        logging.info(worker_command)
+        try:
+            command_util.run_command(command=worker_command, verbose=False, cwd=worker_dir)
+        except subprocess.CalledProcessError as e:
+            tkltest_status('Generating tests using Evosuite failed for class {}: {}\n{}'.format(
+                class_names[worker], e, e.stderr), error=True)
+            shutil.rmtree(worker_dir, ignore_errors=True)
+            return None
+        return worker_dir
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        worker_dirs = list(executor.map(run_worker, range(len(class_names))))
+    failed_classes = worker_dirs.count(None)
+    if failed_classes:
+        tkltest_status('Generating tests using Evosuite failed for {} of {} classes'.format(
+            failed_classes, len(class_names)), error=True)
+    if class_names and not any(worker_dirs):
+        sys.exit(1)
+
+    # merge the tests and statistics of the classes
+    worker_dirs = [worker_dir for worker_dir in worker_dirs if worker_dir]
+    os.makedirs(evosuite_output_dir, exist_ok=True)
+    for worker_dir in worker_dirs:
+        if os.path.isdir(os.path.join(worker_dir, 'tests')):
+            shutil.copytree(os.path.join(worker_dir, 'tests'), evosuite_output_dir, dirs_exist_ok=True)
+    statistics_files = [os.path.join(worker_dir, constants.EVOSUITE_REPORT_DIR, constants.EVOSUITE_STATISTICS_FILE)
+                        for worker_dir in worker_dirs]
+    merge_evosuite_statistics([file for file in statistics_files if os.path.isfile(file)],
+                              os.path.join(constants.EVOSUITE_REPORT_DIR, constants.EVOSUITE_STATISTICS_FILE))
+    for worker_dir in worker_dirs:
+        shutil.rmtree(worker_dir, ignore_errors=True)
+    return failed_classes
+
+
+def __get_evosuite_master_args(evosuite_master_jar, client_heap):
+    """Gets the arguments for launching the EvoSuite master: the class data sharing arguments of the launch (see
+    jvm_util.get_class_data_sharing_args()), the master jar, and the heap size of the client process (if given).
+    """
+    args = ""
+    class_data_sharing_args = jvm_util.get_class_data_sharing_args('java', 'EvoSuiteMaster', [evosuite_master_jar])
+    if class_data_sharing_args:
+        args += " " + class_data_sharing_args
+    args += " -jar " + evosuite_master_jar
+    if client_heap:
+        args += " -mem " + str(client_heap)
+    return args
+
+
+def get_evosuite_target_classes(target_folder):
+    """Gets the names of the top-level classes in the given directory, which EvoSuite generates tests for"""
+    class_names = []
+    for root, _, files in os.walk(target_folder):
+        for name in files:
+            if name.endswith('.class') and '$' not in name and name != 'package-info.class':
+                rel_file = os.path.relpath(os.path.join(root, name), target_folder)
+                class_names.append(rel_file[:-len('.class')].replace(os.sep, '.'))
+    return sorted(class_names)
+
+
+def merge_evosuite_statistics(statistics_files, merged_statistics_file):
+    """Merges EvoSuite statistics files into one file, with the union of their columns.
+
+    Args:
+        statistics_files (list): statistics files to merge
+        merged_statistics_file (str): merged statistics file (appended to if it exists, as by EvoSuite)
+    """
+    columns = []
+    rows = []
+    for file in [merged_statistics_file] + statistics_files:
+        if not os.path.isfile(file):
+            continue
+        with open(file, newline='') as f:
+            reader = csv.DictReader(f)
+            columns += [column for column in reader.fieldnames or [] if column not in columns]
+            rows += list(reader)
+    if not columns:
+        return
+    os.makedirs(os.path.dirname(merged_statistics_file) or '.', exist_ok=True)
+    with open(merged_statistics_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def __arrange_folders_for_evosuite(paths_list,  config):
     # if config['generate']['partitions_file']:
     #     target_list = [f + ".class" for f in __parse_partitions_file(config['generate']['partitions_file'])]
     # elif
-    if config['generate']['target_class_list']:
-        target_list = [f.replace(".", os.sep) + ".class" for f in config['generate']['target_class_list']]
-    else:
-        for cl in config['generate']['excluded_class_list']:
-            os.remove(os.path.join(copy_dir_name, cl.replace(".",os.sep)+".class"))
-        return os.path.abspath(copy_dir_name), ""
-
-    target_list = [cl for cl in target_list if not cl[:-len(".class")] in config['generate']['excluded_class_list']]
+    copy_dir_name, target_dir_name = stage_app_classes_for_evosuite(paths_list, config['generate']['target_class_list'],
+                                                                    config['generate']['excluded_class_list'])
+    return os.path.abspath(copy_dir_name), os.path.abspath(target_dir_name) if target_dir_name else ""
 
-    target_dir_name = 'evosuite-test-targets'
 
-    if os.path.exists(target_dir_name):
-        shutil.rmtree(target_dir_name)
-    os.mkdir(target_dir_name)
+def stage_app_classes_for_evosuite(paths_list, target_class_list, excluded_class_list):
+    """Stages the app classes for evosuite.
 
-    target_root = os.path.abspath(target_dir_name)
-    for root, directories, files in os.walk(copy_dir_name, topdown=False):
-        for name in files:
-            if name.endswith(".class"):
-                for target in target_list:
-                    if os.path.join(root, name).endswith(target):
-                        target_path = os.path.join(target_root, root[len(copy_dir_name)+len(os.sep):])
-                        if not os.path.exists(target_path):
-                            os.makedirs(target_path)
+    Creates a copy of the app directories, from which the excluded classes are omitted. If target classes are
+    specified, the target classes are instead staged, in their package directories, in a separate target directory
+    and omitted from the copy. Files are staged as hard links (or symbolic links, or copies if links cannot be
+    created) to the app files, and target and excluded classes are looked up by their relative paths, so that
+    staging takes time linear in the number of app files. For files that occur in more than one app directory,
+    the file of the first directory is staged.
 
-                        os.rename(os.path.join(root, name), os.path.join(target_path, name))
-                        continue
+    Args:
+        paths_list (list): paths to directories containing classes of the app
+        target_class_list (list): names of target classes
+        excluded_class_list (list): names of classes to exclude
 
-    return os.path.abspath(copy_dir_name),os.path.abspath(target_dir_name)
+    Returns:
+        tuple: copy directory, target directory (empty if no target classes are specified)
+    """
+    copy_dir_name = 'evosuite-app-copy'
+    target_dir_name = 'evosuite-test-targets' if target_class_list else ''
+    excluded_files = {cl.replace('.', '/') + '.class' for cl in excluded_class_list}
+    target_files = {cl.replace('.', '/') + '.class' for cl in target_class_list} - excluded_files
+    if target_class_list:
+        # excluded classes are omitted from the target directory only
+        excluded_files = set()
+
+    for dir_name in [copy_dir_name, target_dir_name]:
+        if dir_name:
+            shutil.rmtree(dir_name, ignore_errors=True)
+            os.mkdir(dir_name)
+    staging_modes = ['hardlink', 'symlink', 'copy']
+    staged_files = set()
+    for app_path in paths_list:
+        for root, _, files in os.walk(app_path):
+            rel_root = os.path.relpath(root, app_path)
+            rel_root = '' if rel_root == os.curdir else rel_root
+            os.makedirs(os.path.join(copy_dir_name, rel_root), exist_ok=True)
+            for name in files:
+                rel_file = os.path.join(rel_root, name).replace(os.sep, '/')
+                if rel_file in staged_files or rel_file in excluded_files:
+                    continue
+                staged_files.add(rel_file)
+                stage_dir = copy_dir_name
+                if rel_file in target_files:
+                    stage_dir = target_dir_name
+                    os.makedirs(os.path.join(stage_dir, rel_root), exist_ok=True)
+                dir_util.stage_file(os.path.join(root, name), os.path.join(stage_dir, rel_root, name), staging_modes)
+    return copy_dir_name, target_dir_name
 
 
 def __get_classpath(config):
@@ -278,7 +600,7 @@ def __get_randoop_flags(config, time_limit):
     return flags
 
 
-def __get_evosuite_flags(config):
+def __get_evosuite_flags(config, test_dir=None):
     flags = ""
     time_limit = config['generate']['time_limit']
     if config['generate']['evosuite']['criterion']:
@@ -293,6 +615,6 @@ def __get_evosuite_flags(config):
         output_dir = config['general']['app_name'] + constants.TKLTEST_DEFAULT_EVOSUITE_TEST_DIR_SUFFIX
     else:
         output_dir = config['general']['test_directory']
-    flags += " -Dtest_dir=" + output_dir
+    flags += " -Dtest_dir=" + (test_dir or output_dir)
     return flags, output_dir
 
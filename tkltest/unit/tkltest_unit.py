@@ -24,7 +24,7 @@ from .execute import execute
 from .generate import generate
 from ..tkltest import *
 from ..util import logging_util
-from .util import config_options_unit
+from .util import config_options_unit, jacoco_service_util
 from ..util.constants import *
 
 
@@ -95,6 +95,7 @@ def main():
                                         .format(args.command, ', '.join(failed_modules)))
     if args.command == 'execute' and tkltest_config['execute']['combine_modules_coverage_reports']:
         execute.merge_modules_coverage_reports(tkltest_config, configs, failed_modules)
+    jacoco_service_util.stop()
 
 
 
@@ -107,6 +108,7 @@ def __process_command(args, config):
         elif args.command == 'generate':
             generate.process_generate_command(args, config)
     finally:
+        jacoco_service_util.stop()
         for path in unjar_paths:
             if os.path.isdir(path):
                 shutil.rmtree(path)
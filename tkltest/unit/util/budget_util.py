@@ -0,0 +1,198 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module implements the coverage-weighted allocation of the test generation time budget across target classes.
+
+Instead of giving every target class the same time limit, the global budget (the time limit times the number of
+target classes) is divided in proportion to the size of the classes, measured by the instructions, branches, and
+methods in their bytecode, and discounted by the fraction of their instructions already covered by the developer
+tests. Per-class budgets are rounded to a small set of tiers (the time limit scaled by powers of two), so that
+classes with the same budget can be handled by a single run of a test generator.
+"""
+
+import math
+
+from tkltest.unit.util import incremental_util, probe_coverage_util
+
+# relative weights of branches and methods with respect to instructions in the size of a class
+__BRANCH_WEIGHT = 4
+__METHOD_WEIGHT = 8
+
+# per-class budgets are bounded below by the time limit divided by this factor, and above by the time limit
+# multiplied by this factor
+__MAX_BUDGET_SCALE = 8
+
+# indexes of the instruction, branch, and method counters in the weights of coverage items
+__INSTRUCTION_COUNTER = probe_coverage_util.COVERAGE_COUNTERS.index('instruction')
+__BRANCH_COUNTER = probe_coverage_util.COVERAGE_COUNTERS.index('branch')
+__METHOD_COUNTER = probe_coverage_util.COVERAGE_COUNTERS.index('method')
+
+
+def get_class_metrics(app_class_files, class_names):
+    """Computes size metrics of the given target classes from their bytecode.
+
+    The metrics of a target class include its nested classes.
+
+    Args:
+        app_class_files (dict): app class files (see incremental_util.get_app_class_files())
+        class_names (list): target classes
+
+    Returns:
+        dict: map from target class name to a dict with the number of instructions, branches, and methods
+    """
+    nested_classes = {}
+    for class_name in app_class_files:
+        if '$' in class_name:
+            nested_classes.setdefault(class_name.split('$', 1)[0], []).append(class_name)
+    class_metrics = {}
+    for class_name in class_names:
+        internal_name = class_name.replace('.', '/')
+        metrics = {'instructions': 0, 'branches': 0, 'methods': 0}
+        for group_class in [internal_name] + nested_classes.get(internal_name, []):
+            group_class_metrics = get_class_file_metrics(incremental_util.read_class_file(app_class_files,
+                                                                                          group_class))
+            for metric in metrics:
+                metrics[metric] += group_class_metrics[metric]
+        class_metrics[class_name] = metrics
+    return class_metrics
+
+
+def get_class_file_metrics(class_bytes):
+    """Computes the number of instructions, branches, and methods of a class file, as counted by JaCoCo.
+
+    The counts are the totals of the coverage model of the class (see probe_coverage_util.analyze_class()); they
+    are zero for class files that cannot be analyzed or are not considered for coverage.
+
+    Args:
+        class_bytes (bytes): content of the class file
+
+    Returns:
+        dict: number of instructions, branches, and methods
+    """
+    metrics = {'instructions': 0, 'branches': 0, 'methods': 0}
+    try:
+        class_model = probe_coverage_util.analyze_class(class_bytes)
+    except Exception:
+        return metrics
+    if class_model is None:
+        return metrics
+    for _, weights in class_model['groups']:
+        metrics['instructions'] += weights[__INSTRUCTION_COUNTER]
+        metrics['branches'] += weights[__BRANCH_COUNTER]
+        metrics['methods'] += weights[__METHOD_COUNTER]
+    return metrics
+
+
+def get_class_weight(metrics, dev_test_coverage=0.0):
+    """Computes the weight of a target class in the allocation of the time budget.
+
+    Args:
+        metrics (dict): size metrics of the class (see get_class_metrics())
+        dev_test_coverage (float): fraction of the instructions of the class covered by the developer tests
+
+    Returns:
+        float: the weight
+    """
+    size = metrics['instructions'] + __BRANCH_WEIGHT * metrics['branches'] + __METHOD_WEIGHT * metrics['methods']
+    return size * (1 - min(max(dev_test_coverage, 0.0), 1.0))
+
+
+def plan_class_time_budgets(class_weights, time_limit):
+    """Divides the time budget of test generation across target classes in proportion to their weights.
+
+    The global budget is the time limit times the number of classes. Each class gets a share of the global budget
+    proportional to its weight, bounded by the time limit divided and multiplied by a scale factor (the budget left
+    over by bounded classes is divided among the other classes); the budget of each class is then rounded to the
+    time limit scaled by the nearest power of two.
+
+    Args:
+        class_weights (dict): map from target class name to weight (see get_class_weight())
+        time_limit (int): time limit per class (in seconds)
+
+    Returns:
+        dict: map from target class name to time budget (in seconds)
+    """
+    min_budget = time_limit / __MAX_BUDGET_SCALE
+    max_budget = time_limit * __MAX_BUDGET_SCALE
+    budgets = {}
+    remaining_budget = time_limit * len(class_weights)
+    unbounded_classes = dict(class_weights)
+    while unbounded_classes:
+        total_weight = sum(unbounded_classes.values())
+        shares = {class_name: remaining_budget * weight / total_weight if total_weight
+                  else remaining_budget / len(unbounded_classes)
+                  for class_name, weight in unbounded_classes.items()}
+        bounded_shares = {class_name: min(max(share, min_budget), max_budget)
+                          for class_name, share in shares.items() if not min_budget <= share <= max_budget}
+        if not bounded_shares:
+            budgets.update(shares)
+            break
+        for class_name, share in bounded_shares.items():
+            budgets[class_name] = share
+            remaining_budget -= share
+            del unbounded_classes[class_name]
+    return {class_name: quantize_time_budget(budget, time_limit) for class_name, budget in budgets.items()}
+
+
+def quantize_time_budget(budget, time_limit):
+    """Rounds a time budget to the time limit scaled by the nearest power of two (at least one second)"""
+    max_exponent = int(math.log2(__MAX_BUDGET_SCALE))
+    exponent = round(math.log2(budget / time_limit)) if budget > 0 else -max_exponent
+    exponent = min(max(exponent, -max_exponent), max_exponent)
+    return max(1, round(time_limit * 2 ** exponent))
+
+
+def get_priority_batches(class_weights, batch_count):
+    """Splits target classes into batches of similar size, in decreasing order of their weights.
+
+    Args:
+        class_weights (dict): map from target class name to weight (see get_class_weight())
+        batch_count (int): maximum number of batches
+
+    Returns:
+        list: target classes of each batch
+    """
+    class_names = sorted(class_weights, key=lambda class_name: (-class_weights[class_name], class_name))
+    batch_size = max(math.ceil(len(class_names) / batch_count), 1)
+    return [class_names[index:index + batch_size] for index in range(0, len(class_names), batch_size)]
+
+
+def fit_batch_to_time(batch, class_time_limits, overhead, parallelism, time_scale, available_time):
+    """Computes the largest prefix of a batch of target classes whose estimated generation time fits in the
+    available time.
+
+    The generation time of a batch is estimated as the overhead plus the time limits of its classes divided by
+    the number of classes generated for in parallel, scaled by a factor calibrated on the earlier batches.
+
+    Args:
+        batch (list): target classes of the batch, in priority order
+        class_time_limits (dict): time limit (in seconds) of each target class
+        overhead (float): time (in seconds) taken by a batch besides the time limits of its classes
+        parallelism (int): number of classes generated for in parallel
+        time_scale (float): ratio of the actual to the estimated time of the earlier batches
+        available_time (float): time (in seconds) available for the batch
+
+    Returns:
+        list: target classes of the prefix
+    """
+    estimated_time = overhead * time_scale
+    for index, class_name in enumerate(batch):
+        estimated_time += class_time_limits[class_name] * time_scale / parallelism
+        if estimated_time > available_time:
+            return batch[:index]
+    return batch
+
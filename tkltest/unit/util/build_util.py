@@ -274,15 +274,17 @@ def __build_ant(classpath_list, app_name, monolith_app_paths, test_root_src_dir,
                                         doc.stag('fileset', file=os.path.abspath(path))
                     doc.stag('html', destdir=main_coverage_dir + "/" + current_partition)
 
-        partitions_tasks = ['test-reports_' + os.path.basename(test_src_dir) for test_src_dir in test_src_dirs]
-        tasks_joined = ','.join(partitions_tasks)
+        # merge-coverage only runs the tests and merges their raw coverage data, without creating test or
+        # coverage reports (as needed for collecting the coverage of each test class during augmentation)
+        execute_tasks = ','.join('execute-tests_' + os.path.basename(test_src_dir) for test_src_dir in test_src_dirs)
+        report_tasks = ','.join('test-reports_' + os.path.basename(test_src_dir) for test_src_dir in test_src_dirs)
 
-        with tag('target', name='merge-coverage', depends=tasks_joined):
+        with tag('target', name='merge-coverage', depends=execute_tasks):
             with tag('jacoco:merge', destfile=build_dir + '/merged_jacoco.exec',
                      xmlnsjacoco="antlib:org.jacoco.ant"):
                 doc.stag('fileset', dir=build_dir, includes="**/*.exec")
 
-        with tag('target', name='merge-coverage-report', depends='merge-coverage'):
+        with tag('target', name='merge-coverage-report', depends=report_tasks + ',merge-coverage'):
             with tag('jacoco:report', xmlnsjacoco="antlib:org.jacoco.ant"):
                 with tag('executiondata'):
                     doc.stag('file', file=build_dir + '/merged_jacoco.exec')
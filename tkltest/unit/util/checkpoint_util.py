@@ -0,0 +1,107 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module implements phase checkpoints of the generate command, which let a generate run resume after
+the phases that completed in an earlier run.
+
+A checkpoint of a phase records a fingerprint of the phase inputs (settings and input files) and a digest of
+the phase outputs. A phase can be skipped when resuming if it has a checkpoint with the same input fingerprint
+and its outputs are intact (i.e., have the same digest). As the input files of a phase include the outputs
+of the preceding phases, re-running a phase invalidates the checkpoints of the phases depending on it.
+"""
+
+import hashlib
+import json
+import os
+
+
+def load_checkpoints(checkpoint_file):
+    """Loads the phase checkpoints recorded in the given file (no checkpoints if the file does not exist)"""
+    try:
+        with open(checkpoint_file, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_fingerprint(settings, input_paths):
+    """Computes the fingerprint of the inputs of a phase.
+
+    Args:
+        settings (dict): settings affecting the phase outputs
+        input_paths (list): input files and directories of the phase
+
+    Returns:
+        str: the fingerprint
+    """
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+    digest.update(get_paths_digest(input_paths).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get_paths_digest(paths):
+    """Computes a digest of the content of the given files and directories (missing paths are included)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode('utf-8'))
+        if os.path.isdir(path):
+            files = sorted(os.path.join(dir, file) for dir, _, dir_files in os.walk(path) for file in dir_files)
+            for file in files:
+                digest.update(os.path.relpath(file, path).encode('utf-8'))
+                __update_file_digest(digest, file)
+        elif os.path.isfile(path):
+            __update_file_digest(digest, path)
+        else:
+            digest.update(b'\0missing')
+    return digest.hexdigest()
+
+
+def is_phase_complete(checkpoints, phase, fingerprint):
+    """Checks whether a phase completed with the given input fingerprint and its outputs are intact"""
+    checkpoint = checkpoints.get(phase)
+    if not checkpoint or checkpoint['fingerprint'] != fingerprint:
+        return False
+    return get_paths_digest(checkpoint['outputs']) == checkpoint['outputs_digest']
+
+
+def mark_phase_complete(checkpoint_file, checkpoints, phase, fingerprint, outputs, data=None):
+    """Records the checkpoint of a completed phase.
+
+    Args:
+        checkpoint_file (str): file to write the checkpoints to
+        checkpoints (dict): checkpoints recorded so far, which are updated with the phase checkpoint
+        phase (str): phase name
+        fingerprint (str): fingerprint of the phase inputs (see get_fingerprint())
+        outputs (list): output files and directories of the phase
+        data (dict): additional phase data to be restored when the phase is skipped
+    """
+    checkpoints[phase] = {
+        'fingerprint': fingerprint,
+        'outputs': outputs,
+        'outputs_digest': get_paths_digest(outputs),
+        'data': data or {}
+    }
+    tmp_checkpoint_file = checkpoint_file + '.tmp'
+    with open(tmp_checkpoint_file, 'w', encoding='utf-8') as f:
+        json.dump(checkpoints, f, indent=2)
+    os.replace(tmp_checkpoint_file, checkpoint_file)
+
+
+def __update_file_digest(digest, file):
+    with open(file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
@@ -352,6 +352,17 @@ __options_spec = {
             'default_value': '',
             'help_message': 'Name of the Ant target that is being used to build the app from the build file; required only for apps that use an Ant build file'
         },
+        'jvm_profiles': {
+            'required': False,
+            'is_toml_option': True,
+            'is_cli_option': False,
+            'type': dict,
+            'default_value': {
+                tool_name: {'max_heap': 0, 'gc': '', 'gc_threads': 0, 'jvm_args': ''}
+                for tool_name in ['ctd_modeler', 'bb_test_generator', 'sequence_extender', 'evosuite', 'randoop']
+            },
+            'help_message': 'per-tool overrides of the JVM resource profiles computed from the machine and app size: heap size in MB (max_heap), garbage collector (gc), garbage collector threads (gc_threads), and additional JVM arguments (jvm_args); 0 or empty for the computed values'
+        },
         # 'jee_support': {
         #     'required': False,
         #     'is_toml_option': True,
@@ -388,6 +399,56 @@ __options_spec = {
                     'default_value': 'combined',
                     'help_message': 'base test generator to use for creating building-block test sequences'
                 },
+                'base_test_generator_shards': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-btgs',
+                    'long_name': '--base-test-generator-shards',
+                    'type': int,
+                    'default_value': 1,
+                    'help_message': 'number of shards of target classes for which building-block test sequences are generated concurrently, each in a separate JVM'
+                },
+                'weighted_time_budget': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-wtb',
+                    'long_name': '--weighted-time-budget',
+                    'type': bool,
+                    'default_value': False,
+                    'help_message': 'divide the time budget of building-block test generation across target classes in proportion to their size and dev-test coverage gap, instead of using the time limit for every class'
+                },
+                'deadline': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-dl',
+                    'long_name': '--deadline',
+                    'type': int,
+                    'default_value': 0,
+                    'help_message': 'wall-clock deadline (in seconds) for the generate command; target classes are generated for in priority batches until the deadline is near (0 for no deadline)'
+                },
+                'plateau_window': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-pw',
+                    'long_name': '--plateau-window',
+                    'type': int,
+                    'default_value': 0,
+                    'help_message': 'window (in seconds) over which the coverage growth of building-block test generation for a class is sampled, to stop the generation for the class once its coverage plateaus (0 for no early stopping)'
+                },
+                'plateau_threshold': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-pt',
+                    'long_name': '--plateau-threshold',
+                    'type': int,
+                    'default_value': 1,
+                    'help_message': 'minimum growth (in percentage points per plateau window) of the sampled coverage of a class for building-block test generation to continue for the class'
+                },
                 'no_augment_coverage': {
                     'required': False,
                     'is_toml_option': True,
@@ -398,6 +459,80 @@ __options_spec = {
                     'default_value': False,
                     'help_message': 'do not augment CTD-guided tests with coverage-increasing base tests'
                 },
+                'augmentation_budget': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-ab',
+                    'long_name': '--augmentation-budget',
+                    'type': int,
+                    'default_value': 0,
+                    'help_message': 'maximum number of base test classes to add during coverage augmentation (0 for no limit)'
+                },
+                'augmentation_target_coverage': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': False,
+                    'type': int,
+                    'default_value': 0,
+                    'help_message': 'instruction coverage percentage at which coverage augmentation stops adding base test classes (0 for no target)'
+                },
+                'augmentation_workers': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-aw',
+                    'long_name': '--augmentation-workers',
+                    'type': int,
+                    'default_value': 0,
+                    'help_message': 'number of parallel workers for collecting coverage of base test classes during coverage augmentation (0 for half the available cores)'
+                },
+                'augmentation_single_jvm': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-asj',
+                    'long_name': '--augmentation-single-jvm',
+                    'type': bool,
+                    'default_value': False,
+                    'help_message': 'collect coverage of all base test classes during coverage augmentation by running them in a single JVM'
+                },
+                'augmentation_cache_size': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': False,
+                    'type': int,
+                    'default_value': 512,
+                    'help_message': 'maximum size, in MB, of the cache of coverage data of base test classes reused across coverage augmentation runs (0 to disable)'
+                },
+                'augmentation_memory_budget': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': False,
+                    'type': int,
+                    'default_value': 256,
+                    'help_message': 'maximum memory, in MB, for the coverage matrix of base test classes during coverage augmentation; larger matrices are kept in a temporary file (0 for no limit)'
+                },
+                'pipeline_augmentation': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-pla',
+                    'long_name': '--pipeline-augmentation',
+                    'type': bool,
+                    'default_value': False,
+                    'help_message': 'collect coverage of base test classes for coverage augmentation in the background, while test sequences are extended'
+                },
+                'augment_test_methods': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-atm',
+                    'long_name': '--augment-test-methods',
+                    'type': bool,
+                    'default_value': False,
+                    'help_message': 'perform coverage augmentation at the granularity of test methods, adding only coverage-increasing test methods of base test classes'
+                },
                 'no_ctd_coverage': {
                     'required': False,
                     'is_toml_option': True,
@@ -424,6 +559,16 @@ __options_spec = {
                     'default_value': 10,
                     'help_message': 'number of executions to perform to determine pass/fail status of generated sequences'
                 },
+                'sequence_extender_shards': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-ses',
+                    'long_name': '--sequence-extender-shards',
+                    'type': int,
+                    'default_value': 1,
+                    'help_message': 'number of shards of target classes for which test sequences are extended concurrently, each in a separate JVM'
+                },
                 'reuse_base_tests': {
                     'required': False,
                     'is_toml_option': True,
@@ -434,6 +579,26 @@ __options_spec = {
                     'default_value': False,
                     'help_message': 'reuse existing base test cases'
                 },
+                'resume': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-rs',
+                    'long_name': '--resume',
+                    'type': bool,
+                    'default_value': False,
+                    'help_message': 'resume generation, skipping the phases completed in the last run whose outputs are intact and whose inputs have not changed'
+                },
+                'incremental': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-inc',
+                    'long_name': '--incremental',
+                    'type': bool,
+                    'default_value': False,
+                    'help_message': 'generate tests only for target classes whose bytecode, direct app dependencies, or test plans changed since the last incremental run, reusing the tests of the other target classes'
+                },
                 # 'refactored_app_path_prefix': {
                 #     # conditionally required: required if partitions_file is specified
                 #     'required': __conditionally_required,
@@ -466,12 +631,43 @@ __options_spec = {
                     'type': list,
                     'default_value': ["BRANCH"],
                     'help_message': 'coverage criterion for evosuite'
+                },
+                'workers': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-w',
+                    'long_name': '--workers',
+                    'type': int,
+                    'default_value': 1,
+                    'help_message': 'number of concurrent evosuite processes, each generating tests for one target class at a time (1 for a single evosuite process over all target classes)'
                 }
             },
 
             # "generate randoop" command options
             'randoop': {
                 'help_message': 'Use Randoop for generating a test suite',
+                'shards': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-s',
+                    'long_name': '--shards',
+                    'type': int,
+                    'default_value': 1,
+                    'help_message': 'number of concurrent randoop processes, each with a distinct random seed, whose tests are merged with structurally identical test methods removed (1 for a single randoop process)'
+                },
+                'shard_mode': {
+                    'required': False,
+                    'is_toml_option': True,
+                    'is_cli_option': True,
+                    'short_name': '-sm',
+                    'long_name': '--shard-mode',
+                    'type': str,
+                    'choices': ['partition', 'seeds'],
+                    'default_value': 'partition',
+                    'help_message': 'whether each randoop shard generates tests for a partition of the target classes (partition) or for all target classes (seeds)'
+                }
             }
         }
     },
@@ -0,0 +1,147 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module implements a persistent, content-addressed cache of the raw coverage data files of test classes,
+which lets test augmentation reuse the coverage data collected for a test class in an earlier generate run.
+
+A cache entry is keyed by a hash of the test class source, the sources of its scaffolding classes, the app
+class files, and the coverage collection mode; so an entry is reused only if running the test class again
+would collect the same coverage data. The cache size is capped, and least recently used entries (by
+modification time, which is updated when an entry is reused) are evicted when the cap is exceeded.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import shutil
+
+__CACHE_ENTRY_SUFFIX = '.exec'
+
+
+def get_app_classes_hash(class_files):
+    """Computes a hash of the content of the given app classes paths.
+
+    Args:
+        class_files (list): App classes paths (class file directories, class files, or jars)
+
+    Returns:
+        str: hex digest of the hash of all class files and jars under the given paths
+    """
+    digest = hashlib.sha256()
+    for class_file in class_files:
+        if os.path.isdir(class_file):
+            files = sorted(os.path.join(dir, file) for dir, _, dir_files in os.walk(class_file)
+                           for file in dir_files if os.path.splitext(file)[1] in ['.class', '.jar', '.zip'])
+            for file in files:
+                digest.update(os.path.relpath(file, class_file).encode('utf-8'))
+                __update_file_hash(digest, file)
+        elif os.path.isfile(class_file):
+            digest.update(os.path.basename(class_file).encode('utf-8'))
+            __update_file_hash(digest, class_file)
+    return digest.hexdigest()
+
+
+def get_test_cache_key(test_class, app_classes_hash, collection_mode):
+    """Computes the cache key of a test class.
+
+    Args:
+        test_class (str): test class, specified as a file path
+        app_classes_hash (str): hash of the app classes (see get_app_classes_hash())
+        collection_mode (str): coverage collection mode (instrumentation and collected packages)
+
+    Returns:
+        str: the cache key
+    """
+    digest = hashlib.sha256()
+    digest.update(app_classes_hash.encode('utf-8'))
+    digest.update(collection_mode.encode('utf-8'))
+    # the test class and its scaffolding classes, which have the test class name as prefix
+    test_base = os.path.splitext(test_class)[0]
+    for test_file in sorted(glob.glob(test_base + '*.java')):
+        digest.update(os.path.basename(test_file).encode('utf-8'))
+        __update_file_hash(digest, test_file)
+    return digest.hexdigest()
+
+
+def get_cached_coverage(cache_dir, key, dest_file):
+    """Copies the cached raw coverage data file for the given key to the destination file, if it exists.
+
+    Args:
+        cache_dir (str): cache directory
+        key (str): cache key (see get_test_cache_key())
+        dest_file (str): raw coverage data file to create
+
+    Returns:
+        bool: whether a cache entry was found
+    """
+    entry_file = os.path.join(cache_dir, key + __CACHE_ENTRY_SUFFIX)
+    try:
+        shutil.copyfile(entry_file, dest_file)
+        os.utime(entry_file)
+    except OSError:
+        return False
+    return True
+
+
+def add_cached_coverage(cache_dir, key, exec_file):
+    """Adds a raw coverage data file to the cache (evict_cached_coverage() should be called after adding entries).
+
+    Args:
+        cache_dir (str): cache directory
+        key (str): cache key (see get_test_cache_key())
+        exec_file (str): raw coverage data file to add
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_file = os.path.join(cache_dir, key + __CACHE_ENTRY_SUFFIX)
+    tmp_entry_file = entry_file + '.tmp'
+    try:
+        shutil.copyfile(exec_file, tmp_entry_file)
+        os.replace(tmp_entry_file, entry_file)
+    except OSError as e:
+        logging.warning('failed to add coverage data file {} to cache: {}'.format(exec_file, e))
+        return
+
+
+def evict_cached_coverage(cache_dir, max_size):
+    """Evicts least recently used cache entries until the total size of the entries is at most max_size MB"""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for file in os.listdir(cache_dir):
+        if file.endswith(__CACHE_ENTRY_SUFFIX):
+            try:
+                stat = os.stat(os.path.join(cache_dir, file))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file))
+    total_size = sum(size for _, size, _ in entries)
+    max_size_bytes = max_size * 1024 * 1024
+    for _, size, file in sorted(entries):
+        if total_size <= max_size_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, file))
+        except OSError:
+            continue
+        total_size -= size
+
+
+def __update_file_hash(digest, file):
+    with open(file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
@@ -21,11 +21,110 @@ import logging
 import subprocess
 import shutil
 import pathlib
+import re
 import sys
+import zipfile
 
-from tkltest.util import command_util, constants
+from tkltest.util import command_util, constants, jvm_util
 from tkltest.util.logging_util import tkltest_status
 from tkltest.unit.execute import execute
+from tkltest.unit.util import jacoco_exec_util, jacoco_service_util
+
+# start of a @Test annotation line, and the declaration of the annotated test method
+__TEST_ANNOTATION_PATTERN = re.compile(r'^[\t ]*@Test\b', re.MULTILINE)
+__TEST_METHOD_PATTERN = re.compile(r'\bvoid\s+(\w+)\s*\(')
+__BLANK_LINE_PATTERN = re.compile(r'[\t ]*\n')
+
+# JUnit runner used for collecting coverage of each test class (or test method) in a single JVM: a run listener
+# resets the JaCoCo agent data when a test class starts and dumps it when the test class (or test method) completes
+__COVERAGE_DUMP_RUNNER_SOURCE = """
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+
+import org.jacoco.agent.rt.IAgent;
+import org.jacoco.agent.rt.RT;
+import org.junit.runner.Description;
+import org.junit.runner.JUnitCore;
+import org.junit.runner.Result;
+import org.junit.runner.notification.RunListener;
+
+public class TkltestCoverageDumpRunner extends RunListener {
+
+    private final IAgent agent = RT.getAgent();
+    private final File outputDir;
+    private final String testClass;
+    private final String testClassName;
+    private final boolean testMethods;
+    // coverage data of the test class setup, added to the coverage data of each test method
+    private byte[] classSetupData;
+
+    TkltestCoverageDumpRunner(File outputDir, String testClass, boolean testMethods) {
+        this.outputDir = outputDir;
+        this.testClass = testClass;
+        this.testClassName = testClass.substring(testClass.lastIndexOf('.') + 1);
+        this.testMethods = testMethods;
+    }
+
+    private void dump(String name, byte[]... data) throws IOException {
+        try (OutputStream out = new FileOutputStream(new File(outputDir, name + "_jacoco.exec"))) {
+            for (byte[] part : data) {
+                out.write(part);
+            }
+        }
+    }
+
+    @Override
+    public void testRunStarted(Description description) {
+        agent.reset();
+        agent.setSessionId(testClass);
+    }
+
+    @Override
+    public void testStarted(Description description) {
+        if (testMethods) {
+            if (classSetupData == null) {
+                classSetupData = agent.getExecutionData(true);
+            }
+            agent.setSessionId(testClass + "#" + description.getMethodName());
+        }
+    }
+
+    @Override
+    public void testFinished(Description description) throws IOException {
+        if (testMethods) {
+            dump(testClassName + "#" + description.getMethodName(), classSetupData, agent.getExecutionData(true));
+        }
+    }
+
+    @Override
+    public void testRunFinished(Result result) throws IOException {
+        if (!testMethods) {
+            dump(testClassName, agent.getExecutionData(true));
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
+        File outputDir = new File(args[0]);
+        boolean testMethods = args.length > 2 && args[2].equals("methods");
+        for (String testClass : Files.readAllLines(Paths.get(args[1]), StandardCharsets.UTF_8)) {
+            try {
+                Class<?> cls = Class.forName(testClass);
+                JUnitCore core = new JUnitCore();
+                core.addListener(new TkltestCoverageDumpRunner(outputDir, testClass, testMethods));
+                core.run(cls);
+            } catch (Throwable e) {
+                System.err.println("Failed to run test class " + testClass + ": " + e);
+            }
+        }
+        System.exit(0);
+    }
+}
+"""
 
 
 def get_coverage_for_test_suite(build_file, build_type, test_root_dir, report_dir,
@@ -119,28 +218,21 @@ def get_coverage_for_test_suite(build_file, build_type, test_root_dir, report_di
             tkltest_status('Warning: {} was not created using command: {}'.format(additional_exec_file, cmd))
             no_failure = False
         if no_failure:
-            jacoco_cli_file = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)
             if has_test_suite:
                 merged_exec_file = jacoco_raw_data_file + '_merged_with_' + os.path.basename(additional_exec_file)
                 merged_csv_file = coverage_csv_file + '_merged_with_' + os.path.basename(additional_exec_file) + '.csv'
                 try:
-                    command_util.run_command("java -jar {} merge {} {} --destfile {}".
-                                             format(jacoco_cli_file, jacoco_raw_data_file, additional_exec_file,
-                                                    merged_exec_file), verbose=True, env_vars=env_vars)
-                except subprocess.CalledProcessError as e:
-                    tkltest_status('Warning: Failed to merge coverage data files {} and {}:\n {}\n{}'.format(jacoco_raw_data_file, additional_exec_file, e, e.stderr))
+                    jacoco_exec_util.merge_exec_files([jacoco_raw_data_file, additional_exec_file], merged_exec_file)
+                except (OSError, ValueError) as e:
+                    tkltest_status('Warning: Failed to merge coverage data files {} and {}:\n {}'.format(jacoco_raw_data_file, additional_exec_file, e))
                     no_failure = False
             else:
                 merged_exec_file = additional_exec_file
                 merged_csv_file = os.path.join(main_coverage_dir, os.path.basename(additional_exec_file) + '.csv')
         if no_failure:
             try:
-                jacoco_classfiles_ops = ''
-                for classpath in class_files:
-                    jacoco_classfiles_ops += '--classfiles {} '.format(classpath)
-                command_util.run_command("java -jar {} report {} {} --csv {}".
-                                         format(jacoco_cli_file, merged_exec_file, jacoco_classfiles_ops,
-                                                merged_csv_file), verbose=True, env_vars=env_vars)
+                jacoco_service_util.report(exec_files=[merged_exec_file], class_files=class_files,
+                                           csv_file=merged_csv_file, jdk_path=jdk_path)
             except subprocess.CalledProcessError as e:
                 tkltest_status('Warning: Failed to create CSV coverage report {} from {}:\n {}\n{}'.format(merged_csv_file, merged_exec_file, e, e.stderr))
                 no_failure = False
@@ -167,128 +259,185 @@ def get_coverage_for_test_suite(build_file, build_type, test_root_dir, report_di
     shutil.move(jacoco_raw_data_file, jacoco_new_file_name)
 
 
-    # read the coverage CSV file and compute total instruction, line, and branch coverage
-    total_inst_covered = 0;
-    total_line_covered = 0
-    total_branch_covered = 0
-    total_method_covered = 0
-    total_inst_missed = 0;
-    total_line_missed = 0
-    total_branch_missed = 0
-    total_method_missed = 0
-    with open(coverage_csv_file, newline='') as f:
-        coverage_info = csv.DictReader(f)
-        for row in coverage_info:
-            total_inst_covered += int(row['INSTRUCTION_COVERED'])
-            total_line_covered += int(row['LINE_COVERED'])
-            total_branch_covered += int(row['BRANCH_COVERED'])
-            total_method_covered += int(row['METHOD_COVERED'])
-            total_inst_missed += int(row['INSTRUCTION_MISSED'])
-            total_line_missed += int(row['LINE_MISSED'])
-            total_branch_missed += int(row['BRANCH_MISSED'])
-            total_method_missed += int(row['METHOD_MISSED'])
-
+    coverage = __read_coverage_csv(coverage_csv_file)
     logging.info('total_inst_cov={}. total_line_cov={}, total_branch_cov={}'.format(
-        total_inst_covered, total_line_covered, total_branch_covered))
-    return {
-            'instruction_covered': total_inst_covered,
-            'line_covered': total_line_covered,
-            'branch_covered': total_branch_covered,
-            'method_covered': total_method_covered,
-            'instruction_total': total_inst_covered + total_inst_missed,
-            'line_total': total_line_covered + total_line_missed,
-            'branch_total': total_branch_covered + total_branch_missed,
-            'method_total': total_method_covered + total_method_missed,
-    }
+        coverage['instruction_covered'], coverage['line_covered'], coverage['branch_covered']))
+    return coverage
 
 
+def get_raw_coverage_for_test_suite(build_file, build_type, test_root_dir, raw_cov_data_dir, raw_cov_data_file_pref,
+                                    jdk_path):
+    """Runs test cases and collects their raw coverage data file only.
 
-def get_delta_coverage(test, test_raw_cov_file, ctd_raw_cov_file, main_coverage_dir, base_coverage, class_files,
-                       remove_merged_cov_file, max_memory, jdk_path):
+    Runs test cases using the given build file up to the creation of the jacoco.exec raw coverage data file,
+    without creating CSV, HTML, and XML coverage reports, and moves the raw coverage data file to the raw
+    coverage data directory (as done by get_coverage_for_test_suite()).
 
-    """Merges two raw coverage data files and returns delta coverage information between respective test suites
+    Args:
+        build_file (str): Build file to use for running tests
+        build_type (str): Type of build file (either ant, maven or gradle)
+        test_root_dir (str): Root directory of test suite
+        raw_cov_data_dir (str): directory to move the raw coverage data file to
+        raw_cov_data_file_pref (str): prefix of the name of the raw coverage data file
+        jdk_path (str): path to the jdk home to be used for executing the tests and measuring their coverage
 
-        Runs jacoco cli merge and report commands between two given raw jacoco.exec data files,
-        reads coverage information from the Jacoco CSV coverage file, and returns dictionary
-        containing instruction, line, and branch delta coverage data.
+    Returns:
+        str: the raw coverage data file, or None if it was not created
+    """
+    if not list(pathlib.Path(test_root_dir).glob('**/*.java')):
+        return None
+    env_vars = dict(os.environ.copy())
+    env_vars['JAVA_HOME'] = jdk_path
+    jacoco_raw_data_file = get_jacoco_exec_file(build_type, os.path.dirname(build_file))
+    try:
+        os.remove(jacoco_raw_data_file)
+    except OSError:
+        pass
+    # run tests using build targets that create the .exec file but no coverage report
+    if build_type == 'ant':
+        cmd = "ant -f {} merge-coverage".format(build_file)
+    elif build_type == 'maven':
+        cmd = "mvn -f {} clean test".format(build_file)
+    else:
+        cmd = "gradle --project-dir {} clean test".format(os.path.dirname(build_file))
+    try:
+        command_util.run_command(cmd, verbose=False, env_vars=env_vars)
+    except subprocess.CalledProcessError as e:
+        tkltest_status('Warning: Error while running test suite for coverage computing, skipping current test file: {}\n{}'.format(e, e.stderr))
+    if not os.path.exists(jacoco_raw_data_file):
+        tkltest_status('Warning: {} was not created by : {}.\n Skipping current test file'.format(jacoco_raw_data_file, cmd))
+        return None
 
-        Args:
-            test (str): the name of the test class whose delta coverage is being computed
-            test_raw_cov_file (str): the jacoco.exec coverage data file of the test
-            ctd_raw_cov_file (str): he jacoco.exec coverage data file of the ctd test suite we are comparing against
-            main_coverage_dir (str): Main directory in which coverage report is generated
-            base_coverage (dict): base coverage to compute coverage gain (delta) against
-            remove_merged_cov_file (bool): whether to remove existing merged coverage file
-            max_memory (int): maximal memory to use for merging coverage reports
-            jdk_path (str): path to the jdk home to be used for executing the tests and measuring their coverage
+    jacoco_new_file_name = os.path.join(raw_cov_data_dir,
+                                        raw_cov_data_file_pref + constants.JACOCO_SUFFIX_FOR_AUGMENTATION)
+    shutil.move(jacoco_raw_data_file, jacoco_new_file_name)
+    return jacoco_new_file_name
 
-        Returns:
-            dict: delta instruction, line, branch coverage
-            dict:
-        """
 
-    # run jacoco cli merge command
+def get_coverage_from_exec_file(exec_file, class_files, main_coverage_dir, report_name, max_memory, jdk_path):
+    """Creates the coverage report for a raw coverage data file and returns coverage information.
 
-    output_exec_file = os.path.join(os.path.dirname(ctd_raw_cov_file), constants.JACOCO_MERGED_DATA_FOR_AUGMENTATION);
+    Runs the jacoco cli report command on the given raw jacoco.exec data file to create CSV, HTML, and XML
+    coverage reports in the main coverage directory, reads coverage information from the Jacoco CSV
+    coverage file, and returns dictionary containing instruction, line, branch, and method coverage data.
 
-    if remove_merged_cov_file:
-        try:
-            os.remove(output_exec_file)
-        except OSError:
-            pass
+    Args:
+        exec_file (str): the jacoco.exec coverage data file
+        class_files (list): App classes paths
+        main_coverage_dir (str): Main directory in which coverage report is generated
+        report_name (str): name of the CSV coverage report file (without extension)
+        max_memory (int): maximal memory to use for creating coverage reports
+        jdk_path (str): path to the jdk home to be used for creating coverage reports
 
-    no_delta_coverage = {
-        'instruction_cov_delta': 0,
-        'line_cov_delta': 0,
-        'branch_cov_delta': 0,
-        'method_cov_delta': 0
-        }, {
-        'instruction_covered': base_coverage['instruction_covered'],
-        'line_covered': base_coverage['line_covered'],
-        'branch_covered': base_coverage['branch_covered'],
-        'method_covered': base_coverage['method_covered'],
-        'instruction_total': base_coverage['instruction_total'],
-        'line_total': base_coverage['line_total'],
-        'branch_total': base_coverage['branch_total'],
-        'method_total': base_coverage['method_total']}
-
-    jacoco_cli_file = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)
-    env_vars = dict(os.environ.copy())
-    env_vars['JAVA_HOME'] = jdk_path
-    if os.path.isfile(ctd_raw_cov_file) and os.path.isfile(test_raw_cov_file):
-        try:
-            command_util.run_command("java -Xmx"+str(max_memory)+"m -jar {} merge {} {} --destfile {}".
-                                 format(jacoco_cli_file, test_raw_cov_file, ctd_raw_cov_file,
-                                        output_exec_file), verbose=True, env_vars=env_vars)
-        except subprocess.CalledProcessError as e:
-            # If merging failed we stop augmentation because subsequent merging will most probably also fail due
-            # to same memory issues
-            tkltest_status('Warning: merging of jacoco output failed for test file: {}\n{}'.format(e, e.stderr))
-            return {},{}
-    elif os.path.isfile(test_raw_cov_file):
-        shutil.copy(test_raw_cov_file, output_exec_file)
-    else:
-        tkltest_status('Warning: coverage data file {} does not exist for test {}, skipping current test file'.format(test_raw_cov_file, test))
-        return no_delta_coverage
-    # run jacoco cli report command
+    Returns:
+        dict: Information about instructions, lines, branches, and methods covered and missed, or None if
+            the coverage report could not be created
+    """
     if not os.path.isdir(main_coverage_dir):
         os.makedirs(main_coverage_dir)
-    coverage_csv_file = os.path.join(main_coverage_dir, os.path.basename(test)) + '.csv'
+    coverage_csv_file = os.path.join(main_coverage_dir, report_name) + '.csv'
     coverage_xml_file = os.path.join(main_coverage_dir, 'jacoco.xml')
 
-    jacoco_classfiles_ops = ''
-    for classpath in class_files:
-        jacoco_classfiles_ops += '--classfiles {} '.format(classpath)
     try:
-        create_report_command ="java -jar {} report {} {} --csv {} --html {} --xml {}".format(
-            jacoco_cli_file, output_exec_file, jacoco_classfiles_ops,
-            coverage_csv_file, main_coverage_dir, coverage_xml_file)
-        command_util.run_command(create_report_command, verbose=True, env_vars=env_vars)
+        jacoco_service_util.report(exec_files=[exec_file], class_files=class_files, csv_file=coverage_csv_file,
+                                   html_dir=main_coverage_dir, xml_file=coverage_xml_file,
+                                   jdk_path=jdk_path, max_memory=max_memory)
     except subprocess.CalledProcessError as e:
-        tkltest_status('Warning: Generating coverage report failed, skipping current test file {}: {}\n{}'.format(create_report_command, e, e.stderr))
-        return no_delta_coverage
+        tkltest_status('Warning: Generating coverage report failed: {}\n{}'.format(e, e.stderr))
+        return None
+
+    return __read_coverage_csv(coverage_csv_file)
 
-    # read the coverage CSV file and compute total instruction, line, and branch coverage
+
+def collect_test_classes_coverage_in_single_jvm(test_classes, test_src_dir, app_paths, app_classpath,
+                                                app_packages, raw_cov_data_dir, work_dir, jdk_path,
+                                                test_methods=False, timeout=None):
+    """Collects a raw coverage data file for each of the given test classes by running them in one JVM.
+
+    Compiles all test classes (along with their scaffolding classes) at once, and runs them in a single JVM
+    with the JaCoCo agent attached. A JUnit run listener resets the JaCoCo agent data before each test class
+    and dumps it after the test class completes, using the test class name as the session id, into the file
+    <raw_cov_data_dir>/<test class name>_jacoco.exec, which is the same raw coverage data file that running
+    the test class alone with the build file creates. Test classes that fail to load get no coverage file.
+    If test_methods is set, the agent data is instead dumped after each test method, into the file
+    <raw_cov_data_dir>/<test class name>#<test method name>_jacoco.exec, which also includes the coverage of
+    the test class setup (e.g., static initialization of app classes by EvoSuite scaffolding). If the run does
+    not complete within the timeout, it is terminated, keeping the raw coverage data files dumped so far.
+
+    Args:
+        test_classes (list): test classes to run, specified as file paths under test_src_dir
+        test_src_dir (str): root directory of the test classes sources
+        app_paths (list): App classes paths
+        app_classpath (str): build classpath, containing app dependencies and tkltest dependencies
+        app_packages (list): app packages to collect coverage for (as in the JaCoCo includes option)
+        raw_cov_data_dir (str): directory to store the raw coverage data files in
+        work_dir (str): scratch directory for the compiled test classes
+        jdk_path (str): path to the jdk home to be used for compiling and running the tests
+        test_methods (bool): whether to collect a raw coverage data file for each test method
+        timeout (float): time (in seconds) after which the run of the test classes is terminated (None for no limit)
+
+    Returns:
+        bool: whether the test classes were compiled and run; if False, no coverage data file was created
+    """
+    env_vars = dict(os.environ.copy())
+    env_vars['JAVA_HOME'] = jdk_path
+    shutil.rmtree(work_dir, ignore_errors=True)
+    classes_dir = os.path.join(work_dir, 'classes')
+    os.makedirs(classes_dir)
+
+    # the java agent jar is packaged inside the jacoco agent artifact
+    agent_jar = os.path.join(work_dir, 'jacocoagent.jar')
+    try:
+        with zipfile.ZipFile(os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_AGENT_JAR_NAME)) as zf:
+            with zf.open('jacocoagent.jar') as src, open(agent_jar, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        tkltest_status('Warning: failed to extract JaCoCo agent: {}'.format(e))
+        return False
+
+    runner_file = os.path.join(work_dir, constants.COVERAGE_DUMP_RUNNER_CLASS + '.java')
+    with open(runner_file, 'w') as f:
+        f.write(__COVERAGE_DUMP_RUNNER_SOURCE)
+    source_files = [os.path.abspath(runner_file)]
+    test_class_names = []
+    for test_class in test_classes:
+        test_base = os.path.splitext(test_class)[0]
+        source_files.extend(os.path.abspath(test_file) for test_file in glob.glob(test_base + '*.java'))
+        test_class_names.append(os.path.relpath(test_base, test_src_dir).replace(os.sep, '.'))
+    sources_file = os.path.join(work_dir, 'sources.txt')
+    with open(sources_file, 'w') as f:
+        f.write('\n'.join('"{}"'.format(source_file.replace('\\', '/')) for source_file in source_files))
+    test_class_names_file = os.path.join(work_dir, 'test-classes.txt')
+    with open(test_class_names_file, 'w') as f:
+        f.write('\n'.join(test_class_names))
+
+    classpath = os.pathsep.join([app_classpath] + [os.path.abspath(path) for path in app_paths] + [agent_jar])
+    compile_command = 'javac -nowarn -d "{}" -cp "{}" @{}'.format(classes_dir, classpath, sources_file)
+    try:
+        command_util.run_command(compile_command, verbose=False, env_vars=env_vars)
+    except subprocess.CalledProcessError as e:
+        tkltest_status('Warning: Error while compiling test classes for coverage computing: {}\n{}'.format(e, e.stderr))
+        return False
+
+    os.makedirs(raw_cov_data_dir, exist_ok=True)
+    run_command = 'java -javaagent:"{}"=output=none,includes={} {} {} "{}" "{}" {}'.format(
+        agent_jar, ':'.join(app_packages),
+        jvm_util.get_jvm_launch_args('java', 'CoverageDumpRunner',
+                                     [classes_dir] + [entry for entry in classpath.split(os.pathsep) if entry]),
+        constants.COVERAGE_DUMP_RUNNER_CLASS, os.path.abspath(raw_cov_data_dir),
+        os.path.abspath(test_class_names_file), 'methods' if test_methods else 'classes')
+    try:
+        command_util.run_command(run_command, verbose=False, env_vars=env_vars, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        tkltest_status('Warning: running test classes for coverage computing did not complete before the deadline')
+    except subprocess.CalledProcessError as e:
+        tkltest_status('Warning: Error while running test classes for coverage computing: {}\n{}'.format(e, e.stderr))
+        return False
+    return True
+
+
+def __read_coverage_csv(coverage_csv_file):
+    """Reads the Jacoco CSV coverage file and computes total instruction, line, branch, and method coverage"""
     total_inst_covered = 0
     total_line_covered = 0
     total_branch_covered = 0
@@ -310,11 +459,6 @@ def get_delta_coverage(test, test_raw_cov_file, ctd_raw_cov_file, main_coverage_
             total_method_missed += int(row['METHOD_MISSED'])
 
     return {
-        'instruction_cov_delta': (total_inst_covered - base_coverage['instruction_covered']),
-        'line_cov_delta': (total_line_covered - base_coverage['line_covered']),
-        'branch_cov_delta': (total_branch_covered - base_coverage['branch_covered']),
-        'method_cov_delta': (total_branch_covered - base_coverage['method_covered']),
-    },{
             'instruction_covered': total_inst_covered,
             'line_covered': total_line_covered,
             'branch_covered': total_branch_covered,
@@ -326,7 +470,6 @@ def get_delta_coverage(test, test_raw_cov_file, ctd_raw_cov_file, main_coverage_
     }
 
 
-
 def add_test_class_to_ctd_suite(test_class, test_directory):
     """Adds a test class to a CTD test suite directory.
 
@@ -348,6 +491,102 @@ def add_test_class_to_ctd_suite(test_class, test_directory):
         shutil.copy(test_file, dst_dir)
 
 
+def add_test_methods_to_ctd_suite(test_class, test_methods, test_directory):
+    """Adds a test class, with only the given test methods, to a CTD test suite directory.
+
+    Like add_test_class_to_ctd_suite(), but the test methods of the test class that are not in the given
+    test methods are removed from the added test class. Other classes with the same base name (EvoSuite
+    scaffolding or JEE-support classes) are added as is.
+
+    Args:
+        test_class (str): Test class to add
+        test_methods (list): names of the test methods to keep in the test class
+        test_directory (str): Test directory to add the class to
+    """
+    add_test_class_to_ctd_suite(test_class=test_class, test_directory=test_directory)
+    test_path, test_file = os.path.split(test_class)
+    test_path_comp = os.path.normpath(test_path).split(os.sep)
+    with open(test_class) as f:
+        source = f.read()
+    test_source = []
+    pos = 0
+    for method_name, start, end in get_test_method_spans(source):
+        if method_name not in test_methods:
+            test_source.append(source[pos:start])
+            pos = end
+    test_source.append(source[pos:])
+    with open(os.path.join(test_directory, os.sep.join(test_path_comp[1:]), test_file), 'w') as f:
+        f.write(''.join(test_source))
+
+
+def get_test_methods(test_class):
+    """Returns the names of the test methods of a test class, in their declaration order.
+
+    Args:
+        test_class (str): Test class, specified as a file path
+
+    Returns:
+        list: names of the test methods (methods annotated with @Test)
+    """
+    with open(test_class) as f:
+        source = f.read()
+    return [method_name for method_name, _, _ in get_test_method_spans(source)]
+
+
+def get_test_method_spans(source):
+    """Returns (method name, start, end) for each @Test method in the given test class source; the span
+    starts at the line of the @Test annotation and ends after the line of the closing brace of the method
+    (and a following blank line, if any)"""
+    spans = []
+    pos = 0
+    while True:
+        annotation = __TEST_ANNOTATION_PATTERN.search(source, pos)
+        if not annotation:
+            return spans
+        method = __TEST_METHOD_PATTERN.search(source, annotation.end())
+        body_start = source.find('{', method.end()) if method else -1
+        if body_start < 0:
+            return spans
+        end = __find_block_end(source, body_start)
+        line_end = source.find('\n', end)
+        end = len(source) if line_end < 0 else line_end + 1
+        blank_line = __BLANK_LINE_PATTERN.match(source, end)
+        if blank_line:
+            end = blank_line.end()
+        spans.append((method.group(1), annotation.start(), end))
+        pos = end
+
+
+def __find_block_end(source, block_start):
+    """Returns the position after the closing brace of the block starting at the given opening brace,
+    skipping braces in comments and string and character literals"""
+    depth = 0
+    pos = block_start
+    while pos < len(source):
+        if source.startswith('//', pos):
+            pos = source.find('\n', pos)
+            if pos < 0:
+                break
+        elif source.startswith('/*', pos):
+            pos = source.find('*/', pos + 2)
+            if pos < 0:
+                break
+            pos += 1
+        elif source[pos] in '"\'':
+            quote = source[pos]
+            pos += 1
+            while pos < len(source) and source[pos] != quote:
+                pos += 2 if source[pos] == '\\' else 1
+        elif source[pos] == '{':
+            depth += 1
+        elif source[pos] == '}':
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return len(source)
+
+
 def remove_test_class_from_ctd_suite(test_class, test_directory):
     """Removes a test class from a CTD test suite directory.
 
@@ -421,30 +660,18 @@ def get_dev_test_coverage(config, output_dir, create_csv=False, create_xml=False
 def generate_coverage_report(monolith_app_path, jdk_path, exec_file, xml_file='', html_dir='', csv_file=''):
     """Generates jacoco XML file from raw coverage (.exec) files.
 
-     runs the jacoco CLI to generate XML report from the raw coverage file.
+     runs a jacoco report in the jacoco service to generate XML report from the raw coverage file.
      The XML reports contains method-level coverage information (line, instruction, branch, etc.).
-     To run the jacoco CLI, directories to the application classes are needed, which is identified
+     To run the jacoco report, directories to the application classes are needed, which is identified
      using the tkltest config files.
 
     """
 
-    jacoco_cli_cmd = 'java -jar {}'.format(os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME))
-    jacoco_classfiles_ops = ''
-    for classpath in monolith_app_path:
-        jacoco_classfiles_ops += '--classfiles {} '.format(classpath)
-    jacoco_cmd = '{} {} {} {}'.format(jacoco_cli_cmd, 'report', exec_file, jacoco_classfiles_ops)
-    if xml_file:
-        jacoco_cmd += ' --xml {}'.format(xml_file)
-    if html_dir:
-        jacoco_cmd += ' --html {}'.format(html_dir)
-    if csv_file:
-        jacoco_cmd += ' --csv {}'.format(csv_file)
-    env_vars = dict(os.environ.copy())
-    env_vars['JAVA_HOME'] = jdk_path
     try:
-        command_util.run_command(jacoco_cmd, verbose=True, env_vars=env_vars)
+        jacoco_service_util.report(exec_files=[exec_file], class_files=monolith_app_path, csv_file=csv_file,
+                                   html_dir=html_dir, xml_file=xml_file, jdk_path=jdk_path)
     except subprocess.CalledProcessError as e:
-        tkltest_status('Error running jacoco cli command {}: {}\n{}'.format(jacoco_cmd, e, e.stderr), error=True)
+        tkltest_status('Error running jacoco report for {}: {}\n{}'.format(exec_file, e, e.stderr), error=True)
         sys.exit(1)
 
 
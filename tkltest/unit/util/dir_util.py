@@ -70,4 +70,34 @@ def delete_app_output(app_name):
             elif os.path.isdir(filename):
                 shutil.rmtree(filename)
         except Exception as e:
-            print('Failed to delete %s. Reason: %s' % (filename, e))
\ No newline at end of file
+            print('Failed to delete %s. Reason: %s' % (filename, e))
+
+
+def stage_file(src, dst, staging_modes):
+    """Stages a file at the given destination without copying it, if possible.
+
+    The file is staged as a hard link, a symbolic link, or a copy, using the first of the given staging modes
+    ("hardlink", "symlink", "copy") that works; modes that fail (e.g., hard links across file systems, or symbolic
+    links without the required privileges) are removed from the list, so that they are not retried for other files.
+
+    Args:
+        src (str): file to stage
+        dst (str): destination path
+        staging_modes (list): staging modes to try, in order of preference
+    """
+    while True:
+        staging_mode = staging_modes[0]
+        try:
+            if staging_mode == 'hardlink':
+                os.link(src, dst)
+            elif staging_mode == 'symlink':
+                os.symlink(os.path.abspath(src), dst)
+            else:
+                shutil.copy2(src, dst)
+            return
+        except FileExistsError:
+            raise
+        except OSError:
+            if len(staging_modes) == 1:
+                raise
+            staging_modes.pop(0)
@@ -0,0 +1,232 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module implements the bookkeeping for class-level incremental generation of CTD-amplified tests.
+
+A manifest records, for each target class, a hash of the class bytecode (including its nested classes), the
+bytecode of the app classes it directly references, its CTD test plans, and the generation settings, along with
+the test files generated for the class. On the next generate run, only target classes whose hash changed need
+to go through building-block test generation and sequence extension; the artifacts of the other target classes
+are reused.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+
+from tkltest.unit.util import java_class_parser
+
+__MANIFEST_FILE = 'manifest.json'
+__MANIFEST_VERSION = 1
+
+__REFERENCED_TYPE_PATTERN = re.compile(r'L([\w/$]+)[;<]')
+
+
+def get_app_class_files(monolith_app_path):
+    """Indexes the class files of the app.
+
+    Args:
+        monolith_app_path (list): paths to directories (or jars) containing classes of the app
+
+    Returns:
+        dict: map from class name (in internal form, e.g., "irs/Employer$1") to a (directory or jar, relative
+            path) pair locating the class file
+    """
+    class_files = {}
+    for app_path in monolith_app_path:
+        if os.path.isdir(app_path):
+            for dir, _, files in os.walk(app_path):
+                for file in files:
+                    if file.endswith('.class'):
+                        rel_path = os.path.relpath(os.path.join(dir, file), app_path)
+                        class_files.setdefault(rel_path[:-len('.class')].replace(os.sep, '/'), (app_path, rel_path))
+        elif zipfile.is_zipfile(app_path):
+            with zipfile.ZipFile(app_path) as jar:
+                for entry in jar.namelist():
+                    if entry.endswith('.class'):
+                        class_files.setdefault(entry[:-len('.class')], (app_path, entry))
+    return class_files
+
+
+def get_target_class_hashes(ctd_plans, app_class_files, generation_settings):
+    """Computes the hash of each target class in the given CTD models and test plans.
+
+    Args:
+        ctd_plans (dict): CTD models and test plans
+        app_class_files (dict): app class files (see get_app_class_files())
+        generation_settings (dict): settings affecting the tests generated for a target class
+
+    Returns:
+        dict: map from target class name to hash
+    """
+    settings = json.dumps(generation_settings, sort_keys=True).encode('utf-8')
+    nested_classes = {}
+    for class_name in app_class_files:
+        if '$' in class_name:
+            nested_classes.setdefault(class_name.split('$', 1)[0], []).append(class_name)
+    class_hashes = {}
+    for partition, partition_plans in ctd_plans['models_and_test_plans'].items():
+        for class_name, class_plans in partition_plans.items():
+            digest = hashlib.sha256(settings)
+            digest.update(json.dumps(class_plans, sort_keys=True).encode('utf-8'))
+            internal_name = class_name.replace('.', '/')
+            class_group = [internal_name] + sorted(nested_classes.get(internal_name, []))
+            referenced_classes = set()
+            for group_class in class_group:
+                class_bytes = read_class_file(app_class_files, group_class)
+                digest.update(group_class.encode('utf-8'))
+                digest.update(hashlib.sha256(class_bytes).digest())
+                referenced_classes.update(get_referenced_classes(class_bytes))
+            # direct dependencies in the app
+            for referenced_class in sorted(referenced_classes - set(class_group)):
+                if referenced_class in app_class_files:
+                    digest.update(referenced_class.encode('utf-8'))
+                    digest.update(hashlib.sha256(read_class_file(app_class_files, referenced_class)).digest())
+            class_hashes[class_name] = digest.hexdigest()
+    return class_hashes
+
+
+def get_referenced_classes(class_bytes):
+    """Gets the classes referenced in the constant pool of a class file.
+
+    Args:
+        class_bytes (bytes): content of the class file
+
+    Returns:
+        set: names (in internal form) of the referenced classes
+    """
+    referenced_classes = set()
+    try:
+        class_file = java_class_parser.JavaClass.from_bytes(class_bytes)
+    except Exception:
+        return referenced_classes
+    for entry in class_file.constant_pool:
+        if entry.tag == java_class_parser.JavaClass.ConstantPoolEntry.TagEnum.class_type:
+            class_name = entry.cp_info.name_as_str
+            if not class_name.startswith('['):
+                referenced_classes.add(class_name)
+        elif entry.tag == java_class_parser.JavaClass.ConstantPoolEntry.TagEnum.utf8:
+            # classes referenced in field and method descriptors and signatures
+            referenced_classes.update(__REFERENCED_TYPE_PATTERN.findall(entry.cp_info.value))
+    return referenced_classes
+
+
+def get_changed_classes(manifest, class_hashes):
+    """Computes the target classes that changed since the run recorded in the manifest.
+
+    Args:
+        manifest (dict): manifest of the previous run
+        class_hashes (dict): current hashes of the target classes
+
+    Returns:
+        tuple: list of changed (or new) target classes, list of target classes that are no longer targets
+    """
+    manifest_classes = manifest.get('classes', {})
+    changed_classes = sorted(class_name for class_name, class_hash in class_hashes.items()
+                             if manifest_classes.get(class_name, {}).get('hash') != class_hash)
+    removed_classes = sorted(set(manifest_classes) - set(class_hashes))
+    return changed_classes, removed_classes
+
+
+def filter_ctd_models_and_test_plans(ctd_plans, classes):
+    """Restricts CTD models and test plans to the given target classes"""
+    filtered_plans = {key: value for key, value in ctd_plans.items() if key != 'models_and_test_plans'}
+    filtered_plans['models_and_test_plans'] = {}
+    for partition, partition_plans in ctd_plans['models_and_test_plans'].items():
+        filtered_partition_plans = {class_name: class_plans for class_name, class_plans in partition_plans.items()
+                                    if class_name in classes}
+        if filtered_partition_plans:
+            filtered_plans['models_and_test_plans'][partition] = filtered_partition_plans
+    return filtered_plans
+
+
+def get_class_test_files(test_dir, class_names):
+    """Gets the test files generated by the extender for each of the given target classes.
+
+    The extender writes the tests for a target class to files, in the package directory of the class, whose
+    names start with the class name (with "." replaced by "_") followed by "_Test".
+
+    Args:
+        test_dir (str): root directory of the generated tests
+        class_names (list): target classes
+
+    Returns:
+        dict: map from target class name to list of test file paths (relative to the test directory)
+    """
+    prefixes = {class_name.replace('.', '_').replace('$', '_') + '_Test': class_name for class_name in class_names}
+    class_test_files = {class_name: [] for class_name in class_names}
+    for dir, _, files in os.walk(test_dir):
+        for file in files:
+            # longest matching prefix, as a class name can be a prefix of another class name
+            matching_prefixes = [prefix for prefix in prefixes if file.startswith(prefix)]
+            if matching_prefixes:
+                class_name = prefixes[max(matching_prefixes, key=len)]
+                class_test_files[class_name].append(os.path.relpath(os.path.join(dir, file), test_dir))
+    return class_test_files
+
+
+def remove_classes_from_report(report, classes):
+    """Removes the entries of the given target classes from an extender report keyed by partition and class"""
+    return {key: {class_name: value for class_name, value in partition_report.items() if class_name not in classes}
+            if isinstance(partition_report, dict) else partition_report
+            for key, partition_report in report.items() if key not in classes}
+
+
+def load_manifest(state_dir):
+    """Loads the manifest of the previous incremental run (an empty manifest if there is none)"""
+    try:
+        with open(os.path.join(state_dir, __MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != __MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_manifest(state_dir, class_hashes, class_test_files):
+    """Saves the manifest of the current incremental run.
+
+    Args:
+        state_dir (str): incremental state directory
+        class_hashes (dict): hashes of the target classes
+        class_test_files (dict): test files (relative to the test directory) of the target classes
+    """
+    manifest = {
+        'version': __MANIFEST_VERSION,
+        'classes': {class_name: {'hash': class_hash, 'tests': sorted(class_test_files.get(class_name, []))}
+                    for class_name, class_hash in class_hashes.items()}
+    }
+    os.makedirs(state_dir, exist_ok=True)
+    tmp_manifest_file = os.path.join(state_dir, __MANIFEST_FILE + '.tmp')
+    with open(tmp_manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_manifest_file, os.path.join(state_dir, __MANIFEST_FILE))
+
+
+def read_class_file(app_class_files, class_name):
+    """Reads a class file of the app (empty content if the class is not an app class)"""
+    if class_name not in app_class_files:
+        return b''
+    container, rel_path = app_class_files[class_name]
+    if os.path.isdir(container):
+        with open(os.path.join(container, rel_path), 'rb') as f:
+            return f.read()
+    with zipfile.ZipFile(container) as jar:
+        return jar.read(rel_path)
@@ -0,0 +1,215 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module reads and writes JaCoCo execution data (.exec) files in-process, so that raw coverage files
+can be merged without launching the JaCoCo CLI. The format is a sequence of blocks, each starting with a
+one-byte block type: a header block (magic number and format version), session info blocks (session id,
+start and dump time stamps), and execution data blocks (class id, class name, probe array).
+
+Execution data is represented as a dict mapping class id (unsigned 64-bit CRC of the class bytes) to a
+tuple (class name, probe count, probes), where probes is an int whose bit i is set if probe i was executed;
+this matches the little-endian bit packing used by JaCoCo for probe arrays, and lets probe arrays be
+unioned with a bitwise or.
+"""
+
+import struct
+
+# block types and header values of the JaCoCo execution data format (version 0x1007, JaCoCo 0.7.5+)
+BLOCK_HEADER = 0x01
+BLOCK_SESSIONINFO = 0x10
+BLOCK_EXECUTIONDATA = 0x11
+EXEC_MAGIC_NUMBER = 0xC0C0
+EXEC_FORMAT_VERSION = 0x1007
+
+__header_struct = struct.Struct('>BHH')
+__u2_struct = struct.Struct('>H')
+__u8_struct = struct.Struct('>Q')
+__s8_struct = struct.Struct('>q')
+
+
+def read_exec_file(exec_file):
+    """Reads a JaCoCo execution data file.
+
+    Args:
+        exec_file (str): path to the .exec file
+
+    Returns:
+        list: session info dicts with keys 'id', 'start' and 'dump'
+        dict: execution data, mapping class id to (class name, probe count, probes)
+
+    Raises:
+        ValueError: if the file is not a valid execution data file
+    """
+    with open(exec_file, 'rb') as f:
+        data = f.read()
+    return read_exec_data(data, exec_file)
+
+
+def read_exec_data(data, source='execution data'):
+    """Parses execution data from the given bytes (see read_exec_file())"""
+    sessions = []
+    exec_data = {}
+    pos = 0
+    size = len(data)
+    while pos < size:
+        block_type = data[pos]
+        pos += 1
+        if block_type == BLOCK_HEADER:
+            magic, version = __header_struct.unpack_from(data, pos - 1)[1:]
+            if magic != EXEC_MAGIC_NUMBER:
+                raise ValueError('{}: invalid execution data file'.format(source))
+            if version != EXEC_FORMAT_VERSION:
+                raise ValueError('{}: incompatible execution data version {:#x}'.format(source, version))
+            pos += 4
+        elif block_type == BLOCK_SESSIONINFO:
+            session_id, pos = __read_utf(data, pos)
+            start = __s8_struct.unpack_from(data, pos)[0]
+            dump = __s8_struct.unpack_from(data, pos + 8)[0]
+            pos += 16
+            sessions.append({'id': session_id, 'start': start, 'dump': dump})
+        elif block_type == BLOCK_EXECUTIONDATA:
+            class_id = __u8_struct.unpack_from(data, pos)[0]
+            class_name, pos = __read_utf(data, pos + 8)
+            probe_count, pos = __read_varint(data, pos)
+            probe_bytes = (probe_count + 7) // 8
+            probes = int.from_bytes(data[pos:pos + probe_bytes], 'little')
+            pos += probe_bytes
+            __merge_class_data(exec_data, class_id, class_name, probe_count, probes)
+        else:
+            raise ValueError('{}: unknown block type {:#x} at offset {}'.format(source, block_type, pos - 1))
+    return sessions, exec_data
+
+
+def write_exec_file(exec_file, sessions, exec_data):
+    """Writes session infos and execution data to a JaCoCo execution data file.
+
+    As in JaCoCo, classes without any executed probe are omitted from the written file.
+
+    Args:
+        exec_file (str): path to the .exec file to write
+        sessions (list): session info dicts with keys 'id', 'start' and 'dump'
+        exec_data (dict): execution data, mapping class id to (class name, probe count, probes)
+    """
+    with open(exec_file, 'wb') as f:
+        f.write(__header_struct.pack(BLOCK_HEADER, EXEC_MAGIC_NUMBER, EXEC_FORMAT_VERSION))
+        for session in sessions:
+            f.write(bytes([BLOCK_SESSIONINFO]))
+            f.write(__encode_utf(session['id']))
+            f.write(__s8_struct.pack(session['start']))
+            f.write(__s8_struct.pack(session['dump']))
+        for class_id, (class_name, probe_count, probes) in exec_data.items():
+            if not probes:
+                continue
+            f.write(bytes([BLOCK_EXECUTIONDATA]))
+            f.write(__u8_struct.pack(class_id))
+            f.write(__encode_utf(class_name))
+            f.write(__encode_varint(probe_count))
+            f.write(probes.to_bytes((probe_count + 7) // 8, 'little'))
+
+
+def merge_exec_data(target_exec_data, source_exec_data):
+    """Merges source execution data into target execution data.
+
+    Probe arrays of the same class are unioned; execution data for classes only in the source is added to
+    the target. The target dict is updated in place.
+
+    Raises:
+        ValueError: if the same class id is recorded with different class names or probe counts
+    """
+    for class_id, (class_name, probe_count, probes) in source_exec_data.items():
+        __merge_class_data(target_exec_data, class_id, class_name, probe_count, probes)
+    return target_exec_data
+
+
+def merge_exec_files(exec_files, dest_file):
+    """Merges JaCoCo execution data files into a single execution data file.
+
+    In-process equivalent of "jacococli merge <exec_files> --destfile <dest_file>": the sessions of all
+    files are retained and probe arrays of the same class are unioned. The destination file may also be
+    one of the input files.
+
+    Args:
+        exec_files (list): paths to the .exec files to merge
+        dest_file (str): path to the merged .exec file to write
+
+    Raises:
+        ValueError: if an input file is not a valid execution data file, or execution data is incompatible
+    """
+    merged_sessions = []
+    merged_exec_data = {}
+    for exec_file in exec_files:
+        sessions, exec_data = read_exec_file(exec_file)
+        merged_sessions.extend(sessions)
+        merge_exec_data(merged_exec_data, exec_data)
+    write_exec_file(dest_file, merged_sessions, merged_exec_data)
+
+
+def __merge_class_data(exec_data, class_id, class_name, probe_count, probes):
+    existing = exec_data.get(class_id)
+    if existing is None:
+        exec_data[class_id] = (class_name, probe_count, probes)
+        return
+    if existing[0] != class_name:
+        raise ValueError('Different class names {} and {} for id {:016x}'.format(existing[0], class_name, class_id))
+    if existing[1] != probe_count:
+        raise ValueError('Incompatible execution data for class {} with id {:016x}'.format(class_name, class_id))
+    exec_data[class_id] = (class_name, probe_count, existing[2] | probes)
+
+
+def __read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return value, pos
+        shift += 7
+
+
+def __encode_varint(value):
+    encoded = bytearray()
+    while value & ~0x7F:
+        encoded.append(0x80 | (value & 0x7F))
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def __read_utf(data, pos):
+    # strings are written with java.io.DataOutput.writeUTF(), which uses modified UTF-8
+    length = __u2_struct.unpack_from(data, pos)[0]
+    pos += 2
+    raw = bytes(data[pos:pos + length])
+    if raw.isascii():
+        return raw.decode('ascii'), pos + length
+    value = raw.replace(b'\xc0\x80', b'\x00').decode('utf-8', 'surrogatepass')
+    # combine surrogate pairs encoded separately into supplementary characters
+    value = value.encode('utf-16-be', 'surrogatepass').decode('utf-16-be')
+    return value, pos + length
+
+
+def __encode_utf(value):
+    if value.isascii() and '\x00' not in value:
+        raw = value.encode('ascii')
+    else:
+        # split supplementary characters into surrogate pairs, each encoded separately
+        units = value.encode('utf-16-be', 'surrogatepass')
+        value = ''.join(chr(int.from_bytes(units[i:i + 2], 'big')) for i in range(0, len(units), 2))
+        raw = value.encode('utf-8', 'surrogatepass').replace(b'\x00', b'\xc0\x80')
+    return __u2_struct.pack(len(raw)) + raw
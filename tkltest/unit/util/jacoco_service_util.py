@@ -0,0 +1,437 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module runs JaCoCo merge, report, and instrument operations in a long-lived JaCoCo service JVM, instead
+of launching the JaCoCo CLI for each operation. The service is started on the first request of a tkltest
+process, reads one request per line from its stdin and writes one response per line to its stdout, and
+keeps the class files read for the --classfiles locations cached between requests (re-reading a class file
+only if it changed). The analysis result of each class file is cached as well, keyed by its class id (the
+CRC64 checksum of its content) and its execution data, and is reused by later reports in which the class is
+unchanged and has the same probes (for example, classes not executed by the tests of either report), so that
+only the classes whose coverage changed are analyzed again. Class files in jars are analyzed for each report.
+The service is stopped by stop(), which is also called at exit.
+
+Requests consist of tab-separated fields: the operation name followed by name=value arguments (a list
+argument is given by repeating its name). The response is "OK", or "ERROR" followed by a tab and the error
+message. If the service cannot be started, operations fall back to running the JaCoCo CLI.
+
+Failed operations raise subprocess.CalledProcessError (with the error message as stderr), as do failed
+JaCoCo CLI commands run with command_util.run_command(), so callers handle both in the same way.
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from tkltest.util import command_util, constants, jvm_util
+from tkltest.util.logging_util import tkltest_status
+
+__SERVICE_CLASS = 'TkltestJacocoService'
+
+__SERVICE_SOURCE = """
+import java.io.BufferedReader;
+import java.io.ByteArrayInputStream;
+import java.io.File;
+import java.io.FileInputStream;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.jacoco.core.analysis.Analyzer;
+import org.jacoco.core.analysis.CoverageBuilder;
+import org.jacoco.core.analysis.IClassCoverage;
+import org.jacoco.core.data.ExecutionData;
+import org.jacoco.core.data.ExecutionDataStore;
+import org.jacoco.core.internal.data.CRC64;
+import org.jacoco.core.instr.Instrumenter;
+import org.jacoco.core.runtime.OfflineInstrumentationAccessGenerator;
+import org.jacoco.core.tools.ExecFileLoader;
+import org.jacoco.report.FileMultiReportOutput;
+import org.jacoco.report.IReportVisitor;
+import org.jacoco.report.MultiReportVisitor;
+import org.jacoco.report.MultiSourceFileLocator;
+import org.jacoco.report.csv.CSVFormatter;
+import org.jacoco.report.html.HTMLFormatter;
+import org.jacoco.report.xml.XMLFormatter;
+
+public class TkltestJacocoService {
+
+    private static class CachedFile {
+        final long lastModified;
+        final long length;
+        final byte[] content;
+
+        CachedFile(File file) throws IOException {
+            lastModified = file.lastModified();
+            length = file.length();
+            content = Files.readAllBytes(file.toPath());
+        }
+    }
+
+    private static class CachedAnalysis {
+        final long classId;
+        final boolean[] probes;
+        // null if the analyzer reported no coverage for the class (e.g., synthetic classes)
+        final IClassCoverage coverage;
+
+        CachedAnalysis(long classId, boolean[] probes, IClassCoverage coverage) {
+            this.classId = classId;
+            this.probes = probes;
+            this.coverage = coverage;
+        }
+    }
+
+    private final Map<String, CachedFile> fileCache = new HashMap<>();
+    private final Map<String, CachedAnalysis> analysisCache = new HashMap<>();
+
+    private byte[] getContent(File file) throws IOException {
+        String path = file.getAbsolutePath();
+        CachedFile cached = fileCache.get(path);
+        if (cached == null || cached.lastModified != file.lastModified() || cached.length != file.length()) {
+            cached = new CachedFile(file);
+            fileCache.put(path, cached);
+        }
+        return cached.content;
+    }
+
+    private void analyze(ExecutionDataStore executionData, CoverageBuilder builder, File file) throws IOException {
+        if (file.isDirectory()) {
+            File[] children = file.listFiles();
+            if (children != null) {
+                for (File child : children) {
+                    analyze(executionData, builder, child);
+                }
+            }
+        } else if (file.isFile() && file.getName().endsWith(".class")) {
+            analyzeClass(executionData, builder, file);
+        } else if (file.isFile()) {
+            new Analyzer(executionData, builder).analyzeAll(new ByteArrayInputStream(getContent(file)),
+                file.getPath());
+        }
+    }
+
+    private void analyzeClass(ExecutionDataStore executionData, CoverageBuilder builder, File file)
+            throws IOException {
+        byte[] content = getContent(file);
+        long classId = CRC64.classId(content);
+        ExecutionData data = executionData.get(classId);
+        boolean[] probes = data == null ? null : data.getProbes();
+        String path = file.getAbsolutePath();
+        CachedAnalysis cached = analysisCache.get(path);
+        // the coverage of a class depends on its content and probes only, except for the no-match flag of classes
+        // without execution data (set if the execution data has a class with the same name but another id)
+        if (cached != null && cached.classId == classId && Arrays.equals(cached.probes, probes)
+                && (cached.coverage == null || cached.coverage.isNoMatch()
+                    == (probes == null && executionData.contains(cached.coverage.getName())))) {
+            if (cached.coverage != null) {
+                builder.visitCoverage(cached.coverage);
+            }
+            return;
+        }
+        IClassCoverage[] coverage = new IClassCoverage[1];
+        new Analyzer(executionData, classCoverage -> coverage[0] = classCoverage)
+            .analyzeClass(content, file.getPath());
+        analysisCache.put(path, new CachedAnalysis(classId, probes == null ? null : probes.clone(), coverage[0]));
+        if (coverage[0] != null) {
+            builder.visitCoverage(coverage[0]);
+        }
+    }
+
+    private ExecFileLoader load(List<String> execFiles) throws IOException {
+        ExecFileLoader loader = new ExecFileLoader();
+        for (String execFile : execFiles) {
+            loader.load(new File(execFile));
+        }
+        return loader;
+    }
+
+    private void merge(Map<String, List<String>> args) throws IOException {
+        load(get(args, "exec")).save(new File(getOne(args, "dest")), false);
+    }
+
+    private void report(Map<String, List<String>> args) throws IOException {
+        ExecFileLoader loader = load(get(args, "exec"));
+        CoverageBuilder builder = new CoverageBuilder();
+        for (String classFiles : get(args, "classfiles")) {
+            analyze(loader.getExecutionDataStore(), builder, new File(classFiles));
+        }
+        List<IReportVisitor> visitors = new ArrayList<>();
+        List<OutputStream> outputs = new ArrayList<>();
+        try {
+            if (args.containsKey("csv")) {
+                OutputStream out = new FileOutputStream(getOne(args, "csv"));
+                outputs.add(out);
+                visitors.add(new CSVFormatter().createVisitor(out));
+            }
+            if (args.containsKey("xml")) {
+                OutputStream out = new FileOutputStream(getOne(args, "xml"));
+                outputs.add(out);
+                visitors.add(new XMLFormatter().createVisitor(out));
+            }
+            if (args.containsKey("html")) {
+                visitors.add(new HTMLFormatter().createVisitor(new FileMultiReportOutput(new File(getOne(args, "html")))));
+            }
+            IReportVisitor visitor = new MultiReportVisitor(visitors);
+            visitor.visitInfo(loader.getSessionInfoStore().getInfos(), loader.getExecutionDataStore().getContents());
+            visitor.visitBundle(builder.getBundle("JaCoCo Coverage Report"), new MultiSourceFileLocator(4));
+            visitor.visitEnd();
+        } finally {
+            for (OutputStream out : outputs) {
+                out.close();
+            }
+        }
+    }
+
+    private void instrument(Instrumenter instrumenter, File source, File dest) throws IOException {
+        if (source.isDirectory()) {
+            File[] children = source.listFiles();
+            if (children != null) {
+                for (File child : children) {
+                    instrument(instrumenter, child, new File(dest, child.getName()));
+                }
+            }
+            return;
+        }
+        dest.getParentFile().mkdirs();
+        try (InputStream in = new FileInputStream(source); OutputStream out = new FileOutputStream(dest)) {
+            instrumenter.instrumentAll(in, out, source.getPath());
+        }
+    }
+
+    private void instrument(Map<String, List<String>> args) throws IOException {
+        Instrumenter instrumenter = new Instrumenter(new OfflineInstrumentationAccessGenerator());
+        File dest = new File(getOne(args, "dest"));
+        for (String source : get(args, "source")) {
+            File sourceFile = new File(source);
+            instrument(instrumenter, sourceFile, sourceFile.isDirectory() ? dest : new File(dest, sourceFile.getName()));
+        }
+    }
+
+    private static List<String> get(Map<String, List<String>> args, String name) {
+        List<String> values = args.get(name);
+        return values == null ? new ArrayList<String>() : values;
+    }
+
+    private static String getOne(Map<String, List<String>> args, String name) {
+        List<String> values = get(args, name);
+        if (values.size() != 1) {
+            throw new IllegalArgumentException("expected one value for argument " + name);
+        }
+        return values.get(0);
+    }
+
+    public static void main(String[] args) throws IOException {
+        // responses are written to the original stdout; any other output goes to stderr
+        PrintStream responses = new PrintStream(System.out, true, "UTF-8");
+        System.setOut(System.err);
+        TkltestJacocoService service = new TkltestJacocoService();
+        BufferedReader requests = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String request;
+        while ((request = requests.readLine()) != null) {
+            String[] fields = request.split("\\t");
+            if (fields[0].equals("quit")) {
+                break;
+            }
+            Map<String, List<String>> requestArgs = new HashMap<>();
+            for (int i = 1; i < fields.length; i++) {
+                int sep = fields[i].indexOf('=');
+                requestArgs.computeIfAbsent(fields[i].substring(0, sep), k -> new ArrayList<>())
+                    .add(fields[i].substring(sep + 1));
+            }
+            try {
+                if (fields[0].equals("merge")) {
+                    service.merge(requestArgs);
+                } else if (fields[0].equals("report")) {
+                    service.report(requestArgs);
+                } else if (fields[0].equals("instrument")) {
+                    service.instrument(requestArgs);
+                } else {
+                    throw new IllegalArgumentException("unknown operation " + fields[0]);
+                }
+                responses.println("OK");
+            } catch (Throwable e) {
+                responses.println("ERROR\\t" + String.valueOf(e).replace('\\n', ' ').replace('\\r', ' '));
+            }
+        }
+    }
+}
+"""
+
+__service = {}
+__service_lock = threading.Lock()
+
+
+def merge(exec_files, dest_file, jdk_path=None, max_memory=None):
+    """Merges JaCoCo execution data files into the given destination file.
+
+    Args:
+        exec_files (list): execution data files to merge
+        dest_file (str): merged execution data file to write
+        jdk_path (str): path to the jdk home to run the service with (used when starting the service)
+        max_memory (int): maximal memory, in MB, of the service JVM (used when starting the service)
+
+    Raises:
+        subprocess.CalledProcessError: if the merge failed
+    """
+    args = [('exec', exec_file) for exec_file in exec_files] + [('dest', dest_file)]
+    cli_command = 'merge {} --destfile {}'.format(' '.join(exec_files), dest_file)
+    __run_operation('merge', args, cli_command, jdk_path, max_memory)
+
+
+def report(exec_files, class_files, csv_file='', html_dir='', xml_file='', jdk_path=None, max_memory=None):
+    """Creates CSV, HTML, and XML coverage reports, as specified, for the given execution data files.
+
+    Args:
+        exec_files (list): execution data files to create the report for
+        class_files (list): App classes paths (class file directories or jars)
+        csv_file (str): CSV report file to create (if empty, no CSV report is created)
+        html_dir (str): directory to create the HTML report in (if empty, no HTML report is created)
+        xml_file (str): XML report file to create (if empty, no XML report is created)
+        jdk_path (str): path to the jdk home to run the service with (used when starting the service)
+        max_memory (int): maximal memory, in MB, of the service JVM (used when starting the service)
+
+    Raises:
+        subprocess.CalledProcessError: if creating the report failed
+    """
+    args = [('exec', exec_file) for exec_file in exec_files] + \
+           [('classfiles', class_file) for class_file in class_files]
+    cli_command = 'report {} {}'.format(' '.join(exec_files),
+                                        ' '.join('--classfiles {}'.format(class_file) for class_file in class_files))
+    for name, cli_option, value in [('csv', '--csv', csv_file), ('html', '--html', html_dir),
+                                    ('xml', '--xml', xml_file)]:
+        if value:
+            args.append((name, value))
+            cli_command += ' {} {}'.format(cli_option, value)
+    __run_operation('report', args, cli_command, jdk_path, max_memory)
+
+
+def instrument(class_files, dest_dir, jdk_path=None, max_memory=None):
+    """Instruments the given class files for offline coverage collection.
+
+    Args:
+        class_files (list): class file directories, class files, or jars to instrument
+        dest_dir (str): directory to write the instrumented class files to
+        jdk_path (str): path to the jdk home to run the service with (used when starting the service)
+        max_memory (int): maximal memory, in MB, of the service JVM (used when starting the service)
+
+    Raises:
+        subprocess.CalledProcessError: if the instrumentation failed
+    """
+    args = [('source', class_file) for class_file in class_files] + [('dest', dest_dir)]
+    cli_command = 'instrument {} --dest {}'.format(' '.join(class_files), dest_dir)
+    __run_operation('instrument', args, cli_command, jdk_path, max_memory)
+
+
+def stop():
+    """Stops the JaCoCo service JVM, if it was started by this process"""
+    with __service_lock:
+        process = __service.pop('process', None)
+        work_dir = __service.pop('work_dir', None)
+        __service.pop('failed', None)
+        if process is not None:
+            try:
+                process.stdin.write('quit\n')
+                process.stdin.close()
+                process.wait(timeout=60)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def __run_operation(operation, args, cli_command, jdk_path, max_memory):
+    args = [(name, os.path.abspath(value)) for name, value in args]
+    request = '\t'.join([operation] + ['{}={}'.format(name, value) for name, value in args])
+    with __service_lock:
+        process = __get_service(jdk_path, max_memory)
+        if process is not None:
+            try:
+                process.stdin.write(request + '\n')
+                process.stdin.flush()
+                response = process.stdout.readline().rstrip('\n')
+            except OSError as e:
+                response = 'ERROR\t{}'.format(e)
+            if response == 'OK':
+                return
+            error = response.split('\t', 1)[1] if '\t' in response else 'JaCoCo service terminated'
+            raise subprocess.CalledProcessError(1, request, stderr=error)
+
+    # the service is not available: run the jacoco cli
+    env_vars = dict(os.environ.copy())
+    if jdk_path:
+        env_vars['JAVA_HOME'] = jdk_path
+    jacoco_cli_file = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)
+    class_data_sharing_args = jvm_util.get_class_data_sharing_args('java', 'jacococli', [jacoco_cli_file])
+    command = 'java {}{}-jar {} {}'.format('-Xmx{}m '.format(max_memory) if max_memory else '',
+                                           class_data_sharing_args + ' ' if class_data_sharing_args else '',
+                                           jacoco_cli_file, cli_command)
+    command_util.run_command(command, verbose=True, env_vars=env_vars)
+
+
+def __get_service(jdk_path, max_memory):
+    """Returns the service process, starting it if needed, or None if the service cannot be started"""
+    process = __service.get('process')
+    if process is not None and process.poll() is None:
+        return process
+    if __service.get('failed'):
+        return None
+
+    env_vars = dict(os.environ.copy())
+    if jdk_path:
+        env_vars['JAVA_HOME'] = jdk_path
+    jacoco_cli_file = os.path.join(constants.TKLTEST_LIB_DOWNLOAD_DIR, constants.JACOCO_CLI_JAR_NAME)
+    work_dir = __service.get('work_dir') or tempfile.mkdtemp(prefix='tkltest-jacoco-service-')
+    __service['work_dir'] = work_dir
+    service_file = os.path.join(work_dir, __SERVICE_CLASS + '.java')
+    try:
+        if not os.path.isfile(os.path.join(work_dir, __SERVICE_CLASS + '.class')):
+            with open(service_file, 'w') as f:
+                f.write(__SERVICE_SOURCE)
+            subprocess.run(['javac', '-nowarn', '-cp', jacoco_cli_file, '-d', work_dir, service_file], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env_vars, encoding='utf-8')
+        command = ['java']
+        if max_memory:
+            command.append('-Xmx{}m'.format(max_memory))
+        command += ['-cp', os.pathsep.join([work_dir, jacoco_cli_file]), __SERVICE_CLASS]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env_vars,
+                                   encoding='utf-8')
+    except (OSError, subprocess.CalledProcessError) as e:
+        tkltest_status('Warning: failed to start JaCoCo service, running JaCoCo CLI instead: {}\n{}'.format(
+            e, getattr(e, 'stderr', '')))
+        __service['failed'] = True
+        return None
+    logging.info('started JaCoCo service: {}'.format(' '.join(command)))
+    __service['process'] = process
+    return process
+
+
+atexit.register(stop)
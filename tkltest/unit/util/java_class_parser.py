@@ -472,7 +472,7 @@ class JavaClass(KaitaiStruct):
 
         def _read(self):
             self.str_len = self._io.read_u2be()
-            self.value = (self._io.read_bytes(self.str_len)).decode(u"UTF-8")
+            self.value = (self._io.read_bytes(self.str_len)).decode(u"UTF-8", errors="replace")
 
 
     class StringCpInfo(KaitaiStruct):
@@ -490,6 +490,21 @@ class JavaClass(KaitaiStruct):
             self.string_index = self._io.read_u2be()
 
 
+    class ModuleCpInfo(KaitaiStruct):
+        """
+        .. seealso::
+           Source - https://docs.oracle.com/javase/specs/jvms/se11/html/jvms-4.html#jvms-4.4.11
+        """
+        def __init__(self, _io, _parent=None, _root=None):
+            self._io = _io
+            self._parent = _parent
+            self._root = _root if _root else self
+            self._read()
+
+        def _read(self):
+            self.name_index = self._io.read_u2be()
+
+
     class MethodTypeCpInfo(KaitaiStruct):
         """
         .. seealso::
@@ -588,7 +603,10 @@ class JavaClass(KaitaiStruct):
             name_and_type = 12
             method_handle = 15
             method_type = 16
+            dynamic = 17
             invoke_dynamic = 18
+            module = 19
+            package = 20
         def __init__(self, is_prev_two_entries, _io, _parent=None, _root=None):
             self._io = _io
             self._parent = _parent
@@ -624,6 +642,12 @@ class JavaClass(KaitaiStruct):
                     self.cp_info = JavaClass.DoubleCpInfo(self._io, self, self._root)
                 elif _on == JavaClass.ConstantPoolEntry.TagEnum.invoke_dynamic:
                     self.cp_info = JavaClass.InvokeDynamicCpInfo(self._io, self, self._root)
+                elif _on == JavaClass.ConstantPoolEntry.TagEnum.dynamic:
+                    self.cp_info = JavaClass.InvokeDynamicCpInfo(self._io, self, self._root)
+                elif _on == JavaClass.ConstantPoolEntry.TagEnum.module:
+                    self.cp_info = JavaClass.ModuleCpInfo(self._io, self, self._root)
+                elif _on == JavaClass.ConstantPoolEntry.TagEnum.package:
+                    self.cp_info = JavaClass.ModuleCpInfo(self._io, self, self._root)
                 elif _on == JavaClass.ConstantPoolEntry.TagEnum.field_ref:
                     self.cp_info = JavaClass.FieldRefCpInfo(self._io, self, self._root)
                 elif _on == JavaClass.ConstantPoolEntry.TagEnum.method_handle:
@@ -0,0 +1,927 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module computes code coverage counters directly from JaCoCo probe arrays, so that the coverage of many
+test suites can be compared without creating a JaCoCo report for each of them.
+
+The class files of the app are analyzed once, replicating the probe placement of the JaCoCo (0.8.7)
+instrumenter and the coverage computation of the JaCoCo analyzer: every instruction, branch, source line and
+method of a class is covered if and only if at least one probe of a specific set of probes of the class is
+executed. Coverage items controlled by the same probe set are grouped together, and each group is weighted
+with its instruction, branch, line and method counts. The coverage of a test is then the set of groups hit
+by its probes, and coverage gains become weighted popcounts over bit-packed (tests x groups) matrices.
+
+The JaCoCo filters for Java bytecode are applied: the method-level filters (synthetic and bridge methods,
+generated enum and record methods, private empty constructors, methods annotated as generated) and the
+instruction-level filters for javac-generated code (exception handlers of synchronized blocks, duplicated
+finally blocks, string switches). The filters for try-with-resources, for string switches compiled by ecj and
+for Kotlin are not applied, so the counters of such code can differ slightly from the ones in a JaCoCo report.
+Classes that cannot be analyzed are modeled with one instruction per probe.
+"""
+
+import logging
+import os
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+from tkltest.unit.util import java_class_parser
+
+# order of the coverage counters in the weight vectors of coverage items
+COVERAGE_COUNTERS = ('instruction', 'branch', 'line', 'method')
+
+# access flags
+__ACC_PRIVATE = 0x0002
+__ACC_SYNTHETIC = 0x1000
+__ACC_MODULE = 0x8000
+
+# opcodes relevant for probe placement and filtering
+__LDC = 0x12
+__ILOAD = 0x15
+__ALOAD = 0x19
+__ISTORE = 0x36
+__ASTORE = 0x3a
+__IINC = 0x84
+__IFEQ = 0x99
+__GOTO = 0xa7
+__JSR = 0xa8
+__RET = 0xa9
+__TABLESWITCH = 0xaa
+__LOOKUPSWITCH = 0xab
+__IRETURN = 0xac
+__ARETURN = 0xb0
+__RETURN = 0xb1
+__INVOKEVIRTUAL = 0xb6
+__INVOKESPECIAL = 0xb7
+__INVOKEDYNAMIC = 0xba
+__ATHROW = 0xbf
+__MONITOREXIT = 0xc3
+__WIDE = 0xc4
+__IFNULL = 0xc6
+__IFNONNULL = 0xc7
+__GOTO_W = 0xc8
+__JSR_W = 0xc9
+
+# lengths of fixed-size instructions, indexed by opcode (0 for invalid and variable-length instructions)
+__OPCODE_LENGTHS = (
+    [1] * 16 +  # nop .. dconst_1
+    [2, 3, 2, 3, 3] +  # bipush, sipush, ldc, ldc_w, ldc2_w
+    [2] * 5 +  # iload .. aload
+    [1] * 28 +  # iload_0 .. saload
+    [2] * 5 +  # istore .. astore
+    [1] * 73 +  # istore_0 .. lxor
+    [3] +  # iinc
+    [1] * 20 +  # i2l .. dcmpg
+    [3] * 16 +  # ifeq .. jsr
+    [2, 0, 0] +  # ret, tableswitch, lookupswitch
+    [1] * 6 +  # ireturn .. return
+    [3] * 7 +  # getstatic .. invokestatic
+    [5, 5, 3, 2, 3, 1, 1, 3, 3, 1, 1, 0, 4, 3, 3, 5, 5] +  # invokeinterface .. jsr_w
+    [0] * 54
+)
+
+# instructions are decoded as by ASM, which the JaCoCo filters are written against: instructions with an implicit
+# local variable (e.g., aload_1) take their generic form (aload 1), and wide forms (e.g., goto_w, ldc_w) their
+# short form
+__IMPLICIT_VAR_OPCODES = dict(
+    [(opcode, (__ILOAD + (opcode - 0x1a) // 4, (opcode - 0x1a) % 4)) for opcode in range(0x1a, 0x2e)] +
+    [(opcode, (__ISTORE + (opcode - 0x3b) // 4, (opcode - 0x3b) % 4)) for opcode in range(0x3b, 0x4f)]
+)
+__SHORT_OPCODES = {0x13: __LDC, 0x14: __LDC, __GOTO_W: __GOTO, __JSR_W: __JSR}
+__VAR_OPCODES = frozenset(list(range(__ILOAD, __ALOAD + 1)) + list(range(__ISTORE, __ASTORE + 1)) + [__RET])
+__CONSTANT_POOL_OPCODES = frozenset([0x13, 0x14, 0xbb, 0xbd, 0xc0, 0xc1, 0xc5] + list(range(0xb2, __INVOKEDYNAMIC + 1)))
+
+__RETURN_OPCODES = frozenset(range(__IRETURN, __RETURN + 1))
+__INVOKE_OPCODES = frozenset(range(__INVOKEVIRTUAL, __INVOKEDYNAMIC + 1))
+__JUMP_OPCODES = frozenset(list(range(__IFEQ, __JSR + 1)) + [__IFNULL, __IFNONNULL])
+__SWITCH_OPCODES = frozenset([__TABLESWITCH, __LOOKUPSWITCH])
+
+
+# JaCoCo class ids: CRC64 with the reversed ECMA-182 polynomial used by org.jacoco.core.internal.data.CRC64
+def __crc64_table_entry(value, poly=0xd800000000000000):
+    for _ in range(8):
+        value = (value >> 1) ^ poly if value & 1 else value >> 1
+    return value
+
+
+__CRC64_TABLE = tuple(__crc64_table_entry(i) for i in range(256))
+
+__s2_struct = struct.Struct('>h')
+__s4_struct = struct.Struct('>i')
+
+# maximum number of test rows for which coverage gains are computed at a time, and maximum size (in bytes) of the
+# temporary arrays for computing them
+__GAIN_CHUNK_SIZE = 256
+__GAIN_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+def get_class_id(class_bytes):
+    """Computes the JaCoCo class id (CRC64 checksum) of the given class file contents.
+
+    As in JaCoCo, class files with the Java 9 version number are hashed as if they had the Java 8 version
+    number.
+
+    Args:
+        class_bytes (bytes): contents of the class file
+
+    Returns:
+        int: class id as an unsigned 64-bit integer
+    """
+    if len(class_bytes) > 7 and class_bytes[6] == 0 and class_bytes[7] == 53:
+        class_bytes = class_bytes[:7] + bytes([52]) + class_bytes[8:]
+    table = __CRC64_TABLE
+    crc = 0
+    for b in class_bytes:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xff]
+    return crc
+
+
+def analyze_class_files(class_files):
+    """Analyzes the app class files to compute the coverage model of each class.
+
+    Class files are read from the given directories (recursively, including jar files contained in them)
+    and jar files, as done by the JaCoCo report command for its "--classfiles" option.
+
+    Args:
+        class_files (list): paths to app class directories and jar files
+
+    Returns:
+        dict: mapping from class id to the coverage model of the class; the model is a dict with keys 'name',
+            'probe_count' and 'groups', where groups is a list of (probe mask, weights) tuples giving the
+            instruction, branch, line and method counts of the coverage items covered iff at least one probe
+            in the mask is executed (None if the class could not be analyzed)
+    """
+    class_models = {}
+    for class_path in class_files:
+        if os.path.isdir(class_path):
+            for dir_path, _, files in os.walk(class_path):
+                for file in sorted(files):
+                    file_path = os.path.join(dir_path, file)
+                    if file.endswith('.class'):
+                        with open(file_path, 'rb') as f:
+                            __add_class_model(class_models, f.read(), file_path)
+                    elif file.endswith('.jar') or file.endswith('.zip'):
+                        __analyze_archive(class_models, file_path)
+        elif os.path.isfile(class_path):
+            if class_path.endswith('.class'):
+                with open(class_path, 'rb') as f:
+                    __add_class_model(class_models, f.read(), class_path)
+            else:
+                __analyze_archive(class_models, class_path)
+    return class_models
+
+
+def analyze_class(class_bytes):
+    """Computes the coverage model of a class (see analyze_class_files()).
+
+    Args:
+        class_bytes (bytes): contents of the class file
+
+    Returns:
+        dict: coverage model of the class, or None if the class is not considered for coverage (module info
+            and synthetic classes)
+
+    Raises:
+        ValueError: if the class uses bytecode features not supported by the analysis (subroutines)
+    """
+    class_file = java_class_parser.JavaClass.from_bytes(class_bytes)
+    if class_file.access_flags & (__ACC_MODULE | __ACC_SYNTHETIC):
+        return None
+    class_name = __get_class_name(class_file, class_file.this_class)
+    super_name = __get_class_name(class_file, class_file.super_class) if class_file.super_class else None
+    class_generated = __has_generated_annotation(class_file, class_file.attributes)
+
+    groups = {}
+    line_masks = {}
+    probe_id = 0
+    for method in class_file.methods:
+        code = next((attr.info for attr in method.attributes if attr.name_as_str == 'Code'), None)
+        if code is None:
+            continue
+        instructions = __decode_instructions(code.code)
+        line_numbers = [
+            (entry.start_pc, entry.line_number)
+            for attr in code.attributes if attr.name_as_str == 'LineNumberTable'
+            for entry in attr.info.line_number_table
+        ]
+        branch_masks, branch_counts, lines, probe_id = __analyze_method(instructions, code.exception_table,
+                                                                        line_numbers, probe_id)
+        if class_generated or __is_method_filtered(class_file, class_name, super_name, method, instructions):
+            continue
+        ignored = __filter_instructions(class_file, instructions, code.exception_table, branch_masks)
+        method_mask = None
+        for i, masks in enumerate(branch_masks):
+            if i in ignored:
+                continue
+            mask = 0
+            for branch_mask in masks.values():
+                mask |= branch_mask
+            __add_weights(groups, mask, 0)
+            if branch_counts[i] > 1:
+                for branch in range(branch_counts[i]):
+                    __add_weights(groups, masks.get(branch, 0), 1)
+            if lines[i] >= 0:
+                line_masks[lines[i]] = line_masks.get(lines[i], 0) | mask
+            method_mask = (method_mask or 0) | mask
+        if method_mask is not None:
+            __add_weights(groups, method_mask, 3)
+    for mask in line_masks.values():
+        __add_weights(groups, mask, 2)
+
+    return {
+        'name': class_name,
+        'probe_count': probe_id,
+        'groups': [(mask, tuple(weights)) for mask, weights in groups.items()]
+    }
+
+
+def build_coverage_matrix(class_models, base_exec_data, tests_exec_data, memory_budget=None):
+    """Builds the coverage matrix of tests over the coverage items not covered by the base test suite.
+
+    The execution data of the tests is streamed: it is consumed one test at a time, so that only the execution
+    data of a single test is held in memory, along with one sparse probe-to-items index per class (built when
+    the class is first seen in the execution data). For each class in the execution data of a test, the
+    executed probes of the test select the groups of the class coverage model that it covers. Only groups
+    that are not covered by the base test suite and are covered by at least one test are kept as columns of
+    the matrix. Rows of the matrix are bit-packed (eight coverage items per byte, in little-endian bit order).
+
+    Memory use does not grow with the number of tests: the covered items of each test are spilled to a temporary
+    file, from which the matrix is filled in blocks of rows that fit in the memory budget. If the matrix itself
+    does not fit in the memory budget, it is backed by a temporary file (as a numpy.memmap, whose pages are
+    loaded on access).
+
+    Args:
+        class_models (dict): class coverage models, as returned by analyze_class_files()
+        base_exec_data (dict): execution data of the base test suite (see jacoco_exec_util)
+        tests_exec_data (iterable): execution data of each test (for example, a generator that reads the
+            execution data files of the tests one at a time)
+        memory_budget (int): maximum size, in MB, of the matrix and of the blocks of rows used for filling it
+            (None for no limit)
+
+    Returns:
+        numpy.ndarray: bit-packed uint8 matrix (tests x coverage items) of items covered by each test
+        numpy.ndarray: integer matrix (coverage items x counters) of the counts of each coverage item, in the
+            order given by COVERAGE_COUNTERS
+    """
+    class_indices = {}
+    weight_blocks = []
+    item_count = 0
+    test_count = 0
+    with tempfile.TemporaryFile() as items_file:
+        for exec_data in tests_exec_data:
+            items = []
+            for class_id, (_, probe_count, probes) in exec_data.items():
+                if class_id not in class_models or not probes:
+                    continue
+                class_index = class_indices.get(class_id)
+                if class_index is None:
+                    class_index = __get_class_index(class_models[class_id], probe_count,
+                                                    __get_probes(base_exec_data, class_id, probe_count), item_count)
+                    class_indices[class_id] = class_index
+                    if class_index is not None:
+                        weight_blocks.append(class_index['weights'])
+                        item_count += len(class_index['weights'])
+                if class_index is None or class_index['probe_count'] != probe_count:
+                    continue
+                executed = __unpack_probes([probes], probe_count)[0]
+                items.append(class_index['items'][executed[class_index['probes']]])
+            # items covered by several executed probes are repeated, which does not affect the matrix
+            items = np.concatenate(items).astype(np.int32) if items else np.zeros(0, dtype=np.int32)
+            items_file.write(np.int32(len(items)).tobytes())
+            items_file.write(items.tobytes())
+            test_count += 1
+
+        # keep only items covered by at least one test
+        used = np.zeros(item_count, dtype=bool)
+        for items in __read_test_items(items_file, test_count):
+            used[items] = True
+        columns = (np.cumsum(used, dtype=np.int64) - 1).astype(np.int32)
+        column_count = int(used.sum())
+        row_bytes = (column_count + 7) // 8
+        budget = memory_budget * 1024 * 1024 if memory_budget else None
+        if budget is not None and test_count * row_bytes > budget:
+            coverage = np.memmap(tempfile.TemporaryFile(), dtype=np.uint8, mode='w+', shape=(test_count, row_bytes))
+        else:
+            coverage = np.zeros((test_count, row_bytes), dtype=np.uint8)
+        block_rows = max(1, budget // max(1, row_bytes)) if budget is not None else __GAIN_CHUNK_SIZE
+        block = np.zeros((min(block_rows, max(1, test_count)), row_bytes), dtype=np.uint8)
+        block_start = 0
+        for row, items in enumerate(__read_test_items(items_file, test_count)):
+            if row - block_start == len(block):
+                coverage[block_start:row] = block
+                block[:] = 0
+                block_start = row
+            if len(items):
+                item_columns = columns[items]
+                np.bitwise_or.at(block[row - block_start], item_columns >> 3,
+                                 np.left_shift(1, item_columns & 7).astype(np.uint8))
+        coverage[block_start:test_count] = block[:test_count - block_start]
+    if weight_blocks:
+        weights = np.concatenate(weight_blocks)[used]
+    else:
+        weights = np.zeros((0, len(COVERAGE_COUNTERS)), dtype=np.int64)
+    return coverage, weights
+
+
+def compute_coverage_gain(coverage, weights, covered=None):
+    """Computes the coverage gain of each test over the given covered items.
+
+    Args:
+        coverage (numpy.ndarray): bit-packed matrix (tests x coverage items), or vector of a single test
+        weights (numpy.ndarray): integer matrix (coverage items x counters)
+        covered (numpy.ndarray): bit-packed vector of already covered items (None if no item is covered)
+
+    Returns:
+        numpy.ndarray: integer matrix (tests x counters), or vector for a single test, of coverage gains
+    """
+    if coverage.ndim == 1:
+        return compute_coverage_gain(coverage[np.newaxis, :], weights, covered)[0]
+    gains = np.zeros((coverage.shape[0], weights.shape[1]), dtype=np.int64)
+    float_weights = weights.astype(np.float64)
+    # unpacked rows take 9 bytes per item (as uint8 and float64)
+    chunk_size = max(1, min(__GAIN_CHUNK_SIZE, __GAIN_CHUNK_BYTES // max(1, 9 * weights.shape[0])))
+    for start in range(0, coverage.shape[0], chunk_size):
+        block = coverage[start:start + chunk_size]
+        if covered is not None:
+            block = block & ~covered
+        block = np.unpackbits(block, axis=1, count=weights.shape[0], bitorder='little')
+        gains[start:start + chunk_size] = np.rint(np.dot(block.astype(np.float64), float_weights))
+    return gains
+
+
+def compute_class_coverage(class_models, exec_data):
+    """Computes the coverage counters of each analyzed class from execution data.
+
+    Args:
+        class_models (dict): class coverage models, as returned by analyze_class_files()
+        exec_data (dict): execution data, e.g., merged from the execution data of several tests (see
+            jacoco_exec_util)
+
+    Returns:
+        dict: mapping from class name (in internal form) to a dict with the covered and total counts of each
+            counter (keys '<counter>_covered' and '<counter>_total', for the counters in COVERAGE_COUNTERS);
+            classes that could not be analyzed are not included
+    """
+    class_coverage = {}
+    for class_id, class_model in class_models.items():
+        if class_model['groups'] is None:
+            continue
+        probes = __get_probes(exec_data, class_id, class_model['probe_count'])
+        counters = class_coverage.setdefault(class_model['name'], {
+            counter + suffix: 0 for counter in COVERAGE_COUNTERS for suffix in ('_covered', '_total')
+        })
+        for mask, weights in class_model['groups']:
+            for counter, weight in zip(COVERAGE_COUNTERS, weights):
+                counters[counter + '_total'] += weight
+                if mask & probes:
+                    counters[counter + '_covered'] += weight
+    return class_coverage
+
+
+def __read_test_items(items_file, test_count):
+    # reads back the covered items of each test, as written by build_coverage_matrix()
+    items_file.seek(0)
+    for _ in range(test_count):
+        item_count = int(np.frombuffer(items_file.read(4), dtype=np.int32)[0])
+        yield np.frombuffer(items_file.read(4 * item_count), dtype=np.int32)
+
+
+def __get_class_index(class_model, probe_count, base_probes, first_item):
+    # sparse probe-to-items index of the groups of a class that are not covered by the base test suite: the
+    # groups containing probe p are items[probes == p], numbered from first_item on
+    groups = [(mask, weights) for mask, weights in __get_class_groups(class_model, probe_count)
+              if mask and not mask & base_probes]
+    if not groups:
+        return None
+    incidence = __unpack_probes([mask for mask, _ in groups], probe_count)
+    group_indices, probes = np.nonzero(incidence)
+    return {
+        'probe_count': probe_count,
+        'probes': probes.astype(np.int32),
+        'items': (group_indices + first_item).astype(np.int32),
+        'weights': np.array([weights for _, weights in groups], dtype=np.int64),
+    }
+
+
+def __add_class_model(class_models, class_bytes, source):
+    class_id = get_class_id(class_bytes)
+    if class_id in class_models:
+        return
+    try:
+        class_model = analyze_class(class_bytes)
+    except Exception as e:
+        logging.warning('Could not analyze class file {}, using probe-level coverage: {}'.format(source, e))
+        class_model = {'name': None, 'probe_count': None, 'groups': None}
+    if class_model is not None:
+        class_models[class_id] = class_model
+
+
+def __analyze_archive(class_models, archive_path):
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for entry in archive.namelist():
+                if entry.endswith('.class'):
+                    __add_class_model(class_models, archive.read(entry), archive_path + '@' + entry)
+    except (OSError, zipfile.BadZipFile) as e:
+        logging.warning('Could not read class files from {}: {}'.format(archive_path, e))
+
+
+def __get_class_groups(class_model, probe_count):
+    # fall back to one instruction per probe for classes that could not be analyzed exactly
+    if class_model['groups'] is None or class_model['probe_count'] != probe_count:
+        return [(1 << probe, (1, 0, 0, 0)) for probe in range(probe_count)]
+    return class_model['groups']
+
+
+def __get_probes(exec_data, class_id, probe_count):
+    class_data = exec_data.get(class_id)
+    if class_data is None or class_data[1] != probe_count:
+        return 0
+    return class_data[2]
+
+
+def __unpack_probes(probe_masks, probe_count):
+    # unpack probe ints into a boolean matrix, using the little-endian bit order of JaCoCo probe arrays
+    byte_count = (probe_count + 7) // 8
+    packed = np.frombuffer(b''.join(mask.to_bytes(byte_count, 'little') for mask in probe_masks), dtype=np.uint8)
+    packed = packed.reshape(len(probe_masks), byte_count)
+    return np.unpackbits(packed, axis=1, bitorder='little')[:, :probe_count].astype(bool)
+
+
+def __add_weights(groups, mask, counter):
+    weights = groups.get(mask)
+    if weights is None:
+        weights = groups[mask] = [0] * len(COVERAGE_COUNTERS)
+    weights[counter] += 1
+
+
+def __decode_instructions(code):
+    """Decodes method bytecode into a list of (offset, opcode, jump targets, constant pool index, local variable)
+    tuples, with opcodes normalized as by ASM (see __IMPLICIT_VAR_OPCODES).
+
+    The constant pool index is only set for instructions referencing the constant pool, and the local variable
+    only for instructions loading, storing, or incrementing a local variable.
+    """
+    instructions = []
+    pos = 0
+    while pos < len(code):
+        opcode = code[pos]
+        targets = None
+        cp_index = None
+        var = None
+        if opcode in __SWITCH_OPCODES:
+            operands = (pos + 4) & ~3
+            default = pos + __s4_struct.unpack_from(code, operands)[0]
+            if opcode == __TABLESWITCH:
+                low, high = struct.unpack_from('>ii', code, operands + 4)
+                offsets = struct.unpack_from('>{}i'.format(high - low + 1), code, operands + 12)
+                length = operands + 12 + 4 * len(offsets) - pos
+            else:
+                pair_count = __s4_struct.unpack_from(code, operands + 4)[0]
+                offsets = struct.unpack_from('>{}i'.format(2 * pair_count), code, operands + 8)[1::2]
+                length = operands + 8 + 8 * pair_count - pos
+            targets = [default] + [pos + offset for offset in offsets]
+        elif opcode == __WIDE:
+            opcode = code[pos + 1]
+            var = (code[pos + 2] << 8) | code[pos + 3]
+            length = 6 if opcode == __IINC else 4
+        else:
+            length = __OPCODE_LENGTHS[opcode]
+            if not length:
+                raise ValueError('invalid opcode {:#x} at offset {}'.format(opcode, pos))
+            if opcode in __IMPLICIT_VAR_OPCODES:
+                opcode, var = __IMPLICIT_VAR_OPCODES[opcode]
+            elif opcode in __VAR_OPCODES or opcode == __IINC:
+                var = code[pos + 1]
+            elif opcode == __LDC:
+                cp_index = code[pos + 1]
+            elif opcode in __CONSTANT_POOL_OPCODES:
+                cp_index = (code[pos + 1] << 8) | code[pos + 2]
+            elif opcode in (__GOTO_W, __JSR_W):
+                targets = [pos + __s4_struct.unpack_from(code, pos + 1)[0]]
+            elif opcode in __JUMP_OPCODES:
+                targets = [pos + __s2_struct.unpack_from(code, pos + 1)[0]]
+            opcode = __SHORT_OPCODES.get(opcode, opcode)
+        instructions.append((pos, opcode, targets, cp_index, var))
+        pos += length
+    return instructions
+
+
+def __analyze_method(instructions, exception_table, line_numbers, probe_id):
+    """Computes probe placement and instruction coverage of a method.
+
+    Replicates JaCoCo's LabelFlowAnalyzer and MethodProbesAdapter to assign probe ids (starting at the given
+    probe id) and builds the instruction graph of the JaCoCo analyzer, in which every instruction has at most
+    one predecessor through which its coverage is propagated.
+
+    Returns:
+        list: for each instruction, map from branch (numbered as by JaCoCo) to the mask of the probes that cover
+            the branch; the instruction is covered iff a probe in one of the masks is executed
+        list: for each instruction, its number of branches
+        list: for each instruction, its source line (-1 if unknown)
+        int: next probe id
+    """
+    index = {instruction[0]: i for i, instruction in enumerate(instructions)}
+    lines_by_offset = {}
+    for start_pc, line in line_numbers:
+        if start_pc in index:
+            lines_by_offset[start_pc] = line
+
+    # label flow analysis: count jumps to each offset, and find offsets reached by falling through
+    # (the first instruction is always considered a jump target)
+    targets = {0: 1}
+    for entry in exception_table:
+        for target in (entry.start_pc, entry.handler_pc):
+            targets[target] = targets.get(target, 0) + 1
+    successors = set()
+    invocation_lines = set()
+    line_start = None
+    for i, (offset, opcode, jump_targets, _, _) in enumerate(instructions):
+        if opcode in (__JSR, __RET):
+            raise ValueError('subroutines are not supported')
+        if offset in lines_by_offset:
+            line_start = offset
+        if opcode in __INVOKE_OPCODES and line_start is not None:
+            invocation_lines.add(line_start)
+        if jump_targets:
+            for target in (set(jump_targets) if opcode in __SWITCH_OPCODES else jump_targets):
+                targets[target] = targets.get(target, 0) + 1
+        if __falls_through(opcode) and i + 1 < len(instructions):
+            successors.add(instructions[i + 1][0])
+
+    def is_multi_target(target):
+        return targets.get(target, 0) + (target in successors) > 1
+
+    # probe placement and instruction graph
+    count = len(instructions)
+    predecessors = [None] * count
+    probes = [[] for _ in range(count)]
+    branch_counts = [0] * count
+    jumps = []
+    lines = [-1] * count
+    current = None
+    line = -1
+    for i, (offset, opcode, jump_targets, _, _) in enumerate(instructions):
+        if current is not None and offset in successors and \
+                (is_multi_target(offset) or offset in invocation_lines):
+            probes[current].append((0, probe_id))
+            branch_counts[current] += 1
+            probe_id += 1
+            current = None
+        line = lines_by_offset.get(offset, line)
+        lines[i] = line
+        if current is not None:
+            predecessors[i] = (current, 0)
+            branch_counts[current] += 1
+        if opcode in __RETURN_OPCODES or opcode == __ATHROW:
+            probes[i].append((0, probe_id))
+            branch_counts[i] += 1
+            probe_id += 1
+        elif opcode in __SWITCH_OPCODES:
+            distinct_targets = []
+            for target in jump_targets:
+                if target not in distinct_targets:
+                    distinct_targets.append(target)
+            for branch, target in enumerate(distinct_targets):
+                if is_multi_target(target):
+                    probes[i].append((branch, probe_id))
+                    probe_id += 1
+                else:
+                    jumps.append((i, target, branch))
+                branch_counts[i] += 1
+        elif jump_targets:
+            if is_multi_target(jump_targets[0]):
+                probes[i].append((1, probe_id))
+                probe_id += 1
+            else:
+                jumps.append((i, jump_targets[0], 1))
+            branch_counts[i] += 1
+        current = i if __falls_through(opcode) else None
+    for source, target, branch in jumps:
+        if target not in index:
+            raise ValueError('invalid jump target {}'.format(target))
+        predecessors[index[target]] = (source, branch)
+
+    # propagate coverage from probes to predecessors: an instruction is covered iff a probe in its subtree is
+    children = [[] for _ in range(count)]
+    for i, predecessor in enumerate(predecessors):
+        if predecessor is not None:
+            children[predecessor[0]].append(i)
+    masks = [0] * count
+    order = []
+    stack = [i for i in range(count) if predecessors[i] is None]
+    while stack:
+        i = stack.pop()
+        order.append(i)
+        stack.extend(children[i])
+    # instructions on predecessor cycles are not reachable from roots; iterate until their masks are stable
+    for i in reversed(order):
+        masks[i] = __get_instruction_mask(i, probes, children, masks)
+    if len(order) < count:
+        visited = set(order)
+        cyclic = [i for i in range(count) if i not in visited]
+        changed = True
+        while changed:
+            changed = False
+            for i in cyclic:
+                mask = __get_instruction_mask(i, probes, children, masks)
+                if mask != masks[i]:
+                    masks[i] = mask
+                    changed = True
+
+    # branches whose target instruction was rewired to another predecessor can never be covered
+    branch_masks = [{} for _ in range(count)]
+    for i in range(count):
+        for branch, probe in probes[i]:
+            branch_masks[i][branch] = branch_masks[i].get(branch, 0) | (1 << probe)
+        for child in children[i]:
+            branch = predecessors[child][1]
+            branch_masks[i][branch] = branch_masks[i].get(branch, 0) | masks[child]
+    return branch_masks, branch_counts, lines, probe_id
+
+
+def __get_instruction_mask(i, probes, children, masks):
+    mask = 0
+    for _, probe in probes[i]:
+        mask |= 1 << probe
+    for child in children[i]:
+        mask |= masks[child]
+    return mask
+
+
+def __falls_through(opcode):
+    return not (opcode in __RETURN_OPCODES or opcode in __SWITCH_OPCODES or
+                opcode in (__ATHROW, __GOTO, __GOTO_W))
+
+
+def __filter_instructions(class_file, instructions, exception_table, branch_masks):
+    """Applies the instruction-level JaCoCo filters for javac-generated code to the coverage of a method.
+
+    Replicates the SynchronizedFilter, FinallyFilter and StringSwitchJavacFilter of JaCoCo: the instructions of
+    exception handlers releasing monitors and of the first switch of string switches are ignored, and the copies
+    of finally blocks at the exits of try blocks are merged into the copy in the catch-any handler, which is
+    covered iff one of the copies is covered. The branch masks of merged instructions are updated in place.
+
+    Returns:
+        set: indices of the ignored instructions
+    """
+    index = {instruction[0]: i for i, instruction in enumerate(instructions)}
+    ignored = set()
+    merged = {}
+    for entry in exception_table:
+        if entry.catch_type == 0 and entry.start_pc != entry.handler_pc:
+            __filter_synchronized(class_file, instructions, index[entry.handler_pc], ignored)
+    for entry in exception_table:
+        if entry.catch_type == 0:
+            __filter_finally(instructions, index, exception_table, entry, ignored, merged)
+    for i, instruction in enumerate(instructions):
+        if instruction[1] in __SWITCH_OPCODES:
+            __filter_string_switch(class_file, instructions, index, i, ignored)
+
+    # merge the branches of duplicate instructions into their representative, and ignore the duplicates
+    merged_masks = {}
+    for i in merged:
+        representative = __find_representative(merged, i)
+        masks = merged_masks.setdefault(representative, dict(branch_masks[representative]))
+        for branch, mask in branch_masks[i].items():
+            masks[branch] = masks.get(branch, 0) | mask
+        ignored.add(i)
+    for i, masks in merged_masks.items():
+        branch_masks[i] = masks
+    return ignored
+
+
+def __filter_synchronized(class_file, instructions, handler, ignored):
+    # exception handler releasing the monitor of a synchronized block (as generated by ecj or javac)
+    end = __match_instructions(class_file, instructions, handler, [
+        (__ALOAD, None), (__MONITOREXIT, None), (__ATHROW, None)])
+    if end is None:
+        end = __match_instructions(class_file, instructions, handler, [
+            (__ASTORE, 't'), (__ALOAD, None), (__MONITOREXIT, None), (__ALOAD, 't'), (__ATHROW, None)])
+    if end is not None:
+        ignored.update(range(handler, end + 1))
+
+
+def __filter_finally(instructions, index, exception_table, catch_any, ignored, merged):
+    # the finally block is copied by javac into the catch-any handler ("astore e; <finally block>; aload e;
+    # athrow") and at every exit of the regions of the handler
+    handler = index[catch_any.handler_pc]
+    size = __get_finally_block_size(instructions, handler)
+    if size <= 0:
+        return
+    inside = set()
+    for entry in exception_table:
+        if entry.handler_pc == catch_any.handler_pc:
+            inside.update(range(index.get(entry.start_pc, len(instructions)),
+                                index.get(entry.end_pc, len(instructions))))
+    for entry in exception_table:
+        if entry.handler_pc == catch_any.handler_pc:
+            continues = False
+            end = index.get(entry.end_pc, len(instructions))
+            for i in range(index.get(entry.start_pc, len(instructions)), end):
+                opcode = instructions[i][1]
+                if opcode in __JUMP_OPCODES:
+                    target = index.get(instructions[i][2][0], len(instructions))
+                    if target not in inside:
+                        __merge_finally_block(instructions, size, handler, target, ignored, merged)
+                    continues = opcode != __GOTO
+                else:
+                    continues = opcode not in __RETURN_OPCODES and opcode != __ATHROW
+            if continues and end not in inside:
+                __merge_finally_block(instructions, size, handler, end, ignored, merged)
+        if entry is not catch_any and entry.start_pc == catch_any.start_pc and entry.end_pc == catch_any.end_pc:
+            # empty catch block of javac: the copy of the finally block follows the store of the exception
+            i = index[entry.handler_pc] + 1
+            if i not in inside:
+                __merge_finally_block(instructions, size, handler, i, ignored, merged)
+
+
+def __get_finally_block_size(instructions, handler):
+    # number of instructions of the finally block in a catch-any handler (0 if the handler has another form)
+    if instructions[handler][1] != __ASTORE:
+        return 0
+    i = handler + 1
+    while i < len(instructions) and not (instructions[i][1] == __ALOAD and
+                                         instructions[i][4] == instructions[handler][4]):
+        i += 1
+    if i + 1 >= len(instructions) or instructions[i + 1][1] != __ATHROW:
+        return 0
+    return i - handler - 1
+
+
+def __merge_finally_block(instructions, size, handler, copy, ignored, merged):
+    # merges a copy of a finally block with the finally block of the handler, if their opcodes are the same
+    if copy + size > len(instructions) or \
+            any(instructions[handler + 1 + k][1] != instructions[copy + k][1] for k in range(size)):
+        return
+    ignored.add(handler)
+    for k in range(size):
+        __merge_instructions(merged, handler + 1 + k, copy + k)
+    ignored.update((handler + size + 1, handler + size + 2))
+    # a goto at the end of a copy cannot be executed if the copy is not
+    if copy + size < len(instructions) and instructions[copy + size][1] == __GOTO:
+        ignored.add(copy + size)
+
+
+def __merge_instructions(merged, i1, i2):
+    i1 = __find_representative(merged, i1)
+    i2 = __find_representative(merged, i2)
+    if i1 != i2:
+        merged[i2] = i1
+
+
+def __find_representative(merged, i):
+    while i in merged:
+        i = merged[i]
+    return i
+
+
+def __filter_string_switch(class_file, instructions, index, start, ignored):
+    # javac compiles a switch on a string into a switch on its hash code, whose cases compare the string with the
+    # case labels of the hash code and store the index of the matching label, followed (at the default target of
+    # the first switch) by a switch on the index; the first switch and its cases are filtered
+    default = index.get(instructions[start][2][0])
+    variables = {}
+    if default is None or default <= start or start < 2 or __match_instructions(
+            class_file, instructions, start - 2,
+            [(__ALOAD, 's'), (__INVOKEVIRTUAL, ('java/lang/String', 'hashCode', '()I'))], variables) != start - 1:
+        return
+    i = start
+    while i + 1 < default:
+        i = __match_instructions(class_file, instructions, i + 1, [
+            (__ALOAD, 's'), (__LDC, None),
+            (__INVOKEVIRTUAL, ('java/lang/String', 'equals', '(Ljava/lang/Object;)Z')), (__IFEQ, None),
+            (None, None), (__ISTORE, 'index')], variables)
+        if i is None:
+            return
+        if i + 1 < default and instructions[i + 1][1] == __GOTO:
+            i += 1
+    ignored.update(range(start, default))
+
+
+def __match_instructions(class_file, instructions, start, pattern, variables=None):
+    """Matches the instructions from the given index on against a pattern, as the matchers of the JaCoCo filters.
+
+    Each step of the pattern is an (opcode, argument) tuple: a None opcode matches any instruction, a str argument
+    names a local variable (which must be the same in all steps with the same name), and a tuple argument gives
+    the owner, name and descriptor of an invoked method.
+
+    Returns:
+        int: index of the last matched instruction, or None if the instructions do not match
+    """
+    variables = {} if variables is None else variables
+    i = start
+    for opcode, argument in pattern:
+        if i >= len(instructions) or (opcode is not None and instructions[i][1] != opcode):
+            return None
+        if isinstance(argument, str):
+            if variables.setdefault(argument, instructions[i][4]) != instructions[i][4]:
+                return None
+        elif argument is not None and not __is_invoke(class_file, instructions, i, opcode, *argument):
+            return None
+        i += 1
+    return i - 1
+
+
+def __is_method_filtered(class_file, class_name, super_name, method, instructions):
+    """Checks whether a method is ignored by the method-level filters of the JaCoCo analyzer"""
+    name = method.name_as_str
+    descriptor = class_file.constant_pool[method.descriptor_index - 1].cp_info.value
+    access = method.access_flags
+    if access & __ACC_SYNTHETIC and not name.startswith('lambda$'):
+        return True
+    if __has_generated_annotation(class_file, method.attributes):
+        return True
+    opcodes = [instruction[1] for instruction in instructions[:5]]
+    first_is_aload_0 = bool(opcodes) and opcodes[0] == __ALOAD and instructions[0][4] == 0
+    if super_name == 'java/lang/Enum':
+        if (name == 'values' and descriptor == '()[L{};'.format(class_name)) or \
+                (name == 'valueOf' and descriptor == '(Ljava/lang/String;)L{};'.format(class_name)):
+            return True
+        if access & __ACC_PRIVATE and name == '<init>' and descriptor == '(Ljava/lang/String;I)V' and \
+                len(opcodes) >= 5 and first_is_aload_0 and opcodes[1] == __ALOAD and opcodes[2] == __ILOAD and \
+                __is_invoke(class_file, instructions, 3, __INVOKESPECIAL, 'java/lang/Enum', '<init>',
+                            '(Ljava/lang/String;I)V') and opcodes[4] == __RETURN:
+            return True
+    if access & __ACC_PRIVATE and name == '<init>' and descriptor == '()V' and len(opcodes) >= 3 and \
+            first_is_aload_0 and __is_invoke(class_file, instructions, 1, __INVOKESPECIAL, super_name, '<init>', '()V') \
+            and opcodes[2] == __RETURN:
+        return True
+    if super_name == 'java/lang/Record' and first_is_aload_0:
+        if name == 'toString' and descriptor == '()Ljava/lang/String;':
+            return opcodes[1:3] == [__INVOKEDYNAMIC, __ARETURN]
+        if name == 'hashCode' and descriptor == '()I':
+            return opcodes[1:3] == [__INVOKEDYNAMIC, __IRETURN]
+        if name == 'equals' and descriptor == '(Ljava/lang/Object;)Z':
+            return len(opcodes) >= 4 and opcodes[1] == __ALOAD and opcodes[2:4] == [__INVOKEDYNAMIC, __IRETURN]
+    return False
+
+
+def __is_invoke(class_file, instructions, i, opcode, owner, name, descriptor):
+    if i < 0 or i >= len(instructions) or instructions[i][1] != opcode:
+        return False
+    method_ref = class_file.constant_pool[instructions[i][3] - 1].cp_info
+    name_and_type = class_file.constant_pool[method_ref.name_and_type_index - 1].cp_info
+    return __get_class_name(class_file, method_ref.class_index) == owner and \
+        class_file.constant_pool[name_and_type.name_index - 1].cp_info.value == name and \
+        class_file.constant_pool[name_and_type.descriptor_index - 1].cp_info.value == descriptor
+
+
+def __get_class_name(class_file, class_index):
+    return class_file.constant_pool[class_index - 1].cp_info.name_as_str
+
+
+def __has_generated_annotation(class_file, attributes):
+    """Checks for a (visible or invisible) annotation whose simple name contains "Generated", as JaCoCo does"""
+    for attr in attributes:
+        if attr.name_as_str not in ('RuntimeVisibleAnnotations', 'RuntimeInvisibleAnnotations'):
+            continue
+        data = attr.info
+        pos = 2
+        for _ in range(struct.unpack_from('>H', data, 0)[0]):
+            type_index = struct.unpack_from('>H', data, pos)[0]
+            descriptor = class_file.constant_pool[type_index - 1].cp_info.value
+            if 'Generated' in descriptor[max(descriptor.rfind('/'), descriptor.rfind('$')) + 1:]:
+                return True
+            pos = __skip_annotation(data, pos)
+    return False
+
+
+def __skip_annotation(data, pos):
+    pair_count = struct.unpack_from('>H', data, pos + 2)[0]
+    pos += 4
+    for _ in range(pair_count):
+        pos = __skip_element_value(data, pos + 2)
+    return pos
+
+
+def __skip_element_value(data, pos):
+    tag = chr(data[pos])
+    pos += 1
+    if tag == 'e':
+        return pos + 4
+    if tag == '@':
+        return __skip_annotation(data, pos)
+    if tag == '[':
+        value_count = struct.unpack_from('>H', data, pos)[0]
+        pos += 2
+        for _ in range(value_count):
+            pos = __skip_element_value(data, pos)
+        return pos
+    return pos + 2
@@ -18,32 +18,36 @@ import subprocess
 import sys
 import shlex
 import os
+import time
 
-def run_command(command, verbose, env_vars=None):
+def run_command(command, verbose, env_vars=None, cwd=None, timeout=None):
     """Runs a command using subprocess.
 
     Runs the given command using subprocess.run(). If verbose is false, stdout is
     discarded. A pipe is opened to stderr of the subprocess so that the subprocess
     error messages can be captured and printed by the CLI if the command fails.
     If env_vars is specified, the command is executed under the given environment
-    variable values
+    variable values. If cwd is specified, the command is executed in the given directory.
+    If timeout (in seconds) is specified, the command is killed when the timeout expires,
+    and subprocess.TimeoutExpired is raised
     """
     if verbose:
         if env_vars:
             subprocess.run(command, shell=True, check=True, stderr=subprocess.PIPE, env=env_vars,
-                           encoding=sys.getfilesystemencoding())
+                           encoding=sys.getfilesystemencoding(), cwd=cwd, timeout=timeout)
         else:
             subprocess.run(command, shell=True, check=True, stderr=subprocess.PIPE,
-                           encoding=sys.getfilesystemencoding())
+                           encoding=sys.getfilesystemencoding(), cwd=cwd, timeout=timeout)
     else:
         if env_vars:
             subprocess.run(command, shell=True, check=True, stdout=subprocess.DEVNULL,
-                           stderr=subprocess.PIPE, env=env_vars, encoding=sys.getfilesystemencoding())
+                           stderr=subprocess.PIPE, env=env_vars, encoding=sys.getfilesystemencoding(), cwd=cwd,
+                           timeout=timeout)
         else:
             subprocess.run(command, shell=True, check=True, stdout=subprocess.DEVNULL,
-                           stderr=subprocess.PIPE, encoding=sys.getfilesystemencoding())
+                           stderr=subprocess.PIPE, encoding=sys.getfilesystemencoding(), cwd=cwd, timeout=timeout)
 
-def start_command(command, verbose):
+def start_command(command, verbose, cwd=None):
     if os.name == 'nt':
         exec_command = command
     else:
@@ -51,9 +55,16 @@ def start_command(command, verbose):
     if verbose:
 
         proc = subprocess.Popen(exec_command, shell=False, stderr=subprocess.PIPE,
-                      encoding=sys.getfilesystemencoding())
+                      encoding=sys.getfilesystemencoding(), cwd=cwd)
     else:
         proc = subprocess.Popen(exec_command, shell=False, stdout=subprocess.DEVNULL,
-                           stderr=subprocess.PIPE, encoding=sys.getfilesystemencoding())
+                           stderr=subprocess.PIPE, encoding=sys.getfilesystemencoding(), cwd=cwd)
     return proc
 
+
+def get_remaining_time(end_time):
+    """Returns the time (in seconds) left until the given end time, for use as a command timeout (None if no end
+    time is given)"""
+    if end_time is None:
+        return None
+    return max(end_time - time.time(), 0)
@@ -248,6 +248,65 @@ def __validate_config_scope(config, options_spec, val_errors, loaded_config=None
             val_errors['invalid_enum_values'][opt_name] = 'must be one of {}: {}\n'.format(
                 opt['choices'], config[opt_name])
 
+        # check parameter value constraints
+        if opt_name == 'augmentation_target_coverage' and not 0 <= config[opt_name] <= 100:
+            val_errors['param_constraint_violation'].append(
+                'Augmentation target coverage must be a percentage between 0 and 100: {}'.format(config[opt_name]))
+
+        if opt_name == 'base_test_generator_shards' and config[opt_name] < 1:
+            val_errors['param_constraint_violation'].append(
+                'Number of base test generator shards must be positive: {}'.format(config[opt_name]))
+
+        if opt_name == 'sequence_extender_shards' and config[opt_name] < 1:
+            val_errors['param_constraint_violation'].append(
+                'Number of sequence extender shards must be positive: {}'.format(config[opt_name]))
+
+        if opt_name == 'augmentation_workers' and config[opt_name] < 0:
+            val_errors['param_constraint_violation'].append(
+                'Number of augmentation workers must be non-negative: {}'.format(config[opt_name]))
+
+        if opt_name == 'augmentation_cache_size' and config[opt_name] < 0:
+            val_errors['param_constraint_violation'].append(
+                'Augmentation cache size must be non-negative: {}'.format(config[opt_name]))
+
+        if opt_name == 'augmentation_memory_budget' and config[opt_name] < 0:
+            val_errors['param_constraint_violation'].append(
+                'Augmentation memory budget must be non-negative: {}'.format(config[opt_name]))
+
+        if opt_name == 'deadline' and config[opt_name] < 0:
+            val_errors['param_constraint_violation'].append(
+                'Deadline must be non-negative: {}'.format(config[opt_name]))
+
+        if opt_name == 'plateau_window' and config[opt_name] < 0:
+            val_errors['param_constraint_violation'].append(
+                'Plateau window must be non-negative: {}'.format(config[opt_name]))
+
+        if opt_name == 'plateau_threshold' and not 0 <= config[opt_name] <= 100:
+            val_errors['param_constraint_violation'].append(
+                'Plateau threshold must be a percentage between 0 and 100: {}'.format(config[opt_name]))
+
+        if opt_name == 'workers' and config[opt_name] < 1:
+            val_errors['param_constraint_violation'].append(
+                'Number of evosuite workers must be positive: {}'.format(config[opt_name]))
+
+        if opt_name == 'shards' and config[opt_name] < 1:
+            val_errors['param_constraint_violation'].append(
+                'Number of randoop shards must be positive: {}'.format(config[opt_name]))
+
+        if opt_name == 'jvm_profiles':
+            for tool_name, profile in config[opt_name].items():
+                if tool_name not in opt['default_value']:
+                    val_errors['param_constraint_violation'].append(
+                        'JVM profile for unknown tool: {}'.format(tool_name))
+                elif profile['max_heap'] < 0 or profile['gc_threads'] < 0:
+                    val_errors['param_constraint_violation'].append(
+                        'Heap size and garbage collector threads in JVM profile must be non-negative: {}'.format(
+                            tool_name))
+                elif profile['gc'] not in ['', 'SerialGC', 'ParallelGC', 'G1GC', 'ZGC', 'ShenandoahGC']:
+                    val_errors['param_constraint_violation'].append(
+                        'Garbage collector in JVM profile must be one of SerialGC, ParallelGC, G1GC, ZGC, '
+                        'ShenandoahGC: {}'.format(profile['gc']))
+
         # check parameter dependency constraints
         if opt_name == 'no_augment_coverage':
             if config[opt_name] is False and config['base_test_generator'] == 'randoop':
@@ -257,6 +316,10 @@ def __validate_config_scope(config, options_spec, val_errors, loaded_config=None
                         opt['short_name'], opt['long_name']
                     ))
 
+        if opt_name == 'deadline' and config[opt_name] > 0 and (config['incremental'] or config['resume']):
+            val_errors['param_constraint_violation'].append(
+                'Deadline mode cannot be combined with incremental generation or resuming generation')
+
 
 def __init_options(options_spec):
     """
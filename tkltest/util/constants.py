@@ -63,6 +63,18 @@ TKL_CODE_COVERAGE_COMPARE_HTML_DIR = 'compare-html'
 # suffix for the file containing the CTD model and test plan
 TKL_CTD_TEST_PLAN_FILE_SUFFIX = '_ctd_models_and_test_plans.json'
 
+# suffix for the file containing the CTD models and test plans of the changed classes in incremental generation
+TKL_INCREMENTAL_CTD_TEST_PLAN_FILE_SUFFIX = '_incremental_ctd_models_and_test_plans.json'
+
+# suffix of the directory containing the state (manifest, tests, sequences, and reports) of incremental generation
+TKL_INCREMENTAL_STATE_DIR_SUFFIX = '-incremental-generation-state'
+
+# suffix for the file containing the phase checkpoints of the generate command (used for resuming generation)
+TKL_GENERATE_CHECKPOINT_FILE_SUFFIX = '_generate_checkpoints.json'
+
+# suffix of the directory containing the snapshot of the CTD-guided tests (used for resuming generation)
+TKL_CHECKPOINT_CTD_TESTS_DIR_SUFFIX = '-checkpoint-ctd-tests'
+
 # suffix for the file containing the building-block test sequences
 TKL_BB_SEQ_FILE_SUFFIX = '_bb_test_sequences.json'
 
@@ -70,6 +82,10 @@ TKL_BB_SEQ_FILE_SUFFIX = '_bb_test_sequences.json'
 
 TKL_EVOSUITE_OUTDIR_SUFFIX = "-evosuite-tests"
 
+# suffix (followed by the shard number) of the working directories of shards of building-block test generation
+
+TKL_BB_SHARD_DIR_SUFFIX = "-bb-shard-"
+
 # name of the test plan coverage file generated by the test sequence extender
 TKL_EXTENDER_COVERAGE_FILE_SUFFIX = '_coverage_report.json'
 
@@ -79,6 +95,37 @@ TKL_EXTENDER_CTD_COVERAGE_FILE_SUFFIX = '_ctd_coverage_report.json'
 # suffix of name of summary file created by the sequence extender
 TKL_EXTENDER_SUMMARY_FILE_SUFFIX = '_test_generation_summary.json'
 
+# suffix (followed by the shard number) of the working directories of shards of the test sequence extender
+TKL_EXTENDER_SHARD_DIR_SUFFIX = '-extender-shard-'
+
+# suffix for the file containing the CTD models and test plans of the classes in the current round of building-block
+# test generation with early stopping on coverage plateaus
+TKL_PLATEAU_ROUND_CTD_TEST_PLAN_FILE_SUFFIX = '_plateau_round_ctd_models_and_test_plans.json'
+
+# suffix of the directory accumulating the outputs of the rounds of building-block test generation with early stopping
+# on coverage plateaus
+TKL_PLATEAU_ROUNDS_DIR_SUFFIX = '-plateau-rounds'
+
+# suffix for the file containing the CTD models and test plans of the current priority batch in deadline mode
+TKL_DEADLINE_BATCH_CTD_TEST_PLAN_FILE_SUFFIX = '_deadline_batch_ctd_models_and_test_plans.json'
+
+# suffix (followed by the batch number) of the directories holding the outputs of priority batches in deadline mode
+TKL_DEADLINE_BATCH_DIR_SUFFIX = '-deadline-batch-'
+
+# suffix (followed by the worker number) of the working directories of the per-class workers of standalone evosuite
+# test generation
+TKL_EVOSUITE_WORKER_DIR_SUFFIX = '-evosuite-worker-'
+
+# default report directory of evosuite, and statistics file written by evosuite to its report directory
+EVOSUITE_REPORT_DIR = 'evosuite-report'
+EVOSUITE_STATISTICS_FILE = 'statistics.csv'
+
+# suffix (followed by the shard number) of the working directories of the shards of standalone randoop test generation
+TKL_RANDOOP_SHARD_DIR_SUFFIX = '-randoop-shard-'
+
+# base names of the regression and error-revealing test classes generated by randoop
+RANDOOP_TEST_BASENAMES = ['RegressionTest', 'ErrorTest']
+
 # name of test generator indicating use of all existing test generators in concert
 COMBINED_TEST_GENERATOR_NAME = 'CombinedTestGenerator'
 
@@ -122,13 +169,39 @@ MAVEN_REPORTS_PLUGIN_VERSION = "3.0.0"
 
 MAVEN_SURFIRE_VERSION = "3.0.0-M5"
 
-# Initial timeout for extender to complete before starting to check if it terminated
+# Interval (in seconds) for checking whether the extender completed, i.e., exited or wrote its coverage file
+
+EXTENDER_COMPLETION_POLL_INTERVAL = 0.05
+
+# Time (in seconds) given to the extender to exit after it wrote its coverage file, before it is terminated
+
+EXTENDER_EXIT_GRACE_PERIOD = 2
 
-EXTENDER_INITIAL_TIMEOUT = 300
+# Interval (in seconds) for reporting progress while waiting for the extender to complete
 
-# Repeated timeout for extender completion after initial timeout is reached
+EXTENDER_PROGRESS_INTERVAL = 60
 
-EXTENDER_REPEATED_TIMEOUT = 60
+# Number of priority batches into which target classes are split in deadline mode
+
+DEADLINE_PRIORITY_BATCHES = 4
+
+# Estimated time (in seconds) taken by a priority batch in deadline mode besides the time limits of its classes,
+# for starting the JVMs and analyzing the app in building-block test generation and sequence extension
+
+DEADLINE_BATCH_OVERHEAD = 60
+
+# Time (in seconds) reserved at the end of the deadline for writing the tests, reports, and build file
+
+DEADLINE_FINALIZATION_TIME = 30
+
+# Fraction of the deadline reserved for coverage-based augmentation in deadline mode
+
+DEADLINE_AUGMENTATION_FRACTION = 0.2
+
+# Directory (in the output directory) caching the classpath argument files and class data sharing archives of the
+# JVMs launched by the CLI
+
+TKLTEST_JVM_CACHE_DIR = 'tkltest-jvm-cache'
 
 # Name of test plan summary report
 
@@ -146,10 +219,27 @@ JACOCO_SUFFIX_FOR_AUGMENTATION = '_jacoco.exec'
 
 JACOCO_MERGED_DATA_FOR_AUGMENTATION = 'ctd-guided-augmented.exec'
 
+# Suffix of the directory containing the cache of raw coverage data files of test classes used in test augmentation
+
+TKL_AUGMENTATION_COVERAGE_CACHE_DIR_SUFFIX = '-augmentation-coverage-cache'
+
+# Separator of test class file and test method name of test methods in the test augmentation pool (also used in
+# names of raw coverage data files of test methods)
+
+AUGMENTATION_TEST_METHOD_SEPARATOR = '#'
+
 # Name of Jacoco CLI jar
 
 JACOCO_CLI_JAR_NAME = 'org.jacoco.cli-0.8.7-nodeps.jar'
 
+# Name of Jacoco agent jar (containing the jacocoagent.jar java agent)
+
+JACOCO_AGENT_JAR_NAME = 'org.jacoco.agent-0.8.7.jar'
+
+# Name of the JUnit runner that dumps coverage data of each test class, used in test augmentation
+
+COVERAGE_DUMP_RUNNER_CLASS = 'TkltestCoverageDumpRunner'
+
 ####### tkltest-ui constants #######
 
 # output directory for generated UI tests
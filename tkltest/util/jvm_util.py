@@ -0,0 +1,281 @@
+# ***************************************************************************
+# Copyright IBM Corporation 2021
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ***************************************************************************
+
+"""
+This module implements startup optimizations for the JVMs launched by the CLI.
+
+Classpaths are passed to the JVM through argument files (supported by Java 9+), which are cached by content, instead
+of on the command line. For each tool and classpath, a dynamic class data sharing (AppCDS) archive of the loaded
+classes is created by the first launch (Java 13+) and mapped by the following launches, which then skip loading and
+verifying those classes from jars. As the JVM cannot create archives for classpaths containing non-empty
+directories, archives are used only for classpaths consisting of jars (such as the classpaths of the tackle core and
+JaCoCo launches, which get the app classes as arguments). Archives are keyed by a fingerprint of the JVM and of the
+classpath entries, so that a changed jar gets a new archive; as sharing is enabled with -Xshare:auto, the JVM
+silently falls back to loading classes from the classpath if an archive cannot be used.
+
+The heap size, garbage collector, and number of concurrent runs of the JVM tools are computed by resource profiles
+from the cores and memory of the machine, the number of classes of the app, and the requested concurrency, and can
+be overridden per tool in the configuration file.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import subprocess
+import threading
+import zipfile
+
+from tkltest.util import constants
+
+# minimum Java feature versions supporting argument files, dynamic archives, and automatic archive creation
+__ARGFILE_JAVA_VERSION = 9
+__DYNAMIC_ARCHIVE_JAVA_VERSION = 13
+__AUTO_ARCHIVE_JAVA_VERSION = 19
+
+# heap size (in MB) of a JVM tool: a base heap plus a heap per class of the app, bounded below by the default heap
+# and by the minimum heap when memory is scarce
+__TOOL_HEAP_SIZES = {
+    'ctd_modeler': (1024, 0.5),
+    'bb_test_generator': (1024, 0.25),
+    'sequence_extender': (1024, 0.5),
+    'evosuite': (1024, 0.25),
+    'randoop': (1024, 0.25)
+}
+__DEFAULT_HEAP = 2048
+__MIN_HEAP = 512
+
+# fraction of the memory of the machine available to the JVM tools (the remainder is left for the OS and for the
+# JVMs spawned by the tools)
+__USABLE_MEMORY_FRACTION = 0.75
+
+__java_versions = {}
+__archives_in_creation = set()
+__app_class_counts = {}
+__lock = threading.Lock()
+
+
+def get_jvm_launch_args(java_path, tool_name, classpath, cache_dir=None):
+    """Gets the JVM arguments for launching a tool with the given classpath.
+
+    Args:
+        java_path (str): path to the java launcher (or "java" for the launcher in the path)
+        tool_name (str): name of the tool, used in the name of its class data sharing archive
+        classpath (list): classpath entries
+        cache_dir (str): directory for argument files and archives (default: the JVM cache directory in the
+            current directory)
+
+    Returns:
+        str: class data sharing arguments followed by the classpath argument
+    """
+    args = get_class_data_sharing_args(java_path, tool_name, classpath, cache_dir)
+    return (args + ' ' if args else '') + get_classpath_args(java_path, classpath, cache_dir)
+
+
+def get_classpath_args(java_path, classpath, cache_dir=None):
+    """Gets the JVM arguments for the given classpath: an argument file if supported by the JVM, -cp otherwise"""
+    cache_dir = os.path.abspath(cache_dir or constants.TKLTEST_JVM_CACHE_DIR)
+    classpath = os.pathsep.join(classpath)
+    if get_java_version(java_path) < __ARGFILE_JAVA_VERSION:
+        return '-cp "{}"'.format(classpath)
+    # backslashes are escape characters in quoted argument file content
+    argfile_content = '-cp "{}"\n'.format(classpath.replace('\\', '\\\\'))
+    argfile = os.path.join(cache_dir, hashlib.sha256(argfile_content.encode('utf-8')).hexdigest()[:32] + '.args')
+    if not os.path.isfile(argfile):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_argfile = '{}.{}.{}.tmp'.format(argfile, os.getpid(), threading.get_ident())
+        with open(tmp_argfile, 'w', encoding='utf-8') as f:
+            f.write(argfile_content)
+        os.replace(tmp_argfile, argfile)
+    return '"@{}"'.format(argfile)
+
+
+def get_class_data_sharing_args(java_path, tool_name, classpath, cache_dir=None):
+    """Gets the JVM arguments for using (or creating) the class data sharing archive of a tool and classpath.
+
+    Args:
+        java_path (str): path to the java launcher
+        tool_name (str): name of the tool
+        classpath (list): classpath entries (for a tool launched with -jar, the jar)
+        cache_dir (str): directory for archives (default: the JVM cache directory in the current directory)
+
+    Returns:
+        str: the arguments (empty if the JVM does not support dynamic archives or the classpath contains
+            directories)
+    """
+    cache_dir = os.path.abspath(cache_dir or constants.TKLTEST_JVM_CACHE_DIR)
+    if any(not os.path.isfile(entry) for entry in classpath):
+        return ''
+    java_version = get_java_version(java_path)
+    if java_version < __DYNAMIC_ARCHIVE_JAVA_VERSION:
+        return ''
+    archive = os.path.join(cache_dir, '{}-{}.jsa'.format(tool_name, get_classpath_fingerprint(java_path, classpath)))
+    os.makedirs(cache_dir, exist_ok=True)
+    args = '-Xshare:auto -Xlog:cds=off -Xlog:cds+dynamic=off'
+    if java_version >= __AUTO_ARCHIVE_JAVA_VERSION:
+        return args + ' -XX:+AutoCreateSharedArchive -XX:SharedArchiveFile="{}"'.format(archive)
+    if os.path.isfile(archive):
+        return args + ' -XX:SharedArchiveFile="{}"'.format(archive)
+    with __lock:
+        # only one of concurrent launches creates the archive
+        if archive in __archives_in_creation:
+            return ''
+        __archives_in_creation.add(archive)
+    return args + ' -XX:ArchiveClassesAtExit="{}"'.format(archive)
+
+
+def get_resource_profile(tool_name, app_class_count=0, concurrency=1, jvm_profiles=None, cpu_count=None,
+                         total_memory=None, heaps_per_run=1):
+    """Computes the resource profile of runs of a JVM tool.
+
+    The heap size is estimated from the number of classes of the app, and bounded by the share of the usable memory
+    of each concurrent run; if the estimated heap of the requested number of concurrent runs does not fit in the
+    usable memory, or there are fewer cores than runs, fewer runs are performed concurrently. The tools are
+    throughput-bound batch tools, so the parallel collector is used, with the cores divided among the concurrent
+    runs (or the serial collector for runs with a single core). Values specified for the tool in the JVM profiles of
+    the configuration override the computed values. For tools whose runs launch a child JVM with the same heap size
+    (e.g., the EvoSuite master and client processes), the usable memory is divided among the heaps of all runs.
+
+    Args:
+        tool_name (str): name of the tool (ctd_modeler, bb_test_generator, sequence_extender, evosuite, or randoop)
+        app_class_count (int): number of classes of the app
+        concurrency (int): requested number of concurrent runs of the tool
+        jvm_profiles (dict): JVM profiles of the configuration, with per-tool overrides
+        cpu_count (int): number of cores (default: the cores of the machine)
+        total_memory (int): memory in MB (default: the memory of the machine; 0 if it cannot be determined)
+        heaps_per_run (int): number of JVM heaps of the computed size in each run
+
+    Returns:
+        dict: heap size in MB (max_heap), garbage collector (gc), number of garbage collector threads (gc_threads),
+            additional JVM arguments (jvm_args), and number of concurrent runs (workers)
+    """
+    if cpu_count is None:
+        cpu_count = os.cpu_count() or 1
+    if total_memory is None:
+        total_memory = get_total_memory()
+    overrides = (jvm_profiles or {}).get(tool_name, {})
+    base_heap, class_heap = __TOOL_HEAP_SIZES[tool_name]
+    max_heap = overrides.get('max_heap') or max(__DEFAULT_HEAP, int(base_heap + class_heap * app_class_count))
+    workers = max(1, min(concurrency, cpu_count))
+    if total_memory:
+        usable_memory = int(total_memory * __USABLE_MEMORY_FRACTION)
+        workers = max(1, min(workers, usable_memory // (max_heap * heaps_per_run)))
+        if not overrides.get('max_heap'):
+            max_heap = min(max_heap, max(__MIN_HEAP, usable_memory // (workers * heaps_per_run)))
+    gc_threads = overrides.get('gc_threads') or max(1, cpu_count // workers)
+    return {
+        'max_heap': max_heap,
+        'gc': overrides.get('gc') or ('ParallelGC' if gc_threads > 1 else 'SerialGC'),
+        'gc_threads': gc_threads,
+        'jvm_args': overrides.get('jvm_args', ''),
+        'workers': workers
+    }
+
+
+def get_resource_args(resource_profile):
+    """Gets the JVM arguments for the given resource profile (see get_resource_profile())"""
+    args = '-Xmx{}m -XX:+Use{}'.format(resource_profile['max_heap'], resource_profile['gc'])
+    if resource_profile['gc'] in ['ParallelGC', 'G1GC']:
+        args += ' -XX:ParallelGCThreads={}'.format(resource_profile['gc_threads'])
+    if resource_profile['jvm_args']:
+        args += ' ' + resource_profile['jvm_args']
+    return args
+
+
+def get_app_class_count(monolith_app_path):
+    """Counts the class files in the given directories and jars of app classes"""
+    key = tuple(monolith_app_path)
+    with __lock:
+        if key in __app_class_counts:
+            return __app_class_counts[key]
+    class_count = 0
+    for app_path in monolith_app_path:
+        if os.path.isdir(app_path):
+            class_count += sum(1 for _, _, files in os.walk(app_path) for file in files if file.endswith('.class'))
+        elif zipfile.is_zipfile(app_path):
+            with zipfile.ZipFile(app_path) as jar:
+                class_count += sum(1 for entry in jar.namelist() if entry.endswith('.class'))
+    with __lock:
+        __app_class_counts[key] = class_count
+    return class_count
+
+
+def get_total_memory():
+    """Gets the memory (in MB) available to the process, taking container limits into account (0 if unknown)"""
+    try:
+        total_memory = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        total_memory = 0
+    for limit_file in ['/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes']:
+        try:
+            with open(limit_file) as f:
+                limit = f.read().strip()
+        except OSError:
+            continue
+        if limit.isdigit() and (not total_memory or int(limit) < total_memory):
+            total_memory = int(limit)
+    return total_memory // (1024 * 1024)
+
+
+def get_classpath_fingerprint(java_path, classpath):
+    """Computes a fingerprint of the JVM and of the classpath entries (paths, sizes, and modification times)"""
+    digest = hashlib.sha256(os.path.realpath(__which(java_path)).encode('utf-8'))
+    digest.update(str(get_java_version(java_path)).encode('utf-8'))
+    for entry in classpath:
+        digest.update(b'\0' + os.path.abspath(entry).encode('utf-8'))
+        if os.path.isfile(entry):
+            stat = os.stat(entry)
+            digest.update('{}:{}'.format(stat.st_size, stat.st_mtime_ns).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def get_java_version(java_path):
+    """Gets the feature version of the given java launcher (e.g., 8 or 17; 0 if it cannot be determined)"""
+    with __lock:
+        if java_path in __java_versions:
+            return __java_versions[java_path]
+    try:
+        version_output = subprocess.run([java_path, '-version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        encoding='utf-8', errors='replace').stdout
+    except OSError as e:
+        logging.info('Cannot determine version of {}: {}'.format(java_path, e))
+        version_output = ''
+    java_version = parse_java_version(version_output)
+    with __lock:
+        __java_versions[java_path] = java_version
+    return java_version
+
+
+def parse_java_version(version_output):
+    """Parses the feature version from the output of "java -version" (0 if it cannot be parsed)"""
+    match = re.search(r'version "(\d+)(?:\.(\d+))?', version_output)
+    if not match:
+        return 0
+    feature_version = int(match.group(1))
+    # versions up to 8 are reported as 1.x
+    if feature_version == 1 and match.group(2):
+        feature_version = int(match.group(2))
+    return feature_version
+
+
+def __which(java_path):
+    if os.path.dirname(java_path):
+        return java_path
+    for path_dir in os.environ.get('PATH', '').split(os.pathsep):
+        candidate = os.path.join(path_dir, java_path)
+        if os.path.isfile(candidate):
+            return candidate
+    return java_path